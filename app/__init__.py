@@ -184,6 +184,9 @@ def create_app(config_filename=None):
     # Initialize document processing scheduler now that extensions and blueprints are ready
     init_scheduler(app)
 
+    from app.utils.llm_usage import llm_usage_recorder
+    llm_usage_recorder.init_app(app)
+
     with app.app_context():
         # Create database tables if they don't exist. Under pytest we force an
         # in-memory SQLite DB, so this is safe and ensures tests that don't
@@ -315,6 +318,19 @@ def create_app(config_filename=None):
                     for column, statement in agenda_column_defs.items():
                         if not _has_column('workshop_agenda', column):
                             conn.execute(text(statement))
+                if _has_column('llm_usage_logs', 'id'):
+                    usage_column_defs = {
+                        'caller': "ALTER TABLE llm_usage_logs ADD COLUMN caller VARCHAR(64)",
+                        'prompt_tokens': "ALTER TABLE llm_usage_logs ADD COLUMN prompt_tokens INTEGER",
+                        'completion_tokens': "ALTER TABLE llm_usage_logs ADD COLUMN completion_tokens INTEGER",
+                        'retries': "ALTER TABLE llm_usage_logs ADD COLUMN retries INTEGER",
+                        'throttles': "ALTER TABLE llm_usage_logs ADD COLUMN throttles INTEGER",
+                        'status': "ALTER TABLE llm_usage_logs ADD COLUMN status VARCHAR(16)",
+                    }
+                    for column, statement in usage_column_defs.items():
+                        if not _has_column('llm_usage_logs', column):
+                            conn.execute(text(statement))
+                    conn.execute(text("CREATE INDEX IF NOT EXISTS ix_llm_usage_logs_caller ON llm_usage_logs (caller)"))
                 # chat_threads: deleted_at (DATETIME NULL), created_by_id index may already exist via model
                 if _has_column('chat_threads', 'id') and not _has_column('chat_threads', 'deleted_at'):
                     conn.execute(text("ALTER TABLE chat_threads ADD COLUMN deleted_at DATETIME NULL"))
@@ -331,6 +347,13 @@ def create_app(config_filename=None):
             os.makedirs(_Cfg.MEDIA_PHOTOS_DIR, exist_ok=True)
         except Exception:
             pass
+        # Persist dot votes a previous process journaled but had not written yet
+        if app.config.get('VOTE_TALLY_ENABLED', True) and not app.config.get('TESTING'):
+            from .sockets_core.vote_tally import vote_tallies
+            try:
+                vote_tallies.replay()
+            except Exception:
+                app.logger.exception("Vote journal replay failed")
     # --- Testing Diagnostics: capture registered socket handlers ---
     if app.config.get('TESTING'):
         names = set()
@@ -15,6 +15,7 @@ from . import admin_api_bp
 from .dashboard import AdminDashboard
 from .decorators import admin_required
 from .health_monitor import HealthMonitor
+from .llm_usage import LLMUsageReport
 from .user_management import UserManager
 from .workshop_admin import WorkshopAdmin
 
@@ -43,6 +44,16 @@ def get_metrics():
     return jsonify({"metrics": metrics, "health": health, "recent_logs": recent_logs})
 
 
+@admin_api_bp.route("/llm-usage")
+@login_required
+@admin_required
+def get_llm_usage():
+    """Return p50/p95 latency and token totals per caller and per workshop, plus registered prompt spend."""
+
+    days = max(1, min(request.args.get("days", 7, type=int) or 7, 90))
+    return jsonify(LLMUsageReport.summarize(days))
+
+
 @admin_api_bp.route("/users/<int:user_id>/role", methods=["PUT", "PATCH"])
 @login_required
 @admin_required
@@ -0,0 +1,90 @@
+"""LLM usage aggregation for the administrative console."""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.extensions import db
+from app.models import LLMUsageLog, Workshop
+from app.utils.prompt_registry import prompt_registry
+
+
+def _percentile(sorted_values: Sequence[int], pct: float) -> Optional[int]:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * (len(sorted_values) - 1)))))
+    return int(sorted_values[index])
+
+
+class LLMUsageReport:
+    """Latency percentiles and token totals from ``LLMUsageLog``, grouped by caller and by workshop."""
+
+    @staticmethod
+    def summarize(days: int = 7, *, workshop_limit: int = 25) -> Dict[str, Any]:
+        since = datetime.utcnow() - timedelta(days=days)
+        rows = (
+            db.session.query(
+                LLMUsageLog.workshop_id,
+                LLMUsageLog.caller,
+                LLMUsageLog.model_used,
+                LLMUsageLog.latency_ms,
+                LLMUsageLog.prompt_tokens,
+                LLMUsageLog.completion_tokens,
+                LLMUsageLog.retries,
+                LLMUsageLog.throttles,
+                LLMUsageLog.status,
+            )
+            .filter(LLMUsageLog.created_timestamp >= since)
+            .all()
+        )
+
+        by_caller: Dict[tuple, List[Any]] = {}
+        by_workshop: Dict[Optional[int], List[Any]] = {}
+        for row in rows:
+            by_caller.setdefault((row.caller or "untagged", row.model_used or "—"), []).append(row)
+            if row.workshop_id is not None:
+                by_workshop.setdefault(row.workshop_id, []).append(row)
+
+        caller_stats = [
+            {"caller": caller, "model": model, **LLMUsageReport._stats(group)}
+            for (caller, model), group in by_caller.items()
+        ]
+        caller_stats.sort(key=lambda item: item["total_tokens"], reverse=True)
+
+        workshop_stats = [
+            {"workshop_id": workshop_id, **LLMUsageReport._stats(group)}
+            for workshop_id, group in by_workshop.items()
+        ]
+        workshop_stats.sort(key=lambda item: item["total_tokens"], reverse=True)
+        workshop_stats = workshop_stats[:workshop_limit]
+        titles = {}
+        if workshop_stats:
+            ids = [item["workshop_id"] for item in workshop_stats]
+            titles = dict(db.session.query(Workshop.id, Workshop.title).filter(Workshop.id.in_(ids)).all())
+        for item in workshop_stats:
+            item["title"] = titles.get(item["workshop_id"]) or f"Workshop {item['workshop_id']}"
+
+        return {
+            "days": days,
+            "totals": LLMUsageReport._stats(rows),
+            "by_caller": caller_stats,
+            "by_workshop": workshop_stats,
+            # In-process counters since this worker started (not limited to ``days``).
+            "by_prompt": prompt_registry.report(),
+        }
+
+    @staticmethod
+    def _stats(rows: Sequence[Any]) -> Dict[str, Any]:
+        latencies = sorted(int(row.latency_ms) for row in rows if row.latency_ms is not None)
+        prompt_tokens = sum(int(row.prompt_tokens or 0) for row in rows)
+        completion_tokens = sum(int(row.completion_tokens or 0) for row in rows)
+        return {
+            "calls": len(rows),
+            "p50_ms": _percentile(latencies, 50),
+            "p95_ms": _percentile(latencies, 95),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "retries": sum(int(row.retries or 0) for row in rows),
+            "throttles": sum(int(row.throttles or 0) for row in rows),
+            "errors": sum(1 for row in rows if row.status == "error"),
+        }
@@ -44,6 +44,7 @@ from .dashboard import AdminDashboard
 from .decorators import admin_required
 from .forms import DocumentUploadForm, SystemConfigForm, UserCreationForm, UserManagementForm
 from .health_monitor import HealthMonitor
+from .llm_usage import LLMUsageReport
 from .document_admin import DocumentAdmin
 from .user_management import UserManager
 from .workshop_admin import WorkshopAdmin
@@ -61,6 +62,7 @@ NAV_ITEMS = (
     {"endpoint": "admin.sessions", "label": "Sessions"},
     {"endpoint": "admin.memory_overview", "label": "Memory"},
     {"endpoint": "admin.bedrock_settings", "label": "Bedrock"},
+    {"endpoint": "admin.llm_usage", "label": "LLM Usage"},
     {"endpoint": "admin.system_settings", "label": "System"},
     {"endpoint": "admin.logs", "label": "Audit Logs"},
 )
@@ -754,6 +756,15 @@ def bedrock_settings():
     return render_template("bedrock.html", **context)
 
 
+@admin_bp.route("/llm-usage")
+@login_required
+@admin_required
+def llm_usage():
+    days = max(1, min(request.args.get("days", 7, type=int) or 7, 90))
+    report = LLMUsageReport.summarize(days)
+    return render_template("llm_usage.html", report=report, days=days)
+
+
 @admin_bp.route("/workshops")
 @login_required
 @admin_required
@@ -1,16 +1,18 @@
 from __future__ import annotations
 
+import hashlib
 import json
-import textwrap
+import time
 import uuid
-from typing import Any, Dict, List, Tuple, Optional, Set
+from typing import Any, Callable, Dict, List, Tuple, Optional, Set
 
 from flask import Blueprint, current_app, request
 from flask.typing import ResponseReturnValue
 from flask_login import current_user
 from pydantic import ValidationError
 
-from app.assistant.context import AssistantContext, ContextFabric, RBACContext, TimerSnapshot
+from app.assistant.context import ActionItemEnvelope, AssistantContext, ContextFabric, RBACContext, TimerSnapshot
+from app.assistant.context_budget import ContextBudget, ContextSection, fit_json
 from app.assistant.persona import PersonaConfig, PersonaRouter
 from app.assistant.registry import TOOL_REGISTRY
 from app.assistant.schemas import (
@@ -24,16 +26,117 @@ from app.assistant.schemas import (
 from app.assistant.tooling import ToolExecutor
 from app.assistant.tools.factory import build_default_registry
 from app.assistant.tools.gateway import ToolGateway
+from app.assistant.tools.metric import assistant_llm_stage_latency, assistant_prompt_tokens, assistant_reply_path
 from app.assistant.memory import AgentCoreMemorySettings, AgentMemoryService, NullMemoryService
+from app.assistant.memory.models import MemoryRetrieval
 from app.extensions import db
 from app.models import Document
 from app.models_assistant import AssistantCitation, AssistantMessageFeedback, ChatThread, ChatTurn
-from app.utils.json_utils import extract_json_block
-from app.utils.llm_bedrock import get_chat_llm_pro
+from app.utils.json_utils import JSONScanner, extract_json_block
+from app.utils.llm_bedrock import PRIORITY_INTERACTIVE, bedrock_priority, get_chat_llm_pro
+from app.utils.llm_usage import llm_usage_context
+from app.utils.prompt_registry import count_tokens, register_prompt
+from app.utils.single_flight import get_single_flight
 
 bp = Blueprint("assistant", __name__, url_prefix="/assistant")
 
 
+# Static prompt text is registered once (validated, versioned, token-counted);
+# each call only fills the variables.
+_PLAN_PROMPT = register_prompt(
+    "assistant.plan",
+    """
+    System: {primer}
+
+    You answer as JSON with keys: role, persona, text, citations, tool_calls, proposed_actions, ui_hints.
+    Persona: {persona}
+    Workshop Context:
+    {context_text}
+    {phase_hints}
+    Temporal Context: {temporal_block}
+    Available tools:
+    {tools_json}
+    {control_instructions}
+
+    If the user asks about idea clusters, clustering results, or to list/show clusters, call the tool named "workshop.list_clusters" to retrieve the latest clusters with names, descriptions, and votes before composing your answer.
+
+    If the user asks for the agenda, session outline, planned phases, or time allocations for this workshop, call the tool named "workshop.get_agenda" to retrieve the saved agenda items (titles, descriptions, durations) before composing your answer.
+
+    If the user asks for the individual ideas (all items) from brainstorming, or what ideas have been submitted, call the tool named "workshop.list_ideas". During brainstorming/warm-up phases, this returns unclustered ideas. After clustering, ideas are grouped by cluster. IMPORTANT: If the tool returns ideas in the 'ideas' array with 'total_count' > 0, list them in your response. If it returns empty arrays but tool succeeded, say 'No ideas have been submitted yet.' If they reference a specific cluster, pass cluster_id to get only that cluster's ideas.
+
+    If the user asks to list documents, reports, files, or attachments for this workshop — including feasibility, framing brief, prioritization shortlist, action plan, or summary — call the tool named "workshop.list_reports" (optionally filter by phase) to retrieve the latest document URLs and metadata before composing your answer.
+
+    If the user asks to summarize, read, quote, or analyze the content of a specific report/document, first locate it via "workshop.list_reports", then call "workshop.read_report" with the document_id (integer ID, NOT the URL path) to retrieve the text content to ground your response. IMPORTANT: Use the numeric Document ID shown in phase context (e.g., 'Document ID 123'), not the file path/URL. Keep summaries concise unless asked for detailed analysis.
+
+    Identity Q&A: If the user asks 'what is my name' or 'what is my role', answer ONLY using RBAC and participants from context. If the display name or role is not present, say you don't know rather than guessing. Do not fabricate identity details.
+
+    User: {query_text}
+    Respond with strict JSON. Use tool_calls when you need extra data.
+    {final_answer_hint}
+
+    TIME TOOLS GUIDANCE:
+    - For time.get_phase_timing: Use workshop_id from context (Workshop ID: {workshop_id})
+    - The tool returns timing for the CURRENT phase automatically - do NOT pass phase name
+    - Example: {{"name": "time.get_phase_timing", "args": {{"workshop_id": {workshop_id}}}}}
+
+    For other time.* tools (start_timer, schedule_reminder, query_recent_activity):
+    - All require workshop_id parameter: {workshop_id}
+
+    Important: For proposed_actions, provide user-friendly descriptions:
+    - Each action should have an "action" field with a clear, natural description (e.g., "Start the workshop timer")
+    - NOT internal tool names (e.g., NOT "Time.start Timer" or "time.start_timer")
+    - Add optional "time_estimate" for action duration
+    Example: {{"action": "Start the workshop timer", "time_estimate": "10 minutes"}}
+    """,
+    dedent=True,
+)
+
+_RESPONSE_PROMPT = register_prompt(
+    "assistant.response",
+    """
+    System: {primer}
+    Persona: {persona}
+    Workshop Context:
+    {context_text}
+    Original User Request: {query_text}
+    Planning JSON: {plan_json}
+    Tool Outputs: {tools_json}
+    Compose the final strict JSON reply with grounded citations, persona field, proposed_actions, and ui_hints.
+    Always include a non-empty "text" field with the assistant's message. Do not omit it.
+
+    Identity Q&A: If asked 'what is my name' or 'what is my role', answer ONLY using RBAC and participants from context. If unknown, state that you don't have that information. Do not guess.
+
+    If you used the tool "workshop.list_clusters", include a short bulleted list of the clusters:
+    - Use the cluster name as the main label
+    - Add a concise gist or description
+    - Include counts, e.g., (ideas: N, votes: V)
+    If you used the tool "workshop.vote_for_cluster", confirm the vote with the returned totals:
+    - Mention the cluster name and its updated vote count
+    - Indicate how many dots the user has remaining when available
+    If you used the tool "workshop.get_agenda", present the agenda clearly:
+    - Use a numbered or bulleted list in chronological order
+    - Include each item's title and, when available, the estimated minutes in parentheses (e.g., "(7 min)")
+    - Add short descriptions when provided in the tool output
+    If you used the tool "workshop.list_ideas", present the granular ideas clearly:
+    - If grouped by cluster, show a bullet per cluster, then nested bullets for each idea text (cap at reasonable length)
+    - If a single cluster was requested, list the ideas as top-level bullets
+    - Do not fabricate ideas; only include items returned by the tool
+    If you used the tool "workshop.list_reports", include a short bulleted list of the returned documents with clickable links:
+    - Use the document title as the link text
+    - Link to the provided URL for each document
+    - Optionally annotate the phase in parentheses (e.g., (feasibility))
+    If the user requested a summary of a specific report, use "workshop.read_report" to retrieve the text and then provide a concise summary in the "text" field with 3-6 bullet points. Include a citation to the document.
+    Include action_buttons inside ui_hints when they would help the facilitator.
+
+    Important: For proposed_actions, use clear, user-friendly descriptions:
+    - "action" field should be natural language (e.g., "Start the workshop timer", "Prepare session materials")
+    - NOT internal tool names (e.g., NOT "Time.start Timer" or "time.start_timer")
+    - Add helpful context in "time_estimate" or "description" fields
+    """,
+    dedent=True,
+)
+
+
 class AssistantLLMClient:
     def __init__(self) -> None:
         self.client = get_chat_llm_pro(
@@ -44,9 +147,17 @@ class AssistantLLMClient:
             }
         )
 
-    def plan(self, persona: PersonaType, context: AssistantContext, query: AssistantQuery) -> AssistantReply:
-        prompt = self._compose_plan_prompt(persona, context, query)
-        raw = self.client.invoke(prompt)
+    def plan(
+        self,
+        persona: PersonaType,
+        context: AssistantContext,
+        query: AssistantQuery,
+        *,
+        allow_final: bool = False,
+    ) -> AssistantReply:
+        prompt = self._compose_plan_prompt(persona, context, query, allow_final=allow_final)
+        with bedrock_priority(PRIORITY_INTERACTIVE), llm_usage_context("assistant.plan", workshop_id=query.workshop_id):
+            raw = self.client.invoke(prompt)
         payload = self._parse_json_payload(raw)
         return AssistantReply.model_validate_json(payload)
 
@@ -59,14 +170,53 @@ class AssistantLLMClient:
         tool_results: List[Dict[str, Any]],
     ) -> AssistantReply:
         prompt = self._compose_response_prompt(persona, context, query, plan, tool_results)
-        raw = self.client.invoke(prompt)
-        payload = self._parse_json_payload(raw)
+
+        def _compose() -> AssistantReply:
+            with bedrock_priority(PRIORITY_INTERACTIVE), llm_usage_context("assistant.compose", workshop_id=query.workshop_id):
+                raw = self.client.invoke(prompt)
+            payload = self._parse_json_payload(raw)
+            return AssistantReply.model_validate_json(payload)
+
+        # A resent question with an identical prompt waits for the compose already running.
+        key = hashlib.sha256(str(prompt).encode("utf-8")).hexdigest()
+        return get_single_flight("assistant_compose").do(key, _compose)
+
+    def compose_stream(
+        self,
+        persona: PersonaType,
+        context: AssistantContext,
+        query: AssistantQuery,
+        plan: AssistantReply,
+        tool_results: List[Dict[str, Any]],
+        on_token: Callable[[str], None],
+    ) -> AssistantReply:
+        """Like ``compose`` but forwards the reply ``text`` to ``on_token`` as it streams.
+
+        Structured fields (citations, ui_hints, proposed_actions, ...) are parsed
+        from the full JSON once the stream completes.
+        """
+        prompt = self._compose_response_prompt(persona, context, query, plan, tool_results)
+        extractor = _ReplyTextExtractor()
+        # Locate/repair the JSON reply while tokens arrive instead of re-scanning it afterwards.
+        scanner = JSONScanner()
+        parts: List[str] = []
+        with bedrock_priority(PRIORITY_INTERACTIVE), llm_usage_context("assistant.compose", workshop_id=query.workshop_id):
+            for chunk in self.client.stream(prompt):
+                piece = _chunk_text(chunk)
+                if not piece:
+                    continue
+                parts.append(piece)
+                scanner.feed(piece)
+                delta = extractor.feed(piece)
+                if delta:
+                    on_token(delta)
+        payload = self._parse_json_payload("".join(parts), json_blob=scanner.finish())
         return AssistantReply.model_validate_json(payload)
 
     @staticmethod
-    def _parse_json_payload(raw: Any) -> str:
+    def _parse_json_payload(raw: Any, json_blob: Optional[str] = None) -> str:
         text = str(getattr(raw, "content", raw))
-        json_blob = extract_json_block(text) or text
+        json_blob = json_blob or extract_json_block(text) or text
         try:
             payload = json.loads(json_blob)
         except json.JSONDecodeError:
@@ -108,9 +258,11 @@ class AssistantLLMClient:
         persona: PersonaType,
         context: AssistantContext,
         query: AssistantQuery,
+        *,
+        allow_final: bool = False,
     ) -> str:
         primer = PersonaRouter().get_primer(persona) or "You are a helpful workshop assistant."
-        context_text = PromptBuilder.compact_context(context)
+        context_text = PromptBuilder.compact_context(context, query.text)
         temporal = getattr(context, "temporal", {}) or {}
         schedule = temporal.get("workshop_schedule") if isinstance(temporal, dict) else {}
         temporal_block = ""
@@ -132,8 +284,6 @@ class AssistantLLMClient:
         available_tools = getattr(context, "available_tools", [])
         tools_json = json.dumps(available_tools, ensure_ascii=False)
 
-        # Hint blocks defined later before returning the final prompt
-
         # Add workshop control command instructions based on user role
         rbac = getattr(context, "rbac", None)
         control_instructions = ""
@@ -173,79 +323,27 @@ Participant Commands (you have permission):
 If the user tries organizer commands, politely explain that only the organizer can execute those actions.
 """
 
-        # Always return a composed prompt (for any role)
-        # Re-define hint blocks here to ensure they are in local scope for the f-string below
-        cluster_hint = (
-            "\nIf the user asks about idea clusters, clustering results, or to list/show clusters, "
-            "call the tool named \"workshop.list_clusters\" to retrieve the latest clusters with names, "
-            "descriptions, and votes before composing your answer.\n"
-        )
-        agenda_hint = (
-            "\nIf the user asks for the agenda, session outline, planned phases, or time allocations for this workshop, "
-            "call the tool named \"workshop.get_agenda\" to retrieve the saved agenda items (titles, descriptions, durations) "
-            "before composing your answer.\n"
-        )
-        ideas_hint = (
-            "\nIf the user asks for the individual ideas (all items) from brainstorming, or what ideas have been submitted, "
-            "call the tool named \"workshop.list_ideas\". During brainstorming/warm-up phases, this returns unclustered ideas. "
-            "After clustering, ideas are grouped by cluster. "
-            "IMPORTANT: If the tool returns ideas in the 'ideas' array with 'total_count' > 0, list them in your response. "
-            "If it returns empty arrays but tool succeeded, say 'No ideas have been submitted yet.' "
-            "If they reference a specific cluster, pass cluster_id to get only that cluster's ideas.\n"
-        )
-        reports_hint = (
-            "\nIf the user asks to list documents, reports, files, or attachments for this workshop — including feasibility, "
-            "framing brief, prioritization shortlist, action plan, or summary — call the tool named \"workshop.list_reports\" "
-            "(optionally filter by phase) to retrieve the latest document URLs and metadata before composing your answer.\n"
-        )
-        read_hint = (
-            "\nIf the user asks to summarize, read, quote, or analyze the content of a specific report/document, first locate it via "
-            "\"workshop.list_reports\", then call \"workshop.read_report\" with the document_id (integer ID, NOT the URL path) to retrieve the text content "
-            "to ground your response. IMPORTANT: Use the numeric Document ID shown in phase context (e.g., 'Document ID 123'), not the file path/URL. "
-            "Keep summaries concise unless asked for detailed analysis.\n"
-        )
-        identity_hint = (
-            "\nIdentity Q&A: If the user asks 'what is my name' or 'what is my role', answer ONLY using RBAC and participants from context. "
-            "If the display name or role is not present, say you don't know rather than guessing. Do not fabricate identity details.\n"
-        )
-        
-        # Phase-aware contextual hints
-        phase_hints = self._build_phase_hints(context)
-        
-        return textwrap.dedent(
-            f"""
-            System: {primer}\n
-            You answer as JSON with keys: role, persona, text, citations, tool_calls, proposed_actions, ui_hints.
-            Persona: {persona.value}
-            Workshop Context:\n{context_text}
-            {phase_hints}
-            Temporal Context: {temporal_block or 'No temporal data provided'}
-            Available tools:\n{tools_json}
-            {control_instructions}
-            {cluster_hint}
-            {agenda_hint}
-            {ideas_hint}
-            {reports_hint}
-            {read_hint}
-            {identity_hint}
-            User: {query.text}
-            Respond with strict JSON. Use tool_calls when you need extra data.
-            
-            TIME TOOLS GUIDANCE:
-            - For time.get_phase_timing: Use workshop_id from context (Workshop ID: {context.workshop.id})
-            - The tool returns timing for the CURRENT phase automatically - do NOT pass phase name
-            - Example: {{"name": "time.get_phase_timing", "args": {{"workshop_id": {context.workshop.id}}}}}
-            
-            For other time.* tools (start_timer, schedule_reminder, query_recent_activity):
-            - All require workshop_id parameter: {context.workshop.id}
-
-            Important: For proposed_actions, provide user-friendly descriptions:
-            - Each action should have an "action" field with a clear, natural description (e.g., "Start the workshop timer")
-            - NOT internal tool names (e.g., NOT "Time.start Timer" or "time.start_timer")
-            - Add optional "time_estimate" for action duration
-            Example: {{"action": "Start the workshop timer", "time_estimate": "10 minutes"}}
-            """
+        final_answer_hint = ""
+        if allow_final:
+            final_answer_hint = (
+                "If you need no tool_calls, this reply is final and shown to the user as-is: put the complete, "
+                "grounded answer in a non-empty \"text\" field with citations, proposed_actions and ui_hints as needed."
+            )
+
+        prompt = _PLAN_PROMPT.format(
+            primer=primer,
+            persona=persona.value,
+            context_text=context_text,
+            phase_hints=self._build_phase_hints(context),
+            temporal_block=temporal_block or "No temporal data provided",
+            tools_json=tools_json,
+            control_instructions=control_instructions,
+            query_text=query.text,
+            final_answer_hint=final_answer_hint,
+            workshop_id=context.workshop.id,
         ).strip()
+        assistant_prompt_tokens.labels(stage="plan").observe(count_tokens(prompt))
+        return prompt
 
     def _compose_response_prompt(
         self,
@@ -256,52 +354,20 @@ If the user tries organizer commands, politely explain that only the organizer c
         tool_results: List[Dict[str, Any]],
     ) -> str:
         primer = PersonaRouter().get_primer(persona) or "You are a helpful workshop assistant."
-        context_text = PromptBuilder.compact_context(context)
-        tools_json = json.dumps(tool_results, ensure_ascii=False)
+        context_text = PromptBuilder.compact_context(context, query.text)
+        # Tool outputs (e.g. every idea of a large workshop) get their own budget.
+        tools_json = fit_json(tool_results, int(current_app.config.get("ASSISTANT_TOOL_OUTPUT_TOKEN_BUDGET", 3000)))
         plan_json = json.dumps(plan.model_dump(), ensure_ascii=False)
-        identity_hint = (
-            "\nIdentity Q&A: If asked 'what is my name' or 'what is my role', answer ONLY using RBAC and participants from context. "
-            "If unknown, state that you don't have that information. Do not guess.\n"
-        )
-        return textwrap.dedent(
-            f"""
-            System: {primer}
-            Persona: {persona.value}
-            Workshop Context:\n{context_text}
-            Original User Request: {query.text}
-            Planning JSON: {plan_json}
-            Tool Outputs: {tools_json}
-            Compose the final strict JSON reply with grounded citations, persona field, proposed_actions, and ui_hints.
-            Always include a non-empty "text" field with the assistant's message. Do not omit it.
-            {identity_hint}
-            If you used the tool "workshop.list_clusters", include a short bulleted list of the clusters:
-            - Use the cluster name as the main label
-            - Add a concise gist or description
-            - Include counts, e.g., (ideas: N, votes: V)
-            If you used the tool "workshop.vote_for_cluster", confirm the vote with the returned totals:
-            - Mention the cluster name and its updated vote count
-            - Indicate how many dots the user has remaining when available
-            If you used the tool "workshop.get_agenda", present the agenda clearly:
-            - Use a numbered or bulleted list in chronological order
-            - Include each item's title and, when available, the estimated minutes in parentheses (e.g., "(7 min)")
-            - Add short descriptions when provided in the tool output
-            If you used the tool "workshop.list_ideas", present the granular ideas clearly:
-            - If grouped by cluster, show a bullet per cluster, then nested bullets for each idea text (cap at reasonable length)
-            - If a single cluster was requested, list the ideas as top-level bullets
-            - Do not fabricate ideas; only include items returned by the tool
-            If you used the tool "workshop.list_reports", include a short bulleted list of the returned documents with clickable links:
-            - Use the document title as the link text
-            - Link to the provided URL for each document
-            - Optionally annotate the phase in parentheses (e.g., (feasibility))
-            If the user requested a summary of a specific report, use "workshop.read_report" to retrieve the text and then provide a concise summary in the "text" field with 3-6 bullet points. Include a citation to the document.
-            Include action_buttons inside ui_hints when they would help the facilitator.
-            
-            Important: For proposed_actions, use clear, user-friendly descriptions:
-            - "action" field should be natural language (e.g., "Start the workshop timer", "Prepare session materials")
-            - NOT internal tool names (e.g., NOT "Time.start Timer" or "time.start_timer")
-            - Add helpful context in "time_estimate" or "description" fields
-            """
+        prompt = _RESPONSE_PROMPT.format(
+            primer=primer,
+            persona=persona.value,
+            context_text=context_text,
+            query_text=query.text,
+            plan_json=plan_json,
+            tools_json=tools_json,
         ).strip()
+        assistant_prompt_tokens.labels(stage="compose").observe(count_tokens(prompt))
+        return prompt
 
     def _build_phase_hints(self, context: AssistantContext) -> str:
         """Build phase-specific contextual hints for the LLM.
@@ -412,9 +478,136 @@ If the user tries organizer commands, politely explain that only the organizer c
         return "\n".join(hints) + "\n"
 
 
+def _chunk_text(chunk: Any) -> str:
+    content = getattr(chunk, "content", chunk)
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        # Converse-style content blocks: [{"type": "text", "text": "..."}]
+        return "".join(
+            block.get("text", "") if isinstance(block, dict) else str(block)
+            for block in content
+        )
+    return "" if content is None else str(content)
+
+
+class _ReplyTextExtractor:
+    """Incrementally decode the top-level ``"text"`` string of a streamed JSON reply.
+
+    Feed raw model output as it arrives; ``feed`` returns the newly decoded part of
+    the value. Anything before the first ``{`` (e.g. a code fence) is ignored, as
+    are nested ``text`` keys such as ``speech.text``.
+    """
+
+    _ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+    def __init__(self, key: str = "text") -> None:
+        self._key = key
+        self._depth = 0
+        self._in_string = False
+        self._is_key = False
+        self._expect_key = False
+        self._capturing = False
+        self._done = False
+        self._escape = False
+        self._unicode: Optional[List[str]] = None
+        self._high_surrogate: Optional[int] = None
+        self._buffer: List[str] = []
+        self._last_key: Optional[str] = None
+
+    def feed(self, chunk: str) -> str:
+        out: List[str] = []
+        for ch in chunk:
+            if self._done:
+                break
+            if self._in_string:
+                self._consume_string_char(ch, out)
+                continue
+            if self._depth == 0:
+                if ch == "{":
+                    self._depth = 1
+                    self._expect_key = True
+                continue
+            if ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._done = True
+            elif self._depth == 1 and ch == ",":
+                self._expect_key = True
+            elif self._depth == 1 and ch == ":":
+                self._expect_key = False
+            elif ch == '"':
+                self._in_string = True
+                self._is_key = self._depth == 1 and self._expect_key
+                self._capturing = self._depth == 1 and not self._expect_key and self._last_key == self._key
+                self._buffer = []
+        return "".join(out)
+
+    def _emit(self, text: str, out: List[str]) -> None:
+        if self._capturing:
+            out.append(text)
+        elif self._is_key:
+            self._buffer.append(text)
+
+    def _consume_string_char(self, ch: str, out: List[str]) -> None:
+        if self._unicode is not None:
+            self._unicode.append(ch)
+            if len(self._unicode) < 4:
+                return
+            try:
+                code = int("".join(self._unicode), 16)
+            except ValueError:
+                code = 0xFFFD
+            self._unicode = None
+            if 0xD800 <= code <= 0xDBFF:
+                self._high_surrogate = code
+                return
+            if 0xDC00 <= code <= 0xDFFF and self._high_surrogate is not None:
+                code = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00)
+            self._high_surrogate = None
+            self._emit(chr(code), out)
+            return
+        if self._escape:
+            self._escape = False
+            if ch == "u":
+                self._unicode = []
+                return
+            self._emit(self._ESCAPES.get(ch, ch), out)
+            return
+        if ch == "\\":
+            self._escape = True
+            return
+        if ch == '"':
+            self._in_string = False
+            if self._is_key:
+                self._last_key = "".join(self._buffer)
+            elif self._capturing:
+                self._capturing = False
+                self._done = True
+            self._last_key = self._last_key if self._is_key else None
+            self._is_key = False
+            return
+        self._emit(ch, out)
+
+
 class PromptBuilder:
     @staticmethod
-    def compact_context(ctx: AssistantContext) -> str:
+    def compact_context(ctx: AssistantContext, query_text: str = "", budget_tokens: Optional[int] = None) -> str:
+        """Workshop context for the assistant prompts, fitted to ``ASSISTANT_CONTEXT_TOKEN_BUDGET``.
+
+        Identity, workshop and timing lines are always included. Participants,
+        decisions, action items, recent transcripts, phase context and memory are
+        ranked by relevance to ``query_text`` and share the rest of the budget;
+        the oldest entries are cut first (see ``app.assistant.context_budget``).
+        """
+        if budget_tokens is None:
+            budget_tokens = int(current_app.config.get("ASSISTANT_CONTEXT_TOKEN_BUDGET", 1000))
+        return ContextBudget(budget_tokens).compose(PromptBuilder.context_sections(ctx), query_text).text
+
+    @staticmethod
+    def context_sections(ctx: AssistantContext) -> List[ContextSection]:
         parts: List[str] = []
         # Current user identity (for personalization)
         try:
@@ -451,15 +644,6 @@ class PromptBuilder:
         else:
             parts.append(f"Workshop ID: {ctx.workshop.id}")
             parts.append(f"Workshop: {ctx.workshop.title} (status={ctx.workshop.status}, phase={ctx.workshop.current_phase})")
-        if ctx.participants:
-            names = ", ".join(p.display_name for p in ctx.participants[:6])
-            parts.append(f"Participants: {names}{'…' if len(ctx.participants) > 6 else ''}")
-        if ctx.decisions:
-            decisions = "; ".join(d.topic for d in ctx.decisions[:3])
-            parts.append(f"Recent decisions: {decisions}")
-        if ctx.action_items:
-            items = ", ".join(a.title for a in ctx.action_items[:3])
-            parts.append(f"Open action items: {items}")
         if ctx.snapshots.framing:
             key_question = ctx.snapshots.framing.get("key_question")
             if key_question:
@@ -493,27 +677,100 @@ class PromptBuilder:
         if getattr(ctx, "time_alerts", None):
             alerts = "; ".join(ctx.time_alerts)
             parts.append(f"Time alerts: {alerts}")
-        
+
+        sections = [ContextSection("workshop", parts, pinned=True)]
+        sections.append(
+            ContextSection(
+                "participants",
+                [f"- {p.display_name} (role={p.role})" for p in ctx.participants],
+                header="Participants:",
+                weight=0.5,
+                omitted_label="more participants",
+            )
+        )
+        # Decisions, action items and transcripts are loaded newest first.
+        sections.append(
+            ContextSection(
+                "decisions",
+                [
+                    f"- {d.topic}: {d.decision}" + (f" (why: {d.rationale})" if d.rationale else "")
+                    for d in ctx.decisions
+                ],
+                header="Recent decisions:",
+                omitted_label="older decisions",
+            )
+        )
+        sections.append(
+            ContextSection(
+                "action_items",
+                [PromptBuilder._format_action_item(a) for a in ctx.action_items],
+                header="Open action items:",
+                omitted_label="older action items",
+            )
+        )
+        sections.append(
+            ContextSection(
+                "transcripts",
+                [
+                    f"- [{t.ts.strftime('%H:%M') if t.ts else '--:--'}] "
+                    f"{f'user-{t.speaker_user_id}' if t.speaker_user_id else t.origin or 'note'}: {t.text}"
+                    for t in ctx.transcripts
+                    if t.text
+                ],
+                header="Recent discussion (newest first):",
+                weight=0.75,
+                omitted_label="older remarks",
+            )
+        )
+
         # NEW: Inject phase context
         if ctx.phase_bundle:
-            phase_context = PromptBuilder._format_phase_context(ctx.phase_bundle)
-            if phase_context:
-                parts.append("\n" + phase_context)
-        
-        if ctx.memory_snippets:
-            memory_lines: List[str] = []
-            for snippet in ctx.memory_snippets[:3]:
-                if not snippet or not snippet.text:
-                    continue
-                label = snippet.namespace.rsplit("/", 1)[-1] if snippet.namespace else "memory"
-                text = snippet.text.strip()
-                if len(text) > 220:
-                    text = f"{text[:217]}…"
-                memory_lines.append(f"- ({label}) {text}")
-            if memory_lines:
-                parts.append("Memory:")
-                parts.extend(memory_lines)
-        return "\n".join(parts)
+            bundle = ctx.phase_bundle
+            sections.append(
+                ContextSection(
+                    "phase_overview",
+                    ["\n=== WORKSHOP PHASE CONTEXT ===", f"Progress: Phase {bundle.current_phase_index + 1}/{bundle.total_phases}"],
+                    pinned=True,
+                )
+            )
+            sections.append(
+                ContextSection(
+                    "phase_history",
+                    [PromptBuilder._format_previous_phase(prev) for prev in bundle.previous_phases],
+                    header="\n**Completed Phases:**",
+                    keep="tail",
+                    omitted_label="earlier phases",
+                )
+            )
+            sections.append(
+                ContextSection(
+                    "phase_current",
+                    PromptBuilder._current_phase_lines(bundle),
+                    weight=2.0,
+                    omitted_label="phase details",
+                )
+            )
+
+        memory_lines: List[str] = []
+        for snippet in (ctx.memory_snippets or [])[:3]:
+            if not snippet or not snippet.text:
+                continue
+            label = snippet.namespace.rsplit("/", 1)[-1] if snippet.namespace else "memory"
+            text = snippet.text.strip()
+            if len(text) > 220:
+                text = f"{text[:217]}…"
+            memory_lines.append(f"- ({label}) {text}")
+        sections.append(ContextSection("memory", memory_lines, header="Memory:", omitted_label="memories"))
+        return sections
+
+    @staticmethod
+    def _format_action_item(item: ActionItemEnvelope) -> str:
+        details = [detail for detail in (
+            f"status={item.status}" if item.status else "",
+            f"due={item.due_date.date().isoformat()}" if item.due_date else "",
+            f"owner=participant-{item.owner_participant_id}" if item.owner_participant_id else "",
+        ) if detail]
+        return f"- {item.title}" + (f" ({', '.join(details)})" if details else "")
     
     @staticmethod
     def _format_phase_context(bundle) -> str:  # type: ignore
@@ -534,31 +791,42 @@ class PromptBuilder:
         if bundle.previous_phases:
             lines.append("\n**Completed Phases:**")
             for prev in bundle.previous_phases:
-                lines.append(f"\n• {prev.phase_label}:")
-                lines.append(f"  {prev.summary}")
-                
-                # Key artifacts (compact)
-                if prev.key_artifacts:
-                    lines.append("  Key artifacts:")
-                    for key, value in prev.key_artifacts.items():
-                        if isinstance(value, str) and value:
-                            val_str = value[:80] + "..." if len(value) > 80 else value
-                            lines.append(f"    - {key}: {val_str}")
-                        elif isinstance(value, list) and value:
-                            lines.append(f"    - {key}: ({len(value)} items)")
-                        elif isinstance(value, dict) and value:
-                            # For nested dicts like top_cluster
-                            summary_parts = []
-                            for k, v in list(value.items())[:2]:
-                                summary_parts.append(f"{k}={v}")
-                            lines.append(f"    - {key}: {', '.join(summary_parts)}")
-                
-                # Documents
-                if prev.documents:
-                    for doc in prev.documents[:2]:  # Limit to 2 docs per phase
-                        lines.append(f"  📄 Document ID {doc.id}: {doc.title} ({doc.url})")
+                lines.append(PromptBuilder._format_previous_phase(prev))
         
-        # Current phase detail
+        lines.extend(PromptBuilder._current_phase_lines(bundle))
+        return "\n".join(lines)
+
+    @staticmethod
+    def _format_previous_phase(prev) -> str:  # type: ignore
+        """One completed phase (summary, key artifacts, documents) as a multi-line block."""
+        lines = [f"\n• {prev.phase_label}:", f"  {prev.summary}"]
+        
+        # Key artifacts (compact)
+        if prev.key_artifacts:
+            lines.append("  Key artifacts:")
+            for key, value in prev.key_artifacts.items():
+                if isinstance(value, str) and value:
+                    val_str = value[:80] + "..." if len(value) > 80 else value
+                    lines.append(f"    - {key}: {val_str}")
+                elif isinstance(value, list) and value:
+                    lines.append(f"    - {key}: ({len(value)} items)")
+                elif isinstance(value, dict) and value:
+                    # For nested dicts like top_cluster
+                    summary_parts = []
+                    for k, v in list(value.items())[:2]:
+                        summary_parts.append(f"{k}={v}")
+                    lines.append(f"    - {key}: {', '.join(summary_parts)}")
+        
+        # Documents
+        if prev.documents:
+            for doc in prev.documents[:2]:  # Limit to 2 docs per phase
+                lines.append(f"  📄 Document ID {doc.id}: {doc.title} ({doc.url})")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _current_phase_lines(bundle) -> List[str]:  # type: ignore
+        """Current phase detail and next phase preview."""
+        lines: List[str] = []
         if bundle.current_phase:
             curr = bundle.current_phase
             lines.append(f"\n**Current Phase: {curr.phase_label}**")
@@ -586,7 +854,7 @@ class PromptBuilder:
             if nxt.description:
                 lines.append(f"  {nxt.description}")
         
-        return "\n".join(lines)
+        return lines
     
     @staticmethod
     def _get_important_fields(phase_name: str) -> List[str]:
@@ -749,6 +1017,8 @@ class AssistantController:
         context: AssistantContext | None = None,
         persona: PersonaConfig | None = None,
         thread_id: int | None = None,
+        on_token: Callable[[str], None] | None = None,
+        memory: MemoryRetrieval | None = None,
     ) -> Tuple[AssistantReply, Dict[str, Any]]:
         context = context or self.context_fabric.build(payload.workshop_id, payload.user_id)
         # Expose only end-user callable tools to the LLM. Internal services like
@@ -764,16 +1034,21 @@ class AssistantController:
             if getattr(schema, "namespace", None) != "notifier"
         ]
         persona_cfg = persona or self.persona_router.select(payload, context)
-        memory_info = self.memory.retrieve(
-            query=payload.text,
-            workshop_id=payload.workshop_id,
-            user_id=payload.user_id,
-            thread_id=thread_id,
-        )
+        memory_info = memory
+        if memory_info is None:
+            memory_info = self.memory.retrieve(
+                query=payload.text,
+                workshop_id=payload.workshop_id,
+                user_id=payload.user_id,
+                thread_id=thread_id,
+            )
         if memory_info.snippets:
             max_snippets = max(1, min(len(memory_info.snippets), 3))
             context.memory_snippets = memory_info.snippets[:max_snippets]
-        plan = self.llm.plan(persona_cfg.name, context, payload)
+        fast_path = bool(current_app.config.get("ASSISTANT_SINGLE_CALL_FAST_PATH", True))
+        stage_started = time.perf_counter()
+        plan = self.llm.plan(persona_cfg.name, context, payload, allow_final=fast_path)
+        assistant_llm_stage_latency.labels(stage="plan").observe(time.perf_counter() - stage_started)
         tool_calls = plan.tool_calls or []
 
         legacy_calls: List[AssistantToolCall] = []
@@ -810,7 +1085,18 @@ class AssistantController:
             if hasattr(result, 'metadata') and result.metadata
         )
 
-        reply = self.llm.compose(persona_cfg.name, context, payload, plan, tool_results)
+        single_call = fast_path and not tool_calls and bool((plan.text or "").strip())
+        if single_call:
+            # The planner already answered and asked for no tools; a compose call would only restate it.
+            reply = plan.model_copy(deep=True)
+        else:
+            stage_started = time.perf_counter()
+            if on_token is not None and current_app.config.get("ASSISTANT_STREAMING_ENABLED", True):
+                reply = self.llm.compose_stream(persona_cfg.name, context, payload, plan, tool_results, on_token)
+            else:
+                reply = self.llm.compose(persona_cfg.name, context, payload, plan, tool_results)
+            assistant_llm_stage_latency.labels(stage="compose").observe(time.perf_counter() - stage_started)
+        assistant_reply_path.labels(path="single_call" if single_call else "plan_compose").inc()
         if (not reply.ui_hints) and getattr(plan, "ui_hints", None):
             try:
                 reply.ui_hints = dict(plan.ui_hints)
@@ -895,6 +1181,7 @@ class AssistantController:
             "tool_results": tool_results,
             "plan": plan.model_dump(),
             "memory": memory_info.as_meta(),
+            "llm_path": "single_call" if single_call else "plan_compose",
         }
         if gateway_meta:
             meta["tool_gateway"] = gateway_meta
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import threading
+import time
+from collections import OrderedDict
 from typing import Any, Dict, Optional
 
 from flask import current_app, request
@@ -9,15 +12,43 @@ from botocore.exceptions import ClientError
 
 from app.assistant.assistant_controller import (
     controller,
+    _format_timer,
     _phase_snapshot,
     _rbac_payload,
     _sidebar_actions,
     _sidebar_threads,
     _timebox_payload,
 )
+from app.assistant.context import TimerSnapshot
+from app.assistant.memory.models import MemoryRetrieval
 from app.assistant.schemas import AssistantQuery, AssistantReply
+from app.assistant.tools.metric import assistant_time_to_first_token
 from app.extensions import db, socketio
 
+# Header fields from the last full context build per workshop. Timer ticks reuse
+# these instead of rebuilding the whole AssistantContext every second. Bounded LRU
+# (ASSISTANT_CONTEXT_CACHE_MAX_WORKSHOPS, like the context cache); an evicted
+# workshop just takes one full build on its next tick.
+_state_headers: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+_state_headers_lock = threading.Lock()
+
+
+def _remember_header(workshop_id: int, header: Dict[str, Any]) -> None:
+    max_entries = max(1, int(current_app.config.get("ASSISTANT_CONTEXT_CACHE_MAX_WORKSHOPS", 256)))
+    with _state_headers_lock:
+        _state_headers[workshop_id] = header
+        _state_headers.move_to_end(workshop_id)
+        while len(_state_headers) > max_entries:
+            _state_headers.popitem(last=False)
+
+
+def _recall_header(workshop_id: int) -> Optional[Dict[str, Any]]:
+    with _state_headers_lock:
+        header = _state_headers.get(workshop_id)
+        if header is not None:
+            _state_headers.move_to_end(workshop_id)
+        return header
+
 
 class AssistantNamespace(Namespace):
     def on_connect(self) -> None:  # pragma: no cover - network layer
@@ -32,6 +63,15 @@ class AssistantNamespace(Namespace):
         emit("assistant:ready", {"ok": True})
         try:
             if workshop_id is not None:
+                # Imported here: app.sockets_core imports this module.
+                from app.sockets_core.join_admission import join_admission
+
+                started = time.monotonic()
+                # Building the assistant state is the expensive part of a reconnect; it shares the join budget.
+                admission = join_admission.try_admit(workshop_id, user_id, kind="assistant")
+                if not admission.admitted:
+                    emit("assistant:syncing", admission.syncing_payload(workshop_id=workshop_id))
+                    return
                 target_sid = getattr(request, "sid", None)
                 emit_assistant_state(
                     workshop_id,
@@ -40,6 +80,7 @@ class AssistantNamespace(Namespace):
                     include_sidebar=True,
                     include_phase_snapshot=True,
                 )
+                join_admission.observe_join(admission, time.monotonic() - started)
         except Exception:
             current_app.logger.exception("assistant_join_state_failed")
 
@@ -50,6 +91,16 @@ class AssistantNamespace(Namespace):
             emit("assistant:error", {"error": str(exc)})
             return
 
+        started = time.perf_counter()
+        streamed: list[str] = []
+
+        def _forward_token(delta: str) -> None:
+            if not streamed:
+                assistant_time_to_first_token.labels(mode="stream").observe(time.perf_counter() - started)
+            streamed.append(delta)
+            emit("assistant:token", {"delta": delta})
+            socketio.sleep(0)
+
         try:
             context = controller.context_fabric.build(payload.workshop_id, payload.user_id)
             persona_cfg = controller.persona_router.select(payload, context)
@@ -75,7 +126,8 @@ class AssistantNamespace(Namespace):
                     "threads": _sidebar_threads(thread, []),
                 },
             }
-            # Lightweight memory surface for ACK badge; safe best-effort and non-blocking.
+            # Retrieve memory once per ask: it feeds the ACK badge and is handed to handle_query.
+            memory_info = None
             try:
                 memory_info = controller.memory.retrieve(
                     query=payload.text,
@@ -86,7 +138,7 @@ class AssistantNamespace(Namespace):
                 ack_payload["memory"] = memory_info.as_meta()
             except Exception:
                 # Do not fail ACK if memory is disabled/unavailable
-                pass
+                memory_info = MemoryRetrieval.empty()
             emit("assistant:ack", ack_payload)
             rate_limited = False
             try:
@@ -95,6 +147,8 @@ class AssistantNamespace(Namespace):
                     context=context,
                     persona=persona_cfg,
                     thread_id=thread.id,
+                    on_token=_forward_token,
+                    memory=memory_info,
                 )
             except ClientError as exc:
                 error_code = exc.response.get("Error", {}).get("Code") if hasattr(exc, "response") else None
@@ -128,8 +182,11 @@ class AssistantNamespace(Namespace):
                     raise
             for result in meta.get("tool_results", []):
                 emit("assistant:tool_result", result)
-            if not rate_limited:
-                for chunk in _stream_text(reply.text):
+            if not rate_limited and not streamed:
+                # Non-streaming fallback (streaming disabled or no top-level "text" in the reply JSON)
+                for index, chunk in enumerate(_stream_text(reply.text)):
+                    if index == 0:
+                        assistant_time_to_first_token.labels(mode="buffered").observe(time.perf_counter() - started)
                     emit("assistant:token", {"delta": chunk})
                     socketio.sleep(0)
             assistant_turn = controller.persist_turns(payload, reply, meta, thread.id)
@@ -225,6 +282,16 @@ def emit_assistant_state(
         return
 
     timebox = _timebox_payload(context)
+    _remember_header(
+        workshop_id,
+        {
+            "task_id": context.workshop.current_task_id,
+            "workshop_title": context.workshop.title,
+            "phase": context.workshop.current_phase,
+            "timer_total_seconds": timebox["total_seconds"],
+            "workshop_status": timebox["workshop_status"],
+        },
+    )
     payload: Dict[str, Any] = {
         "workshop_id": workshop_id,
         "workshop_title": context.workshop.title,
@@ -262,3 +329,58 @@ def emit_assistant_state(
             "assistant_state_emit_failed",
             extra={"workshop_id": workshop_id, "room": target_room},
         )
+
+
+def emit_assistant_timer_state(
+    workshop_id: int,
+    *,
+    task_id: Optional[int],
+    remaining_seconds: Optional[int],
+    is_paused: bool,
+    room: Optional[str] = None,
+) -> None:
+    """Push timer fields to the assistant panel without rebuilding context.
+
+    Falls back to a full ``emit_assistant_state`` when this workshop has not
+    been built yet or the task changed since the last build (phase change).
+    """
+    header = _recall_header(workshop_id)
+    if header is None or (task_id is not None and header.get("task_id") != task_id):
+        emit_assistant_state(workshop_id, room=room)
+        return
+
+    status = header.get("workshop_status") or ""
+    if is_paused:
+        status = "paused"
+    elif str(status).lower() == "paused":
+        status = "inprogress"
+    remaining = _safe_int(remaining_seconds)
+    payload: Dict[str, Any] = {
+        "workshop_id": workshop_id,
+        "workshop_title": header.get("workshop_title"),
+        "phase": header.get("phase"),
+        "phase_label": header.get("phase"),
+        "timer": _format_timer(TimerSnapshot(remaining_seconds=remaining)),
+        "timer_seconds": remaining,
+        "timer_total_seconds": header.get("timer_total_seconds"),
+        "timebox_active": (
+            remaining is not None
+            and remaining > 0
+            and str(status).lower() in {"inprogress", "running"}
+        ),
+        "timer_paused": bool(is_paused),
+        "workshop_status": status,
+    }
+    target_room = room or f"workshop_{workshop_id}"
+    try:
+        socketio.emit(
+            "assistant:state",
+            payload,
+            namespace="/assistant",
+            to=target_room,
+        )
+    except Exception:
+        current_app.logger.exception(
+            "assistant_timer_state_emit_failed",
+            extra={"workshop_id": workshop_id, "room": target_room},
+        )
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
@@ -19,6 +18,8 @@ from app.models import (
     WorkshopParticipant,
 )
 
+from app.assistant.context_cache import context_snapshot_cache
+from app.service.phase_artifacts import latest_phase_artifacts
 from app.assistant.memory.models import MemorySnippet
 from app.assistant.time_context import TimeContextProvider
 from app.assistant.phase_context_provider import PhaseContextProvider
@@ -134,6 +135,20 @@ class AssistantContext:
     phase_bundle: Optional[PhaseContextBundle] = None
 
 
+@dataclass
+class WorkshopSnapshot:
+    """Workshop-level, user-independent part of the context (shared via cache)."""
+
+    workshop: WorkshopEnvelope
+    participants: List[ParticipantEnvelope]
+    documents: List[DocumentEnvelope]
+    decisions: List[DecisionEnvelope]
+    action_items: List[ActionItemEnvelope]
+    transcripts: List[TranscriptExcerpt]
+    snapshots: PhaseSnapshots
+    phase_bundle: Optional[PhaseContextBundle]
+
+
 class ContextFabric:
     def __init__(self, recent_minutes: int = 15):
         self.recent_minutes = recent_minutes
@@ -141,6 +156,43 @@ class ContextFabric:
         self.phase_provider = PhaseContextProvider()
 
     def build(self, workshop_id: int, user_id: Optional[int]) -> AssistantContext:
+        snapshot: WorkshopSnapshot = context_snapshot_cache.get_or_build(
+            workshop_id, lambda: self._build_snapshot(workshop_id)
+        )
+        workshop = db.session.get(Workshop, workshop_id)
+        if not workshop:
+            raise ValueError(f"Workshop {workshop_id} not found")
+
+        cutoff = datetime.utcnow() - timedelta(minutes=self.recent_minutes)
+        transcripts = [t for t in snapshot.transcripts if t.ts is None or t.ts >= cutoff]
+        timers = self._derive_timer_snapshot(workshop)
+        rbac = self._rbac_from_snapshot(snapshot, user_id)
+        temporal_context = self.time_provider.get_time_context(workshop_id)
+        time_alerts: List[str] = []
+        schedule = temporal_context.get("workshop_schedule", {}) if isinstance(temporal_context, dict) else {}
+        remaining = schedule.get("remaining_minutes_in_phase") if isinstance(schedule, dict) else None
+        overrun = schedule.get("phase_overrun_minutes") if isinstance(schedule, dict) else None
+        if isinstance(remaining, int) and remaining >= 0 and remaining < 5:
+            time_alerts.append("Phase ending soon")
+        if isinstance(overrun, int) and overrun > 0:
+            time_alerts.append("Phase time exceeded")
+
+        return AssistantContext(
+            workshop=snapshot.workshop,
+            participants=list(snapshot.participants),
+            documents=list(snapshot.documents),
+            decisions=list(snapshot.decisions),
+            action_items=list(snapshot.action_items),
+            transcripts=transcripts,
+            snapshots=snapshot.snapshots,
+            timers=timers,
+            rbac=rbac,
+            temporal=temporal_context,
+            time_alerts=time_alerts,
+            phase_bundle=snapshot.phase_bundle,
+        )
+
+    def _build_snapshot(self, workshop_id: int) -> WorkshopSnapshot:
         workshop = db.session.get(
             Workshop,
             workshop_id,
@@ -168,40 +220,16 @@ class ContextFabric:
             date_time=getattr(workshop, "date_time", None),
         )
 
-        participants = self._load_participants(workshop_id)
-        documents = self._load_documents(workshop_id)
-        decisions = self._load_decisions(workshop_id)
-        action_items = self._load_action_items(workshop_id)
-        transcripts = self._load_transcripts(workshop_id)
-        snapshots = self._load_phase_snapshots(workshop_id)
-        timers = self._derive_timer_snapshot(workshop)
-        rbac = self._derive_rbac(workshop, user_id)
-        temporal_context = self.time_provider.get_time_context(workshop_id)
-        time_alerts: List[str] = []
-        schedule = temporal_context.get("workshop_schedule", {}) if isinstance(temporal_context, dict) else {}
-        remaining = schedule.get("remaining_minutes_in_phase") if isinstance(schedule, dict) else None
-        overrun = schedule.get("phase_overrun_minutes") if isinstance(schedule, dict) else None
-        if isinstance(remaining, int) and remaining >= 0 and remaining < 5:
-            time_alerts.append("Phase ending soon")
-        if isinstance(overrun, int) and overrun > 0:
-            time_alerts.append("Phase time exceeded")
-
-        # Build phase context bundle
-        phase_bundle = self.phase_provider.build_phase_bundle(workshop)
-        
-        return AssistantContext(
+        return WorkshopSnapshot(
             workshop=workshop_env,
-            participants=participants,
-            documents=documents,
-            decisions=decisions,
-            action_items=action_items,
-            transcripts=transcripts,
-            snapshots=snapshots,
-            timers=timers,
-            rbac=rbac,
-            temporal=temporal_context,
-            time_alerts=time_alerts,
-            phase_bundle=phase_bundle,
+            participants=self._load_participants(workshop_id),
+            documents=self._load_documents(workshop_id),
+            decisions=self._load_decisions(workshop_id),
+            action_items=self._load_action_items(workshop_id),
+            transcripts=self._load_transcripts(workshop_id),
+            snapshots=self._load_phase_snapshots(workshop_id),
+            # Build phase context bundle
+            phase_bundle=self.phase_provider.build_phase_bundle(workshop),
         )
 
     def _load_participants(self, workshop_id: int) -> List[ParticipantEnvelope]:
@@ -324,16 +352,11 @@ class ContextFabric:
             "action_plan": "results_action_plan",
             "summary": "summary",
         }
+        artifacts = latest_phase_artifacts(workshop_id, task_types.values())
         payloads: Dict[str, Optional[Dict[str, Any]]] = {}
         for key, task_type in task_types.items():
-            record = (
-                db.session.query(BrainstormTask)
-                .filter(BrainstormTask.workshop_id == workshop_id)
-                .filter(BrainstormTask.task_type == task_type)
-                .order_by(BrainstormTask.created_at.desc())
-                .first()
-            )
-            payloads[key] = self._safe_json(record.payload_json) if record else None
+            artifact = artifacts.get(task_type)
+            payloads[key] = self._wrap_payload(artifact.payload) if artifact else None
         return PhaseSnapshots(**payloads)
 
     def _derive_timer_snapshot(self, workshop: Workshop) -> TimerSnapshot:
@@ -432,11 +455,39 @@ class ContextFabric:
         )
 
     @staticmethod
-    def _safe_json(value: Optional[str]) -> Optional[Dict[str, Any]]:
-        if not value:
+    def _rbac_from_snapshot(snapshot: WorkshopSnapshot, user_id: Optional[int]) -> Optional[RBACContext]:
+        """Same rules as ``_derive_rbac`` but resolved from the cached participant list."""
+        if user_id is None:
             return None
-        try:
-            parsed = json.loads(value)
-            return parsed if isinstance(parsed, dict) else {"value": parsed}
-        except Exception:
+        is_organizer = snapshot.workshop.created_by_id == user_id
+        participant = next((p for p in snapshot.participants if p.user_id == user_id), None)
+        if participant is None:
+            if is_organizer:
+                return RBACContext(
+                    user_id=user_id,
+                    role="organizer",
+                    is_facilitator=True,
+                    is_organizer=True,
+                    is_participant=False,
+                )
+            return RBACContext(
+                user_id=user_id,
+                role="guest",
+                is_facilitator=False,
+                is_organizer=False,
+                is_participant=False,
+            )
+        role = participant.role or "participant"
+        return RBACContext(
+            user_id=user_id,
+            role=role,
+            is_facilitator=role in {"organizer", "facilitator", "admin"},
+            is_organizer=is_organizer,
+            is_participant=True,
+        )
+
+    @staticmethod
+    def _wrap_payload(parsed: Any) -> Optional[Dict[str, Any]]:
+        if parsed is None:
             return None
+        return parsed if isinstance(parsed, dict) else {"value": parsed}
@@ -0,0 +1,246 @@
+"""Token-budgeted assembly of the assistant's workshop context.
+
+``PromptBuilder.compact_context`` used to paste fixed slices of the context into
+both assistant prompts regardless of size. It now hands ``ContextSection``\\ s
+to ``ContextBudget``, which:
+
+1. always includes *pinned* sections (identity, workshop, time) in full;
+2. scores the remaining sections by lexical overlap with the question, so a
+   question about action items gets more room for action items than for
+   transcripts;
+3. shares the remaining token budget in proportion to those scores (sections
+   that need less than their share give the rest back); and
+4. truncates each section to its allotment from the *old* end, replacing what
+   was cut with a one-line "N older items omitted" note.
+
+Tool outputs placed in the compose prompt are bounded separately with
+``fit_json``, which shortens long lists and strings but keeps valid JSON.
+Tokens are estimated locally (``count_tokens``); no model call is involved.
+"""
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from app.assistant.tools.metric import assistant_context_truncations
+from app.utils.prompt_registry import count_tokens
+
+_WORD_RE = re.compile(r"[a-z0-9]{3,}")
+_STOPWORDS: FrozenSet[str] = frozenset(
+    "the and for are was were you your our what which who whom this that these those with from into about "
+    "have has had can could would should will shall may might must not but all any some how why when where "
+    "there their them they then than its it's let lets please tell show give list me one".split()
+)
+# Sections below this allotment are dropped rather than cut to a stub.
+_MIN_SECTION_TOKENS = 12
+# Share floor for sections that do not mention any query term.
+_BASE_RELEVANCE = 0.25
+
+
+def query_terms(text: str) -> FrozenSet[str]:
+    """Lower-cased content words (3+ characters, no stopwords, plural ``s`` dropped) of ``text``."""
+    words = set(_WORD_RE.findall((text or "").lower())) - _STOPWORDS
+    return frozenset(word[:-1] if len(word) > 4 and word[-1] == "s" and word[-2] != "s" else word for word in words)
+
+
+@dataclass
+class ContextSection:
+    """One block of context lines.
+
+    ``items`` are rendered one per line in the given order. ``keep`` names the end
+    that survives truncation: ``"head"`` when items are newest/most important
+    first, ``"tail"`` when they are chronological.
+    """
+
+    name: str
+    items: List[str]
+    header: Optional[str] = None
+    pinned: bool = False
+    weight: float = 1.0
+    keep: str = "head"
+    omitted_label: str = "older items"
+
+
+@dataclass
+class SectionUsage:
+    name: str
+    needed: int
+    allotted: int = 0
+    used: int = 0
+    kept: int = 0
+    dropped: int = 0
+    relevance: float = 0.0
+
+
+@dataclass
+class BudgetResult:
+    text: str
+    tokens: int
+    sections: List[SectionUsage] = field(default_factory=list)
+
+
+def _line_tokens(line: str) -> int:
+    return count_tokens(line) + 1  # newline
+
+
+class ContextBudget:
+    """Fit ``ContextSection``\\ s into ``budget_tokens``; see the module docstring."""
+
+    def __init__(self, budget_tokens: int) -> None:
+        self.budget_tokens = max(0, int(budget_tokens))
+
+    def compose(self, sections: Sequence[ContextSection], query: str = "") -> BudgetResult:
+        terms = query_terms(query)
+        usages: Dict[str, SectionUsage] = {}
+        rendered: Dict[str, List[str]] = {}
+        remaining = self.budget_tokens
+        flexible: List[Tuple[float, ContextSection, int]] = []
+
+        for section in sections:
+            lines = [item for item in section.items if item]
+            if not lines:
+                continue
+            needed = sum(_line_tokens(line) for line in lines) + (_line_tokens(section.header) if section.header else 0)
+            usage = usages[section.name] = SectionUsage(section.name, needed)
+            rendered[section.name] = ([section.header] if section.header else []) + lines
+            usage.allotted = usage.used = needed
+            usage.kept = len(lines)
+            if section.pinned:
+                remaining -= needed
+            else:
+                flexible.append((section.weight, section, needed))
+
+        if sum(needed for _, _, needed in flexible) <= remaining:
+            # Everything fits: no ranking or truncation needed.
+            flexible = []
+        elif terms:
+            for index, (weight, section, needed) in enumerate(flexible):
+                usage = usages[section.name]
+                text = " ".join([section.name.replace("_", " "), section.header or "", *section.items])
+                usage.relevance = round(len(terms & query_terms(text)) / len(terms), 3)
+                flexible[index] = (weight * (_BASE_RELEVANCE + usage.relevance), section, needed)
+
+        allotments = self._allot(flexible, max(0, remaining))
+        # Most relevant first, so whatever a section cannot use (item granularity) flows to the next one.
+        carry = 0
+        for score, section, needed in sorted(flexible, key=lambda entry: entry[0], reverse=True):
+            usage = usages[section.name]
+            usage.allotted = allotments[section.name] + carry
+            lines, used, kept, dropped = self._fit(section, usage.allotted)
+            usage.used, usage.kept, usage.dropped = used, kept, dropped
+            carry = usage.allotted - used
+            if lines:
+                rendered[section.name] = lines
+            else:
+                rendered.pop(section.name, None)
+            if dropped:
+                assistant_context_truncations.labels(section=section.name).inc()
+
+        out: List[str] = []
+        for section in sections:
+            out.extend(rendered.get(section.name, ()))
+        text = "\n".join(out)
+        return BudgetResult(text=text, tokens=count_tokens(text), sections=[usages[s.name] for s in sections if s.name in usages])
+
+    @staticmethod
+    def _allot(flexible: Sequence[Tuple[float, ContextSection, int]], budget: int) -> Dict[str, int]:
+        """Proportional shares by score; sections needing less than their share return the surplus."""
+        allotted: Dict[str, int] = {}
+        open_entries = list(flexible)
+        while open_entries and budget > 0:
+            total = sum(score for score, _, _ in open_entries) or 1.0
+            satisfied = [entry for entry in open_entries if entry[2] <= budget * entry[0] / total]
+            if not satisfied:
+                for score, section, _ in open_entries:
+                    allotted[section.name] = int(budget * score / total)
+                return allotted
+            for entry in satisfied:
+                allotted[entry[1].name] = entry[2]
+                budget -= entry[2]
+                open_entries.remove(entry)
+        for _, section, _ in open_entries:
+            allotted.setdefault(section.name, 0)
+        return allotted
+
+    @staticmethod
+    def _fit(section: ContextSection, allotted: int) -> Tuple[List[str], int, int, int]:
+        """``(lines, tokens used, items kept, items dropped)`` for ``section`` within ``allotted`` tokens."""
+        items = [item for item in section.items if item]
+        header_cost = _line_tokens(section.header) if section.header else 0
+        if allotted < header_cost + _MIN_SECTION_TOKENS:
+            return [], 0, 0, len(items)
+        ordered = items if section.keep == "head" else list(reversed(items))
+        # Reserve room for the omission note up front; it is short and fixed-size.
+        note_cost = _line_tokens(f"(+{len(items)} {section.omitted_label} omitted)")
+        budget = allotted - header_cost
+        kept: List[str] = []
+        used = 0
+        for index, item in enumerate(ordered):
+            cost = _line_tokens(item)
+            reserve = note_cost if index < len(ordered) - 1 else 0
+            if used + cost + reserve > budget:
+                if not kept:
+                    # A single oversized item: keep its beginning instead of nothing.
+                    chars = max(0, (budget - note_cost - 1) * 4 - 1)
+                    if chars >= 40:
+                        item = item[:chars].rstrip() + "…"
+                        kept.append(item)
+                        used += _line_tokens(item)
+                break
+            kept.append(item)
+            used += cost
+        dropped = len(items) - len(kept)
+        if section.keep != "head":
+            kept.reverse()
+        lines = ([section.header] if section.header else []) + kept
+        if dropped:
+            note = f"(+{dropped} {section.omitted_label} omitted)"
+            if section.keep == "head":
+                lines.append(note)
+            else:
+                lines.insert(1 if section.header else 0, note)
+            used += _line_tokens(note)
+        return lines, used + header_cost, len(kept), dropped
+
+
+def _shrink(value: Any, max_items: int, max_chars: int) -> Any:
+    if isinstance(value, str):
+        return value if len(value) <= max_chars else value[:max_chars].rstrip() + "…"
+    if isinstance(value, list):
+        head = [_shrink(item, max_items, max_chars) for item in value[:max_items]]
+        if len(value) > max_items:
+            head.append(f"… {len(value) - max_items} more items omitted")
+        return head
+    if isinstance(value, dict):
+        return {key: _shrink(item, max_items, max_chars) for key, item in value.items()}
+    return value
+
+
+def fit_json(value: Any, budget_tokens: int) -> str:
+    """``json.dumps(value)`` shortened (long lists and strings first) until it fits ``budget_tokens``.
+
+    The result is always valid JSON; when even the tightest setting does not fit,
+    that setting is returned.
+    """
+    text = json.dumps(value, ensure_ascii=False, default=str)
+    if budget_tokens <= 0 or count_tokens(text) <= budget_tokens:
+        return text
+    max_items, max_chars = 64, 2000
+    while True:
+        text = json.dumps(_shrink(value, max_items, max_chars), ensure_ascii=False, default=str)
+        if count_tokens(text) <= budget_tokens or (max_items <= 1 and max_chars <= 80):
+            return text
+        max_items = max(1, max_items // 2)
+        max_chars = max(80, max_chars // 2)
+
+
+__all__ = [
+    "BudgetResult",
+    "ContextBudget",
+    "ContextSection",
+    "SectionUsage",
+    "fit_json",
+    "query_terms",
+]
@@ -0,0 +1,267 @@
+"""Versioned cache for the workshop-level part of ``ContextFabric.build``.
+
+Every workshop carries an in-process version counter. Commits that touch rows
+feeding the assistant context (ideas, votes, decisions, action items, task
+transitions, document links, participants, notes, the workshop row itself)
+bump the counter of the workshops they belong to; a cached snapshot is only
+served while its version still matches. Per-user (RBAC) and wall-clock
+(timers, temporal) fields are layered on top by the caller on every build.
+
+Concurrent builds for the same workshop/version share one in-flight build.
+Writes made by other worker processes are not observed, so entries also expire
+after ``ASSISTANT_CONTEXT_CACHE_TTL_SECONDS``.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+from flask import current_app, has_app_context
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from app.models import (
+    ActionItem,
+    BrainstormIdea,
+    BrainstormTask,
+    CapturedDecision,
+    DiscussionNote,
+    GenericVote,
+    IdeaCluster,
+    IdeaVote,
+    Workshop,
+    WorkshopDocument,
+    WorkshopParticipant,
+)
+from app.assistant.tools.metric import context_cache_events
+
+_TRACKED_MODELS = (
+    Workshop,
+    WorkshopParticipant,
+    WorkshopDocument,
+    BrainstormTask,
+    BrainstormIdea,
+    IdeaCluster,
+    IdeaVote,
+    GenericVote,
+    CapturedDecision,
+    ActionItem,
+    DiscussionNote,
+)
+_PENDING_KEY = "assistant_context_dirty_workshops"
+
+
+class WorkshopVersions:
+    """Monotonic per-workshop version counters (process-local)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._versions: Dict[int, int] = {}
+
+    def get(self, workshop_id: int) -> int:
+        with self._lock:
+            return self._versions.get(workshop_id, 0)
+
+    def bump(self, workshop_ids: Iterable[int]) -> None:
+        with self._lock:
+            for workshop_id in workshop_ids:
+                self._versions[workshop_id] = self._versions.get(workshop_id, 0) + 1
+
+
+workshop_versions = WorkshopVersions()
+
+
+@dataclass
+class _Entry:
+    version: int
+    built_at: float
+    value: Any
+
+
+@dataclass
+class _InFlight:
+    version: int
+    done: threading.Event = field(default_factory=threading.Event)
+    value: Any = None
+    error: Optional[BaseException] = None
+
+
+class ContextSnapshotCache:
+    def __init__(self, versions: WorkshopVersions, *, max_entries: int = 256, ttl_seconds: float = 30.0):
+        self._versions = versions
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._inflight: Dict[int, _InFlight] = {}
+        self._default_max_entries = max_entries
+        self._default_ttl = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def _config(self, key: str, default: float) -> float:
+        if has_app_context():
+            try:
+                return float(current_app.config.get(key, default))
+            except (TypeError, ValueError):
+                return default
+        return default
+
+    def get_or_build(self, workshop_id: int, builder: Callable[[], Any]) -> Any:
+        ttl = self._config("ASSISTANT_CONTEXT_CACHE_TTL_SECONDS", self._default_ttl)
+        if ttl <= 0:
+            return builder()
+        version = self._versions.get(workshop_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(workshop_id)
+            if entry and entry.version == version and (now - entry.built_at) < ttl:
+                self._entries.move_to_end(workshop_id)
+                self.hits += 1
+                context_cache_events.labels(result="hit").inc()
+                return entry.value
+            pending = self._inflight.get(workshop_id)
+            leader = pending is None or pending.version != version
+            if leader:
+                pending = _InFlight(version=version)
+                self._inflight[workshop_id] = pending
+                self.misses += 1
+                context_cache_events.labels(result="miss").inc()
+            else:
+                self.coalesced += 1
+                context_cache_events.labels(result="coalesced").inc()
+        assert pending is not None
+
+        if not leader:
+            pending.done.wait(timeout=30.0)
+            if pending.done.is_set() and pending.error is None and pending.value is not None:
+                return pending.value
+            return builder()
+
+        try:
+            value = builder()
+            pending.value = value
+        except BaseException as exc:
+            pending.error = exc
+            raise
+        finally:
+            with self._lock:
+                if self._inflight.get(workshop_id) is pending:
+                    del self._inflight[workshop_id]
+            pending.done.set()
+
+        with self._lock:
+            # Only store if no write landed while we were building.
+            if self._versions.get(workshop_id) == version:
+                self._entries[workshop_id] = _Entry(version=version, built_at=time.monotonic(), value=value)
+                self._entries.move_to_end(workshop_id)
+                max_entries = int(self._config("ASSISTANT_CONTEXT_CACHE_MAX_WORKSHOPS", self._default_max_entries))
+                while len(self._entries) > max(1, max_entries):
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, workshop_id: Optional[int] = None) -> None:
+        with self._lock:
+            if workshop_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(workshop_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+            }
+
+
+context_snapshot_cache = ContextSnapshotCache(workshop_versions)
+
+
+# ----------------------------------------------------------------------
+# Invalidation: collect affected workshops on flush, bump on commit.
+# ----------------------------------------------------------------------
+_task_workshop: Dict[int, int] = {}
+_cluster_workshop: Dict[int, int] = {}
+
+
+def _lookup(session: Session, cache: Dict[int, int], sql: str, key: Any) -> Optional[int]:
+    try:
+        key = int(key)
+    except (TypeError, ValueError):
+        return None
+    if key in cache:
+        return cache[key]
+    try:
+        row = session.connection().execute(text(sql), {"id": key}).first()
+    except Exception:
+        return None
+    if not row or row[0] is None:
+        return None
+    if len(cache) > 4096:
+        cache.clear()
+    cache[key] = int(row[0])
+    return cache[key]
+
+
+def _workshop_id_for(session: Session, obj: Any) -> Optional[int]:
+    if isinstance(obj, Workshop):
+        return obj.id
+    workshop_id = getattr(obj, "workshop_id", None)
+    if workshop_id is not None:
+        if isinstance(obj, BrainstormTask) and obj.id is not None:
+            _task_workshop[int(obj.id)] = int(workshop_id)
+        return int(workshop_id)
+    if isinstance(obj, IdeaVote):
+        return _lookup(
+            session,
+            _cluster_workshop,
+            "SELECT t.workshop_id FROM idea_clusters c "
+            "JOIN brainstorm_tasks t ON t.id = c.task_id WHERE c.id = :id",
+            obj.cluster_id,
+        )
+    task_id = getattr(obj, "task_id", None)
+    if task_id is not None:
+        return _lookup(
+            session,
+            _task_workshop,
+            "SELECT workshop_id FROM brainstorm_tasks WHERE id = :id",
+            task_id,
+        )
+    return None
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_dirty_workshops(session: Session, flush_context: Any) -> None:
+    pending: Set[int] = session.info.setdefault(_PENDING_KEY, set())
+    for collection in (session.new, session.dirty, session.deleted):
+        for obj in collection:
+            if not isinstance(obj, _TRACKED_MODELS):
+                continue
+            workshop_id = _workshop_id_for(session, obj)
+            if workshop_id is not None:
+                pending.add(workshop_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_dirty_workshops(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        workshop_versions.bump(pending)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_dirty_workshops(session: Session, previous_transaction: Any) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+__all__ = [
+    "WorkshopVersions",
+    "ContextSnapshotCache",
+    "workshop_versions",
+    "context_snapshot_cache",
+]
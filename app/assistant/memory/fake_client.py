@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import re
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+
+def _tokens(text: str) -> set[str]:
+    return set(re.findall(r"\w{3,}", (text or "").lower()))
+
+
+def _message_text(message: Any) -> str:
+    if isinstance(message, (tuple, list)) and message:
+        return str(message[0])
+    if isinstance(message, dict):
+        content = message.get("content")
+        if isinstance(content, list):
+            return " ".join(str(part.get("text") or "") for part in content if isinstance(part, dict))
+        return str(content or message.get("text") or "")
+    return str(message)
+
+
+class FakeMemoryClient:
+    """In-process AgentCore ``MemoryClient`` stand-in used when ``AWS_BACKEND=fake``.
+
+    Events are kept per memory id; retrieval scores them by word overlap with the
+    query and only considers events whose actor or session id appears in the
+    requested namespace, mimicking namespace scoping. The store is shared by
+    every instance in the process, like the remote memory would be.
+    """
+
+    _lock = threading.Lock()
+    _records: Dict[str, List[Dict[str, Any]]] = {}
+
+    def __init__(self, region_name: Optional[str] = None, **_: Any) -> None:
+        self.region_name = region_name
+
+    def create_event(
+        self,
+        memory_id: str,
+        actor_id: str,
+        session_id: str,
+        messages: List[Any],
+        event_timestamp: Optional[datetime] = None,
+        branch: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        created = (event_timestamp or datetime.now(timezone.utc)).isoformat()
+        with self._lock:
+            bucket = self._records.setdefault(memory_id, [])
+            event_id = f"fake-event-{len(bucket) + 1}"
+            for message in messages or []:
+                text = _message_text(message).strip()
+                if text:
+                    bucket.append(
+                        {
+                            "eventId": event_id,
+                            "actorId": actor_id,
+                            "sessionId": session_id,
+                            "text": text,
+                            "createdAt": created,
+                        }
+                    )
+        return {"eventId": event_id, "memoryId": memory_id, "actorId": actor_id, "sessionId": session_id}
+
+    def retrieve_memories(self, memory_id: str, namespace: str, query: str, top_k: int = 3) -> List[Dict[str, Any]]:
+        query_tokens = _tokens(query)
+        with self._lock:
+            records = list(self._records.get(memory_id, ()))
+        scored = []
+        for record in records:
+            if record["actorId"] not in namespace and record["sessionId"] not in namespace:
+                continue
+            overlap = len(query_tokens & _tokens(record["text"]))
+            if overlap:
+                scored.append((overlap / max(1, len(query_tokens)), record))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [
+            {
+                "content": {"text": record["text"]},
+                "score": round(score, 3),
+                "namespaces": [namespace],
+                "createdAt": record["createdAt"],
+            }
+            for score, record in scored[: max(0, int(top_k))]
+        ]
@@ -20,6 +20,7 @@ class MemoryRetrieval:
     namespaces: List[str] = field(default_factory=list)
     latency_ms: Optional[int] = None
     errors: List[str] = field(default_factory=list)
+    cached: bool = False
 
     @classmethod
     def empty(cls) -> "MemoryRetrieval":
@@ -31,4 +32,5 @@ class MemoryRetrieval:
             "namespaces": sorted({snippet.namespace for snippet in self.snippets}),
             "latency_ms": self.latency_ms,
             "errors": self.errors,
+            "cached": self.cached,
         }
@@ -3,13 +3,20 @@ from __future__ import annotations
 import inspect
 import json
 import logging
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import replace
 from datetime import datetime
-from typing import Any, Dict, Iterable, Optional
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 from flask import current_app, has_app_context
 from botocore.exceptions import BotoCoreError, ClientError
 
+from app.config import Config
+
+from .fake_client import FakeMemoryClient
 from .models import MemoryRetrieval, MemorySnippet
 from .settings import AgentCoreMemorySettings
 
@@ -70,14 +77,23 @@ class AgentMemoryService:
         self._message_modes: list[str] = ["tuple", "structured"]
         self._supports_metadata_kw = False
         self._supports_attributes_kw = False
+        # Retrievals are cached briefly; long-term memory extraction is asynchronous on the
+        # AgentCore side, so a fresh store() is rarely visible within the TTL anyway.
+        self._cache: "OrderedDict[Tuple[Any, ...], Tuple[float, MemoryRetrieval]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(4, 2 * len(settings.namespace_templates)),
+            thread_name_prefix="agent-memory",
+        )
         if not self.enabled:
             return
-        if MemoryClient is None:
+        client_cls = FakeMemoryClient if Config.AWS_BACKEND == "fake" else MemoryClient
+        if client_cls is None:
             _get_logger().warning("agent_memory_import_failed", extra={"memory_id": settings.memory_id})
             self.enabled = False
             return
         try:
-            self._client = MemoryClient(region_name=settings.region)
+            self._client = client_cls(region_name=settings.region)
             self._inspect_client()
         except Exception as exc:  # pragma: no cover - network availability
             _get_logger().warning(
@@ -101,22 +117,39 @@ class AgentMemoryService:
         if not query_text:
             return MemoryRetrieval.empty()
 
+        cache_key = (workshop_id, user_id, thread_id, self._normalize_query(query_text))
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         actor_id = self._derive_actor_id(user_id, workshop_id)
         session_id = self._derive_session_id(thread_id, workshop_id)
 
-        snippets = []
+        snippets: list[MemorySnippet] = []
         errors: list[str] = []
         start = time.time()
         namespaces = self.settings.formatted_namespaces(actor_id, session_id, workshop_id)
 
+        # One remote call per namespace, all in flight at once, bounded by timeout_seconds.
+        futures = {
+            namespace: self._executor.submit(self._retrieve_namespace, namespace, query_text)
+            for namespace in namespaces
+        }
+        wait(list(futures.values()), timeout=self.settings.timeout_seconds)
         for namespace in namespaces:
-            try:
-                records = self._client.retrieve_memories(  # type: ignore[attr-defined]
-                    memory_id=self.settings.memory_id,
+            future = futures[namespace]
+            if not future.done():
+                future.cancel()
+                errors.append(f"{namespace}:timeout")
+                self._log(
+                    "warning",
+                    "agent_memory_retrieval_timeout",
                     namespace=namespace,
-                    query=query_text,
-                    top_k=self.settings.top_k,
+                    timeout_seconds=self.settings.timeout_seconds,
                 )
+                continue
+            try:
+                records = future.result()
             except (ClientError, BotoCoreError) as exc:  # pragma: no cover
                 errors.append(f"{namespace}:{getattr(exc, 'response', str(exc))}")
                 self._log("warning", "agent_memory_retrieval_failed", namespace=namespace, error=str(exc))
@@ -142,12 +175,53 @@ class AgentMemoryService:
                 latency_ms=latency_ms,
             )
 
-        return MemoryRetrieval(
+        result = MemoryRetrieval(
             snippets=snippets,
             namespaces=namespaces,
             latency_ms=latency_ms,
             errors=errors,
         )
+        if not errors:
+            self._cache_put(cache_key, result)
+        return result
+
+    def _retrieve_namespace(self, namespace: str, query_text: str) -> Any:
+        return self._client.retrieve_memories(  # type: ignore[attr-defined]
+            memory_id=self.settings.memory_id,
+            namespace=namespace,
+            query=query_text,
+            top_k=self.settings.top_k,
+        )
+
+    @staticmethod
+    def _normalize_query(query_text: str) -> str:
+        collapsed = " ".join(query_text.lower().split())
+        return collapsed.rstrip(" ?!.")
+
+    def _cache_get(self, key: Tuple[Any, ...]) -> Optional[MemoryRetrieval]:
+        ttl = self.settings.cache_ttl_seconds
+        if ttl <= 0:
+            return None
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if now - stored_at >= ttl:
+                self._cache.pop(key, None)
+                return None
+            self._cache.move_to_end(key)
+        return replace(value, snippets=list(value.snippets), errors=list(value.errors), latency_ms=0, cached=True)
+
+    def _cache_put(self, key: Tuple[Any, ...], value: MemoryRetrieval) -> None:
+        if self.settings.cache_ttl_seconds <= 0:
+            return
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic(), value)
+            self._cache.move_to_end(key)
+            while len(self._cache) > max(1, self.settings.cache_max_entries):
+                self._cache.popitem(last=False)
 
     # -- Persistence ----------------------------------------------------------------
     def store(
@@ -24,6 +24,8 @@ class AgentCoreMemorySettings:
     store_in_background: bool = True
     debug_log: bool = False
     memory_arn: Optional[str] = None
+    cache_ttl_seconds: float = 60.0
+    cache_max_entries: int = 256
 
     @classmethod
     def from_app(cls) -> "AgentCoreMemorySettings":
@@ -61,6 +63,7 @@ class AgentCoreMemorySettings:
             namespace_templates=namespace_templates,
             store_in_background=Config.AGENTCORE_MEMORY_STORE_BACKGROUND,
             debug_log=Config.AGENTCORE_MEMORY_DEBUG_LOG,
+            cache_ttl_seconds=Config.AGENTCORE_MEMORY_CACHE_TTL_SECONDS,
         )
 
     def formatted_namespaces(self, actor_id: str, session_id: str, workshop_id: int) -> List[str]:
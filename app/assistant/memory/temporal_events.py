@@ -11,6 +11,8 @@ except Exception:  # pragma: no cover
 
 from app.config import Config
 
+from .fake_client import FakeMemoryClient
+
 
 class TemporalMemoryService:
     """Store and query timestamped workshop events in AgentCore Memory."""
@@ -19,9 +21,10 @@ class TemporalMemoryService:
         self.memory_id = Config.AGENTCORE_MEMORY_ID
         self.region = Config.AGENTCORE_MEMORY_REGION
         self._client = None
-        if MemoryClient and self.memory_id:
+        client_cls = FakeMemoryClient if Config.AWS_BACKEND == "fake" else MemoryClient
+        if client_cls and self.memory_id:
             try:
-                self._client = MemoryClient(region_name=self.region)
+                self._client = client_cls(region_name=self.region)
             except Exception:  # pragma: no cover - network/runtime failures during init
                 self._client = None
 
@@ -36,7 +39,8 @@ class TemporalMemoryService:
         event_data: Dict[str, Any],
         timestamp: Optional[datetime] = None,
     ) -> None:
-        if not self.enabled:
+        client, memory_id = self._client, self.memory_id
+        if client is None or not memory_id:
             return
         timestamp = timestamp or datetime.now(timezone.utc)
         actor_id = f"workshop-{workshop_id}"
@@ -47,8 +51,8 @@ class TemporalMemoryService:
             "data": event_data,
         }
         try:
-            self._client.create_event(  # type: ignore[operator]
-                memory_id=self.memory_id,
+            client.create_event(
+                memory_id=memory_id,
                 actor_id=actor_id,
                 session_id=f"temporal-{workshop_id}",
                 messages=[
@@ -76,7 +80,8 @@ class TemporalMemoryService:
         end_time: Optional[datetime] = None,
         event_types: Optional[List[str]] = None,
     ) -> List[Dict[str, Any]]:
-        if not self.enabled:
+        client, memory_id = self._client, self.memory_id
+        if client is None or not memory_id:
             return []
         end_time = end_time or datetime.now(timezone.utc)
         actor_id = f"workshop-{workshop_id}"
@@ -86,8 +91,8 @@ class TemporalMemoryService:
             query_parts.append(f"events: {', '.join(event_types)}")
         query = " ".join(query_parts)
         try:
-            memories = self._client.retrieve_memories(  # type: ignore[operator]
-                memory_id=self.memory_id,
+            memories = client.retrieve_memories(
+                memory_id=memory_id,
                 namespace=namespace,
                 query=query,
                 top_k=50,
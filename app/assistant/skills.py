@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 from datetime import date, datetime, timedelta
 from typing import Any, Dict, List, Optional
 
@@ -21,6 +20,8 @@ from app.models import (
     WorkshopDocument,
     WorkshopParticipant,
 )
+from app.document.service.vector_index import semantic_search
+from app.service.phase_artifacts import latest_phase_artifact, latest_phase_artifacts
 from app.utils.data_aggregation import aggregate_pre_workshop_data
 
 
@@ -112,29 +113,27 @@ def skill_fetch_workshop_context(workshop_id: int) -> Dict[str, Any]:
 
 
 def skill_fetch_phase_snapshot(workshop_id: int) -> Dict[str, Any]:
+    phase_types = {
+        "framing": "framing",
+        "brainstorming": "brainstorming",
+        "clustering_voting": "clustering_voting",
+        "feasibility": "results_feasibility",
+        "prioritization": "results_prioritization",
+        "discussion": "results_discussion",
+        "action_plan": "results_action_plan",
+        "summary": "summary",
+    }
+    artifacts = latest_phase_artifacts(workshop_id, phase_types.values())
+
     def _latest_payload(task_type: str) -> Optional[Any]:
-        record = (
-            BrainstormTask.query.filter_by(workshop_id=workshop_id, task_type=task_type)
-            .order_by(BrainstormTask.created_at.desc())
-            .first()
-        )
-        if not record or not record.payload_json:
+        artifact = artifacts.get(task_type)
+        if not artifact:
             return None
-        try:
-            return json.loads(record.payload_json)
-        except Exception:
-            return record.payload_json
+        if artifact.payload is None:
+            return artifact.raw_payload
+        return artifact.payload
 
-    return {
-        "framing": _latest_payload("framing"),
-        "brainstorming": _latest_payload("brainstorming"),
-        "clustering_voting": _latest_payload("clustering_voting"),
-        "feasibility": _latest_payload("results_feasibility"),
-        "prioritization": _latest_payload("results_prioritization"),
-        "discussion": _latest_payload("results_discussion"),
-        "action_plan": _latest_payload("results_action_plan"),
-        "summary": _latest_payload("summary"),
-    }
+    return {key: _latest_payload(task_type) for key, task_type in phase_types.items()}
 
 
 def skill_retrieve_workshop_phase(workshop_id: int) -> Dict[str, Any]:
@@ -173,28 +172,48 @@ def skill_retrieve_workshop_phase(workshop_id: int) -> Dict[str, Any]:
 
 
 def skill_search_documents(workshop_id: int, query: str) -> List[Dict[str, Any]]:
+    """Workshop documents matching ``query``.
+
+    Documents with semantically close chunks (per-workspace vector index) come first,
+    each with its best passages under ``matches``; title/description substring
+    matches fill the remaining slots.
+    """
+    passages: Dict[int, List[Dict[str, Any]]] = {}
+    for hit in semantic_search(query, workshop_id=workshop_id, top_k=12):
+        passages.setdefault(hit["document_id"], []).append(
+            {"chunk_id": hit["chunk_id"], "score": hit["score"], "excerpt": (hit["content"] or "")[:400]}
+        )
+
     links = (
         WorkshopDocument.query
         .options(joinedload(WorkshopDocument.document))
         .filter(WorkshopDocument.workshop_id == workshop_id)
         .join(Document, WorkshopDocument.document_id == Document.id)
-        .filter(Document.title.ilike(f"%{query}%") | Document.description.ilike(f"%{query}%"))
+        .filter(
+            Document.title.ilike(f"%{query}%")
+            | Document.description.ilike(f"%{query}%")
+            | Document.id.in_(list(passages))
+        )
         .all()
     )
+    # Semantic hits in score order, then keyword-only matches in their original order.
+    rank = {doc_id: i for i, doc_id in enumerate(passages)}
+    links.sort(key=lambda link: rank.get(link.document_id, len(rank)))
 
     out: List[Dict[str, Any]] = []
     for link in links[:8]:
         doc = link.document
         if not doc:
             continue
-        out.append(
-            {
-                "document_id": doc.id,
-                "title": doc.title,
-                "summary": (doc.summary or doc.description or "")[:400],
-                "file_path": doc.file_path,
-            }
-        )
+        entry = {
+            "document_id": doc.id,
+            "title": doc.title,
+            "summary": (doc.summary or doc.description or "")[:400],
+            "file_path": doc.file_path,
+        }
+        if doc.id in passages:
+            entry["matches"] = passages[doc.id][:3]
+        out.append(entry)
     return out
 
 
@@ -386,17 +405,13 @@ def skill_render_whiteboard_snapshot(workshop_id: int, format: str = "image") ->
 
 
 def skill_explain_chart(workshop_id: int, chart_id: str) -> Dict[str, Any]:
-    task = (
-        BrainstormTask.query
-        .filter(BrainstormTask.workshop_id == workshop_id)
-        .filter(BrainstormTask.task_type.in_(["results_feasibility", "results_prioritization", "summary"]))
-        .order_by(BrainstormTask.created_at.desc())
-        .first()
+    artifact = latest_phase_artifact(
+        workshop_id, ["results_feasibility", "results_prioritization", "summary"]
     )
     chart_meta: Optional[Dict[str, Any]] = None
-    if task and task.payload_json:
+    if artifact and artifact.payload is not None:
         try:
-            payload = json.loads(task.payload_json)
+            payload = artifact.payload
             charts = payload.get("charts") if isinstance(payload, dict) else None
             if isinstance(charts, dict):
                 chart_meta = charts.get(chart_id)
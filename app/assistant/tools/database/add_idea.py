@@ -41,6 +41,7 @@ class AddIdeaTool(BaseTool):
                 },
             },
             allowed_roles={"facilitator", "organizer", "participant"},
+            sequential=True,
         )
 
     def execute(self, params: Dict[str, Any]) -> ToolResult:
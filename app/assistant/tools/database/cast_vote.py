@@ -44,6 +44,7 @@ class CastVoteTool(BaseTool):
                     "dots_remaining": {"type": "integer"},
                 },
             },
+            sequential=True,
         )
 
     def execute(self, params: Dict[str, Any]) -> ToolResult:
@@ -38,6 +38,7 @@ class CreateActionItemTool(BaseTool):
                 },
             },
             allowed_roles={"facilitator", "organizer"},
+            sequential=True,
         )
 
     def execute(self, params: Dict[str, Any]) -> ToolResult:
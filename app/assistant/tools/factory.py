@@ -23,7 +23,7 @@ from .workshop_control import (
     CastVoteTool as WorkshopCastVoteTool,
 )
 from .workshop import VoteForClusterTool
-from .workshop_data import GetAgendaTool, ListClustersTool, ListReportsTool
+from .workshop_data import GetAgendaTool, ListClustersTool, ListReportsTool, SearchDocumentsTool
 from .workshop_data.list_ideas import ListIdeasTool
 from .workshop_data.read_report import ReadReportTool
 
@@ -67,5 +67,6 @@ def build_default_registry(*, include_notifier: bool = True) -> ToolRegistry:
     registry.register(ListIdeasTool())
     registry.register(ListReportsTool())
     registry.register(ReadReportTool())
+    registry.register(SearchDocumentsTool())
     
     return registry
@@ -3,8 +3,8 @@ from __future__ import annotations
 import logging
 import time
 import uuid
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
-from threading import Lock
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from threading import BoundedSemaphore, Lock
 from typing import Iterable, List, Tuple
 
 from flask import current_app, has_app_context
@@ -31,6 +31,7 @@ class ToolGateway:
         timeout_seconds: float | None = None,
         failure_threshold: int | None = None,
         circuit_reset_seconds: float | None = None,
+        per_tool_max_concurrency: int | None = None,
     ) -> None:
         self.registry = registry
         self._lock = Lock()
@@ -48,7 +49,19 @@ class ToolGateway:
             60.0,
             minimum=1.0,
         )
+        self.per_tool_max_concurrency = self._resolve_int(
+            per_tool_max_concurrency,
+            "TOOL_GATEWAY_PER_TOOL_MAX_CONCURRENCY",
+            4,
+            minimum=1,
+        )
+        self.sequential_prefixes: Tuple[str, ...] = ("workshop_control.",)
+        if has_app_context():
+            prefixes = current_app.config.get("TOOL_GATEWAY_SEQUENTIAL_PREFIXES")
+            if isinstance(prefixes, (list, tuple)):
+                self.sequential_prefixes = tuple(str(prefix) for prefix in prefixes)
         self.executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        self._tool_semaphores: dict[str, BoundedSemaphore] = {}
         self._failure_counts: dict[str, int] = {}
         self._circuit_until: dict[str, float] = {}
 
@@ -59,6 +72,13 @@ class ToolGateway:
         *,
         correlation_id: str | None = None,
     ) -> Tuple[List[ToolExecutionResult], List[ToolResult]]:
+        """Run a plan's tool calls and return results in call order.
+
+        Consecutive independent calls are submitted together and gathered with a
+        shared deadline. Sequential tools (``ToolSchema.sequential`` or a name
+        matching ``TOOL_GATEWAY_SEQUENTIAL_PREFIXES``) run alone, after every
+        earlier call and before any later one.
+        """
         results: List[ToolExecutionResult] = []
         raw: List[ToolResult] = []
         base_correlation = correlation_id or str(uuid.uuid4())
@@ -69,141 +89,36 @@ class ToolGateway:
         notifier_requests = []
         notifier_available = "notifier.notify" in self.registry.tools
 
-        for index, call in enumerate(calls):
-            invocation = ToolInvocation(
+        call_list = list(calls)
+        invocations = [
+            ToolInvocation(
                 tool_name=call.name,
                 params=call.args,
                 correlation_id=f"{base_correlation}:{index}",
                 workshop_id=workshop_id,
                 user_id=user_id,
             )
+            for index, call in enumerate(call_list)
+        ]
+        outcomes: List[ToolResult | None] = [None] * len(invocations)
+        for wave in self._plan_waves(invocations):
+            self._run_wave(wave, invocations, outcomes, workshop_id)
 
-            short_circuit = self._is_circuit_open(invocation.tool_name)
-            if short_circuit:
-                tool_result = ToolResult(
-                    success=False,
-                    error="Circuit breaker open",
-                    correlation_id=invocation.correlation_id,
-                )
-                self._attach_gateway_metadata(tool_result, circuit_open=True)
-                self._record_metric(
-                    "tool_gateway_circuit_open",
-                    tool_name=invocation.tool_name,
-                    workshop_id=workshop_id,
-                    correlation_id=invocation.correlation_id,
-                )
-                raw.append(tool_result)
-                results.append(
-                    ToolExecutionResult(
-                        name=call.name,
-                        success=tool_result.success,
-                        output=None,
-                        error=tool_result.error,
-                        elapsed_ms=None,
-                    )
-                )
-                continue
-
-            start = time.perf_counter()
-            future = self._submit_invocation(invocation)
-            try:
-                # Use a longer timeout for control-plane tools like begin/next/end
-                call_timeout = self.timeout_seconds
-                if invocation.tool_name.startswith("workshop_control."):
-                    try:
-                        call_timeout = float(getattr(Config, "TOOL_GATEWAY_CONTROL_TIMEOUT_SECONDS", self.timeout_seconds))
-                    except Exception:
-                        call_timeout = self.timeout_seconds
-                tool_result = future.result(timeout=call_timeout)
-            except FuturesTimeoutError:
-                future.cancel()
-                latency_ms = (time.perf_counter() - start) * 1000.0
-                tool_result = ToolResult(
-                    success=False,
-                    error=f"Tool execution timeout ({call_timeout:.1f}s)",
-                    latency_ms=latency_ms,
-                    correlation_id=invocation.correlation_id,
-                )
-                self._attach_gateway_metadata(tool_result, timeout=True)
-                self._register_failure(invocation.tool_name)
-                self._log(
-                    "warning",
-                    "tool_gateway_timeout",
-                    tool_name=invocation.tool_name,
-                    correlation_id=invocation.correlation_id,
-                    timeout_seconds=call_timeout,
-                    workshop_id=workshop_id,
-                )
-                self._record_metric(
-                    "tool_gateway_timeout",
-                    tool_name=invocation.tool_name,
-                    workshop_id=workshop_id,
-                    correlation_id=invocation.correlation_id,
-                    latency_ms=latency_ms,
-                )
-            except Exception as exc:  # pragma: no cover - defensive
-                future.cancel()
-                latency_ms = (time.perf_counter() - start) * 1000.0
-                tool_result = ToolResult(
-                    success=False,
-                    error=str(exc),
-                    latency_ms=latency_ms,
-                    correlation_id=invocation.correlation_id,
-                )
-                self._attach_gateway_metadata(tool_result, exception=str(exc))
-                self._register_failure(invocation.tool_name)
-                self._log(
-                    "error",
-                    "tool_gateway_exception",
-                    tool_name=invocation.tool_name,
-                    correlation_id=invocation.correlation_id,
-                    error=str(exc),
-                    workshop_id=workshop_id,
-                )
-                self._record_metric(
-                    "tool_gateway_exception",
-                    tool_name=invocation.tool_name,
-                    workshop_id=workshop_id,
-                    correlation_id=invocation.correlation_id,
-                )
-            else:
-                elapsed_ms = (time.perf_counter() - start) * 1000.0
-                if not tool_result.latency_ms:
-                    tool_result.latency_ms = elapsed_ms
-                if tool_result.success:
-                    self._register_success(invocation.tool_name)
-                else:
-                    self._register_failure(invocation.tool_name)
-                self._attach_gateway_metadata(
-                    tool_result,
-                    failure_count=self._failure_counts.get(invocation.tool_name, 0),
-                )
-                if not tool_result.success:
-                    self._log(
-                        "warning",
-                        "tool_gateway_tool_failure",
-                        tool_name=invocation.tool_name,
-                        correlation_id=invocation.correlation_id,
-                        error=tool_result.error,
-                        workshop_id=workshop_id,
-                    )
-                self._record_metric(
-                    "tool_gateway_result",
-                    tool_name=invocation.tool_name,
-                    success=tool_result.success,
-                    workshop_id=workshop_id,
-                    correlation_id=invocation.correlation_id,
-                    latency_ms=tool_result.latency_ms,
-                )
-
+        for call, tool_result in zip(call_list, outcomes):
+            assert tool_result is not None
+            circuit_open = bool((tool_result.metadata or {}).get("gateway", {}).get("circuit_open"))
             raw.append(tool_result)
             results.append(
                 ToolExecutionResult(
                     name=call.name,
                     success=tool_result.success,
-                    output=tool_result.data,
+                    output=None if circuit_open else tool_result.data,
                     error=None if tool_result.success else tool_result.error,
-                    elapsed_ms=int(tool_result.latency_ms) if tool_result.latency_ms is not None else None,
+                    elapsed_ms=(
+                        None
+                        if circuit_open or tool_result.latency_ms is None
+                        else int(tool_result.latency_ms)
+                    ),
                 )
             )
             notifier_payload = None
@@ -241,6 +156,188 @@ class ToolGateway:
             )
         return results, raw
 
+    # ------------------------------------------------------------------
+    def _plan_waves(self, invocations: List[ToolInvocation]) -> List[List[int]]:
+        waves: List[List[int]] = []
+        pending: List[int] = []
+        for index, invocation in enumerate(invocations):
+            if self._is_sequential(invocation.tool_name):
+                if pending:
+                    waves.append(pending)
+                    pending = []
+                waves.append([index])
+            else:
+                pending.append(index)
+        if pending:
+            waves.append(pending)
+        return waves
+
+    def _run_wave(
+        self,
+        wave: List[int],
+        invocations: List[ToolInvocation],
+        outcomes: List[ToolResult | None],
+        workshop_id: int | None,
+    ) -> None:
+        submitted: List[Tuple[int, Future, float, float]] = []
+        for index in wave:
+            invocation = invocations[index]
+            if self._is_circuit_open(invocation.tool_name):
+                tool_result = ToolResult(
+                    success=False,
+                    error="Circuit breaker open",
+                    correlation_id=invocation.correlation_id,
+                )
+                self._attach_gateway_metadata(tool_result, circuit_open=True)
+                self._record_metric(
+                    "tool_gateway_circuit_open",
+                    tool_name=invocation.tool_name,
+                    workshop_id=workshop_id,
+                    correlation_id=invocation.correlation_id,
+                )
+                outcomes[index] = tool_result
+                continue
+            call_timeout = self._call_timeout(invocation.tool_name)
+            submitted.append((index, self._submit_invocation(invocation), time.perf_counter(), call_timeout))
+
+        if not submitted:
+            return
+        deadline = max(started + call_timeout for _, _, started, call_timeout in submitted)
+        wait([future for _, future, _, _ in submitted], timeout=max(0.0, deadline - time.perf_counter()))
+        for index, future, started, call_timeout in submitted:
+            outcomes[index] = self._collect(invocations[index], future, started, call_timeout, workshop_id)
+
+    def _collect(
+        self,
+        invocation: ToolInvocation,
+        future: Future,
+        start: float,
+        call_timeout: float,
+        workshop_id: int | None,
+    ) -> ToolResult:
+        if not future.done():
+            future.cancel()
+            latency_ms = (time.perf_counter() - start) * 1000.0
+            tool_result = ToolResult(
+                success=False,
+                error=f"Tool execution timeout ({call_timeout:.1f}s)",
+                latency_ms=latency_ms,
+                correlation_id=invocation.correlation_id,
+            )
+            self._attach_gateway_metadata(tool_result, timeout=True)
+            self._register_failure(invocation.tool_name)
+            self._log(
+                "warning",
+                "tool_gateway_timeout",
+                tool_name=invocation.tool_name,
+                correlation_id=invocation.correlation_id,
+                timeout_seconds=call_timeout,
+                workshop_id=workshop_id,
+            )
+            self._record_metric(
+                "tool_gateway_timeout",
+                tool_name=invocation.tool_name,
+                workshop_id=workshop_id,
+                correlation_id=invocation.correlation_id,
+                latency_ms=latency_ms,
+            )
+            return tool_result
+        try:
+            tool_result = future.result()
+        except Exception as exc:  # pragma: no cover - defensive
+            latency_ms = (time.perf_counter() - start) * 1000.0
+            tool_result = ToolResult(
+                success=False,
+                error=str(exc),
+                latency_ms=latency_ms,
+                correlation_id=invocation.correlation_id,
+            )
+            self._attach_gateway_metadata(tool_result, exception=str(exc))
+            self._register_failure(invocation.tool_name)
+            self._log(
+                "error",
+                "tool_gateway_exception",
+                tool_name=invocation.tool_name,
+                correlation_id=invocation.correlation_id,
+                error=str(exc),
+                workshop_id=workshop_id,
+            )
+            self._record_metric(
+                "tool_gateway_exception",
+                tool_name=invocation.tool_name,
+                workshop_id=workshop_id,
+                correlation_id=invocation.correlation_id,
+            )
+            return tool_result
+
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+        if not tool_result.latency_ms:
+            tool_result.latency_ms = elapsed_ms
+        if tool_result.success:
+            self._register_success(invocation.tool_name)
+        else:
+            self._register_failure(invocation.tool_name)
+        self._attach_gateway_metadata(
+            tool_result,
+            failure_count=self._failure_counts.get(invocation.tool_name, 0),
+        )
+        if not tool_result.success:
+            self._log(
+                "warning",
+                "tool_gateway_tool_failure",
+                tool_name=invocation.tool_name,
+                correlation_id=invocation.correlation_id,
+                error=tool_result.error,
+                workshop_id=workshop_id,
+            )
+        self._record_metric(
+            "tool_gateway_result",
+            tool_name=invocation.tool_name,
+            success=tool_result.success,
+            workshop_id=workshop_id,
+            correlation_id=invocation.correlation_id,
+            latency_ms=tool_result.latency_ms,
+        )
+        return tool_result
+
+    def _call_timeout(self, tool_name: str) -> float:
+        # Use a longer timeout for control-plane tools like begin/next/end
+        if tool_name.startswith("workshop_control."):
+            try:
+                return float(getattr(Config, "TOOL_GATEWAY_CONTROL_TIMEOUT_SECONDS", self.timeout_seconds))
+            except Exception:
+                return self.timeout_seconds
+        return self.timeout_seconds
+
+    def _is_sequential(self, tool_name: str) -> bool:
+        schema = self.registry.get_schema(tool_name)
+        if schema is not None and schema.sequential:
+            return True
+        return any(tool_name.startswith(prefix) for prefix in self.sequential_prefixes)
+
+    def _tool_semaphore(self, tool_name: str) -> BoundedSemaphore:
+        with self._lock:
+            semaphore = self._tool_semaphores.get(tool_name)
+            if semaphore is None:
+                schema = self.registry.get_schema(tool_name)
+                cap = schema.max_concurrency if schema is not None and schema.max_concurrency else None
+                semaphore = BoundedSemaphore(max(1, cap or self.per_tool_max_concurrency))
+                self._tool_semaphores[tool_name] = semaphore
+            return semaphore
+
+    def _execute_capped(self, invocation: ToolInvocation) -> ToolResult:
+        semaphore = self._tool_semaphore(invocation.tool_name)
+        if not semaphore.acquire(timeout=self._call_timeout(invocation.tool_name)):
+            return ToolResult(
+                success=False,
+                error="Tool concurrency limit reached",
+                correlation_id=invocation.correlation_id,
+            )
+        try:
+            return self.registry.execute(invocation)
+        finally:
+            semaphore.release()
+
     # ------------------------------------------------------------------
     def _register_success(self, tool_name: str) -> None:
         with self._lock:
@@ -352,7 +449,7 @@ class ToolGateway:
 
             def _runner():
                 with app_obj.app_context():
-                    return self.registry.execute(invocation)
+                    return self._execute_capped(invocation)
 
             return self.executor.submit(_runner)
-        return self.executor.submit(self.registry.execute, invocation)
+        return self.executor.submit(self._execute_capped, invocation)
@@ -6,7 +6,7 @@ from typing import Any
 from flask import Blueprint, Response
 
 try:  # pragma: no cover - optional dependency handling
-    from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest  # type: ignore[import-not-found]
+    from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest  # type: ignore[import-not-found]
 except Exception:  # pragma: no cover - dependency not installed
     CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
     generate_latest = lambda: b""  # type: ignore
@@ -21,12 +21,50 @@ except Exception:  # pragma: no cover - dependency not installed
         def observe(self, value: float) -> None:
             return None
 
+        def set(self, value: float) -> None:
+            return None
+
+        def set_function(self, func: Any) -> None:
+            return None
+
     PROMETHEUS_ENABLED = False
     tool_invocations = _NoOpMetric()
     tool_latency = _NoOpMetric()
     phase_remaining_time = _NoOpMetric()
     idle_detections = _NoOpMetric()
     timer_starts = _NoOpMetric()
+    context_cache_events = _NoOpMetric()
+    assistant_time_to_first_token = _NoOpMetric()
+    assistant_reply_path = _NoOpMetric()
+    assistant_llm_stage_latency = _NoOpMetric()
+    assistant_prompt_tokens = _NoOpMetric()
+    assistant_context_truncations = _NoOpMetric()
+    bedrock_client_pool_events = _NoOpMetric()
+    bedrock_client_construct_seconds = _NoOpMetric()
+    bedrock_llm_cache_events = _NoOpMetric()
+    bedrock_http_connections_opened = _NoOpMetric()
+    bedrock_http_requests_sent = _NoOpMetric()
+    llm_response_cache_events = _NoOpMetric()
+    llm_response_cache_saved_seconds = _NoOpMetric()
+    llm_prompt_tokens = _NoOpMetric()
+    bedrock_admission_wait = _NoOpMetric()
+    bedrock_admission_rejected = _NoOpMetric()
+    bedrock_inflight = _NoOpMetric()
+    single_flight_events = _NoOpMetric()
+    llm_call_latency = _NoOpMetric()
+    llm_tokens = _NoOpMetric()
+    llm_call_retries = _NoOpMetric()
+    bedrock_hedge_events = _NoOpMetric()
+    bedrock_hedge_delay = _NoOpMetric()
+    room_join_sync = _NoOpMetric()
+    room_snapshot_builds = _NoOpMetric()
+    room_join_admission = _NoOpMetric()
+    room_join_queue_depth = _NoOpMetric()
+    room_join_latency = _NoOpMetric()
+    vote_tally_events = _NoOpMetric()
+    vote_flush_batch = _NoOpMetric()
+    socket_frames_saved = _NoOpMetric()
+    socket_emit_batch_size = _NoOpMetric()
 else:
     PROMETHEUS_ENABLED = True
     tool_invocations = Counter(
@@ -54,6 +92,171 @@ else:
         "Number of timers started",
         ["workshop_id"],
     )
+    context_cache_events = Counter(
+        "assistant_context_cache_total",
+        "Assistant context cache lookups by result (hit, miss, coalesced)",
+        ["result"],
+    )
+    assistant_time_to_first_token = Histogram(
+        "assistant_time_to_first_token_seconds",
+        "Time from receiving an assistant question to the first assistant:token event",
+        ["mode"],
+        buckets=(0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 21.0, 34.0),
+    )
+    assistant_prompt_tokens = Histogram(
+        "assistant_prompt_tokens",
+        "Estimated input tokens of each assistant LLM prompt by stage (plan, compose)",
+        ["stage"],
+        buckets=(500, 1000, 2000, 3000, 4000, 6000, 8000, 12000, 16000, 32000),
+    )
+    assistant_context_truncations = Counter(
+        "assistant_context_truncations_total",
+        "Assistant context sections cut to fit the token budget, by section",
+        ["section"],
+    )
+    assistant_reply_path = Counter(
+        "assistant_reply_path_total",
+        "Assistant replies by LLM path (single_call skips compose; plan_compose makes both calls)",
+        ["path"],
+    )
+    assistant_llm_stage_latency = Histogram(
+        "assistant_llm_stage_latency_seconds",
+        "Assistant LLM call latency by stage (plan, compose); compose time is what single_call saves",
+        ["stage"],
+        buckets=(0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 21.0, 34.0),
+    )
+    bedrock_client_pool_events = Counter(
+        "bedrock_client_pool_total",
+        "Shared bedrock-runtime client lookups by result (hit, miss)",
+        ["result"],
+    )
+    bedrock_client_construct_seconds = Histogram(
+        "bedrock_client_construct_seconds",
+        "Time spent building a boto3 bedrock-runtime client (credential resolution + endpoint setup)",
+        buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+    )
+    bedrock_llm_cache_events = Counter(
+        "bedrock_llm_cache_total",
+        "Cached ChatBedrock instance lookups by result (hit, miss)",
+        ["result"],
+    )
+    bedrock_http_connections_opened = Gauge(
+        "bedrock_http_connections_opened",
+        "HTTP connections opened by the shared bedrock-runtime clients since start",
+    )
+    bedrock_http_requests_sent = Gauge(
+        "bedrock_http_requests_sent",
+        "HTTP requests sent by the shared bedrock-runtime clients since start; reuse = 1 - opened/sent",
+    )
+    llm_response_cache_events = Counter(
+        "llm_response_cache_total",
+        "LLM response cache lookups by phase and result (hit, miss, bypass)",
+        ["phase", "result"],
+    )
+    llm_response_cache_saved_seconds = Counter(
+        "llm_response_cache_saved_seconds_total",
+        "Bedrock latency avoided by LLM response cache hits (original generation time)",
+        ["phase"],
+    )
+    llm_prompt_tokens = Counter(
+        "llm_prompt_tokens_total",
+        "Estimated tokens rendered by registered prompts, split into static template text and variables",
+        ["prompt", "part"],
+    )
+    bedrock_admission_wait = Histogram(
+        "bedrock_admission_wait_seconds",
+        "Time a Bedrock call waited for a concurrency slot / rate budget, by model and priority",
+        ["model", "priority"],
+        buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0),
+    )
+    bedrock_admission_rejected = Counter(
+        "bedrock_admission_rejected_total",
+        "Bedrock calls that gave up waiting for admission, by model and priority",
+        ["model", "priority"],
+    )
+    bedrock_inflight = Gauge(
+        "bedrock_inflight_requests",
+        "Bedrock calls currently holding an admission slot, by model",
+        ["model"],
+    )
+    single_flight_events = Counter(
+        "single_flight_requests_total",
+        "Single-flight calls by name and role (leader ran the work, coalesced waited for it)",
+        ["name", "result"],
+    )
+    llm_call_latency = Histogram(
+        "llm_call_latency_seconds",
+        "Bedrock chat call latency including retries and admission wait, by model, caller and status",
+        ["model", "caller", "status"],
+        buckets=(0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 21.0, 34.0, 55.0, 89.0),
+    )
+    llm_tokens = Counter(
+        "llm_tokens_total",
+        "Bedrock chat tokens by model, caller and kind (prompt, completion)",
+        ["model", "caller", "kind"],
+    )
+    llm_call_retries = Counter(
+        "llm_call_retries_total",
+        "Bedrock chat retries by model, caller and reason (throttle, error)",
+        ["model", "caller", "reason"],
+    )
+    bedrock_hedge_events = Counter(
+        "bedrock_hedge_total",
+        "Routed Bedrock calls by primary model and outcome (primary, hedge, primary_after_hedge, fallback, failed)",
+        ["model", "outcome"],
+    )
+    bedrock_hedge_delay = Histogram(
+        "bedrock_hedge_delay_seconds",
+        "Wait before a hedged request is sent to the next model tier, by primary model and priority",
+        ["model", "priority"],
+        buckets=(0.5, 1.0, 2.0, 3.0, 5.0, 8.0, 13.0, 21.0, 34.0),
+    )
+    room_join_sync = Counter(
+        "room_join_sync_total",
+        "join_room state syncs by mode (snapshot, delta, events)",
+        ["mode"],
+    )
+    room_snapshot_builds = Counter(
+        "room_snapshot_builds_total",
+        "Room snapshots rebuilt from the database, by reason (cold, stale, expired) and whether the content changed",
+        ["reason", "changed"],
+    )
+    room_join_admission = Counter(
+        "room_join_admission_total",
+        "Room and assistant join attempts by priority (facilitator, participant) and outcome (admitted, deferred)",
+        ["priority", "outcome"],
+    )
+    room_join_queue_depth = Gauge(
+        "room_join_queue_depth",
+        "Clients told to retry their join that have not been admitted yet, by priority",
+        ["priority"],
+    )
+    room_join_latency = Histogram(
+        "room_join_latency_seconds",
+        "Join latency seen by the client (time deferred plus the join handler), by priority",
+        ["priority"],
+        buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 40.0),
+    )
+    vote_tally_events = Counter(
+        "vote_tally_events_total",
+        "Votes decided against the in-memory tally, by kind (clustering_voting, vote_generic) and outcome (voted, unvoted, none, rejected)",
+        ["kind", "outcome"],
+    )
+    vote_flush_batch = Histogram(
+        "vote_flush_batch_size",
+        "Journaled vote toggles persisted per write-behind flush",
+        buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000),
+    )
+    socket_frames_saved = Counter(
+        "socket_frames_saved_total",
+        "Socket.IO frames not sent because the emit batcher merged an event into a newer one (merged) or sent it inside a batch frame (batched), by event",
+        ["event", "reason"],
+    )
+    socket_emit_batch_size = Histogram(
+        "socket_emit_batch_size",
+        "Events per frame sent by the emit batcher",
+        buckets=(1, 2, 3, 5, 10, 20, 50, 100),
+    )
 
 
 # Blueprint for metrics endpoint
@@ -75,4 +278,36 @@ __all__ = [
     "phase_remaining_time",
     "idle_detections",
     "timer_starts",
+    "context_cache_events",
+    "assistant_time_to_first_token",
+    "assistant_reply_path",
+    "assistant_llm_stage_latency",
+    "assistant_prompt_tokens",
+    "assistant_context_truncations",
+    "bedrock_client_pool_events",
+    "bedrock_client_construct_seconds",
+    "bedrock_llm_cache_events",
+    "bedrock_http_connections_opened",
+    "bedrock_http_requests_sent",
+    "llm_response_cache_events",
+    "llm_response_cache_saved_seconds",
+    "llm_prompt_tokens",
+    "bedrock_admission_wait",
+    "bedrock_admission_rejected",
+    "bedrock_inflight",
+    "single_flight_events",
+    "llm_call_latency",
+    "llm_tokens",
+    "llm_call_retries",
+    "bedrock_hedge_events",
+    "bedrock_hedge_delay",
+    "room_join_sync",
+    "room_snapshot_builds",
+    "room_join_admission",
+    "room_join_queue_depth",
+    "room_join_latency",
+    "vote_tally_events",
+    "vote_flush_batch",
+    "socket_frames_saved",
+    "socket_emit_batch_size",
 ]
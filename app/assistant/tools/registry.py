@@ -37,6 +37,9 @@ class ToolRegistry:
     def list_tools(self) -> Iterable[ToolSchema]:
         return self._schemas.values()
 
+    def get_schema(self, tool_name: str) -> ToolSchema | None:
+        return self._schemas.get(tool_name)
+
     # ------------------------------------------------------------------
     # Execution
     # ------------------------------------------------------------------
@@ -198,6 +198,7 @@ class StartTimerTool(BaseTool):
                 },
             },
             requires_auth=False,
+            sequential=True,
         )
 
     def execute(self, params: Dict[str, Any]) -> ToolResult:
@@ -273,6 +274,7 @@ class ScheduleReminderTool(BaseTool):
                 },
             },
             requires_auth=False,
+            sequential=True,
         )
 
     def execute(self, params: Dict[str, Any]) -> ToolResult:
@@ -32,6 +32,11 @@ class ToolSchema(BaseModel):
     requires_auth: bool = True
     requires_workshop: bool = True
     allowed_roles: Optional[set[str]] = None
+    # Gateway scheduling hints: sequential tools never overlap with other calls of the
+    # same plan (they run after all earlier calls and before any later ones);
+    # max_concurrency caps simultaneous executions of this tool across requests.
+    sequential: bool = False
+    max_concurrency: Optional[int] = None
 
     @field_validator("allowed_roles", mode="before")
     @classmethod
@@ -62,6 +62,7 @@ class VoteForClusterTool(BaseTool):
             },
             requires_auth=True,
             requires_workshop=True,
+            sequential=True,
         )
 
     def execute(self, params: Dict[str, Any]) -> ToolResult:
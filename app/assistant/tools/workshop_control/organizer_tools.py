@@ -135,6 +135,11 @@ class BeginWorkshopTool(WorkshopControlTool):
             workshop.timer_start_time = datetime.utcnow()
             workshop.timer_paused_at = None
             db.session.commit()
+            if workshop.current_task_id:
+                from app.sockets_core.timer_scheduler import schedule_phase_timer
+                schedule_phase_timer(
+                    workshop.id, workshop.current_task_id, workshop.get_remaining_task_time()
+                )
 
             try:
                 from flask_socketio import emit
@@ -419,6 +424,8 @@ class EndCurrentTaskTool(WorkshopControlTool):
         
         # Commit changes
         db.session.commit()
+        from app.sockets_core.timer_scheduler import cancel_phase_timer
+        cancel_phase_timer(workshop.id)
         
         # Emit Socket.IO event for real-time UI update
         try:
@@ -512,6 +519,8 @@ class PauseWorkshopTool(WorkshopControlTool):
         workshop.status = "paused"
         workshop.timer_paused_at = datetime.utcnow()
         db.session.commit()
+        from app.sockets_core.timer_scheduler import pause_phase_timer
+        pause_phase_timer(workshop.id, workshop.get_remaining_task_time())
         
         # Emit Socket.IO event
         try:
@@ -607,6 +616,11 @@ class ResumeWorkshopTool(WorkshopControlTool):
         workshop.timer_start_time = datetime.utcnow()
         workshop.timer_paused_at = None
         db.session.commit()
+        if workshop.current_task_id:
+            from app.sockets_core.timer_scheduler import schedule_phase_timer
+            schedule_phase_timer(
+                workshop.id, workshop.current_task_id, workshop.get_remaining_task_time()
+            )
         
         # Emit Socket.IO event
         try:
@@ -708,6 +722,8 @@ class StopWorkshopTool(WorkshopControlTool):
         # Set workshop to completed
         workshop.status = "completed"
         db.session.commit()
+        from app.sockets_core.timer_scheduler import cancel_phase_timer
+        cancel_phase_timer(workshop.id)
         
         # Emit Socket.IO event
         try:
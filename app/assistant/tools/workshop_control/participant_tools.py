@@ -149,8 +149,8 @@ class AddIdeaTool(WorkshopControlTool):
             # Emit Socket.IO event for real-time UI update
             # Must match the payload structure expected by addStickyNote() in workshop_room.html
             try:
-                from app.extensions import socketio
-                
+                from app.sockets_core.room_state import room_state
+
                 # Get username for display
                 try:
                     username = f"{user.first_name} {user.last_name}".strip()
@@ -171,7 +171,7 @@ class AddIdeaTool(WorkshopControlTool):
                 }
                 
                 room = f"workshop_room_{workshop.id}"
-                socketio.emit("new_idea", emit_payload, to=room)
+                room_state.broadcast(workshop.id, "new_idea", emit_payload, room, db_writes=None)
                 logger.info(f"Emitted new_idea event to {room} for idea {idea.id}")
                 
             except Exception as e:
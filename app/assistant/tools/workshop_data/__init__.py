@@ -1,9 +1,11 @@
 from .get_agenda import GetAgendaTool
 from .list_clusters import ListClustersTool
 from .list_reports import ListReportsTool
+from .search_documents import SearchDocumentsTool
 
 __all__ = [
     "GetAgendaTool",
     "ListClustersTool",
     "ListReportsTool",
+    "SearchDocumentsTool",
 ]
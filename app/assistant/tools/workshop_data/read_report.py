@@ -85,6 +85,7 @@ class ReadReportTool(BaseTool):
             },
             requires_auth=True,
             requires_workshop=True,
+            max_concurrency=2,
         )
 
     def execute(self, params: Dict[str, Any]) -> ToolResult:
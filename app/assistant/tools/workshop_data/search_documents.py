@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from app.assistant.tools.base import BaseTool
+from app.assistant.tools.types import ToolResult, ToolSchema
+from app.document.service.vector_index import semantic_search
+from app.models import Document, db
+
+
+class SearchDocumentsTool(BaseTool):
+    """Semantic passage search over the documents linked to a workshop."""
+
+    def get_schema(self) -> ToolSchema:
+        return ToolSchema(
+            name="search_documents",
+            namespace="workshop",
+            description=(
+                "Find the passages in this workshop's uploaded documents that best match a question "
+                "or topic. Returns ranked excerpts with their document titles; optionally restrict "
+                "to specific document ids."
+            ),
+            parameters={
+                "type": "object",
+                "properties": {
+                    "workshop_id": {"type": "integer", "minimum": 1},
+                    # Gateway injects user_id for auth'd calls; accept it to satisfy validation
+                    "user_id": {"type": "integer", "minimum": 1},
+                    "query": {"type": "string", "minLength": 1},
+                    "document_ids": {"type": "array", "items": {"type": "integer", "minimum": 1}},
+                    "top_k": {"type": "integer", "minimum": 1, "maximum": 20, "default": 5},
+                },
+                "required": ["workshop_id", "query"],
+                "additionalProperties": False,
+            },
+            returns={
+                "type": "object",
+                "properties": {
+                    "passages": {"type": "array"},
+                    "count": {"type": "integer"},
+                },
+            },
+            requires_auth=True,
+            requires_workshop=True,
+        )
+
+    def execute(self, params: Dict[str, Any]) -> ToolResult:
+        workshop = self.ensure_workshop(params.get("workshop_id"))
+        try:
+            top_k = int(params.get("top_k") or 5)
+        except (TypeError, ValueError):
+            top_k = 5
+        top_k = max(1, min(top_k, 20))
+
+        hits = semantic_search(
+            str(params.get("query") or ""),
+            workshop_id=workshop.id,
+            document_ids=params.get("document_ids") or None,
+            top_k=top_k,
+        )
+        titles: Dict[int, str] = {}
+        if hits:
+            titles = dict(
+                db.session.query(Document.id, Document.title)
+                .filter(Document.id.in_({hit["document_id"] for hit in hits}))
+                .all()
+            )
+        passages: List[Dict[str, Any]] = [
+            {
+                "document_id": hit["document_id"],
+                "document_title": titles.get(hit["document_id"]),
+                "chunk_id": hit["chunk_id"],
+                "score": hit["score"],
+                "excerpt": (hit["content"] or "")[:800],
+            }
+            for hit in hits
+        ]
+        return ToolResult(success=True, data={"passages": passages, "count": len(passages)})
@@ -85,6 +85,109 @@ class Config:
         )
     except ValueError:
         BEDROCK_BOTO_MAX_ATTEMPTS = max(2, BEDROCK_RETRY_MAX_ATTEMPTS)
+    # Shared bedrock-runtime clients (one per region/credentials) and cached LLM wrappers
+    try:
+        BEDROCK_MAX_POOL_CONNECTIONS = max(1, int(os.environ.get("BEDROCK_MAX_POOL_CONNECTIONS", "50")))
+    except ValueError:
+        BEDROCK_MAX_POOL_CONNECTIONS = 50
+    BEDROCK_TCP_KEEPALIVE: bool = os.environ.get("BEDROCK_TCP_KEEPALIVE", "true").lower() not in {"0", "false"}
+    try:
+        BEDROCK_LLM_CACHE_MAX_ENTRIES = max(0, int(os.environ.get("BEDROCK_LLM_CACHE_MAX_ENTRIES", "64")))
+    except ValueError:
+        BEDROCK_LLM_CACHE_MAX_ENTRIES = 64
+    # Bedrock admission control: per-model concurrency caps, request/token buckets and
+    # priority classes (interactive > phase > background). Rates of 0 disable the bucket.
+    BEDROCK_ADMISSION_ENABLED: bool = os.environ.get("BEDROCK_ADMISSION_ENABLED", "true").lower() not in {"0", "false"}
+    try:
+        BEDROCK_MAX_CONCURRENCY_PER_MODEL = max(1, int(os.environ.get("BEDROCK_MAX_CONCURRENCY_PER_MODEL", "8")))
+    except ValueError:
+        BEDROCK_MAX_CONCURRENCY_PER_MODEL = 8
+    # Optional per-model overrides, e.g. "amazon.nova-pro-v1:0=4,amazon.nova-lite-v1:0=12"
+    BEDROCK_MODEL_CONCURRENCY = os.environ.get("BEDROCK_MODEL_CONCURRENCY", "")
+    try:
+        BEDROCK_REQUESTS_PER_MINUTE = max(0, int(os.environ.get("BEDROCK_REQUESTS_PER_MINUTE", "0")))
+    except ValueError:
+        BEDROCK_REQUESTS_PER_MINUTE = 0
+    try:
+        BEDROCK_TOKENS_PER_MINUTE = max(0, int(os.environ.get("BEDROCK_TOKENS_PER_MINUTE", "0")))
+    except ValueError:
+        BEDROCK_TOKENS_PER_MINUTE = 0
+    try:
+        BEDROCK_ADMISSION_TIMEOUT_SECONDS = max(1.0, float(os.environ.get("BEDROCK_ADMISSION_TIMEOUT_SECONDS", "60")))
+    except ValueError:
+        BEDROCK_ADMISSION_TIMEOUT_SECONDS = 60.0
+    # Model tiering: "primary=fallback" pairs. A routed call that fails (throttled,
+    # unavailable, admission timeout) retries once on the fallback tier, and a call
+    # still unanswered after its hedge delay races a second request against it.
+    BEDROCK_MODEL_TIERS = os.environ.get(
+        "BEDROCK_MODEL_TIERS",
+        f"{BEDROCK_CLAUDE_SONNET}={BEDROCK_NOVA_PRO},{BEDROCK_NOVA_PRO}={BEDROCK_MODEL_ID}",
+    )
+    # Hedging is opt-in: the fallback tier is a cheaper model, so a hedge that wins
+    # replaces the primary's reply with a lower-quality one.
+    BEDROCK_HEDGING_ENABLED: bool = os.environ.get("BEDROCK_HEDGING_ENABLED", "false").lower() in {"1", "true", "yes"}
+    # Latency budget (seconds) per priority class; the hedge delay is the observed p95 for
+    # the model and caller, capped by the budget. Callers with fewer than
+    # BEDROCK_HEDGE_MIN_SAMPLES observed calls, and classes left out, are never hedged.
+    # Phase generation opts in with e.g. "interactive=6,phase=20".
+    BEDROCK_HEDGE_BUDGETS = os.environ.get("BEDROCK_HEDGE_BUDGETS", "interactive=6")
+    try:
+        BEDROCK_HEDGE_MIN_SAMPLES = max(1, int(os.environ.get("BEDROCK_HEDGE_MIN_SAMPLES", "20")))
+    except ValueError:
+        BEDROCK_HEDGE_MIN_SAMPLES = 20
+    try:
+        BEDROCK_HEDGE_MAX_WORKERS = max(2, int(os.environ.get("BEDROCK_HEDGE_MAX_WORKERS", "32")))
+    except ValueError:
+        BEDROCK_HEDGE_MAX_WORKERS = 32
+    # Content-addressed LLM response cache (opt-in per call site via invoke_cached)
+    LLM_RESPONSE_CACHE_ENABLED: bool = os.environ.get("LLM_RESPONSE_CACHE_ENABLED", "true").lower() not in {"0", "false"}
+    LLM_RESPONSE_CACHE_PATH = os.environ.get(
+        "LLM_RESPONSE_CACHE_PATH", os.path.join(_BASE_DIR, "instance", "llm_response_cache.sqlite")
+    )
+    try:
+        LLM_RESPONSE_CACHE_TTL_SECONDS = max(0, int(os.environ.get("LLM_RESPONSE_CACHE_TTL_SECONDS", str(7 * 24 * 3600))))
+    except ValueError:
+        LLM_RESPONSE_CACHE_TTL_SECONDS = 7 * 24 * 3600
+    try:
+        LLM_RESPONSE_CACHE_MAX_ENTRIES = max(0, int(os.environ.get("LLM_RESPONSE_CACHE_MAX_ENTRIES", "2000")))
+    except ValueError:
+        LLM_RESPONSE_CACHE_MAX_ENTRIES = 2000
+    # Per-call LLM usage accounting (LLMUsageLog rows written in batches off the request path)
+    LLM_USAGE_LOG_ENABLED: bool = os.environ.get("LLM_USAGE_LOG_ENABLED", "true").lower() not in {"0", "false"}
+    try:
+        LLM_USAGE_LOG_BATCH_SIZE = max(1, int(os.environ.get("LLM_USAGE_LOG_BATCH_SIZE", "50")))
+    except ValueError:
+        LLM_USAGE_LOG_BATCH_SIZE = 50
+    try:
+        LLM_USAGE_LOG_FLUSH_SECONDS = max(0.1, float(os.environ.get("LLM_USAGE_LOG_FLUSH_SECONDS", "2")))
+    except ValueError:
+        LLM_USAGE_LOG_FLUSH_SECONDS = 2.0
+    try:
+        LLM_USAGE_LOG_QUEUE_SIZE = max(1, int(os.environ.get("LLM_USAGE_LOG_QUEUE_SIZE", "5000")))
+    except ValueError:
+        LLM_USAGE_LOG_QUEUE_SIZE = 5000
+    # Worker threads shared by phase pipelines that run independent LLM/render steps
+    # concurrently (app.utils.task_graph); 1 runs every pipeline sequentially.
+    try:
+        PIPELINE_MAX_WORKERS = max(1, int(os.environ.get("PIPELINE_MAX_WORKERS", "4")))
+    except ValueError:
+        PIPELINE_MAX_WORKERS = 4
+
+    # AWS backend: "aws" (live services), "record" (live, and every Bedrock chat
+    # response is saved under AWS_FAKE_RECORDINGS_DIR) or "fake" (no network:
+    # recordings are replayed, schema-valid phase JSON is synthesized otherwise,
+    # and Polly/Transcribe/AgentCore memory are served by local stand-ins).
+    AWS_BACKEND = os.environ.get("AWS_BACKEND", "aws").strip().lower()
+    AWS_FAKE_RECORDINGS_DIR = os.environ.get(
+        "AWS_FAKE_RECORDINGS_DIR", os.path.join(_BASE_DIR, "instance", "bedrock_recordings")
+    )
+    # Fake reply latency: "none", "recorded", "fixed:<ms>", "uniform:<min_ms>:<max_ms>"
+    # or "lognormal:<p50_ms>:<p95_ms>".
+    AWS_FAKE_LATENCY = os.environ.get("AWS_FAKE_LATENCY", "none")
+    try:
+        AWS_FAKE_SEED = int(os.environ.get("AWS_FAKE_SEED", "0"))
+    except ValueError:
+        AWS_FAKE_SEED = 0
 
     # Time awareness defaults
     DEFAULT_TIMEZONE = os.environ.get("DEFAULT_TIMEZONE", "America/Toronto")
@@ -100,6 +203,11 @@ class Config:
         HEARTBEAT_INTERVAL_SECONDS = max(10, int(os.environ.get("HEARTBEAT_INTERVAL_SECONDS", "60")))
     except ValueError:
         HEARTBEAT_INTERVAL_SECONDS = 60
+    try:
+        # Coarse cadence for periodic timer_sync broadcasts; clients count down locally between syncs
+        TIMER_SYNC_INTERVAL_SECONDS = max(1.0, float(os.environ.get("TIMER_SYNC_INTERVAL_SECONDS", "15")))
+    except ValueError:
+        TIMER_SYNC_INTERVAL_SECONDS = 15.0
     try:
         IDLE_THRESHOLD_MINUTES = max(1, int(os.environ.get("IDLE_THRESHOLD_MINUTES", "10")))
     except ValueError:
@@ -118,6 +226,11 @@ class Config:
         AGENTCORE_MEMORY_TIMEOUT_SECONDS = max(0.2, float(os.environ.get("AGENTCORE_MEMORY_TIMEOUT_SECONDS", "4.0")))
     except ValueError:
         AGENTCORE_MEMORY_TIMEOUT_SECONDS = 4.0
+    try:
+        # Short-lived cache of retrievals keyed by (workshop, user, thread, normalized query); 0 disables
+        AGENTCORE_MEMORY_CACHE_TTL_SECONDS = max(0.0, float(os.environ.get("AGENTCORE_MEMORY_CACHE_TTL_SECONDS", "60")))
+    except ValueError:
+        AGENTCORE_MEMORY_CACHE_TTL_SECONDS = 60.0
     AGENTCORE_MEMORY_NAMESPACE_TEMPLATES = os.environ.get("AGENTCORE_MEMORY_NAMESPACE_TEMPLATES", "")
     AGENTCORE_MEMORY_STORE_BACKGROUND = os.environ.get("AGENTCORE_MEMORY_STORE_BACKGROUND", "true").lower() == "true"
     AGENTCORE_MEMORY_DEBUG_LOG = os.environ.get("AGENTCORE_MEMORY_DEBUG_LOG", "false").lower() == "true"
@@ -192,6 +305,17 @@ class Config:
         TOOL_GATEWAY_CONTROL_TIMEOUT_SECONDS = max(0.1, float(os.environ.get("TOOL_CONTROL_TIMEOUT_SECONDS", str(TOOL_GATEWAY_TIMEOUT_SECONDS))))
     except ValueError:
         TOOL_GATEWAY_CONTROL_TIMEOUT_SECONDS = TOOL_GATEWAY_TIMEOUT_SECONDS
+    # Independent tool calls in one plan run concurrently. Tools matching these prefixes
+    # (or declaring ToolSchema.sequential) act as ordering barriers between them.
+    TOOL_GATEWAY_SEQUENTIAL_PREFIXES = tuple(
+        p.strip()
+        for p in os.environ.get("TOOL_SEQUENTIAL_PREFIXES", "workshop_control.").split(",")
+        if p.strip()
+    )
+    try:
+        TOOL_GATEWAY_PER_TOOL_MAX_CONCURRENCY = max(1, int(os.environ.get("TOOL_PER_TOOL_MAX_CONCURRENCY", "4")))
+    except ValueError:
+        TOOL_GATEWAY_PER_TOOL_MAX_CONCURRENCY = 4
 
     # Media and uploads
     # All profile photos must be stored under instance/uploads/photos
@@ -209,9 +333,121 @@ class Config:
     # Assistant Threads feature flag (Phase 1 server-side)
     ASSISTANT_THREADS_ENABLED: bool = os.environ.get("ASSISTANT_THREADS_ENABLED", "true").lower() not in {"0", "false"}
 
+    # Versioned ContextFabric snapshot cache (bounded staleness across worker processes)
+    try:
+        ASSISTANT_CONTEXT_CACHE_TTL_SECONDS = max(0.0, float(os.environ.get("ASSISTANT_CONTEXT_CACHE_TTL_SECONDS", "30")))
+    except ValueError:
+        ASSISTANT_CONTEXT_CACHE_TTL_SECONDS = 30.0
+    try:
+        ASSISTANT_CONTEXT_CACHE_MAX_WORKSHOPS = max(1, int(os.environ.get("ASSISTANT_CONTEXT_CACHE_MAX_WORKSHOPS", "256")))
+    except ValueError:
+        ASSISTANT_CONTEXT_CACHE_MAX_WORKSHOPS = 256
+
+    # Per-workshop room snapshots served on join_room, plus a bounded log of room events
+    # so reconnecting clients that send their last room version receive only the delta
+    ROOM_SNAPSHOT_ENABLED: bool = os.environ.get("ROOM_SNAPSHOT_ENABLED", "true").lower() not in {"0", "false"}
+    try:
+        ROOM_SNAPSHOT_TTL_SECONDS = max(0.0, float(os.environ.get("ROOM_SNAPSHOT_TTL_SECONDS", "30")))
+    except ValueError:
+        ROOM_SNAPSHOT_TTL_SECONDS = 30.0
+    try:
+        ROOM_DELTA_LOG_SIZE = max(0, int(os.environ.get("ROOM_DELTA_LOG_SIZE", "256")))
+    except ValueError:
+        ROOM_DELTA_LOG_SIZE = 256
+    try:
+        ROOM_SNAPSHOT_MAX_WORKSHOPS = max(1, int(os.environ.get("ROOM_SNAPSHOT_MAX_WORKSHOPS", "256")))
+    except ValueError:
+        ROOM_SNAPSHOT_MAX_WORKSHOPS = 256
+
+    # Join admission during reconnect storms: joins beyond these token buckets (global and
+    # per workshop, refilled per second) get a "syncing" reply with a jittered retry delay.
+    # Participants leave ROOM_JOIN_FACILITATOR_RESERVE of each burst for facilitators.
+    ROOM_JOIN_ADMISSION_ENABLED: bool = os.environ.get("ROOM_JOIN_ADMISSION_ENABLED", "true").lower() not in {"0", "false"}
+    try:
+        ROOM_JOIN_RATE_PER_SECOND = max(0.0, float(os.environ.get("ROOM_JOIN_RATE_PER_SECOND", "40")))
+    except ValueError:
+        ROOM_JOIN_RATE_PER_SECOND = 40.0
+    try:
+        ROOM_JOIN_BURST = max(1.0, float(os.environ.get("ROOM_JOIN_BURST", "80")))
+    except ValueError:
+        ROOM_JOIN_BURST = 80.0
+    try:
+        ROOM_JOIN_WORKSHOP_RATE_PER_SECOND = max(0.0, float(os.environ.get("ROOM_JOIN_WORKSHOP_RATE_PER_SECOND", "15")))
+    except ValueError:
+        ROOM_JOIN_WORKSHOP_RATE_PER_SECOND = 15.0
+    try:
+        ROOM_JOIN_WORKSHOP_BURST = max(1.0, float(os.environ.get("ROOM_JOIN_WORKSHOP_BURST", "30")))
+    except ValueError:
+        ROOM_JOIN_WORKSHOP_BURST = 30.0
+    try:
+        ROOM_JOIN_FACILITATOR_RESERVE = min(0.9, max(0.0, float(os.environ.get("ROOM_JOIN_FACILITATOR_RESERVE", "0.25"))))
+    except ValueError:
+        ROOM_JOIN_FACILITATOR_RESERVE = 0.25
+    try:
+        ROOM_JOIN_MAX_RETRY_SECONDS = max(1.0, float(os.environ.get("ROOM_JOIN_MAX_RETRY_SECONDS", "20")))
+    except ValueError:
+        ROOM_JOIN_MAX_RETRY_SECONDS = 20.0
+
+    # Dot votes decided against an in-memory tally of the active voting task; counts are
+    # broadcast every VOTE_BROADCAST_INTERVAL_MS and persisted in batches, with accepted votes
+    # journaled to VOTE_JOURNAL_DIR until committed (one Socket.IO worker per journal directory)
+    VOTE_TALLY_ENABLED: bool = os.environ.get("VOTE_TALLY_ENABLED", "true").lower() not in {"0", "false"}
+    try:
+        VOTE_BROADCAST_INTERVAL_MS = max(20, int(os.environ.get("VOTE_BROADCAST_INTERVAL_MS", "250")))
+    except ValueError:
+        VOTE_BROADCAST_INTERVAL_MS = 250
+    try:
+        VOTE_FLUSH_INTERVAL_SECONDS = max(0.0, float(os.environ.get("VOTE_FLUSH_INTERVAL_SECONDS", "1.0")))
+    except ValueError:
+        VOTE_FLUSH_INTERVAL_SECONDS = 1.0
+    VOTE_JOURNAL_DIR = os.environ.get("VOTE_JOURNAL_DIR", os.path.join(INSTANCE_DIR, "vote_journal"))
+    VOTE_JOURNAL_FSYNC: bool = os.environ.get("VOTE_JOURNAL_FSYNC", "false").lower() in {"1", "true"}
+
+    # High-frequency room emits (typing, timer, partial transcripts, vote counts, new ideas,
+    # presence deltas) are buffered per room for EMIT_BATCH_WINDOW_MS and sent as one frame
+    EMIT_BATCH_ENABLED: bool = os.environ.get("EMIT_BATCH_ENABLED", "true").lower() not in {"0", "false"}
+    try:
+        EMIT_BATCH_WINDOW_MS = max(0, int(os.environ.get("EMIT_BATCH_WINDOW_MS", "50")))
+    except ValueError:
+        EMIT_BATCH_WINDOW_MS = 50
+    try:
+        EMIT_BATCH_MAX_EVENTS = max(1, int(os.environ.get("EMIT_BATCH_MAX_EVENTS", "100")))
+    except ValueError:
+        EMIT_BATCH_MAX_EVENTS = 100
+
+    # Parsed BrainstormTask payloads kept in memory, keyed by (task_id, updated_at)
+    try:
+        PHASE_ARTIFACT_CACHE_MAX_ENTRIES = max(0, int(os.environ.get("PHASE_ARTIFACT_CACHE_MAX_ENTRIES", "512")))
+    except ValueError:
+        PHASE_ARTIFACT_CACHE_MAX_ENTRIES = 512
+
+    # Per-workspace chunk vector index (instance/vector_index, memory-mapped .npy files)
+    VECTOR_INDEX_ENABLED: bool = os.environ.get("VECTOR_INDEX_ENABLED", "true").lower() not in {"0", "false"}
+    VECTOR_INDEX_DIR = os.environ.get("VECTOR_INDEX_DIR", os.path.join(INSTANCE_DIR, "vector_index"))
+    try:
+        VECTOR_INDEX_MAX_WORKSPACES = max(1, int(os.environ.get("VECTOR_INDEX_MAX_WORKSPACES", "8")))
+    except ValueError:
+        VECTOR_INDEX_MAX_WORKSPACES = 8
+
     # Strict JSON-only outputs from Assistant (no heuristic fallbacks)
     ASSISTANT_STRICT_JSON: bool = os.environ.get("ASSISTANT_STRICT_JSON", "true").lower() not in {"0", "false"}
 
+    # Stream the compose call token-by-token to assistant:token (socket path only)
+    ASSISTANT_STREAMING_ENABLED: bool = os.environ.get("ASSISTANT_STREAMING_ENABLED", "true").lower() not in {"0", "false"}
+
+    # Token budgets for the workshop context and for tool outputs placed in assistant prompts
+    try:
+        ASSISTANT_CONTEXT_TOKEN_BUDGET = max(200, int(os.environ.get("ASSISTANT_CONTEXT_TOKEN_BUDGET", "1000")))
+    except ValueError:
+        ASSISTANT_CONTEXT_TOKEN_BUDGET = 1000
+    try:
+        ASSISTANT_TOOL_OUTPUT_TOKEN_BUDGET = max(200, int(os.environ.get("ASSISTANT_TOOL_OUTPUT_TOKEN_BUDGET", "3000")))
+    except ValueError:
+        ASSISTANT_TOOL_OUTPUT_TOKEN_BUDGET = 3000
+
+    # Use the planner's reply as the final answer when it requests no tools (skips the compose call)
+    ASSISTANT_SINGLE_CALL_FAST_PATH: bool = os.environ.get("ASSISTANT_SINGLE_CALL_FAST_PATH", "true").lower() not in {"0", "false"}
+
     # When enabled, the backend will not inject any proactive UI hints (e.g., "Open Feasibility Report" button).
     # All UI hints must come from the LLM response itself.
     ASSISTANT_UI_STRICT_LLM_ONLY: bool = os.environ.get("ASSISTANT_UI_STRICT_LLM_ONLY", "false").lower() in {"1", "true", "yes"}
@@ -9,7 +9,7 @@ from typing import Callable, Optional, Tuple
 
 from flask import current_app
 
-from app.extensions import db, socketio
+from app.extensions import db
 from app.models import Document, DocumentProcessingJob
 from app.document.service.pipeline import DocumentProcessingPipeline, PipelineResult
 
@@ -133,11 +133,13 @@ class DocumentJobScheduler:
 	# Socket events
 	# ------------------------------------------------------------------
 	def _emit_progress(self, document_id: int, *, stage: str, status: str) -> None:
+		from app.sockets_core.emit_batcher import emit_batcher
+
 		payload = {"documentId": document_id, "stage": stage, "status": status}
 		room = self._workspace_room(document_id)
 		if room:
-			socketio.emit("doc_processing_progress", payload, to=room)
-		socketio.emit("doc_processing_progress", payload)
+			emit_batcher.emit("doc_processing_progress", payload, room)
+		emit_batcher.emit("doc_processing_progress", payload)
 
 	def _emit_done(self, document_id: int, result: PipelineResult) -> None:
 		payload = {
@@ -149,10 +151,13 @@ class DocumentJobScheduler:
 			"summary": result.summary,
 			"totalPages": result.total_pages,
 		}
+		from app.sockets_core.emit_batcher import emit_batcher
+
 		room = self._workspace_room(document_id)
+		self._flush_progress(room)
 		if room:
-			socketio.emit("doc_processing_done", payload, to=room)
-		socketio.emit("doc_processing_done", payload)
+			emit_batcher.emit("doc_processing_done", payload, room)
+		emit_batcher.emit("doc_processing_done", payload)
 
 	def _emit_failed(self, document_id: int, error: str) -> None:
 		payload = {
@@ -160,10 +165,22 @@ class DocumentJobScheduler:
 			"status": "failed",
 			"error": error,
 		}
+		from app.sockets_core.emit_batcher import emit_batcher
+
 		room = self._workspace_room(document_id)
+		self._flush_progress(room)
+		if room:
+			emit_batcher.emit("doc_processing_failed", payload, room)
+		emit_batcher.emit("doc_processing_failed", payload)
+
+	@staticmethod
+	def _flush_progress(room: Optional[str]) -> None:
+		"""Send buffered progress for both targets, so neither copy lands after the final event."""
+		from app.sockets_core.emit_batcher import emit_batcher
+
 		if room:
-			socketio.emit("doc_processing_failed", payload, to=room)
-		socketio.emit("doc_processing_failed", payload)
+			emit_batcher.flush(room)
+		emit_batcher.flush(None)
 
 	def _workspace_room(self, document_id: int) -> Optional[str]:
 		document = db.session.get(Document, document_id)
@@ -9,7 +9,8 @@ from typing import Dict, Optional
 from flask import current_app
 
 from app.config import Config
-from app.utils.llm_bedrock import get_chat_llm, is_bedrock_configured
+from app.utils.llm_bedrock import PRIORITY_BACKGROUND, bedrock_priority, get_chat_llm, is_bedrock_configured
+from app.utils.llm_usage import llm_usage_context
 
 
 @dataclass(slots=True)
@@ -60,7 +61,9 @@ class DocumentLLMEnricher:
 
 		try:
 			llm = get_chat_llm({"temperature": self.temperature, "top_p": 0.9})
-			response = llm.invoke(prompt)
+			# Batch work: yields Bedrock capacity to the assistant and phase transitions.
+			with bedrock_priority(PRIORITY_BACKGROUND), llm_usage_context("document_enrichment"):
+				response = llm.invoke(prompt)
 			raw_text = self._extract_text(response)
 		except Exception as exc:  # pragma: no cover - upstream service error
 			current_app.logger.exception("Nova Lite enrichment failed: %s", exc)
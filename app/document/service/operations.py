@@ -16,6 +16,7 @@ from app.models import (
     DocumentProcessingLog,
     DocumentProcessingLogArchive,
 )
+from app.document.service.vector_index import vector_index_registry
 
 
 @dataclass(frozen=True)
@@ -117,6 +118,16 @@ def delete_document_tree(document: Document, *, actor_id: Optional[int]) -> Docu
         extra={"document_ids": document_ids, "workspace_ids": list(doc_workspace_map.values())},
     )
 
+    docs_by_workspace: dict[int, list[int]] = {}
+    for doc_id, workspace_id in doc_workspace_map.items():
+        docs_by_workspace.setdefault(workspace_id, []).append(doc_id)
+    for workspace_id, workspace_doc_ids in docs_by_workspace.items():
+        try:
+            vector_index_registry.remove_documents(workspace_id, workspace_doc_ids)
+        except Exception as exc:  # pragma: no cover - index is a derived cache
+            current_app.logger.warning("Vector index update failed for workspace %s: %s", workspace_id, exc)
+            vector_index_registry.invalidate(workspace_id)
+
     for path in document_file_paths:
         try:
             if path.exists():
@@ -23,6 +23,7 @@ from .extractors import ExtractionError, ExtractionResult, extract_content
 from .llm_enrichment import LLMEnrichmentResult, enrich_document
 from .normalizer import NormalizationResult, normalize_text
 from .tts_reader import TTSScriptManager, TTSOptions, get_manager
+from .vector_index import vector_index_registry
 
 
 @dataclass(slots=True)
@@ -197,6 +198,7 @@ class DocumentProcessingPipeline:
 			# Replace chunks
 			Chunk.query.filter(Chunk.document_id == document.id).delete(synchronize_session=False)
 			db.session.flush()
+			chunks: list[Chunk] = []
 			for payload, vector in zip(chunk_payloads, embeddings):
 				chunk = Chunk()
 				chunk.document_id = document.id
@@ -204,6 +206,11 @@ class DocumentProcessingPipeline:
 				chunk.meta_data = payload.metadata
 				chunk.vector = vector
 				db.session.add(chunk)
+				chunks.append(chunk)
+			db.session.flush()
+			# Captured before the stage commit expires the ORM objects.
+			workspace_id = document.workspace_id
+			indexed_ids = [chunk.id for chunk in chunks]
 
 			# Persist TTS script and optional audio
 			self.context.tts_manager.save_script(document, enrichment.tts_script)
@@ -217,7 +224,7 @@ class DocumentProcessingPipeline:
 			if extraction.total_pages is not None:
 				log.total_pages = extraction.total_pages
 
-			return PipelineResult(
+			result = PipelineResult(
 				document_id=document.id,
 				chunk_count=len(chunk_payloads),
 				total_pages=extraction.total_pages,
@@ -226,6 +233,23 @@ class DocumentProcessingPipeline:
 				summary=document.summary or "",
 			)
 
+		self._update_vector_index(workspace_id, result.document_id, indexed_ids, embeddings)
+		return result
+
+	def _update_vector_index(
+		self,
+		workspace_id: int,
+		document_id: int,
+		chunk_ids: list[int],
+		embeddings: list[list[float]],
+	) -> None:
+		# The chunks are already committed; an index failure must not fail the document.
+		try:
+			vector_index_registry.replace_document(workspace_id, document_id, chunk_ids, embeddings)
+		except Exception as exc:  # pragma: no cover - index is a derived cache
+			current_app.logger.warning("Vector index update failed for doc %s: %s", document_id, exc)
+			vector_index_registry.invalidate(workspace_id)
+
 	# ------------------------------------------------------------------
 	# Stage helper
 	# ------------------------------------------------------------------
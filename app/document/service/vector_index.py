@@ -0,0 +1,545 @@
+"""Per-workspace vector index over ``document_chunks`` for semantic retrieval."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import func
+
+from app.extensions import db
+from app.models import Chunk, Document, WorkshopDocument
+
+from .embedder import DummyEmbedder, EmbeddingError, EmbeddingProvider, get_default_embedder
+
+VECTOR_DIM = 384
+# Rows scored per matrix-vector product; bounds scratch memory on large indexes.
+_BLOCK_ROWS = 65536
+_BUILD_BATCH = 2000
+# How long a loaded index is trusted before its source fingerprint is re-checked.
+_SOURCE_CHECK_SECONDS = 5.0
+_FORMAT_VERSION = 1
+
+# (chunk count, max chunk id, sum of document versions) for a workspace.
+SourceState = Tuple[int, int, int]
+
+
+@dataclass(slots=True, frozen=True)
+class ChunkHit:
+	chunk_id: int
+	document_id: int
+	score: float
+
+
+def _to_rows(vectors: Sequence[Any], dim: int = VECTOR_DIM) -> Tuple[np.ndarray, np.ndarray]:
+	"""Stack raw vectors into L2-normalised float32 rows.
+
+	Returns the matrix and a boolean mask of which inputs were kept; vectors of the
+	wrong size and all-zero vectors (``DummyEmbedder``) are dropped.
+	"""
+	keep = np.zeros(len(vectors), dtype=bool)
+	rows: List[np.ndarray] = []
+	for i, raw in enumerate(vectors):
+		if raw is None:
+			continue
+		vec = np.asarray(raw, dtype=np.float32).reshape(-1)
+		if vec.shape[0] != dim:
+			continue
+		norm = float(np.linalg.norm(vec))
+		if not norm or not np.isfinite(norm):
+			continue
+		rows.append(vec / norm)
+		keep[i] = True
+	if not rows:
+		return np.empty((0, dim), dtype=np.float32), keep
+	return np.vstack(rows).astype(np.float32, copy=False), keep
+
+
+def _source_state(workspace_id: int) -> SourceState:
+	count, max_id = (
+		db.session.query(func.count(Chunk.id), func.max(Chunk.id))
+		.join(Document, Chunk.document_id == Document.id)
+		.filter(Document.workspace_id == workspace_id, Chunk.vector.isnot(None))
+		.one()
+	)
+	versions = (
+		db.session.query(func.coalesce(func.sum(Document.version), 0))
+		.filter(Document.workspace_id == workspace_id)
+		.scalar()
+	)
+	return int(count or 0), int(max_id or 0), int(versions or 0)
+
+
+class WorkspaceVectorIndex:
+	"""Brute-force cosine index for the chunks of one workspace.
+
+	Rows are normalised float32 vectors, so a query is a matrix-vector product over
+	the candidate rows; ``chunk_ids`` and ``document_ids`` are parallel int64 arrays.
+	Arrays loaded from disk are memory-mapped read-only. Updates build new arrays and
+	swap them in as one tuple, so concurrent searches always see a consistent view.
+	"""
+
+	def __init__(
+		self,
+		workspace_id: int,
+		vectors: np.ndarray,
+		chunk_ids: np.ndarray,
+		document_ids: np.ndarray,
+		*,
+		source: SourceState = (0, 0, 0),
+	) -> None:
+		self.workspace_id = workspace_id
+		self._data = (vectors, chunk_ids, document_ids)
+		self.source = source
+		self.checked_at = time.monotonic()
+		self._lock = threading.Lock()
+
+	def __len__(self) -> int:
+		return int(self._data[1].shape[0])
+
+	@property
+	def dim(self) -> int:
+		return int(self._data[0].shape[1]) if self._data[0].ndim == 2 else VECTOR_DIM
+
+	# ------------------------------------------------------------------
+	# Query
+	# ------------------------------------------------------------------
+	def search(
+		self,
+		query: Sequence[float],
+		*,
+		top_k: int = 5,
+		document_ids: Optional[Iterable[int]] = None,
+	) -> List[ChunkHit]:
+		vectors, chunk_ids, doc_ids = self._data
+		total = int(chunk_ids.shape[0])
+		if total == 0 or top_k <= 0:
+			return []
+		q = np.asarray(query, dtype=np.float32).reshape(-1)
+		if q.shape[0] != vectors.shape[1]:
+			return []
+		norm = float(np.linalg.norm(q))
+		if not norm:
+			return []
+		q = q / norm
+
+		candidates: Optional[np.ndarray] = None
+		if document_ids is not None:
+			wanted = np.fromiter((int(d) for d in document_ids), dtype=np.int64)
+			candidates = np.flatnonzero(np.isin(doc_ids, wanted))
+			if candidates.size == 0:
+				return []
+		size = total if candidates is None else int(candidates.size)
+
+		best_rows: List[np.ndarray] = []
+		best_scores: List[np.ndarray] = []
+		for start in range(0, size, _BLOCK_ROWS):
+			stop = min(size, start + _BLOCK_ROWS)
+			if candidates is None:
+				rows = np.arange(start, stop)
+				scores = vectors[start:stop] @ q
+			else:
+				rows = candidates[start:stop]
+				scores = vectors[rows] @ q
+			k = min(top_k, scores.shape[0])
+			if k < scores.shape[0]:
+				part = np.argpartition(-scores, k - 1)[:k]
+				rows, scores = rows[part], scores[part]
+			best_rows.append(rows)
+			best_scores.append(scores)
+
+		rows = np.concatenate(best_rows)
+		scores = np.concatenate(best_scores)
+		order = np.argsort(-scores, kind="stable")[:top_k]
+		return [
+			ChunkHit(chunk_id=int(chunk_ids[r]), document_id=int(doc_ids[r]), score=float(scores[i]))
+			for i, r in ((i, rows[i]) for i in order)
+		]
+
+	# ------------------------------------------------------------------
+	# Incremental updates
+	# ------------------------------------------------------------------
+	def replace_document(self, document_id: int, chunk_ids: Sequence[int], vectors: Sequence[Any]) -> None:
+		new_rows, keep = _to_rows(vectors, self.dim)
+		new_ids = np.asarray(chunk_ids, dtype=np.int64)[keep]
+		with self._lock:
+			old_vectors, old_chunk_ids, old_doc_ids = self._data
+			retained = old_doc_ids != document_id
+			self._data = (
+				np.concatenate([np.asarray(old_vectors[retained]), new_rows]),
+				np.concatenate([np.asarray(old_chunk_ids[retained]), new_ids]),
+				np.concatenate(
+					[np.asarray(old_doc_ids[retained]), np.full(new_ids.shape[0], document_id, dtype=np.int64)]
+				),
+			)
+
+	def remove_documents(self, document_ids: Iterable[int]) -> None:
+		wanted = np.fromiter((int(d) for d in document_ids), dtype=np.int64)
+		with self._lock:
+			vectors, chunk_ids, doc_ids = self._data
+			retained = ~np.isin(doc_ids, wanted)
+			if retained.all():
+				return
+			self._data = (
+				np.asarray(vectors[retained]),
+				np.asarray(chunk_ids[retained]),
+				np.asarray(doc_ids[retained]),
+			)
+
+	# ------------------------------------------------------------------
+	# Build / persistence
+	# ------------------------------------------------------------------
+	@classmethod
+	def build(cls, workspace_id: int, source: Optional[SourceState] = None) -> "WorkspaceVectorIndex":
+		source = source or _source_state(workspace_id)
+		query = (
+			db.session.query(Chunk.id, Chunk.document_id, Chunk.vector)
+			.join(Document, Chunk.document_id == Document.id)
+			.filter(Document.workspace_id == workspace_id, Chunk.vector.isnot(None))
+			.order_by(Chunk.id)
+			.execution_options(yield_per=_BUILD_BATCH)
+		)
+		matrices: List[np.ndarray] = []
+		chunk_ids: List[np.ndarray] = []
+		doc_ids: List[np.ndarray] = []
+
+		def flush(batch: List[Any]) -> None:
+			rows, keep = _to_rows([row.vector for row in batch])
+			matrices.append(rows)
+			chunk_ids.append(np.asarray([row.id for row in batch], dtype=np.int64)[keep])
+			doc_ids.append(np.asarray([row.document_id for row in batch], dtype=np.int64)[keep])
+
+		batch: List[Any] = []
+		for row in query:
+			batch.append(row)
+			if len(batch) >= _BUILD_BATCH:
+				flush(batch)
+				batch = []
+		if batch:
+			flush(batch)
+
+		if not matrices:
+			return cls(
+				workspace_id,
+				np.empty((0, VECTOR_DIM), dtype=np.float32),
+				np.empty(0, dtype=np.int64),
+				np.empty(0, dtype=np.int64),
+				source=source,
+			)
+		return cls(
+			workspace_id,
+			np.concatenate(matrices),
+			np.concatenate(chunk_ids),
+			np.concatenate(doc_ids),
+			source=source,
+		)
+
+	def save(self, directory: Path) -> None:
+		"""Write the arrays, then the manifest; readers only trust a matching manifest."""
+		directory.mkdir(parents=True, exist_ok=True)
+		vectors, chunk_ids, doc_ids = self._data
+		for name, array in (("vectors", vectors), ("chunk_ids", chunk_ids), ("document_ids", doc_ids)):
+			tmp = directory / f"{name}.npy.tmp"
+			with open(tmp, "wb") as fh:
+				np.save(fh, np.ascontiguousarray(array))
+			os.replace(tmp, directory / f"{name}.npy")
+		manifest = {
+			"format": _FORMAT_VERSION,
+			"workspace_id": self.workspace_id,
+			"rows": len(self),
+			"dim": self.dim,
+			"source": list(self.source),
+		}
+		tmp = directory / "manifest.json.tmp"
+		tmp.write_text(json.dumps(manifest), encoding="utf-8")
+		os.replace(tmp, directory / "manifest.json")
+
+	@classmethod
+	def load(cls, directory: Path, workspace_id: int) -> Optional["WorkspaceVectorIndex"]:
+		try:
+			manifest = json.loads((directory / "manifest.json").read_text(encoding="utf-8"))
+			if manifest.get("format") != _FORMAT_VERSION:
+				return None
+			vectors = np.load(directory / "vectors.npy", mmap_mode="r")
+			chunk_ids = np.load(directory / "chunk_ids.npy", mmap_mode="r")
+			doc_ids = np.load(directory / "document_ids.npy", mmap_mode="r")
+		except (OSError, ValueError):
+			return None
+		rows = int(manifest.get("rows", -1))
+		if vectors.ndim != 2 or not (vectors.shape[0] == chunk_ids.shape[0] == doc_ids.shape[0] == rows):
+			return None
+		source = tuple(int(v) for v in manifest.get("source", ()))
+		if len(source) != 3:
+			return None
+		return cls(workspace_id, vectors, chunk_ids, doc_ids, source=source)  # type: ignore[arg-type]
+
+
+class VectorIndexRegistry:
+	"""Process-wide LRU of loaded workspace indexes.
+
+	An index is loaded from ``VECTOR_INDEX_DIR`` (or built from ``document_chunks``)
+	on first use. Its source fingerprint is re-checked against the database at most
+	every few seconds so writes from other processes trigger a rebuild; writes made
+	through the document pipeline are applied incrementally instead.
+	"""
+
+	def __init__(self) -> None:
+		self._lock = threading.Lock()
+		self._indexes: "OrderedDict[int, WorkspaceVectorIndex]" = OrderedDict()
+		self._build_locks: Dict[int, threading.Lock] = {}
+
+	@staticmethod
+	def enabled() -> bool:
+		return bool(current_app.config.get("VECTOR_INDEX_ENABLED", True))
+
+	@staticmethod
+	def _directory(workspace_id: int) -> Path:
+		base = current_app.config.get("VECTOR_INDEX_DIR") or os.path.join(current_app.instance_path, "vector_index")
+		return Path(base) / f"workspace_{int(workspace_id)}"
+
+	def _build_lock(self, workspace_id: int) -> threading.Lock:
+		with self._lock:
+			return self._build_locks.setdefault(workspace_id, threading.Lock())
+
+	def _remember(self, index: WorkspaceVectorIndex) -> None:
+		max_workspaces = int(current_app.config.get("VECTOR_INDEX_MAX_WORKSPACES", 8))
+		with self._lock:
+			self._indexes[index.workspace_id] = index
+			self._indexes.move_to_end(index.workspace_id)
+			while len(self._indexes) > max(1, max_workspaces):
+				self._indexes.popitem(last=False)
+
+	def _save(self, index: WorkspaceVectorIndex) -> None:
+		try:
+			index.save(self._directory(index.workspace_id))
+		except OSError as exc:
+			current_app.logger.warning("Vector index save failed for workspace %s: %s", index.workspace_id, exc)
+
+	def get(self, workspace_id: int) -> Optional[WorkspaceVectorIndex]:
+		if not self.enabled():
+			return None
+		with self._lock:
+			index = self._indexes.get(workspace_id)
+			if index is not None:
+				self._indexes.move_to_end(workspace_id)
+		if index is not None and time.monotonic() - index.checked_at < _SOURCE_CHECK_SECONDS:
+			return index
+
+		source = _source_state(workspace_id)
+		if index is not None and index.source == source:
+			index.checked_at = time.monotonic()
+			return index
+
+		with self._build_lock(workspace_id):
+			with self._lock:
+				current = self._indexes.get(workspace_id)
+			if current is not None and current is not index and current.source == source:
+				return current
+			loaded = WorkspaceVectorIndex.load(self._directory(workspace_id), workspace_id)
+			if loaded is not None and loaded.source == source:
+				index = loaded
+			else:
+				started = time.perf_counter()
+				index = WorkspaceVectorIndex.build(workspace_id, source)
+				current_app.logger.info(
+					"Vector index built",
+					extra={
+						"workspace_id": workspace_id,
+						"rows": len(index),
+						"duration_ms": int((time.perf_counter() - started) * 1000),
+					},
+				)
+				self._save(index)
+			self._remember(index)
+			return index
+
+	def _loaded_or_persisted(self, workspace_id: int) -> Optional[WorkspaceVectorIndex]:
+		with self._lock:
+			index = self._indexes.get(workspace_id)
+		if index is None:
+			index = WorkspaceVectorIndex.load(self._directory(workspace_id), workspace_id)
+		return index
+
+	def replace_document(
+		self,
+		workspace_id: int,
+		document_id: int,
+		chunk_ids: Sequence[int],
+		vectors: Sequence[Any],
+	) -> None:
+		"""Swap a document's rows after its chunks were committed.
+
+		Workspaces that were never indexed are left alone; they are built on first search.
+		"""
+		if not self.enabled():
+			return
+		with self._build_lock(workspace_id):
+			index = self._loaded_or_persisted(workspace_id)
+			if index is None:
+				return
+			index.replace_document(document_id, chunk_ids, vectors)
+			index.source = _source_state(workspace_id)
+			index.checked_at = time.monotonic()
+			self._save(index)
+			self._remember(index)
+
+	def remove_documents(self, workspace_id: int, document_ids: Iterable[int]) -> None:
+		if not self.enabled():
+			return
+		with self._build_lock(workspace_id):
+			index = self._loaded_or_persisted(workspace_id)
+			if index is None:
+				return
+			index.remove_documents(document_ids)
+			index.source = _source_state(workspace_id)
+			index.checked_at = time.monotonic()
+			self._save(index)
+			self._remember(index)
+
+	def invalidate(self, workspace_id: int) -> None:
+		"""Forget a workspace index; the next search rebuilds it from the database."""
+		with self._lock:
+			self._indexes.pop(workspace_id, None)
+		try:
+			(self._directory(workspace_id) / "manifest.json").unlink()
+		except FileNotFoundError:
+			pass
+		except OSError as exc:
+			current_app.logger.warning("Vector index invalidate failed for workspace %s: %s", workspace_id, exc)
+
+	def clear(self) -> None:
+		with self._lock:
+			self._indexes.clear()
+
+
+vector_index_registry = VectorIndexRegistry()
+
+
+def _search_scopes(
+	*,
+	workspace_id: Optional[int],
+	workshop_id: Optional[int],
+	document_ids: Optional[Iterable[int]],
+) -> Dict[int, Optional[set[int]]]:
+	"""Map workspace id -> allowed document ids (None meaning the whole workspace)."""
+	doc_filter = {int(d) for d in document_ids} if document_ids is not None else None
+	if workshop_id is not None:
+		rows = (
+			db.session.query(Document.id, Document.workspace_id)
+			.join(WorkshopDocument, WorkshopDocument.document_id == Document.id)
+			.filter(WorkshopDocument.workshop_id == workshop_id)
+			.all()
+		)
+		scopes: Dict[int, Optional[set[int]]] = {}
+		for doc_id, ws_id in rows:
+			if doc_filter is not None and doc_id not in doc_filter:
+				continue
+			if workspace_id is not None and ws_id != workspace_id:
+				continue
+			scopes.setdefault(ws_id, set()).add(doc_id)  # type: ignore[union-attr]
+		return scopes
+	if workspace_id is not None:
+		return {workspace_id: doc_filter}
+	if doc_filter:
+		scopes = {}
+		for doc_id, ws_id in db.session.query(Document.id, Document.workspace_id).filter(Document.id.in_(doc_filter)):
+			scopes.setdefault(ws_id, set()).add(doc_id)  # type: ignore[union-attr]
+		return scopes
+	return {}
+
+
+def search_chunks(
+	query_vector: Sequence[float],
+	*,
+	workspace_id: Optional[int] = None,
+	workshop_id: Optional[int] = None,
+	document_ids: Optional[Iterable[int]] = None,
+	top_k: int = 5,
+) -> List[ChunkHit]:
+	"""Top-k chunks by cosine similarity within a workspace, workshop, or document set."""
+	hits: List[ChunkHit] = []
+	for ws_id, allowed in _search_scopes(
+		workspace_id=workspace_id, workshop_id=workshop_id, document_ids=document_ids
+	).items():
+		index = vector_index_registry.get(ws_id)
+		if index is None:
+			continue
+		hits.extend(index.search(query_vector, top_k=top_k, document_ids=allowed))
+	hits.sort(key=lambda h: h.score, reverse=True)
+	return hits[:top_k]
+
+
+def semantic_search(
+	query: str,
+	*,
+	workspace_id: Optional[int] = None,
+	workshop_id: Optional[int] = None,
+	document_ids: Optional[Iterable[int]] = None,
+	top_k: int = 5,
+	embedder: Optional[EmbeddingProvider] = None,
+) -> List[Dict[str, Any]]:
+	"""Embed ``query`` and return the best matching chunks with their content.
+
+	Returns an empty list when the index is disabled or no real embedder is available.
+	"""
+	if not (query or "").strip() or not vector_index_registry.enabled():
+		return []
+	embedder = embedder or get_default_embedder()
+	if isinstance(embedder, DummyEmbedder):
+		return []
+	try:
+		vectors = embedder.embed([query])
+	except EmbeddingError as exc:
+		current_app.logger.debug("Semantic search unavailable: %s", exc)
+		return []
+	if not vectors:
+		return []
+
+	hits = search_chunks(
+		vectors[0],
+		workspace_id=workspace_id,
+		workshop_id=workshop_id,
+		document_ids=document_ids,
+		top_k=top_k,
+	)
+	if not hits:
+		return []
+	rows = {
+		row.id: row
+		for row in db.session.query(Chunk.id, Chunk.content, Chunk.meta_data).filter(
+			Chunk.id.in_([h.chunk_id for h in hits])
+		)
+	}
+	out: List[Dict[str, Any]] = []
+	for hit in hits:
+		row = rows.get(hit.chunk_id)
+		if row is None:  # deleted since the index was last refreshed
+			continue
+		out.append(
+			{
+				"chunk_id": hit.chunk_id,
+				"document_id": hit.document_id,
+				"score": round(hit.score, 4),
+				"content": row.content,
+				"metadata": row.meta_data or {},
+			}
+		)
+	return out
+
+
+__all__ = [
+	"ChunkHit",
+	"WorkspaceVectorIndex",
+	"VectorIndexRegistry",
+	"vector_index_registry",
+	"search_chunks",
+	"semantic_search",
+]
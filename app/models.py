@@ -971,6 +971,14 @@ class LLMUsageLog(db.Model):
     token_usage = db.Column(db.String(64), nullable=True)     # provider-specific usage info (text)
     latency_ms = db.Column(db.Integer, nullable=True)
 
+    # Per-call accounting written by the Bedrock chat wrapper
+    caller = db.Column(db.String(64), nullable=True, index=True)  # e.g., 'clustering', 'assistant.compose'
+    prompt_tokens = db.Column(db.Integer, nullable=True)
+    completion_tokens = db.Column(db.Integer, nullable=True)
+    retries = db.Column(db.Integer, nullable=True)
+    throttles = db.Column(db.Integer, nullable=True)
+    status = db.Column(db.String(16), nullable=True)  # 'ok' / 'error'
+
     # Optional user feedback on the generated output
     feedback_vote = db.Column(db.Integer, nullable=True)      # +1 / 0 / -1
     feedback_comment = db.Column(db.Text, nullable=True)
@@ -992,6 +1000,12 @@ class LLMUsageLog(db.Model):
             'response_size': self.response_size,
             'token_usage': self.token_usage,
             'latency_ms': self.latency_ms,
+            'caller': self.caller,
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'retries': self.retries,
+            'throttles': self.throttles,
+            'status': self.status,
             'feedback_vote': self.feedback_vote,
             'feedback_comment': self.feedback_comment,
             'created_timestamp': self.created_timestamp.isoformat() if self.created_timestamp else None,
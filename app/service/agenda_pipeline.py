@@ -19,6 +19,7 @@ from app.models import Document, LLMUsageLog, Workshop, WorkshopAgenda, Workshop
 from app.utils.data_aggregation import aggregate_pre_workshop_data
 from app.utils.json_utils import extract_json_block
 from app.utils.llm_bedrock import get_chat_llm
+from app.utils.llm_usage import llm_usage_context
 from app.utils.context_models import WorkspaceContextBundle
 from sqlalchemy.orm import joinedload
 
@@ -844,19 +845,20 @@ Planned Duration (minutes): {planned_duration}
 
     # --- Invoke LLM (simple) ---------------------------------------------------
     start_ts = time.perf_counter()
-    if isinstance(llm, Runnable):
-        chain = prompt | llm
-        raw = chain.invoke(inputs)
-    else:
-        prompt_value = prompt.invoke(inputs)
-        if hasattr(llm, "invoke"):
-            raw = llm.invoke(prompt_value)
-        elif callable(llm):
-            raw = llm(prompt_value)
+    with llm_usage_context("agenda_pipeline", workshop_id=workshop.id):
+        if isinstance(llm, Runnable):
+            chain = prompt | llm
+            raw = chain.invoke(inputs)
         else:
-            raise TypeError(
-                "LLM client must be a LangChain Runnable, callable, or expose invoke()"
-            )
+            prompt_value = prompt.invoke(inputs)
+            if hasattr(llm, "invoke"):
+                raw = llm.invoke(prompt_value)
+            elif callable(llm):
+                raw = llm(prompt_value)
+            else:
+                raise TypeError(
+                    "LLM client must be a LangChain Runnable, callable, or expose invoke()"
+                )
     print(f"\n\n\n\n\n\n[Agenda Pipeline] LLM raw response: {raw}\n\n\n\n\n\n")
     
     
@@ -904,12 +906,14 @@ Planned Duration (minutes): {planned_duration}
         agenda_draft,
     )
 
-    _record_usage_log(
-        workshop_id=workshop.id,
-        prompt_chars=len(template) + sum(len(str(v)) for v in inputs.values()),
-        response_chars=len(text),
-        latency_ms=latency_ms,
-    )
+    if llm_client is not None:
+        # The default Bedrock client records its own usage row; only custom clients need one here.
+        _record_usage_log(
+            workshop_id=workshop.id,
+            prompt_chars=len(template) + sum(len(str(v)) for v in inputs.values()),
+            response_chars=len(text),
+            latency_ms=latency_ms,
+        )
 
     return AgendaPipelineResult(
         agenda_json=agenda_json_str,
@@ -5,7 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, Literal
 
-from langchain_core.prompts import PromptTemplate
+from app.utils.prompt_registry import RegisteredPrompt, register_prompt
 
 Mode = Literal["initial", "devil_advocate", "mediator", "scribe"]
 
@@ -141,6 +141,8 @@ Action Items:
 {action_items_json}
 """.strip()
 
+DISCUSSION_PROMPT = register_prompt("discussion", _DISCUSSION_TEMPLATE)
+
 
 def get_mode_contract(mode: Mode) -> ModeContract:
     """Return the prompt contract for a given discussion mode."""
@@ -149,9 +151,9 @@ def get_mode_contract(mode: Mode) -> ModeContract:
     return _MODE_CONTRACTS[mode]
 
 
-def build_prompt_template() -> PromptTemplate:
+def build_prompt_template() -> RegisteredPrompt:
     """Return the compiled prompt template shared across discussion modes."""
-    return PromptTemplate.from_template(_DISCUSSION_TEMPLATE)
+    return DISCUSSION_PROMPT
 
 
-__all__ = ["Mode", "ModeContract", "get_mode_contract", "build_prompt_template"]
+__all__ = ["Mode", "ModeContract", "DISCUSSION_PROMPT", "get_mode_contract", "build_prompt_template"]
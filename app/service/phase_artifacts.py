@@ -0,0 +1,217 @@
+"""Latest phase artifacts (BrainstormTask payloads) per workshop.
+
+Every phase route, the report page and the assistant need "the newest task of
+type X for this workshop, with its payload parsed". This module answers that for
+any number of task types with one windowed query, and parses each payload once
+per change: parsed payloads are kept in an LRU keyed by ``(task_id, updated_at)``
+so unchanged rows are never re-read or re-parsed.
+
+Parsed payloads are shared between callers and must be treated as read-only.
+"""
+from __future__ import annotations
+
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import func
+
+from app.extensions import db
+from app.models import BrainstormTask
+
+
+@dataclass(frozen=True)
+class PhaseArtifact:
+    task_id: int
+    task_type: str
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    payload: Any = None  # parsed ``payload_json``; None when empty or invalid
+    raw_payload: Optional[str] = None  # kept only when ``payload_json`` is not valid JSON
+    legacy_payload: Any = None  # parsed ``prompt`` for rows predating ``payload_json``
+
+    @property
+    def payload_dict(self) -> Optional[Dict[str, Any]]:
+        return self.payload if isinstance(self.payload, dict) else None
+
+
+@dataclass(frozen=True)
+class _Parsed:
+    payload: Any
+    raw_payload: Optional[str]
+    legacy_payload: Any
+
+
+def _parse(text: Optional[str]) -> Tuple[Any, bool]:
+    if not text:
+        return None, True
+    try:
+        return json.loads(text), True
+    except Exception:
+        return None, False
+
+
+def _parse_row(payload_json: Optional[str], prompt: Optional[str]) -> _Parsed:
+    payload, ok = _parse(payload_json)
+    legacy = None
+    if not payload_json and prompt:
+        legacy, _ = _parse(prompt)
+    return _Parsed(payload=payload, raw_payload=None if ok else payload_json, legacy_payload=legacy)
+
+
+class ParsedPayloadCache:
+    """Thread-safe LRU of parsed payloads keyed by ``(task_id, updated_at)``."""
+
+    def __init__(self, max_entries: int = 512):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[int, datetime], _Parsed]" = OrderedDict()
+        self._default_max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def _max_entries(self) -> int:
+        if has_app_context():
+            try:
+                return int(current_app.config.get("PHASE_ARTIFACT_CACHE_MAX_ENTRIES", self._default_max_entries))
+            except (TypeError, ValueError):
+                pass
+        return self._default_max_entries
+
+    def get(self, key: Tuple[int, Optional[datetime]]) -> Optional[_Parsed]:
+        if key[1] is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)  # type: ignore[arg-type]
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)  # type: ignore[arg-type]
+            self.hits += 1
+            return entry
+
+    def put(self, key: Tuple[int, Optional[datetime]], value: _Parsed) -> None:
+        # Rows without updated_at cannot be told apart across edits; never cache them.
+        if key[1] is None:
+            return
+        max_entries = self._max_entries()
+        if max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value  # type: ignore[index]
+            self._entries.move_to_end(key)  # type: ignore[arg-type]
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+parsed_payload_cache = ParsedPayloadCache()
+
+
+def latest_phase_artifacts(
+    workshop_id: int,
+    task_types: Optional[Iterable[str]] = None,
+) -> Dict[str, PhaseArtifact]:
+    """Return the newest task per ``task_type`` for a workshop, payloads parsed.
+
+    One query ranks the workshop's tasks per type (``created_at`` desc, ``id``
+    desc); payload columns are only fetched for rows missing from the parse cache.
+    """
+    types: Optional[List[str]] = None
+    if task_types is not None:
+        types = sorted({t for t in task_types if t})
+        if not types:
+            return {}
+
+    ranked = db.session.query(
+        BrainstormTask.id.label("id"),
+        BrainstormTask.task_type.label("task_type"),
+        BrainstormTask.created_at.label("created_at"),
+        BrainstormTask.updated_at.label("updated_at"),
+        func.row_number()
+        .over(
+            partition_by=BrainstormTask.task_type,
+            order_by=(BrainstormTask.created_at.desc(), BrainstormTask.id.desc()),
+        )
+        .label("rn"),
+    ).filter(BrainstormTask.workshop_id == workshop_id)
+    if types is not None:
+        ranked = ranked.filter(BrainstormTask.task_type.in_(types))
+    sub = ranked.subquery()
+    rows = (
+        db.session.query(sub.c.id, sub.c.task_type, sub.c.created_at, sub.c.updated_at)
+        .filter(sub.c.rn == 1)
+        .all()
+    )
+
+    parsed: Dict[int, _Parsed] = {}
+    missing: List[int] = []
+    for row in rows:
+        hit = parsed_payload_cache.get((row.id, row.updated_at))
+        if hit is None:
+            missing.append(row.id)
+        else:
+            parsed[row.id] = hit
+    if missing:
+        updated = {row.id: row.updated_at for row in rows}
+        payload_rows = (
+            db.session.query(BrainstormTask.id, BrainstormTask.payload_json, BrainstormTask.prompt)
+            .filter(BrainstormTask.id.in_(missing))
+            .all()
+        )
+        for task_id, payload_json, prompt in payload_rows:
+            value = _parse_row(payload_json, prompt)
+            parsed_payload_cache.put((task_id, updated.get(task_id)), value)
+            parsed[task_id] = value
+
+    out: Dict[str, PhaseArtifact] = {}
+    for row in rows:
+        value = parsed.get(row.id) or _Parsed(None, None, None)
+        out[row.task_type] = PhaseArtifact(
+            task_id=row.id,
+            task_type=row.task_type,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            payload=value.payload,
+            raw_payload=value.raw_payload,
+            legacy_payload=value.legacy_payload,
+        )
+    return out
+
+
+def latest_phase_artifact(workshop_id: int, task_types: Iterable[str]) -> Optional[PhaseArtifact]:
+    """Newest task across ``task_types`` (same ordering as ``created_at desc``)."""
+    artifacts = latest_phase_artifacts(workshop_id, task_types)
+    if not artifacts:
+        return None
+    return max(
+        artifacts.values(),
+        # NULL created_at sorts last under DESC in SQLite; mirror that here.
+        key=lambda a: (a.created_at is not None, a.created_at or datetime.min, a.task_id),
+    )
+
+
+def latest_phase_payload(workshop_id: int, task_types: Iterable[str]) -> Optional[Dict[str, Any]]:
+    """Parsed ``payload_json`` of the newest matching task, if it is a JSON object."""
+    artifact = latest_phase_artifact(workshop_id, task_types)
+    return artifact.payload_dict if artifact else None
+
+
+__all__ = [
+    "PhaseArtifact",
+    "ParsedPayloadCache",
+    "parsed_payload_cache",
+    "latest_phase_artifacts",
+    "latest_phase_artifact",
+    "latest_phase_payload",
+]
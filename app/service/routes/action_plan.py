@@ -45,6 +45,9 @@ from app.models import (
 from app.utils.json_utils import extract_json_block
 from app.utils.data_aggregation import get_pre_workshop_context_json
 from app.utils.llm_bedrock import get_chat_llm_pro
+from app.utils.single_flight import single_flight
+from app.utils.llm_usage import track_llm_usage
+from app.service.phase_artifacts import latest_phase_payload
 from langchain_core.prompts import PromptTemplate
 from app.service.routes.presentation import _build_shortlist as _presentation_build_shortlist
 
@@ -356,19 +359,11 @@ def _collect_overview(ws: Workshop) -> Dict[str, Any]:
 
 def _load_latest_payload(workshop_id: int, types: List[str]) -> Optional[Dict[str, Any]]:
     try:
-        task = (
-            BrainstormTask.query
-            .filter(BrainstormTask.workshop_id == workshop_id, BrainstormTask.task_type.in_(types))
-            .order_by(BrainstormTask.created_at.desc())
-            .first()
-        )
-        if not task or not task.payload_json:
-            return None
-        data = json.loads(task.payload_json)
-        return data if isinstance(data, dict) else None
+        return latest_phase_payload(workshop_id, types)
     except Exception:
         return None
 
+
 def _clusters_with_votes(previous_cluster_task_id: int) -> List[Dict[str, Any]]:
     rows = (
         db.session.query(
@@ -610,6 +605,8 @@ Phase Context: {phase_context}
 # =========================
 # API Entry Point
 # =========================
+@single_flight("action_plan")
+@track_llm_usage("action_plan")
 def get_action_plan_payload(workshop_id: int, phase_context: str | None = None) -> Union[Dict[str, Any], Tuple[str, int]]:
     ws = db.session.get(Workshop, workshop_id)
     if not ws:
@@ -146,7 +146,7 @@ def get_action_plan_payload(workshop_id: int, phase_context: str | None = None)
                     milestones_for_pdf = _extract_milestones(actions_for_pdf)
             except Exception:
                 pass
-        rel, _ = _generate_action_plan_pdf(ws, actions_for_pdf, milestones_for_pdf)
+        rel, _ = _generate_action_plan_pdf(ws.title, actions_for_pdf, milestones_for_pdf)
         url = f"{current_app.config.get('MEDIA_REPORTS_URL_PREFIX','/media/reports')}/{os.path.basename(rel)}"
     except Exception as e:
         current_app.logger.warning(f"[ActionPlan] PDF error: {e}")
@@ -272,7 +272,7 @@ def rebuild_action_plan_artifacts(workshop_id: int, weights: Dict[str, float] |
     except Exception:
         pass
     try:
-        rel, _ = _generate_action_plan_pdf(ws, actions, [])
+        rel, _ = _generate_action_plan_pdf(ws.title, actions, [])
         url = f"{current_app.config.get('MEDIA_REPORTS_URL_PREFIX','/media/reports')}/{os.path.basename(rel)}"
     except Exception:
         rel = url = ""
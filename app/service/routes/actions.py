@@ -27,6 +27,7 @@ from sqlalchemy import func
 from sqlalchemy.orm import joinedload
 from app.models import WorkshopParticipant as WP
 from app.utils.llm_bedrock import get_chat_llm
+from app.utils.llm_usage import track_llm_usage
 from pydantic import SecretStr
 from langchain_core.prompts import PromptTemplate
 
@@ -73,6 +74,7 @@ def _collect_activity_summary(workshop_id: int) -> str:
     return "\n".join([p for p in parts if p])
 
 
+@track_llm_usage("action_items")
 def generate_action_items_text(workshop_id: int) -> Tuple[str, int]:
     """Call LLM to propose action items in JSON format."""
     current_app.logger.debug(f"[Actions] Generating action items for workshop {workshop_id}")
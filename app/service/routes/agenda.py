@@ -4,6 +4,7 @@ import json
 from flask import jsonify
 from flask_login import login_required
 from app.utils.llm_bedrock import get_chat_llm
+from app.utils.llm_usage import track_llm_usage
 from app.utils.json_utils import extract_json_block
 from langchain_core.prompts import PromptTemplate
 from app.config import Config
@@ -20,6 +21,7 @@ import markdown # If you plan to return HTML directly later
 
 # -----------------------------------------------------------
 # 1.b Generate workshop agenda (New Function)
+@track_llm_usage("agenda")
 def generate_agenda_text(workshop_id):
     """Generates a suggested workshop agenda using the LLM."""
     pre_workshop_data = get_pre_workshop_context_json(workshop_id)
@@ -58,6 +58,7 @@ from langchain_core.prompts import PromptTemplate
 
 
 from app.extensions import db, socketio
+from app.sockets_core.room_state import room_state
 from flask_login import current_user
 from datetime import datetime
 from app.config import Config
@@ -311,6 +312,8 @@ def chat():
         pass
     db.session.add(chat_msg)
     db.session.commit()
+    # Not broadcast as receive_message, so cached join chat history must be reloaded
+    room_state.drop_chat(workshop_id)
     
     # Use the unified LLM chain to process the query
     agent_response = process_user_query(workshop_id, user_message)
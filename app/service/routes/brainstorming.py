@@ -11,6 +11,9 @@ from app.utils.agenda_utils import strip_agenda_durations
 from app.utils.data_aggregation import get_pre_workshop_context_json
 from app.utils.json_utils import extract_json_block
 from app.utils.llm_bedrock import get_chat_llm
+from app.utils.single_flight import single_flight
+from app.utils.llm_usage import track_llm_usage
+from app.service.phase_artifacts import latest_phase_payload
 from langchain_core.prompts import PromptTemplate
 
 from app.service.routes.warm_up import get_cached_warmup_payload
@@ -112,24 +115,13 @@ def _collect_workshop_overview(ws: Workshop) -> Dict[str, Any]:
 
 def _load_latest_task_payload(workshop_id: int, task_types: List[str]) -> Optional[Dict[str, Any]]:
     try:
-        task = (
-            BrainstormTask.query
-            .filter(
-                BrainstormTask.workshop_id == workshop_id,
-                BrainstormTask.task_type.in_(task_types),
-            )
-            .order_by(BrainstormTask.created_at.desc())
-            .first()
-        )
-        if not task or not task.payload_json:
-            return None
-        data = json.loads(task.payload_json)
-        return data if isinstance(data, dict) else None
+        return latest_phase_payload(workshop_id, task_types)
     except Exception:
         current_app.logger.debug("[Brainstorming] Failed to load historical payload for types %s", task_types, exc_info=True)
         return None
 
 
+
 def _build_next_phase_snapshot(ws: Workshop) -> Dict[str, Any]:
     raw_items = getattr(ws, "plan_items", None)
     items: List[WorkshopPlanItem] = []
@@ -399,6 +391,8 @@ Return only the JSON object described above. Do not wrap it in markdown fences.
         return f"Error generating brainstorming task: {exc}", 500, metadata
 
 # --- MODIFIED FUNCTION SIGNATURE ---
+@single_flight("brainstorming")
+@track_llm_usage("brainstorming")
 def get_brainstorming_task_payload(workshop_id: int, phase_context: str):
     """Generates text, creates DB record, returns payload."""
     raw_text, code, metadata = generate_brainstorming_text(workshop_id, phase_context)
@@ -13,7 +13,6 @@ from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Sequence, Tuple, Set
 
 from flask import current_app
-from langchain_core.prompts import PromptTemplate
 
 from app.extensions import db
 from app.models import Workshop, BrainstormTask, BrainstormIdea, IdeaCluster, WorkshopParticipant, WorkshopPlanItem
@@ -21,6 +20,11 @@ from app.config import Config
 from app.utils.json_utils import extract_json_block
 from app.utils.data_aggregation import get_pre_workshop_context_json
 from app.utils.llm_bedrock import get_chat_llm, get_chat_llm_pro
+from app.utils.llm_response_cache import invoke_cached
+from app.utils.prompt_registry import register_prompt
+from app.utils.single_flight import single_flight
+from app.utils.llm_usage import track_llm_usage
+from app.service.phase_artifacts import latest_phase_payload
 
 # ---------------------------- helpers & plumbing ----------------------------
 def _strip_agenda_durations(pre_workshop_data: str) -> str:
@@ -111,23 +115,11 @@ def _collect_workshop_overview(ws: Workshop) -> Dict[str, Any]:
 
 def _load_latest_task_payload(workshop_id: int, task_types: List[str]) -> Optional[Dict[str, Any]]:
     try:
-        task = (
-            BrainstormTask.query
-            .filter(
-                BrainstormTask.workshop_id == workshop_id,
-                BrainstormTask.task_type.in_(task_types),
-            )
-            .order_by(BrainstormTask.created_at.desc())
-            .first()
-        )
-        if not task or not task.payload_json:
-            return None
-        data = json.loads(task.payload_json)
-        return data if isinstance(data, dict) else None
+        return latest_phase_payload(workshop_id, task_types)
     except Exception:
         current_app.logger.debug("[Voting] Failed to load historical payload for types %s", task_types, exc_info=True)
         return None
-    
+
 def _build_next_phase_snapshot(ws: Workshop) -> Dict[str, Any]:
     raw_items = getattr(ws, "plan_items", None)
     items: List[WorkshopPlanItem] = []
@@ -345,7 +337,7 @@ Respond with ONLY the JSON object matching this contract:
 }}
 """
 
-CLUSTERING_PROMPT = PromptTemplate.from_template(CLUSTERING_PROMPT_TEMPLATE)
+CLUSTERING_PROMPT = register_prompt("clustering", CLUSTERING_PROMPT_TEMPLATE)
 
 
 @dataclass
@@ -425,11 +417,17 @@ def _prepare_clustering_context(
     )
 
 
-def _invoke_clustering_llm(ctx: ClusteringContext) -> str:
+def _invoke_clustering_llm(ctx: ClusteringContext, *, bypass_cache: bool = False) -> str:
     llm = get_chat_llm_pro(model_kwargs={"temperature": 0.45, "max_tokens": 3200})
-    chain = CLUSTERING_PROMPT | llm
     try:
-        raw = chain.invoke(ctx.prompt_inputs)
+        raw = invoke_cached(
+            CLUSTERING_PROMPT,
+            llm,
+            ctx.prompt_inputs,
+            phase="clustering",
+            bypass=bypass_cache,
+            validate=lambda text: bool(extract_json_block(text, repair_truncated=False)),
+        )
     except Exception as exc:
         current_app.logger.error(
             "[Clustering] LLM failure for workshop %s: %s",
@@ -840,7 +838,9 @@ def _persist_clustering_outputs(
     return payload
 
 
-def get_clustering_voting_payload(workshop_id: int, previous_task_id: int, phase_context: str):
+@single_flight("clustering")
+@track_llm_usage("clustering")
+def get_clustering_voting_payload(workshop_id: int, previous_task_id: int, phase_context: str, *, bypass_cache: bool = False):
     """Fetch brainstorming ideas, cluster them via LLM, persist results, return payload."""
 
     ideas = (
@@ -869,7 +869,7 @@ def get_clustering_voting_payload(workshop_id: int, previous_task_id: int, phase
         return "No ideas available for clustering.", 400
 
     try:
-        raw_output = _invoke_clustering_llm(ctx)
+        raw_output = _invoke_clustering_llm(ctx, bypass_cache=bypass_cache)
     except Exception as exc:
         return f"Error generating clustering task: {exc}", 500
 
@@ -33,6 +33,10 @@ from app.models_forum import ForumAIAssist, ForumCategory, ForumTopic, ForumPost
 from app.forum.service import seed_forum_from_results
 from app.utils.json_utils import extract_json_block
 from app.utils.llm_bedrock import get_chat_llm
+from app.utils.llm_response_cache import invoke_cached
+from app.utils.single_flight import single_flight
+from app.utils.llm_usage import track_llm_usage
+from app.service.phase_artifacts import latest_phase_artifact
 
 from app.service.discussion_prompt import (
     Mode,
@@ -158,18 +162,8 @@ def _require_access(workshop_id: int, *, organizer: bool = False) -> Tuple[Optio
 
 
 def _latest_payload(ws_id: int, types: List[str]) -> Optional[Dict[str, Any]]:
-    task = (
-        BrainstormTask.query
-        .filter(BrainstormTask.workshop_id == ws_id, BrainstormTask.task_type.in_(types))
-        .order_by(BrainstormTask.created_at.desc())
-        .first()
-    )
-    if not task or not task.payload_json:
-        return None
-    try:
-        return json.loads(task.payload_json)
-    except Exception:
-        return None
+    artifact = latest_phase_artifact(ws_id, types)
+    return artifact.payload if artifact else None
 
 
 def _clusters(ws_id: int) -> List[Dict[str, Any]]:
@@ -584,11 +578,18 @@ def _hash_inputs(inputs: Dict[str, str]) -> str:
     return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
 
 
-def _invoke_discussion_llm(inputs: Dict[str, str]) -> Tuple[Dict[str, Any], int, str, str]:
+def _invoke_discussion_llm(inputs: Dict[str, str], *, bypass_cache: bool = False) -> Tuple[Dict[str, Any], int, str, str]:
     llm = get_chat_llm(model_kwargs={"temperature": 0.35, "max_tokens": 1800})
     prompt = build_prompt_template()
     start = time.perf_counter()
-    raw = (prompt | llm).invoke(inputs)
+    raw = invoke_cached(
+        prompt,
+        llm,
+        inputs,
+        phase="discussion",
+        bypass=bypass_cache,
+        validate=lambda text: bool(extract_json_block(text, repair_truncated=False)),
+    )
     latency_ms = int((time.perf_counter() - start) * 1000)
 
     def _to_text(val: Any) -> str:
@@ -623,6 +624,7 @@ def _invoke_discussion_llm(inputs: Dict[str, str]) -> Tuple[Dict[str, Any], int,
     return data, latency_ms, model_used, text_response
 
 
+@track_llm_usage("discussion")
 def _execute_discussion_mode(
     workshop_id: int,
     *,
@@ -633,6 +635,7 @@ def _execute_discussion_mode(
     allow_forum_seed: bool,
     enforce_cadence: bool,
     create_task: bool,
+    bypass_cache: bool = False,
 ) -> Dict[str, Any]:
     lock = _lock_for(workshop_id)
     with lock:
@@ -649,7 +652,7 @@ def _execute_discussion_mode(
         checksum = _hash_inputs(inputs)
 
         try:
-            data, latency_ms, model_id, _ = _invoke_discussion_llm(inputs)
+            data, latency_ms, model_id, _ = _invoke_discussion_llm(inputs, bypass_cache=bypass_cache)
         except DiscussionStateError as exc:
             _log_discussion_run(
                 workshop_id,
@@ -983,6 +986,8 @@ def _broadcast_mode_results(workshop_id: int, outputs: Dict[str, Any]) -> None:
         _emit_discussion_event(workshop_id, "forum_seed_done", {"success": True})
 
 
+@single_flight("discussion")
+@track_llm_usage("discussion")
 def get_discussion_payload(workshop_id: int, phase_context: str | None = None) -> Dict[str, Any] | Tuple[str, int]:
     try:
         result = _execute_discussion_mode(
@@ -1052,6 +1057,7 @@ def api_refresh_discussion(workshop_id: int):
             allow_forum_seed=(mode == "initial"),
             enforce_cadence=True,
             create_task=False,
+            bypass_cache=bool(body.get("refresh")),
         )
     except DiscussionStateError as exc:
         return jsonify({"error": str(exc)}), exc.status_code
@@ -1103,6 +1109,7 @@ def api_run_discussion(workshop_id: int):
             allow_forum_seed=True,
             enforce_cadence=False,
             create_task=True,
+            bypass_cache=bool(body.get("refresh")),
         )
     except DiscussionStateError as exc:
         return jsonify({"error": str(exc)}), exc.status_code
@@ -1149,6 +1156,7 @@ def _execute_special_mode_endpoint(
             allow_forum_seed=allow_forum_seed,
             enforce_cadence=enforce_cadence,
             create_task=False,
+            bypass_cache=bool(body.get("refresh")),
         )
     except DiscussionStateError as exc:
         return {"error": str(exc)}, exc.status_code
@@ -25,9 +25,13 @@ from app.models import (
 
 from app.utils.agenda_utils import strip_agenda_durations
 from app.utils.data_aggregation import get_pre_workshop_context_json
+from app.utils.json_utils import extract_json_block
 from app.utils.llm_bedrock import get_chat_llm, get_chat_llm_pro
-
-from langchain_core.prompts import PromptTemplate
+from app.utils.llm_response_cache import invoke_cached
+from app.utils.prompt_registry import register_prompt
+from app.utils.single_flight import single_flight
+from app.utils.llm_usage import track_llm_usage
+from app.service.phase_artifacts import latest_phase_payload
 
 # =========================
 # Errors
@@ -624,21 +628,13 @@ def _collect_overview(ws: Workshop) -> Dict[str, Any]:
 
 def _load_latest_payload(workshop_id: int, types: List[str]) -> Optional[Dict[str, Any]]:
     try:
-        task = (
-            BrainstormTask.query
-            .filter(BrainstormTask.workshop_id == workshop_id, BrainstormTask.task_type.in_(types))
-            .order_by(BrainstormTask.created_at.desc())
-            .first()
-        )
-        if not task or not task.payload_json:
-            return None
-        data = json.loads(task.payload_json)
-        return data if isinstance(data, dict) else None
+        return latest_phase_payload(workshop_id, types)
     except Exception:
         current_app.logger.debug("[Feasibility] Failed to load payload types=%s", types, exc_info=True)
         return None
 
 
+
 def _clusters_with_votes(previous_task_id: int) -> List[Dict[str, Any]]:
     rows = (
         db.session.query(
@@ -766,20 +762,7 @@ def _prepare_feasibility_inputs(workshop_id: int, previous_task_id: int, phase_c
 
 
 
-# =========================
-# LLM Invocation
-# =========================
-def _invoke_feasibility_model(inputs: Dict[str, Any]) -> Dict[str, Any]:
-    if not PromptTemplate:
-        raise FeasibilityGenerationError("PromptTemplate unavailable")
-    llm = get_chat_llm_pro(model_kwargs={
-                                         "temperature": 0.35,
-                                         "max_tokens": 4000,
-                                         "top_k": 40,
-                                         "top_p": 0.9
-                                         })
-
-    template = """
+_FEASIBILITY_TEMPLATE = """
                 You are the feasibility analyst and report author. Study the provided workshop data carefully.
                 Analyze the top voted idea clusters for feasibility across multiple dimensions including technical, operational, legal/compliance, data privacy, financial, timeline, and risk.
                 Identify key constraints, dependencies, regulatory notes, and ethical considerations.
@@ -862,9 +845,28 @@ def _invoke_feasibility_model(inputs: Dict[str, Any]) -> Dict[str, Any]:
                 {next_phase_json}
                 
                 """
-    prompt = PromptTemplate.from_template(template)
-    chain = prompt | llm
-    raw = chain.invoke(inputs)
+
+FEASIBILITY_PROMPT = register_prompt("feasibility", _FEASIBILITY_TEMPLATE)
+
+
+# =========================
+# LLM Invocation
+# =========================
+def _invoke_feasibility_model(inputs: Dict[str, Any], *, bypass_cache: bool = False) -> Dict[str, Any]:
+    llm = get_chat_llm_pro(model_kwargs={
+                                         "temperature": 0.35,
+                                         "max_tokens": 4000,
+                                         "top_k": 40,
+                                         "top_p": 0.9
+                                         })
+    raw = invoke_cached(
+        FEASIBILITY_PROMPT,
+        llm,
+        inputs,
+        phase="feasibility",
+        bypass=bypass_cache,
+        validate=lambda text: bool(extract_json_block(text, repair_truncated=False)),
+    )
     print("[Feasibility] LLM raw response:", raw)
     text = _coerce_text(raw)
     current_app.logger.debug(
@@ -931,6 +933,8 @@ def generate_feasibility_text(
     workshop_id: int,
     clusters_summary: str,
     phase_context: str,
+    *,
+    bypass_cache: bool = False,
 ) -> Tuple[Dict[str, Any], int]:
     """Compatibility shim so tests can stub the LLM output."""
     try:
@@ -946,7 +950,7 @@ def generate_feasibility_text(
         inputs.setdefault("phase_context", phase_context)
         inputs.setdefault("current_phase_label", phase_context)
 
-    payload = _invoke_feasibility_model(inputs)
+    payload = _invoke_feasibility_model(inputs, bypass_cache=bypass_cache)
     return payload, 200
 
 
@@ -954,7 +958,15 @@ def generate_feasibility_text(
 # =========================
 # API Entry Point
 # =========================
-def get_feasibility_payload(workshop_id: int, previous_task_id: int, phase_context: str) -> Dict[str, Any] | Tuple[str, int]:
+@single_flight("feasibility")
+@track_llm_usage("feasibility")
+def get_feasibility_payload(
+    workshop_id: int,
+    previous_task_id: int,
+    phase_context: str,
+    *,
+    bypass_cache: bool = False,
+) -> Dict[str, Any] | Tuple[str, int]:
     """Generate feasibility results (single LLM call), persist task, render PDF, return payload."""
     ws = db.session.get(Workshop, workshop_id)
     if not ws:
@@ -974,6 +986,7 @@ def get_feasibility_payload(workshop_id: int, previous_task_id: int, phase_conte
             workshop_id,
             clusters_summary,
             phase_context or "",
+            bypass_cache=bypass_cache,
         )
     except FeasibilityGenerationError as exc:
         payload = {
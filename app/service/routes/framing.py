@@ -24,6 +24,8 @@ from app.models import BrainstormTask, Workshop, WorkshopPlanItem, Document, Wor
 from app.tasks.registry import TASK_REGISTRY
 from app.utils.data_aggregation import get_pre_workshop_context_json
 from app.utils.json_utils import extract_json_block
+from app.utils.single_flight import single_flight
+from app.utils.llm_usage import track_llm_usage
 
 try:  # pragma: no cover - optional dependency
     from app.utils.llm_bedrock import get_chat_llm, get_chat_llm_pro  # type: ignore
@@ -865,6 +867,8 @@ def _build_payload(
     return payload
 
 
+@single_flight("framing")
+@track_llm_usage("framing")
 def get_framing_payload(workshop_id: int, phase_context: str | None = None):
     ws = db.session.get(Workshop, workshop_id)
     if not ws:
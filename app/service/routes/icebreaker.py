@@ -4,6 +4,7 @@ import json
 from flask import jsonify
 from flask_login import login_required
 from app.utils.llm_bedrock import get_chat_llm
+from app.utils.llm_usage import track_llm_usage
 from langchain_core.prompts import PromptTemplate
 from app.config import Config
 # Import the blueprint and the helper function from agent.py
@@ -15,6 +16,7 @@ from app.utils.json_utils import extract_json_block
 # #-----------------------------------------------------------
 # # 2.c Generate icebreaker activities
 
+@track_llm_usage("icebreaker")
 def generate_icebreaker_text(workshop_id):
     """Generates only the icebreaker text using the LLM."""
     pre_workshop_data = get_pre_workshop_context_json(workshop_id)
@@ -15,7 +15,7 @@ from __future__ import annotations
 import json
 import os
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from flask import current_app
 
@@ -28,6 +28,8 @@ from app.service.llm_adapter import (
     build_milestones_from_llm,
 )
 from app.config import Config
+from app.utils.llm_bedrock import get_chat_llm_pro
+from app.utils.task_graph import TaskGraph
 from app.utils.value_parsing import bounded_int, safe_float, safe_int
 
 
@@ -176,81 +178,21 @@ def get_presentation_payload(workshop_id: int, phase_context: str | None = None)
         shortlist, rationale = _build_shortlist(ws.id, weights, constraints)
         payload["shortlist"] = shortlist
         payload["rationale"] = rationale
-        # Optional LLM scoring pass (replace shortlist if configured)
+        # LLM scoring pass (updates shortlist scores in place); the PDF shows the result,
+        # so the two run in order.
         try:
-            _raw_invoke = getattr(current_app, 'llm_invoke', None)
-            def llm_invoke(prompt: str) -> str:
-                try:
-                    if callable(_raw_invoke):
-                        res = _raw_invoke(prompt)
-                        return str(res) if res is not None else ""
-                except Exception:
-                    return ""
-                return ""
-            if callable(_raw_invoke):
-                # Gather workshop objective and cluster/vote context
-                objective = getattr(ws, 'objective', '') or ''
-                latest_cluster_task = (
-                    BrainstormTask.query
-                    .filter_by(workshop_id=ws.id, task_type="clustering_voting")
-                    .order_by(BrainstormTask.started_at.desc().nullslast(), BrainstormTask.id.desc())
-                    .first()
-                )
-                clusters = []
-                vote_counts = {}
-                if latest_cluster_task:
-                    cl = IdeaCluster.query.filter_by(task_id=latest_cluster_task.id).all()
-                    for c in cl:
-                        clusters.append({"id": c.id, "name": c.name, "summary": c.description})
-                        try:
-                            vote_counts[c.id] = int(IdeaVote.query.filter_by(cluster_id=c.id).count())
-                        except Exception:
-                            vote_counts[c.id] = 0
-                candidates = [
-                    {
-                        "id": it.get("id"),
-                        "title": it.get("label"),
-                        "cluster_id": it.get("cluster_id"),
-                        "votes_norm": it.get("votes_norm"),
-                    }
-                    for it in shortlist
-                ]
-                llm_prioritized = build_prioritized_from_llm(
-                    objective=objective,
-                    clusters=clusters,
-                    vote_counts=vote_counts,
-                    candidates=candidates,
-                    invoke=llm_invoke,
-                )
-                if isinstance(llm_prioritized, list) and llm_prioritized:
-                    # Keep score if provided; otherwise fall back to heuristic score
-                    def _score_of(pid):
-                        try:
-                            return next((x.get("score") for x in llm_prioritized if x.get("id") == pid), None)
-                        except Exception:
-                            return None
-                    for it in shortlist:
-                        sc = _score_of(it.get("id"))
-                        if sc is not None:
-                            it["score"] = sc
-                    # Attach optional impact/effort into shortlist items for charting
-                    for it in shortlist:
-                        try:
-                            src = next((x for x in llm_prioritized if x.get("id") == it.get("id")), None)
-                            if src and isinstance(src.get("scores"), dict):
-                                it["scores"] = {"impact": src["scores"].get("impact"), "effort": src["scores"].get("effort")}
-                        except Exception:
-                            pass
+            scoring_context = _prioritization_context(ws, shortlist)
         except Exception:
-            pass
+            scoring_context = None
+        _apply_llm_prioritization(shortlist, scoring_context, _llm_invoker())
         # Provide normalized contract for downstream modules
         try:
             payload["prioritized"] = _normalize_prioritized(shortlist)
         except Exception:
             payload["prioritized"] = []
-        # Generate PDF artifact in instance/uploads/reports
+        # PDF artifact in instance/uploads/reports
         try:
-            pdf_path_rel, pdf_url = _generate_shortlist_pdf(ws, shortlist, weights, rationale)
+            pdf_path_rel, pdf_url = _generate_shortlist_pdf(ws.title, shortlist, weights, rationale)
             payload["shortlist_pdf_path"] = pdf_path_rel
             # Prefer serving via reports media route when possible
             if not pdf_url and pdf_path_rel:
@@ -292,79 +234,40 @@ def get_presentation_payload(workshop_id: int, phase_context: str | None = None)
         # Derive action items from shortlist-like pass (reuse function)
         shortlist, _ = _build_shortlist(ws.id, weights, constraints)
         actions = _derive_action_plan_from_shortlist(ws.id, shortlist)
-        # Optional LLM action plan pass
-        try:
-            _raw_invoke = getattr(current_app, 'llm_invoke', None)
-            def llm_invoke(prompt: str) -> str:
-                try:
-                    if callable(_raw_invoke):
-                        res = _raw_invoke(prompt)
-                        return str(res) if res is not None else ""
-                except Exception:
-                    return ""
-                return ""
-            if callable(_raw_invoke):
-                participants = []
-                try:
-                    parts = WorkshopParticipant.query.filter_by(workshop_id=ws.id).all()
-                    for p in parts:
-                        u = getattr(p, 'user', None)
-                        participants.append({
-                            "participant_id": p.id,
-                            "first_name": getattr(u, 'first_name', None),
-                            "last_name": getattr(u, 'last_name', None),
-                            "email": getattr(u, 'email', None),
-                        })
-                except Exception:
-                    participants = []
-                prioritized = payload.get("prioritized") or _normalize_prioritized(shortlist)
-                llm_actions = build_action_plan_from_llm(
-                    prioritized=prioritized,
-                    participants=participants,
-                    invoke=llm_invoke,
-                )
-                if isinstance(llm_actions, list) and llm_actions:
-                    actions = llm_actions
-        except Exception:
-            pass
-        # LLM enrichment (milestones, due dates, recommendations)
-        try:
-            enriched = _llm_enrich_action_plan(ws.id, actions, phase_context)
-            if isinstance(enriched, list) and enriched:
-                actions = enriched
-        except Exception:
-            pass
+        llm_invoke = _llm_invoker()
+        participants = _participant_roster(ws.id)
+        prioritized = payload.get("prioritized") or _normalize_prioritized(shortlist)
+        # Milestones and the PDF both need the final action items but not each other,
+        # so the milestones prompt runs while the PDF renders.
+        # Graph nodes get their own session: hand them plain values, not the ORM workshop.
+        title = ws.title
+        graph = TaskGraph(f"presentation:{workshop_id}:action_plan")
+        graph.add(
+            "action_items",
+            lambda _: _build_action_items(workshop_id, actions, prioritized, participants, llm_invoke, phase_context),
+        )
+        graph.add("milestones", lambda deps: _build_milestones(deps["action_items"], llm_invoke), deps=("action_items",))
+        graph.add("action_plan_pdf", lambda deps: _generate_action_plan_pdf(title, deps["action_items"]), deps=("action_items",))
+        outcomes = graph.run()
+        if outcomes["action_items"].ok:
+            actions = outcomes["action_items"].value
         payload["action_items"] = actions
+        ms = outcomes["milestones"].value if outcomes["milestones"].ok else None
         try:
-            # Optional LLM milestones pass
-            ms = None
-            try:
-                _raw_invoke = getattr(current_app, 'llm_invoke', None)
-                def llm_invoke(prompt: str) -> str:
-                    try:
-                        if callable(_raw_invoke):
-                            res = _raw_invoke(prompt)
-                            return str(res) if res is not None else ""
-                    except Exception:
-                        return ""
-                    return ""
-                if callable(_raw_invoke):
-                    ms = build_milestones_from_llm(action_items=actions, invoke=llm_invoke)
-            except Exception:
-                ms = None
             payload["milestones"] = (ms if isinstance(ms, list) and ms else _extract_milestones(actions))
         except Exception:
             payload["milestones"] = []
-        try:
-            pdf_path_rel, pdf_url = _generate_action_plan_pdf(ws, actions)
+        pdf_outcome = outcomes["action_plan_pdf"]
+        if pdf_outcome.ok:
+            pdf_path_rel, pdf_url = pdf_outcome.value
             payload["action_plan_pdf_path"] = pdf_path_rel
             if not pdf_url and pdf_path_rel:
                 fname = os.path.basename(pdf_path_rel)
                 pdf_url = f"{Config.MEDIA_REPORTS_URL_PREFIX}/{fname}"
             payload["action_plan_pdf_url"] = pdf_url
             payload["pdf_document"] = pdf_url
-        except Exception as e:
-            current_app.logger.warning(f"[Presentation] Action plan PDF generation skipped: {e}")
+        else:
+            current_app.logger.warning(f"[Presentation] Action plan PDF generation skipped: {pdf_outcome.error}")
         # Build a spoken overview
         try:
             items = payload.get('action_items') or []
@@ -485,9 +388,9 @@ def _reports_dir() -> str:
     return base
 
 
-def _name_for_pdf(workshop: Workshop, kind: str) -> Tuple[str, str]:
+def _name_for_pdf(title: Optional[str], kind: str) -> Tuple[str, str]:
     # kind: "shortlist" | "action-plan"
-    safe_title = (workshop.title or "Workshop").strip().replace("/", "-")
+    safe_title = (title or "Workshop").strip().replace("/", "-")
     ts = datetime.utcnow().strftime("%Y-%m-%d %H-%M-%S")
     fname = f"{safe_title} {kind} {ts}.pdf"
     abs_path = os.path.join(_reports_dir(), fname)
@@ -495,16 +398,16 @@ def _name_for_pdf(workshop: Workshop, kind: str) -> Tuple[str, str]:
     return abs_path, rel_path
 
 
-def _generate_shortlist_pdf(workshop: Workshop, shortlist: List[Dict[str, Any]], weights: Dict[str, float], rationale: Dict[str, Any]) -> Tuple[str, str]:
+def _generate_shortlist_pdf(title: Optional[str], shortlist: List[Dict[str, Any]], weights: Dict[str, float], rationale: Dict[str, Any]) -> Tuple[str, str]:
     from reportlab.lib.pagesizes import LETTER
     from reportlab.lib.styles import getSampleStyleSheet
     from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
     from reportlab.lib import colors
-    abs_path, rel_path = _name_for_pdf(workshop, "shortlist")
+    abs_path, rel_path = _name_for_pdf(title, "shortlist")
     doc = SimpleDocTemplate(abs_path, pagesize=LETTER)
     styles = getSampleStyleSheet()
     elements = []
-    elements.append(Paragraph(f"{workshop.title} — Shortlist", styles['Title']))
+    elements.append(Paragraph(f"{title} — Shortlist", styles['Title']))
     elements.append(Spacer(1, 12))
     try:
         method_text = ""
@@ -614,16 +517,16 @@ def _derive_action_plan_from_shortlist(workshop_id: int, shortlist: List[Dict[st
     return actions
 
 
-def _generate_action_plan_pdf(workshop: Workshop, actions: List[Dict[str, Any]], milestones: Optional[List[Dict[str, Any]]] = None) -> Tuple[str, str]:
+def _generate_action_plan_pdf(title: Optional[str], actions: List[Dict[str, Any]], milestones: Optional[List[Dict[str, Any]]] = None) -> Tuple[str, str]:
     from reportlab.lib.pagesizes import LETTER
     from reportlab.lib.styles import getSampleStyleSheet
     from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
     from reportlab.lib import colors
-    abs_path, rel_path = _name_for_pdf(workshop, "action plan")
+    abs_path, rel_path = _name_for_pdf(title, "action plan")
     doc = SimpleDocTemplate(abs_path, pagesize=LETTER)
     styles = getSampleStyleSheet()
     elements = []
-    elements.append(Paragraph(f"{workshop.title} — Action Plan", styles['Title']))
+    elements.append(Paragraph(f"{title} — Action Plan", styles['Title']))
     elements.append(Spacer(1, 12))
     data = [["#", "Title", "Owner (participant id)", "Status", "Due", "Priority"]]
     for idx, a in enumerate(actions, start=1):
@@ -699,7 +602,7 @@ def rebuild_presentation_artifacts(
         result["rationale"] = rationale
         # PDF artifact
         try:
-            rel, url = _generate_shortlist_pdf(ws, shortlist, w, rationale)
+            rel, url = _generate_shortlist_pdf(ws.title, shortlist, w, rationale)
             result["shortlist_pdf_path"] = rel
             if not url and rel:
                 fname = os.path.basename(rel)
@@ -734,7 +637,7 @@ def rebuild_presentation_artifacts(
         actions = _derive_action_plan_from_shortlist(ws.id, shortlist)
         result["action_items"] = actions
         try:
-            rel, url = _generate_action_plan_pdf(ws, actions)
+            rel, url = _generate_action_plan_pdf(ws.title, actions)
             result["action_plan_pdf_path"] = rel
             if not url and rel:
                 fname = os.path.basename(rel)
@@ -764,6 +667,150 @@ def rebuild_presentation_artifacts(
     return {"mode": m, "note": "Slideshow mode has no rebuildable artifacts."}
 
 
+# ---------- LLM passes (action plan ones run as TaskGraph nodes) ----------
+
+def _llm_invoker() -> Callable[[str], str]:
+    """Text-in/text-out LLM call for the presentation passes; failures read as an empty reply.
+
+    Uses ``current_app.llm_invoke`` when an app installs one (tests, offline runs),
+    otherwise Nova Pro through the shared Bedrock admission limiter.
+    """
+    raw_invoke = getattr(current_app, 'llm_invoke', None)
+    if not callable(raw_invoke):
+        llm = get_chat_llm_pro(model_kwargs={"temperature": 0.3, "max_tokens": 2000})
+
+        def raw_invoke(prompt: str) -> Any:
+            return getattr(llm.invoke(prompt), "content", None)
+
+    def llm_invoke(prompt: str) -> str:
+        try:
+            res = raw_invoke(prompt)
+            return str(res) if res is not None else ""
+        except Exception:
+            current_app.logger.warning("[Presentation] LLM pass failed; keeping heuristic output", exc_info=True)
+            return ""
+    return llm_invoke
+
+
+def _prioritization_context(ws: Workshop, shortlist: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Objective, latest clusters with vote counts, and shortlist candidates for the scoring prompt."""
+    latest_cluster_task = (
+        BrainstormTask.query
+        .filter_by(workshop_id=ws.id, task_type="clustering_voting")
+        .order_by(BrainstormTask.started_at.desc().nullslast(), BrainstormTask.id.desc())
+        .first()
+    )
+    clusters = []
+    vote_counts = {}
+    if latest_cluster_task:
+        cl = IdeaCluster.query.filter_by(task_id=latest_cluster_task.id).all()
+        for c in cl:
+            clusters.append({"id": c.id, "name": c.name, "summary": c.description})
+            try:
+                vote_counts[c.id] = int(IdeaVote.query.filter_by(cluster_id=c.id).count())
+            except Exception:
+                vote_counts[c.id] = 0
+    candidates = [
+        {
+            "id": it.get("id"),
+            "title": it.get("label"),
+            "cluster_id": it.get("cluster_id"),
+            "votes_norm": it.get("votes_norm"),
+        }
+        for it in shortlist
+    ]
+    return {
+        "objective": getattr(ws, 'objective', '') or '',
+        "clusters": clusters,
+        "vote_counts": vote_counts,
+        "candidates": candidates,
+    }
+
+
+def _apply_llm_prioritization(
+    shortlist: List[Dict[str, Any]],
+    context: Optional[Dict[str, Any]],
+    llm_invoke: Optional[Callable[[str], str]],
+) -> List[Dict[str, Any]]:
+    """Replace heuristic scores (and attach impact/effort) from the LLM scoring pass, when available."""
+    if not llm_invoke or not context:
+        return shortlist
+    try:
+        llm_prioritized = build_prioritized_from_llm(invoke=llm_invoke, **context)
+    except Exception:
+        return shortlist
+    if not (isinstance(llm_prioritized, list) and llm_prioritized):
+        return shortlist
+    by_id = {x.get("id"): x for x in llm_prioritized if isinstance(x, dict)}
+    for it in shortlist:
+        src = by_id.get(it.get("id"))
+        if not src:
+            continue
+        # Keep score if provided; otherwise fall back to heuristic score
+        if src.get("score") is not None:
+            it["score"] = src.get("score")
+        # Optional impact/effort for charting
+        if isinstance(src.get("scores"), dict):
+            it["scores"] = {"impact": src["scores"].get("impact"), "effort": src["scores"].get("effort")}
+    return shortlist
+
+
+def _participant_roster(workshop_id: int) -> List[Dict[str, Any]]:
+    participants = []
+    try:
+        parts = WorkshopParticipant.query.filter_by(workshop_id=workshop_id).all()
+        for p in parts:
+            u = getattr(p, 'user', None)
+            participants.append({
+                "participant_id": p.id,
+                "first_name": getattr(u, 'first_name', None),
+                "last_name": getattr(u, 'last_name', None),
+                "email": getattr(u, 'email', None),
+            })
+    except Exception:
+        participants = []
+    return participants
+
+
+def _build_action_items(
+    workshop_id: int,
+    actions: List[Dict[str, Any]],
+    prioritized: List[Dict[str, Any]],
+    participants: List[Dict[str, Any]],
+    llm_invoke: Optional[Callable[[str], str]],
+    phase_context: Optional[str],
+) -> List[Dict[str, Any]]:
+    """Optional LLM action plan pass over the heuristic actions, then due-date/priority enrichment."""
+    if llm_invoke:
+        try:
+            llm_actions = build_action_plan_from_llm(
+                prioritized=prioritized,
+                participants=participants,
+                invoke=llm_invoke,
+            )
+            if isinstance(llm_actions, list) and llm_actions:
+                actions = llm_actions
+        except Exception:
+            pass
+    try:
+        enriched = _llm_enrich_action_plan(workshop_id, actions, phase_context)
+        if isinstance(enriched, list) and enriched:
+            actions = enriched
+    except Exception:
+        pass
+    return actions
+
+
+def _build_milestones(actions: List[Dict[str, Any]], llm_invoke: Optional[Callable[[str], str]]) -> Optional[List[Dict[str, Any]]]:
+    """Optional LLM milestones pass; None lets the caller fall back to ``_extract_milestones``."""
+    if not llm_invoke:
+        return None
+    try:
+        return build_milestones_from_llm(action_items=actions, invoke=llm_invoke)
+    except Exception:
+        return None
+
+
 # ---------- Utilities and LLM placeholders (non-blocking) ----------
 
 def _normalize_prioritized(shortlist: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
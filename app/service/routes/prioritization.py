@@ -120,6 +120,10 @@ from app.utils.agenda_utils import strip_agenda_durations
 from app.utils.data_aggregation import get_pre_workshop_context_json
 from app.utils.json_utils import extract_json_block
 from app.utils.llm_bedrock import get_chat_llm_pro
+from app.utils.llm_response_cache import invoke_cached
+from app.utils.single_flight import single_flight
+from app.utils.llm_usage import track_llm_usage
+from app.service.phase_artifacts import latest_phase_payload
 from langchain_core.prompts import PromptTemplate
 from app.service.routes.presentation import _build_shortlist as _presentation_build_shortlist
 
@@ -370,20 +374,12 @@ def _attach_doc(ws: Workshop, abs_path: str, rel_path: str, url: str, payload: D
 # ---------- input assembly ----------
 def _load_latest_payload(workshop_id: int, types: List[str]) -> Optional[Dict[str, Any]]:
     try:
-        task = (
-            BrainstormTask.query
-            .filter(BrainstormTask.workshop_id == workshop_id, BrainstormTask.task_type.in_(types))
-            .order_by(BrainstormTask.created_at.desc())
-            .first()
-        )
-        if not task or not task.payload_json:
-            return None
-        data = json.loads(task.payload_json)
-        return data if isinstance(data, dict) else None
+        return latest_phase_payload(workshop_id, types)
     except Exception:
         current_app.logger.debug("[Prioritization] Could not load payload types=%s", types, exc_info=True)
         return None
 
+
 def _clusters_full(previous_task_id: Optional[int]) -> List[Dict[str, Any]]:
     if not previous_task_id:
         return []
@@ -902,7 +898,7 @@ def _prepare_prioritization_inputs(
     }
 
 # ---------- LLM call ----------
-def _invoke_prioritization_model(inputs: Dict[str, Any]) -> Dict[str, Any]:
+def _invoke_prioritization_model(inputs: Dict[str, Any], *, bypass_cache: bool = False) -> Dict[str, Any]:
     prompt_template = """
 You are a pragmatic product strategist. Use ONLY the provided data to produce a single STRICT JSON object for the
 Prioritization & Shortlist phase of the workshop. Begin from the provided shortlist baseline and quantitative metrics.
@@ -1013,8 +1009,14 @@ Upcoming Phase (JSON):
             "cache": False,
         }
     )
-    chain = PromptTemplate.from_template(prompt_template, template_format="jinja2") | llm
-    raw = chain.invoke(inputs)
+    raw = invoke_cached(
+        PromptTemplate.from_template(prompt_template, template_format="jinja2"),
+        llm,
+        inputs,
+        phase="prioritization",
+        bypass=bypass_cache,
+        validate=lambda text: bool(extract_json_block(text, repair_truncated=False)),
+    )
 
     text = raw.content if hasattr(raw, "content") else str(raw)
     json_block = extract_json_block(text) or text
@@ -1024,10 +1026,14 @@ Upcoming Phase (JSON):
     return data
 
 # ---------- API entry ----------
+@single_flight("prioritization")
+@track_llm_usage("prioritization")
 def get_prioritization_payload(
     workshop_id: int,
     previous_task_id: Optional[int] = None,
     phase_context: Optional[str] = None,
+    *,
+    bypass_cache: bool = False,
 ) -> Dict[str, Any] | Tuple[str, int]:
     ws = db.session.get(Workshop, workshop_id)
     if not ws:
@@ -1040,7 +1046,7 @@ def get_prioritization_payload(
         return "Failed to prepare prioritization inputs", 500
 
     try:
-        data = _invoke_prioritization_model(inputs)
+        data = _invoke_prioritization_model(inputs, bypass_cache=bypass_cache)
     except Exception as exc:
         current_app.logger.error("[Prioritization] LLM error: %s", exc, exc_info=True)
         return "Prioritization generation error", 503
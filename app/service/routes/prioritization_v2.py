@@ -23,6 +23,9 @@ from app.models import (
 from app.utils.json_utils import extract_json_block
 from app.utils.data_aggregation import get_pre_workshop_context_json
 from app.utils.llm_bedrock import get_chat_llm
+from app.utils.single_flight import single_flight
+from app.utils.llm_usage import track_llm_usage
+from app.service.phase_artifacts import latest_phase_payload
 from langchain_core.prompts import PromptTemplate
 
 # ---------- shared PDF primitives (same style as feasibility JSON->PDF) ----------
@@ -171,20 +174,12 @@ def _collect_overview(ws: Workshop) -> Dict[str, Any]:
     }
 
 def _load_latest_payload(workshop_id: int, types: List[str]) -> Optional[Dict[str, Any]]:
-    t = (
-        BrainstormTask.query
-        .filter(BrainstormTask.workshop_id == workshop_id, BrainstormTask.task_type.in_(types))
-        .order_by(BrainstormTask.created_at.desc())
-        .first()
-    )
-    if not t or not t.payload_json:
-        return None
     try:
-        data = json.loads(t.payload_json)
-        return data if isinstance(data, dict) else None
+        return latest_phase_payload(workshop_id, types)
     except Exception:
         return None
 
+
 def _clusters_with_votes(previous_task_id: int) -> List[Dict[str, Any]]:
     rows = (
         db.session.query(
@@ -372,6 +367,8 @@ Upcoming Phase:
     return json.loads(block)
 
 # ---------- API entry ----------
+@single_flight("prioritization")
+@track_llm_usage("prioritization")
 def get_prioritization_payload(workshop_id: int, previous_task_id: int, phase_context: str) -> Dict[str, Any] | Tuple[str, int]:
     ws = db.session.get(Workshop, workshop_id)
     if not ws: return "Workshop not found", 404
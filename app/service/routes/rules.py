@@ -3,6 +3,7 @@
 from flask import jsonify
 from flask_login import login_required
 from app.utils.llm_bedrock import get_chat_llm
+from app.utils.llm_usage import track_llm_usage
 from langchain_core.prompts import PromptTemplate
 from app.config import Config
 # Import the blueprint and the helper function from agent.py
@@ -14,6 +15,7 @@ from app.utils.data_aggregation import get_pre_workshop_context_json
 # # 2.b Generate rules and guidelines
 @agent_bp.route("/generate_rules_text/<int:workshop_id>", methods=["POST"])
 @login_required
+@track_llm_usage("rules")
 def generate_rules_text(workshop_id):
     """ Service Generates suggested workshop rules using the LLM."""
     pre_workshop_data = get_pre_workshop_context_json(workshop_id)
@@ -26,7 +26,11 @@ from app.models import (
 from app.utils.json_utils import extract_json_block
 from app.utils.data_aggregation import get_pre_workshop_context_json
 from app.utils.llm_bedrock import get_chat_llm_pro
-from langchain_core.prompts import PromptTemplate
+from app.utils.llm_response_cache import invoke_cached
+from app.utils.prompt_registry import register_prompt
+from app.utils.single_flight import single_flight
+from app.utils.llm_usage import track_llm_usage
+from app.service.phase_artifacts import latest_phase_payload
 
 
 # =============== Utilities ===============
@@ -330,20 +334,12 @@ def _attach_doc(ws: Workshop, abs_path: str, rel_path: str, url: str, payload: D
 
 def _load_latest_payload(workshop_id: int, types: List[str]) -> Optional[Dict[str, Any]]:
     try:
-        task = (
-            BrainstormTask.query
-            .filter(BrainstormTask.workshop_id == workshop_id, BrainstormTask.task_type.in_(types))
-            .order_by(BrainstormTask.created_at.desc())
-            .first()
-        )
-        if not task or not task.payload_json:
-            return None
-        data = json.loads(task.payload_json)
-        return data if isinstance(data, dict) else None
+        return latest_phase_payload(workshop_id, types)
     except Exception:
         current_app.logger.debug("[Summary] Failed to load payload types=%s", types, exc_info=True)
         return None
 
+
 def _collect_full_context(workshop_id: int) -> Dict[str, Any]:
     ws = db.session.get(Workshop, workshop_id)
     if not ws:
@@ -501,11 +497,7 @@ def _build_canonical_session(inputs: Dict[str, Any]) -> Dict[str, Any]:
     return canonical
 
 
-# =============== LLM Invocation ===============
-
-def _invoke_summary_model(inputs: Dict[str, Any]) -> Dict[str, Any]:
-    llm = get_chat_llm_pro(model_kwargs={"temperature": 0.45, "max_tokens": 4000})
-    template = """
+_SUMMARY_TEMPLATE = """
 You are the workshop composer and closing facilitator. Using ONLY the provided data, create a share-ready executive package for the group.
 
 Return ONE strict JSON object with exactly these top-level keys (no markdown fences, no extra text). Every key below is required—do not omit any:
@@ -572,9 +564,22 @@ Transcripts:
 Pre-Workshop Research (may be truncated):
 {pre_workshop_data}
 """
-    prompt = PromptTemplate.from_template(template)
-    chain = prompt | llm
-    raw = chain.invoke(inputs)
+
+SUMMARY_PROMPT = register_prompt("summary", _SUMMARY_TEMPLATE)
+
+
+# =============== LLM Invocation ===============
+
+def _invoke_summary_model(inputs: Dict[str, Any], *, bypass_cache: bool = False) -> Dict[str, Any]:
+    llm = get_chat_llm_pro(model_kwargs={"temperature": 0.45, "max_tokens": 4000})
+    raw = invoke_cached(
+        SUMMARY_PROMPT,
+        llm,
+        inputs,
+        phase="summary",
+        bypass=bypass_cache,
+        validate=lambda text: bool(extract_json_block(text, repair_truncated=False)),
+    )
     text = _coerce_text(raw)
     block = extract_json_block(text) or text
     try:
@@ -589,7 +594,14 @@ Pre-Workshop Research (may be truncated):
 
 # =============== API entrypoint ===============
 
-def get_summary_payload(workshop_id: int, phase_context: str) -> Dict[str, Any] | Tuple[str, int]:
+@single_flight("summary")
+@track_llm_usage("summary")
+def get_summary_payload(
+    workshop_id: int,
+    phase_context: str,
+    *,
+    bypass_cache: bool = False,
+) -> Dict[str, Any] | Tuple[str, int]:
     ws = db.session.get(Workshop, workshop_id)
     if not ws:
         return "Workshop not found", 404
@@ -603,7 +615,7 @@ def get_summary_payload(workshop_id: int, phase_context: str) -> Dict[str, Any]
         return "Failed to collect summary inputs", 500
 
     try:
-        data = _invoke_summary_model(inputs)
+        data = _invoke_summary_model(inputs, bypass_cache=bypass_cache)
     except SummaryGenerationError as exc:
         current_app.logger.error("[Summary] LLM failure: %s", exc, exc_info=True)
         return str(exc), 503
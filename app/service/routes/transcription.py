@@ -111,10 +111,13 @@ def _start_runner(session_id: str, state: SessionState, config: ProviderConfig)
                             "startTs": start_time,
                             "endTs": end_time,
                         }
-                        socketio.emit(
+                        from app.sockets_core.emit_batcher import emit_batcher
+
+                        # Through the batcher so it follows any stt_partial still buffered
+                        emit_batcher.emit(
                             "transcript_final",
                             final_payload,
-                            to=f"workshop_room_{ctx.workshop_id}",
+                            f"workshop_room_{ctx.workshop_id}",
                         )
                     else:
                         if text != state.last_partial_text:
@@ -124,7 +127,9 @@ def _start_runner(session_id: str, state: SessionState, config: ProviderConfig)
                                 state.partial_dialogue_id,
                             )
                             state.last_partial_text = text
-                            socketio.emit(
+                            from app.sockets_core.emit_batcher import emit_batcher
+
+                            emit_batcher.emit(
                                 "stt_partial",
                                 {
                                     "workshop_id": ctx.workshop_id,
@@ -132,7 +137,7 @@ def _start_runner(session_id: str, state: SessionState, config: ProviderConfig)
                                     "text": text,
                                     "startTs": start_time,
                                 },
-                                to=f"workshop_room_{ctx.workshop_id}",
+                                f"workshop_room_{ctx.workshop_id}",
                             )
 
         writer_task = asyncio.create_task(_audio_writer())
@@ -10,7 +10,7 @@ from sqlalchemy import select
 
 from app.extensions import db, socketio
 from app.models import Transcript, Workshop, LLMUsageLog, ActivityLog, WorkshopParticipant
-from app.utils.llm_bedrock import get_bedrock_runtime_client
+from app.utils.llm_bedrock import bedrock_admission, estimate_tokens, get_bedrock_runtime_client
 import re
 from app.utils.telemetry import log_event
 
@@ -46,12 +46,13 @@ def _invoke_nova(prompt: str, model_id: str) -> str:
             "topP": 0.9,
         },
     }
-    resp = br.invoke_model(
-        modelId=model_id,
-        contentType="application/json",
-        accept="application/json",
-        body=json.dumps(body).encode("utf-8"),
-    )
+    with bedrock_admission.slot(model_id, tokens=estimate_tokens(prompt, 800)):
+        resp = br.invoke_model(
+            modelId=model_id,
+            contentType="application/json",
+            accept="application/json",
+            body=json.dumps(body).encode("utf-8"),
+        )
     out = json.loads(resp["body"].read().decode("utf-8"))
     return out.get("results", [{}])[0].get("outputText", "").strip()
 
@@ -51,7 +51,7 @@ def speak() -> Response | tuple[Response, int]:
         fmt = fmt.lower()
 
         provider = get_provider(provider_name)
-        mime = "audio/mpeg" if (provider.name == "polly" and fmt == "mp3") else "audio/wav"
+        mime = "audio/mpeg" if (provider.name in ("polly", "fake") and fmt == "mp3") else "audio/wav"
 
         def generate() -> Iterator[bytes]:
             try:
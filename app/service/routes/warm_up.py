@@ -17,6 +17,8 @@ from app.utils.data_aggregation import get_pre_workshop_context_json
 from app.utils.json_utils import extract_json_block
 from app.utils.llm_bedrock import get_chat_llm
 from app.utils.telemetry import log_event
+from app.utils.single_flight import single_flight
+from app.utils.llm_usage import track_llm_usage
 
 
 class WarmupGenerationError(RuntimeError):
@@ -560,6 +562,8 @@ def _build_facilitator_panel(content: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+@single_flight("warm_up")
+@track_llm_usage("warm_up")
 def get_warm_up_payload(workshop_id: int, phase_context: Optional[str] = None) -> Dict[str, Any]:
     ws = db.session.get(Workshop, workshop_id)
     if not ws:
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import os
+
+from app.config import Config
+from .fake_provider import FakeSpeechProvider
 from .piper_provider import PiperProvider
 try:
     from .polly_provider import PollyProvider  # optional
@@ -10,6 +13,8 @@ except Exception:  # pragma: no cover - optional dependency
 
 def get_provider(name: str | None = None):
     name = (name or os.getenv("TTS_PROVIDER", "piper")).lower()
+    if name == "fake" or (name == "polly" and Config.AWS_BACKEND == "fake"):
+        return FakeSpeechProvider()
     if name == "polly" and PollyProvider is not None:
         region = os.getenv("AWS_REGION", "us-east-1")
         return PollyProvider(region=region)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import struct
+from typing import Iterable, Optional
+
+from .base import SynthesisProvider
+
+_WORDS_PER_MINUTE = 150
+_WAV_RATE = 8000
+# Silent MPEG-1 Layer III frame: 128 kbps, 44.1 kHz, 417 bytes, 1152 samples.
+_MP3_FRAME = b"\xff\xfb\x90\x64" + b"\x00" * 413
+_MP3_FRAMES_PER_SECOND = 44100 / 1152
+
+
+class FakeSpeechProvider(SynthesisProvider):
+    """Offline Polly stand-in (``AWS_BACKEND=fake``): silent audio sized to the text, evenly spaced word marks."""
+
+    name = "fake"
+
+    @staticmethod
+    def _duration_seconds(text: str, speed: float) -> float:
+        words = max(1, len(text.split()))
+        return words * 60.0 / (_WORDS_PER_MINUTE * max(0.25, float(speed or 1.0)))
+
+    def synth_stream(self, text: str, *, voice: str | None = None, speed: float = 1.0, fmt: str = "wav") -> Iterable[bytes]:
+        seconds = self._duration_seconds(text, speed)
+        if fmt == "mp3":
+            frames = int(seconds * _MP3_FRAMES_PER_SECOND) + 1
+            for start in range(0, frames, 32):
+                yield _MP3_FRAME * min(32, frames - start)
+            return
+        data_len = int(seconds * _WAV_RATE) * 2
+        yield b"RIFF" + struct.pack("<I", 36 + data_len) + b"WAVE" + b"fmt " + struct.pack(
+            "<IHHIIHH", 16, 1, 1, _WAV_RATE, _WAV_RATE * 2, 2, 16
+        ) + b"data" + struct.pack("<I", data_len)
+        CHUNK = 16384
+        for start in range(0, data_len, CHUNK):
+            yield b"\x00" * min(CHUNK, data_len - start)
+
+    def get_word_marks(self, text: str, *, voice: Optional[str] = None, speed: float = 1.0) -> list[dict]:
+        words = text.split()
+        if not words:
+            return []
+        step = self._duration_seconds(text, speed) * 1000.0 / len(words)
+        return [{"time": int(index * step), "value": word} for index, word in enumerate(words)]
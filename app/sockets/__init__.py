@@ -22,10 +22,9 @@ try:  # Defensive: only import if core is present
         emit_workshop_resumed,
         emit_warm_up_start,
         emit_task_ready,
-        _room_presence,
-        _sid_registry,
         _broadcast_participant_list,
     )
+    from app.sockets_core.presence import presence  # type: ignore
 except Exception:  # pragma: no cover - fail silently; routes will error making issue visible
     pass
 
@@ -39,7 +38,6 @@ __all__ = [
     "emit_workshop_resumed",
     "emit_warm_up_start",
     "emit_task_ready",
-    "_room_presence",
-    "_sid_registry",
     "_broadcast_participant_list",
+    "presence",
 ]
@@ -32,6 +32,7 @@ from flask import current_app
 
 from app import socketio  # assumes global socketio instance in app.__init__
 from app.models import db, Transcript, Dialogue, Workshop, WorkshopParticipant
+from app.sockets_core.emit_batcher import emit_batcher
 from app.transcription import ProviderConfig
 from app.transcription.factory import create_provider
 
@@ -376,7 +377,7 @@ def stt_start(data):
                             except Exception:
                                 sp_first = None
                                 sp_last = None
-                            socketio.emit('transcript_final', {  # type: ignore[arg-type]
+                            emit_batcher.emit('transcript_final', {
                                 'workshop_id': workshop_id,
                                 'transcript_id': transcript.transcript_id,
                                 'user_id': user_id,
@@ -387,7 +388,7 @@ def stt_start(data):
                                 'text': evt.text,
                                 'startTs': evt.start_time,
                                 'endTs': evt.end_time,
-                            }, to=f'workshop_room_{workshop_id}')  # type: ignore[arg-type]
+                            }, f'workshop_room_{workshop_id}')
                         else:
                             # Persist or update a single in-progress Dialogue row for this speaker.
                             sess_ref = _sessions.get(key)  # type: ignore[arg-type]
@@ -417,12 +418,12 @@ def stt_start(data):
                                 if last_text != evt.text:
                                     sess_ref['last_partial_text'] = evt.text
                                     sess_ref['partials'] = sess_ref.get('partials', 0) + 1
-                                    socketio.emit('stt_partial', {  # type: ignore[arg-type]
+                                    emit_batcher.emit('stt_partial', {
                                         'workshop_id': workshop_id,
                                         'user_id': user_id,
                                         'text': evt.text,
                                         'startTs': evt.start_time,
-                                    }, to=f'workshop_room_{workshop_id}')  # type: ignore[arg-type]
+                                    }, f'workshop_room_{workshop_id}')
                     except Exception:  # pragma: no cover - defensive
                         log.exception('Result handling error')
             feeder_task = asyncio.create_task(_feeder())
@@ -619,7 +620,7 @@ def stt_audio_chunk(data):
                     except Exception:
                         sp_first = None
                         sp_last = None
-                    socketio.emit('transcript_final', {
+                    emit_batcher.emit('transcript_final', {
                         'workshop_id': workshop_id,
                         'transcript_id': transcript.transcript_id,
                         'user_id': user_id,
@@ -630,7 +631,7 @@ def stt_audio_chunk(data):
                         'text': text,
                         'startTs': None,
                         'endTs': None,
-                    }, to=f'workshop_room_{workshop_id}')
+                    }, f'workshop_room_{workshop_id}')
             else:
                 import json as _json
                 try:
@@ -654,12 +655,12 @@ def stt_audio_chunk(data):
                     if last_text != ptext:
                         sess['last_partial_text'] = ptext
                         sess['partials'] = sess.get('partials', 0) + 1
-                        socketio.emit('stt_partial', {
+                        emit_batcher.emit('stt_partial', {
                             'workshop_id': workshop_id,
                             'user_id': user_id,
                             'text': ptext,
                             'startTs': None,
-                        }, to=f'workshop_room_{workshop_id}')
+                        }, f'workshop_room_{workshop_id}')
             sess['last_chunk_ts'] = time.time()
         except Exception as e:  # noqa
             log.exception('[SIMPLE VOSK] processing error')
@@ -767,7 +768,7 @@ def stt_stop(data):
                 except Exception:
                     sp_first = None
                     sp_last = None
-                socketio.emit('transcript_final', {
+                emit_batcher.emit('transcript_final', {
                     'workshop_id': workshop_id,
                     'transcript_id': transcript.transcript_id,
                     'user_id': user_id,
@@ -776,7 +777,7 @@ def stt_stop(data):
                     'text': ftext,
                     'startTs': None,
                     'endTs': None,
-                }, to=f'workshop_room_{workshop_id}')
+                }, f'workshop_room_{workshop_id}')
         except Exception:
             log.exception('[SIMPLE VOSK] finalization error')
         stats = _sessions.pop(key, None) or sess
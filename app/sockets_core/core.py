@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import json
-import threading
 import time
 from collections import defaultdict
 from datetime import datetime
@@ -15,7 +14,7 @@ from sqlalchemy import func
 from sqlalchemy.orm import selectinload  # type: ignore
 
 from app.config import TASK_SEQUENCE  # type: ignore
-from app.assistant.assistant_socket import emit_assistant_state
+from app.assistant.assistant_socket import emit_assistant_timer_state
 from app.extensions import socketio, db  # type: ignore
 from app.models import (
     User,
@@ -35,11 +34,22 @@ from app.service.routes.moderator import (
     initialize_participant_tracking,  # type: ignore
     cleanup_participant_tracking,  # type: ignore
 )
+from app.assistant.tools.metric import room_join_sync
+from app.sockets_core.emit_batcher import emit_batcher
+from app.sockets_core.join_admission import join_admission
+from app.sockets_core.presence import PresenceChange, presence
+from app.sockets_core.room_state import (
+    CHAT_HISTORY_LIMIT,
+    CHAT_SCOPES,
+    VIEWER_EVENTS,
+    RoomSnapshot,
+    chat_key,
+    merge_participant_dots,
+    room_state,
+)
+from app.sockets_core.timer_scheduler import phase_timers
+from app.sockets_core.vote_tally import CLUSTER_VOTING, GENERIC_VOTING, TaskTally, vote_tallies
 
-_sid_registry: Dict[str, Dict] = {}
-_room_presence: Dict[str, set] = defaultdict(set)
-_timer_thread: threading.Thread | None = None
-_timer_thread_stop = threading.Event()
 # Last-known presentation viewer state per (workshop_id, task_id)
 _presentation_state: Dict[Tuple[int, int], dict] = {}
 # Last-known feasibility viewer state per (workshop_id, task_id)
@@ -52,160 +62,43 @@ _action_plan_state: Dict[Tuple[int, int], dict] = {}
 _ui_flags: DefaultDict[int, Dict[str, Any]] = defaultdict(dict)
 
 
-def _timer_loop():
-    while not _timer_thread_stop.is_set():
-        try:
-            time.sleep(1)
-            active_workshops = Workshop.query.filter(
-                Workshop.status.in_(["inprogress", "paused"])
-            ).all()
-            for ws in active_workshops:
-                room = f"workshop_room_{ws.id}"
-                if not ws.current_task_id:
-                    continue
-                remaining = ws.get_remaining_task_time()
-                emit_timer_sync(
-                    room,
-                    {
-                        "task_id": ws.current_task_id,
-                        "remaining_seconds": remaining,
-                        "is_paused": ws.status == "paused",
-                    },
-                    workshop_id=ws.id,
-                )
-                if ws.status == "inprogress" and remaining <= 0:
-                    task = ws.current_task
-                    if not task or task.status != "running":
-                        continue
-                    task.status = "completed"
-                    task.ended_at = datetime.utcnow()
-                    db.session.commit()
-                    current_app.logger.info(
-                        f"Auto-completed task {task.id} for workshop {ws.id} due to time expiry"
-                    )
-                    socketio.emit(
-                        "task_completed",
-                        {"task_id": task.id, "workshop_id": ws.id},
-                        to=room,
-                    )
-                    if getattr(ws, "auto_advance_enabled", True) and (
-                        getattr(ws, "auto_advance_after_seconds", 0) or 0
-                    ) >= 0:
-                        delay = int(
-                            getattr(ws, "auto_advance_after_seconds", 0) or 0
-                        )
-                        if delay > 0:
-                            time.sleep(min(delay, 5))
-                        try:
-                            from app.workshop.advance import (
-                                advance_to_next_task,  # type: ignore
-                            )
-
-                            ok, err = advance_to_next_task(ws.id)
-                            if not ok:
-                                if isinstance(err, str) and "No more tasks" in err:
-                                    try:
-                                        ws.status = "completed"
-                                        ws.current_task_id = None
-                                        ws.timer_start_time = None
-                                        ws.timer_paused_at = None
-                                        ws.timer_elapsed_before_pause = 0
-                                        db.session.commit()
-                                        socketio.emit(
-                                            "workshop_stopped",
-                                            {"workshop_id": ws.id},
-                                            to=room,
-                                        )
-                                        current_app.logger.info(
-                                            f"Workshop {ws.id} completed at end of sequence (auto-advance)"
-                                        )
-                                    except Exception as ce:  # noqa
-                                        db.session.rollback()
-                                        current_app.logger.error(
-                                            f"Error completing workshop {ws.id} at end of sequence: {ce}"
-                                        )
-                                else:
-                                    ws.current_task_id = None
-                                    ws.timer_start_time = None
-                                    ws.timer_paused_at = None
-                                    ws.timer_elapsed_before_pause = 0
-                                    db.session.commit()
-                        except Exception as e:  # noqa
-                            current_app.logger.error(
-                                f"Auto-advance failure for workshop {ws.id}: {e}"
-                            )
-                    else:
-                        ws.current_task_id = None
-                        ws.timer_start_time = None
-                        ws.timer_paused_at = None
-                        ws.timer_elapsed_before_pause = 0
-                        db.session.commit()
-        except Exception as e:  # noqa
-            current_app.logger.error(f"Timer loop error: {e}", exc_info=True)
-
-
 def start_timer_thread():
-    global _timer_thread
-    if _timer_thread and _timer_thread.is_alive():
-        return
-    _timer_thread_stop.clear()
-    _timer_thread = threading.Thread(
-        target=_timer_loop, name="workshop-timer", daemon=True
-    )
-    _timer_thread.start()
+    """Start the deadline-driven phase timer dispatcher (see timer_scheduler)."""
+    phase_timers.start(current_app._get_current_object())  # type: ignore[attr-defined]
 
 
 def stop_timer_thread():
-    if _timer_thread:
-        _timer_thread_stop.set()
+    phase_timers.stop()
 
 
-def _get_participant_payload(workshop_id: int) -> List[dict]:
+def _participant_entries(workshop_id: int, user_ids: List[int]) -> List[dict]:
+    """Participant list rows for ``user_ids`` of the workshop (users without an account row are skipped)."""
+    if not user_ids:
+        return []
     workshop = db.session.get(Workshop, workshop_id)
     if not workshop:
         return []
 
     facilitator_roles = {"organizer", "facilitator", "admin"}
 
-    def _normalize_id(value: Any) -> Optional[int]:
-        try:
-            return int(value)
-        except (TypeError, ValueError):
-            return None
-
-    target_workshop_id = _normalize_id(workshop_id)
-    if target_workshop_id is None:
-        return []
-
-    online_ids: set[int] = set()
-    for info in _sid_registry.values():
-        if _normalize_id(info.get("workshop_id")) != target_workshop_id:
-            continue
-        normalized_user_id = _normalize_id(info.get("user_id"))
-        if normalized_user_id is not None:
-            online_ids.add(normalized_user_id)
-
-    if not online_ids:
-        return []
-
     participants = (
         db.session.query(WorkshopParticipant)
         .options(selectinload(WorkshopParticipant.user))  # type: ignore[arg-type]
-        .filter(WorkshopParticipant.workshop_id == target_workshop_id)
-        .filter(WorkshopParticipant.user_id.in_(online_ids))
+        .filter(WorkshopParticipant.workshop_id == workshop_id)
+        .filter(WorkshopParticipant.user_id.in_(user_ids))
         .all()
     )
     participants_by_user_id = {p.user_id: p for p in participants}
 
     users = (
         db.session.query(User)
-        .filter(User.user_id.in_(online_ids))
+        .filter(User.user_id.in_(user_ids))
         .all()
     )
     users_by_id = {u.user_id: u for u in users}
 
     payload: List[dict] = []
-    for user_id in sorted(online_ids):
+    for user_id in sorted(user_ids):
         user = users_by_id.get(user_id)
         if not user:
             continue
@@ -248,12 +141,40 @@ def _get_participant_payload(workshop_id: int) -> List[dict]:
     return payload
 
 
+def _get_participant_payload(workshop_id: int) -> List[dict]:
+    _, online_ids = presence.online(workshop_id)
+    return _participant_entries(int(workshop_id), online_ids)
+
+
+def _participant_list_payload(workshop_id: int) -> dict:
+    version, online_ids = presence.online(workshop_id)
+    return {
+        "workshop_id": int(workshop_id),
+        "version": version,
+        "participants": _participant_entries(int(workshop_id), online_ids),
+    }
+
+
 def _broadcast_participant_list(room: str, workshop_id: int):
-    emit(
-        "participant_list_update",
-        {"workshop_id": workshop_id, "participants": _get_participant_payload(workshop_id)},
-        to=room,
-    )
+    """Full participant list to the whole room; routine presence changes use ``_emit_presence_change``."""
+    socketio.emit("participant_list_update", _participant_list_payload(workshop_id), to=room)
+
+
+def _emit_presence_change(change: Optional[PresenceChange]) -> None:
+    """Send ``participant_joined``/``participant_left`` to the workshop's rooms when a user came or went."""
+    if change is None or not change.changed:
+        return
+    workshop_id, user_id = change.entry.workshop_id, change.entry.user_id
+    rooms = set(presence.rooms(workshop_id)) | {change.entry.room}
+    payload: Dict[str, Any] = {"workshop_id": workshop_id, "version": change.version, "user_id": user_id}
+    if change.online:
+        entries = _participant_entries(workshop_id, [user_id])
+        # Sent even without a row so clients' versions stay contiguous.
+        event, payload["participant"] = "participant_joined", (entries[0] if entries else None)
+    else:
+        event = "participant_left"
+    for room in rooms:
+        emit_batcher.emit(event, payload, room)
 
 
 @socketio.on("connect")
@@ -268,35 +189,349 @@ def _on_disconnect():  # type: ignore
     if not isinstance(sid, str):
         current_app.logger.warning("Disconnect with invalid SID: %s", sid)
         return
-    info = _sid_registry.pop(sid, None)
-    if info:
-        room, workshop_id, user_id = (
-            info["room"],
-            info["workshop_id"],
-            info["user_id"],
+    change = presence.remove(sid)
+    if change:
+        entry = change.entry
+        current_app.logger.debug(
+            f"Client {sid} disconnected from {entry.room} (user {entry.user_id})"
         )
-        if room in _room_presence:
-            _room_presence[room].discard(user_id)
-            if workshop_id and user_id:
-                cleanup_participant_tracking(workshop_id, user_id)
-            current_app.logger.debug(
-                f"Client {sid} disconnected from {room} (user {user_id})"
-            )
-            if _room_presence[room]:
-                _broadcast_participant_list(room, workshop_id)
-            else:
-                del _room_presence[room]
-                current_app.logger.debug(f"Cleaned up empty room: {room}")
+        if change.changed:
+            cleanup_participant_tracking(entry.workshop_id, entry.user_id)
+            _emit_presence_change(change)
     else:
-        # This can happen if the client already emitted leave_room, we replaced an older SID,
+        # This can happen if the client already emitted leave_room, never joined a room,
         # or cleanup happened earlier in another handler. Treat as benign.
         current_app.logger.debug(
             f"SID {sid} not found in presence tracking during disconnect (likely already cleaned up)."
         )
 
 
+def _load_chat_history(workshop_id: int, scope: str) -> List[dict]:
+    """Last ``CHAT_HISTORY_LIMIT`` chat messages, oldest first; ``scope`` '*' means unfiltered."""
+    q = ChatMessage.query.filter_by(workshop_id=workshop_id)
+    try:
+        if scope in CHAT_SCOPES:
+            q = q.filter(ChatMessage.chat_scope == scope)  # type: ignore[attr-defined]
+    except Exception:
+        pass
+    chat_history = (
+        q
+        .order_by(ChatMessage.timestamp.desc())
+        .limit(CHAT_HISTORY_LIMIT)
+        .all()
+    )
+    chat_history.reverse()
+    history_payload = []
+    for msg in chat_history:
+        try:
+            mtype = getattr(msg, 'message_type', 'user')
+        except Exception:
+            mtype = 'user'
+        try:
+            cscope = getattr(msg, 'chat_scope', 'workshop_chat')
+        except Exception:
+            cscope = 'workshop_chat'
+        history_payload.append({
+            "user_name": msg.username,
+            "message": msg.message,
+            "timestamp": msg.timestamp.isoformat(),
+            "message_type": mtype,
+            "chat_scope": cscope,
+        })
+    return history_payload
+
+
+def _build_room_snapshot(workshop_id: int) -> Optional[RoomSnapshot]:
+    """Read the room-wide join state of a workshop from the database (see room_state)."""
+    workshop = db.session.get(Workshop, workshop_id)
+    if not workshop:
+        return None
+    snap = RoomSnapshot(workshop_id=workshop_id, status=workshop.status)
+    if not (workshop.current_task_id and workshop.current_task):
+        current_app.logger.debug(
+            f"Workshop {workshop_id} has no active task upon join."
+        )
+        return snap
+    task = workshop.current_task
+    remaining_seconds = workshop.get_remaining_task_time()
+    # Re-arm the phase deadline if this process hasn't seen it (e.g. after a restart)
+    if workshop.status in ("inprogress", "paused"):
+        phase_timers.ensure(
+            int(workshop.id),
+            int(task.id),
+            remaining_seconds,
+            paused=workshop.status == "paused",
+            total_seconds=task.duration,
+        )
+    current_task_index = (
+        workshop.current_task_index
+        if workshop.current_task_index is not None
+        else -1
+    )
+    current_task_type = (
+        (task.task_type or "").strip().lower()
+        if getattr(task, "task_type", None)
+        else ""
+    )
+    if not current_task_type:
+        try:
+            ordered_items = (
+                WorkshopPlanItem.query.filter_by(
+                    workshop_id=workshop_id, enabled=True
+                )
+                .order_by(WorkshopPlanItem.order_index.asc())
+                .all()
+            )
+            if 0 <= current_task_index < len(ordered_items):
+                current_task_type = (
+                    ordered_items[current_task_index].task_type or ""
+                ).strip().lower() or "unknown"
+            else:
+                current_task_type = (
+                    TASK_SEQUENCE[current_task_index]
+                    if 0 <= current_task_index < len(TASK_SEQUENCE)
+                    else "unknown"
+                )
+        except Exception:  # noqa
+            current_task_type = (
+                TASK_SEQUENCE[current_task_index]
+                if 0 <= current_task_index < len(TASK_SEQUENCE)
+                else "unknown"
+            )
+    if current_task_index == -1:
+        current_task_type = "warm-up"
+    current_app.logger.debug(
+        f"Building room snapshot for task {task.id} (Type: {current_task_type}, Index: {current_task_index})"
+    )
+    snap.task_id = task.id
+    snap.task_type = current_task_type
+    snap.timer = {
+        "task_id": task.id,
+        "remaining_seconds": remaining_seconds,
+        "is_paused": workshop.status == "paused",
+        "at": time.time(),
+    }
+    task_details: dict[str, Any] = {}
+    # Prefer payload_json (may include server-augmented fields like feasibility_pdf_url)
+    raw_json: str | None = None
+    try:
+        raw_json = getattr(task, 'payload_json', None) or getattr(task, 'prompt', None)
+    except Exception:
+        raw_json = getattr(task, 'prompt', None)
+    try:
+        task_details = json.loads(raw_json) if raw_json else {}
+    except json.JSONDecodeError:
+        current_app.logger.warning(
+            f"Could not parse task JSON for task {task.id}"
+        )
+        task_details = {"error": "Could not load task details."}
+    event_name = "task_ready"
+    payload = {
+        "task_id": task.id,
+        "title": task.title,
+        "duration": task.duration,
+        "task_type": current_task_type,
+        "task_index": current_task_index,
+        **task_details,
+    }
+    if current_task_type == "warm-up":
+        event_name = "warm_up_start"
+    elif current_task_type == "clustering_voting":
+        event_name = "clusters_ready"
+        participants_data = WorkshopParticipant.query.filter_by(
+            workshop_id=workshop_id, status="accepted"
+        ).all()
+        payload["participants_dots"] = {
+            part.user_id: part.dots_remaining for part in participants_data
+        }
+        try:
+            # Expose configured dots per user for clearer client instructions
+            payload["dots_per_user"] = int(getattr(workshop, "dots_per_user", 5) or 5)
+        except Exception:
+            payload["dots_per_user"] = 5
+    elif current_task_type == "results_feasibility":
+        event_name = "feasibility_ready"
+    elif current_task_type == "results_prioritization":
+        event_name = "prioritization_ready"
+    elif current_task_type == "results_action_plan":
+        event_name = "action_plan_ready"
+    elif current_task_type == "summary":
+        event_name = "summary_ready"
+    elif current_task_type == "discussion":
+        event_name = "discussion_ready"
+    elif current_task_type == "vote_generic":
+        event_name = "vote_ready"
+    snap.task_event = (event_name, payload)
+    # Persisted UI flags (e.g., organizer toggles) for late joiners
+    snap.ui_flags = dict(_ui_flags.get(int(workshop_id), {}))
+    # Last-known viewer state of the presentation/report viewers so late joiners align
+    viewer_states = {
+        "presentation": _presentation_state,
+        "results_feasibility": _feasibility_state,
+        "results_prioritization": _prioritization_state,
+        "results_action_plan": _action_plan_state,
+    }
+    if current_task_type in viewer_states:
+        st = viewer_states[current_task_type].get((int(workshop_id), int(task.id)))
+        if st:
+            snap.viewer = (VIEWER_EVENTS[current_task_type], dict(st))
+    if current_task_type in ["warm-up", "brainstorming", "discussion"]:
+        include_flag = True
+        try:
+            payload_blob = json.loads(task.payload_json) if task.payload_json else {}
+            if isinstance(payload_blob, dict):
+                include_flag = bool(payload_blob.get("ai_ideas_include_in_outputs", True))
+        except Exception:
+            include_flag = True
+        ideas = (
+            BrainstormIdea.query.filter_by(task_id=task.id)
+            .options(selectinload(BrainstormIdea.participant).selectinload(WorkshopParticipant.user))  # type: ignore[arg-type]
+            .order_by(BrainstormIdea.timestamp)
+            .all()
+        )
+        ideas_payload = []
+        for idea in ideas:
+            try:
+                username = (
+                    idea.participant.user.first_name
+                    or idea.participant.user.email.split("@")[0]
+                    if idea.participant and idea.participant.user
+                    else "Unknown"
+                )
+            except Exception:
+                username = "Unknown"
+            metadata: Any = None
+            raw_meta = getattr(idea, "metadata_json", None)
+            if raw_meta:
+                try:
+                    metadata = json.loads(raw_meta)
+                except Exception:
+                    metadata = raw_meta
+            ideas_payload.append(
+                {
+                    "idea_id": idea.id,
+                    "user": username,
+                    "content": idea.content,
+                    "timestamp": idea.timestamp.isoformat(),
+                    "source": getattr(idea, "source", "human"),
+                    "rationale": getattr(idea, "rationale", None),
+                    "metadata": metadata,
+                    "include_in_outputs": bool(getattr(idea, "include_in_outputs", True)),
+                }
+            )
+        snap.board["whiteboard_sync"] = {"ideas": ideas_payload, "ai_ideas_include_in_outputs": include_flag}
+    elif current_task_type == "clustering_voting":
+        # Votes not yet written behind are in the live tally (checked first: a stale one flushes)
+        live = vote_tallies.view(workshop_id, task.id)
+        clusters_with_votes = (
+            db.session.query(
+                IdeaCluster, func.count(IdeaVote.id).label("vote_count")
+            )
+            .outerjoin(IdeaVote, IdeaCluster.id == IdeaVote.cluster_id)
+            .filter(IdeaCluster.task_id == task.id)
+            .group_by(IdeaCluster.id)
+            .all()
+        )
+        snap.board["all_votes_sync"] = {
+            "votes": {
+                cluster.id: live[0].get(str(cluster.id), 0) if live is not None else count
+                for cluster, count in clusters_with_votes
+            }
+        }
+        if live is not None:
+            merge_participant_dots(snap, live[1])
+    elif current_task_type == "vote_generic":
+        live = vote_tallies.view(workshop_id, task.id)
+        # Count votes per (item_type,item_id) for this task
+        rows = (
+            db.session.query(GenericVote.item_type, GenericVote.item_id, func.count(GenericVote.id))
+            .filter(GenericVote.task_id == task.id)
+            .group_by(GenericVote.item_type, GenericVote.item_id)
+            .all()
+        )
+        counts = {f"{t}:{i}": c for (t, i, c) in rows}
+        if live is not None:
+            counts = {key: count for key, count in live[0].items() if count}
+            merge_participant_dots(snap, live[1])
+        snap.board["generic_votes_sync"] = {"counts": counts}
+    return snap
+
+
+def _emit_user_state(sid: str, snap: RoomSnapshot, workshop_id: int, user_id: Any) -> None:
+    """Per-user join state that is not part of the room snapshot: the timer and the user's own votes."""
+    if snap.task_id is None:
+        return
+    timer = phase_timers.get(workshop_id)
+    if timer is not None and timer.task_id == snap.task_id:
+        timer_payload = {
+            "task_id": snap.task_id,
+            "remaining_seconds": timer.remaining_seconds(),
+            "is_paused": timer.paused,
+        }
+    else:
+        timer_payload = snap.timer_state()
+    if timer_payload:
+        emit_timer_sync(sid, timer_payload, workshop_id=workshop_id)
+    mine = vote_tallies.user_items(workshop_id, snap.task_id, user_id)
+    if mine is not None:
+        if snap.task_type == "clustering_voting":
+            emit("user_votes_sync", {"voted_cluster_ids": [int(cid) for cid in mine]}, to=sid)
+        else:
+            emit("generic_user_votes_sync", {"items": mine}, to=sid)
+    elif snap.task_type == "clustering_voting":
+        # The set of clusters this participant has already voted on
+        try:
+            participant = WorkshopParticipant.query.filter_by(
+                workshop_id=workshop_id, user_id=user_id, status="accepted"
+            ).first()
+            if participant:
+                voted_cluster_ids = (
+                    db.session.query(IdeaVote.cluster_id)
+                    .join(IdeaCluster, IdeaCluster.id == IdeaVote.cluster_id)
+                    .filter(
+                        IdeaVote.participant_id == participant.id,
+                        IdeaCluster.task_id == snap.task_id,
+                    )
+                    .all()
+                )
+                voted_cluster_ids = [cid for (cid,) in voted_cluster_ids]
+                emit("user_votes_sync", {"voted_cluster_ids": voted_cluster_ids}, to=sid)
+                current_app.logger.debug(
+                    f"Emitted user_votes_sync with {len(voted_cluster_ids)} clusters for participant {participant.id}"
+                )
+        except Exception as e:  # noqa
+            current_app.logger.warning(
+                f"Failed emitting user_votes_sync for workshop {workshop_id}, user {user_id}: {e}"
+            )
+    elif snap.task_type == "vote_generic":
+        # User's selected items
+        try:
+            participant = WorkshopParticipant.query.filter_by(
+                workshop_id=workshop_id, user_id=user_id, status="accepted"
+            ).first()
+            if participant:
+                mine = (
+                    db.session.query(GenericVote.item_type, GenericVote.item_id)
+                    .filter(GenericVote.task_id == snap.task_id, GenericVote.participant_id == participant.id)
+                    .all()
+                )
+                mine_keys = [f"{t}:{i}" for (t, i) in mine]
+                emit("generic_user_votes_sync", {"items": mine_keys}, to=sid)
+        except Exception as e:
+            current_app.logger.warning(f"Failed generic vote sync for workshop {workshop_id}: {e}")
+
+
 @socketio.on("join_room")
 def _on_join_room(data):  # type: ignore
+    """Register the SID in the room and bring the client up to date.
+
+    Clients that send ``room_epoch``/``room_version`` (the last ``room_version``
+    they saw) get one ``room_delta`` or ``room_snapshot``; others get the
+    individual state events. Both are served from the shared room snapshot.
+    During a reconnect storm the join may instead be answered with
+    ``room_syncing`` and a ``retry_after_ms`` (see ``join_admission``).
+    """
+    started = time.monotonic()
     room = data.get("room")
     workshop_id = data.get("workshop_id")
     user_id = data.get("user_id")
@@ -307,45 +542,28 @@ def _on_join_room(data):  # type: ignore
     if not all([room, workshop_id, user_id]):
         current_app.logger.warning(f"join_room incomplete data from {sid}: {data}")
         return
+    try:
+        wid = int(workshop_id)
+    except (TypeError, ValueError):
+        current_app.logger.warning(f"join_room invalid workshop_id from {sid}: {data}")
+        return
+    scope = data.get("scope") or "workshop_chat"
     # If this SID is already registered in the same room/workshop/user, avoid re-sending full state.
     # Treat re-emits as a lightweight scope/history refresh only to prevent client/server loops.
-    existing_entry = _sid_registry.get(sid)
+    existing_entry = presence.get(sid)
     if (
         existing_entry
-        and existing_entry.get("room") == room
-        and existing_entry.get("workshop_id") == workshop_id
-        and existing_entry.get("user_id") == user_id
+        and existing_entry.room == room
+        and existing_entry.workshop_id == wid
+        and str(existing_entry.user_id) == str(user_id)
     ):
         try:
-            scope = data.get("scope") or "workshop_chat"
-            q = ChatMessage.query.filter_by(workshop_id=workshop_id)
-            try:
-                if scope in ("workshop_chat", "discussion_chat"):
-                    q = q.filter(ChatMessage.chat_scope == scope)  # type: ignore[attr-defined]
-            except Exception:
-                pass
-            chat_history = (
-                q.order_by(ChatMessage.timestamp.desc()).limit(50).all()
-            )
-            chat_history.reverse()
-            history_payload = []
-            for msg in chat_history:
-                try:
-                    mtype = getattr(msg, "message_type", "user")
-                except Exception:
-                    mtype = "user"
-                try:
-                    cscope = getattr(msg, "chat_scope", "workshop_chat")
-                except Exception:
-                    cscope = "workshop_chat"
-                history_payload.append(
-                    {
-                        "user_name": msg.username,
-                        "message": msg.message,
-                        "timestamp": msg.timestamp.isoformat(),
-                        "message_type": mtype,
-                        "chat_scope": cscope,
-                    }
+            snap = room_state.snapshot(wid, lambda: _build_room_snapshot(wid))
+            if snap is None:
+                history_payload = _load_chat_history(wid, chat_key(scope))
+            else:
+                history_payload = room_state.chat_history(
+                    wid, snap, scope, lambda key: _load_chat_history(wid, key)
                 )
             emit("chat_history", {"messages": history_payload}, to=sid)
             current_app.logger.debug(
@@ -356,346 +574,71 @@ def _on_join_room(data):  # type: ignore
                 f"Failed lightweight chat history emit for workshop {workshop_id}, SID {sid}: {e}"
             )
         return
-    existing_sid = None
-    for s, info in list(_sid_registry.items()):
-        if info.get("workshop_id") == workshop_id and info.get("user_id") == user_id:
-            existing_sid = s
-            break
-    if existing_sid and existing_sid != sid:
-        current_app.logger.warning(
-            f"User {user_id} already in room {room} with SID {existing_sid}. Removing old entry."
+    admission = join_admission.try_admit(wid, user_id)
+    if not admission.admitted:
+        emit("room_syncing", admission.syncing_payload(workshop_id=wid, room=room), to=sid)
+        current_app.logger.debug(
+            f"join_room deferred for user {user_id} in {room}: retry in {admission.retry_after:.2f}s"
         )
-        _sid_registry.pop(existing_sid, None)
-        if room in _room_presence:
-            _room_presence[room].discard(user_id)
+        return
+    if existing_entry and existing_entry.workshop_id != wid:
+        # The socket moved to another workshop: that one may have lost the user.
+        _emit_presence_change(presence.remove(sid))
     join_room(room)
-    _sid_registry[sid] = {
-        "room": room,
-        "workshop_id": workshop_id,
-        "user_id": user_id,
-    }
-    if room not in _room_presence:
-        _room_presence[room] = set()
-    _room_presence[room].add(user_id)
+    # Users may hold several sockets (tabs, a reconnect racing the old socket's
+    # disconnect); only the first one in the workshop announces them.
+    change = presence.add(sid, room, wid, user_id)
+    if change is None:
+        current_app.logger.warning(f"join_room invalid user_id from {sid}: {data}")
+        return
     current_app.logger.info(f"User {user_id} (SID: {sid}) joined {room}")
-    _broadcast_participant_list(room, workshop_id)
-    initialize_participant_tracking(workshop_id, user_id)
+    emit("participant_list_update", _participant_list_payload(wid), to=sid)
+    _emit_presence_change(change)
+    initialize_participant_tracking(wid, change.entry.user_id)
     try:
-        workshop = db.session.get(Workshop, workshop_id)
-        if not workshop:
+        snap = room_state.snapshot(wid, lambda: _build_room_snapshot(wid))
+        if snap is None:
             return
-        emit(
-            "workshop_status_update",
-            {"workshop_id": workshop_id, "status": workshop.status},
-            to=sid,
-        )
-        if workshop.current_task_id and workshop.current_task:
-            task = workshop.current_task
-            remaining_seconds = workshop.get_remaining_task_time()
-            current_task_index = (
-                workshop.current_task_index
-                if workshop.current_task_index is not None
-                else -1
-            )
-            current_task_type = (
-                (task.task_type or "").strip().lower()
-                if getattr(task, "task_type", None)
-                else ""
-            )
-            if not current_task_type:
-                try:
-                    ordered_items = (
-                        WorkshopPlanItem.query.filter_by(
-                            workshop_id=workshop_id, enabled=True
-                        )
-                        .order_by(WorkshopPlanItem.order_index.asc())
-                        .all()
-                    )
-                    if 0 <= current_task_index < len(ordered_items):
-                        current_task_type = (
-                            ordered_items[current_task_index].task_type or ""
-                        ).strip().lower() or "unknown"
-                    else:
-                        current_task_type = (
-                            TASK_SEQUENCE[current_task_index]
-                            if 0 <= current_task_index < len(TASK_SEQUENCE)
-                            else "unknown"
-                        )
-                except Exception:  # noqa
-                    current_task_type = (
-                        TASK_SEQUENCE[current_task_index]
-                        if 0 <= current_task_index < len(TASK_SEQUENCE)
-                        else "unknown"
-                    )
-            if current_task_index == -1:
-                current_task_type = "warm-up"
-            current_app.logger.debug(
-                f"Syncing state for task {task.id} (Type: {current_task_type}, Index: {current_task_index})"
-            )
-            task_details: dict[str, Any] = {}
-            # Prefer payload_json (may include server-augmented fields like feasibility_pdf_url)
-            raw_json: str | None = None
-            try:
-                raw_json = getattr(task, 'payload_json', None) or getattr(task, 'prompt', None)
-            except Exception:
-                raw_json = getattr(task, 'prompt', None)
-            try:
-                task_details = json.loads(raw_json) if raw_json else {}
-            except json.JSONDecodeError:
-                current_app.logger.warning(
-                    f"Could not parse task JSON for task {task.id}"
-                )
-                task_details = {"error": "Could not load task details."}
-            event_name = "task_ready"
-            payload = {
-                "task_id": task.id,
-                "title": task.title,
-                "duration": task.duration,
-                "task_type": current_task_type,
-                "task_index": current_task_index,
-                **task_details,
-            }
-            if current_task_type == "warm-up":
-                event_name = "warm_up_start"
-            elif current_task_type == "clustering_voting":
-                event_name = "clusters_ready"
-                participants_data = WorkshopParticipant.query.filter_by(
-                    workshop_id=workshop_id, status="accepted"
-                ).all()
-                payload["participants_dots"] = {
-                    part.user_id: part.dots_remaining for part in participants_data
-                }
-                try:
-                    # Expose configured dots per user for clearer client instructions
-                    payload["dots_per_user"] = int(getattr(workshop, "dots_per_user", 5) or 5)
-                except Exception:
-                    payload["dots_per_user"] = 5
-            elif current_task_type == "results_feasibility":
-                event_name = "feasibility_ready"
-            elif current_task_type == "results_prioritization":
-                event_name = "prioritization_ready"
-            elif current_task_type == "results_action_plan":
-                event_name = "action_plan_ready"
-            elif current_task_type == "summary":
-                event_name = "summary_ready"
-            elif current_task_type == "discussion":
-                event_name = "discussion_ready"
-            elif current_task_type == "vote_generic":
-                event_name = "vote_ready"
-            current_app.logger.debug(
-                f"Emitting {event_name} to {sid} for task {task.id}"
-            )
-            emit(event_name, payload, to=sid)
-            # Emit any persisted UI flags (e.g., organizer toggles) to late joiners
-            try:
-                wid = int(workshop_id)
-                flags = _ui_flags.get(wid, {})
-                for k, v in flags.items():
-                    emit('ui_hint', { 'workshop_id': wid, 'key': k, 'value': v }, to=sid)
-            except Exception:
-                pass
-            # If current task is presentation, also send last-known viewer state so late joiners align
-            try:
-                if current_task_type == "presentation":
-                    key = (int(workshop_id), int(task.id))
-                    st = _presentation_state.get(key)
-                    if st:
-                        emit("presentation_sync", st, to=sid)
-                elif current_task_type == "results_feasibility":
-                    # Emit last-known feasibility viewer state (page/zoom/fit) if any
-                    key = (int(workshop_id), int(task.id))
-                    fst = _feasibility_state.get(key)
-                    if fst:
-                        emit("feasibility_sync", fst, to=sid)
-                elif current_task_type == "results_prioritization":
-                    key = (int(workshop_id), int(task.id))
-                    pst = _prioritization_state.get(key)
-                    if pst:
-                        emit("prioritization_sync", pst, to=sid)
-                elif current_task_type == "results_action_plan":
-                    key = (int(workshop_id), int(task.id))
-                    ast = _action_plan_state.get(key)
-                    if ast:
-                        emit("action_plan_sync", ast, to=sid)
-            except Exception:
-                pass
-            try:
-                wid_int = int(workshop_id) if workshop_id is not None else None
-            except (TypeError, ValueError):
-                wid_int = None
-            emit_timer_sync(
-                sid,
+        versioned = "room_version" in data
+        delta = room_state.delta(wid, data.get("room_epoch"), data.get("room_version")) if versioned else None
+        if delta is not None:
+            version, events = delta
+            emit(
+                "room_delta",
                 {
-                    "task_id": task.id,
-                    "remaining_seconds": remaining_seconds,
-                    "is_paused": workshop.status == "paused",
+                    "workshop_id": wid,
+                    "epoch": data.get("room_epoch"),
+                    "since": data.get("room_version"),
+                    "version": version,
+                    "events": events,
                 },
-                workshop_id=wid_int,
+                to=sid,
             )
-            if current_task_type in ["warm-up", "brainstorming", "discussion"]:
-                include_flag = True
-                try:
-                    payload_blob = json.loads(task.payload_json) if task.payload_json else {}
-                    if isinstance(payload_blob, dict):
-                        include_flag = bool(payload_blob.get("ai_ideas_include_in_outputs", True))
-                except Exception:
-                    include_flag = True
-                ideas = (
-                    BrainstormIdea.query.filter_by(task_id=task.id)
-                    .order_by(BrainstormIdea.timestamp)
-                    .all()
-                )
-                ideas_payload = []
-                for idea in ideas:
-                    try:
-                        username = (
-                            idea.participant.user.first_name
-                            or idea.participant.user.email.split("@")[0]
-                            if idea.participant and idea.participant.user
-                            else "Unknown"
-                        )
-                    except Exception:
-                        username = "Unknown"
-                    metadata: Any = None
-                    raw_meta = getattr(idea, "metadata_json", None)
-                    if raw_meta:
-                        try:
-                            metadata = json.loads(raw_meta)
-                        except Exception:
-                            metadata = raw_meta
-                    ideas_payload.append(
-                        {
-                            "idea_id": idea.id,
-                            "user": username,
-                            "content": idea.content,
-                            "timestamp": idea.timestamp.isoformat(),
-                            "source": getattr(idea, "source", "human"),
-                            "rationale": getattr(idea, "rationale", None),
-                            "metadata": metadata,
-                            "include_in_outputs": bool(getattr(idea, "include_in_outputs", True)),
-                        }
-                    )
+            room_join_sync.labels(mode="delta").inc()
+            current_app.logger.debug(f"Emitted room_delta with {len(events)} events to {sid}")
+        else:
+            epoch, version, events = room_state.render(
+                wid, snap, scope, lambda key: _load_chat_history(wid, key)
+            )
+            if versioned:
                 emit(
-                    "whiteboard_sync",
-                    {"ideas": ideas_payload, "ai_ideas_include_in_outputs": include_flag},
+                    "room_snapshot",
+                    {
+                        "workshop_id": wid,
+                        "epoch": epoch,
+                        "version": version,
+                        "events": [{"event": name, "data": payload} for name, payload in events],
+                    },
                     to=sid,
                 )
-                current_app.logger.debug(
-                    f"Emitted whiteboard_sync with {len(ideas_payload)} ideas to {sid}"
-                )
-            elif current_task_type == "clustering_voting":
-                clusters_with_votes = (
-                    db.session.query(
-                        IdeaCluster, func.count(IdeaVote.id).label("vote_count")
-                    )
-                    .outerjoin(IdeaVote, IdeaCluster.id == IdeaVote.cluster_id)
-                    .filter(IdeaCluster.task_id == task.id)
-                    .group_by(IdeaCluster.id)
-                    .all()
-                )
-                votes_payload = {cluster.id: count for cluster, count in clusters_with_votes}
-                emit("all_votes_sync", {"votes": votes_payload}, to=sid)
-                current_app.logger.debug(
-                    f"Emitted all_votes_sync with counts for {len(votes_payload)} clusters to {sid}"
-                )
-                # Also emit the set of clusters this participant has already voted on
-                try:
-                    participant = WorkshopParticipant.query.filter_by(
-                        workshop_id=workshop_id, user_id=user_id, status="accepted"
-                    ).first()
-                    if participant:
-                        voted_cluster_ids = (
-                            db.session.query(IdeaVote.cluster_id)
-                            .join(IdeaCluster, IdeaCluster.id == IdeaVote.cluster_id)
-                            .filter(
-                                IdeaVote.participant_id == participant.id,
-                                IdeaCluster.task_id == task.id,
-                            )
-                            .all()
-                        )
-                        voted_cluster_ids = [cid for (cid,) in voted_cluster_ids]
-                        emit("user_votes_sync", {"voted_cluster_ids": voted_cluster_ids}, to=sid)
-                        current_app.logger.debug(
-                            f"Emitted user_votes_sync with {len(voted_cluster_ids)} clusters for participant {participant.id}"
-                        )
-                except Exception as e:  # noqa
-                    current_app.logger.warning(
-                        f"Failed emitting user_votes_sync for workshop {workshop_id}, user {user_id}: {e}"
-                    )
-            elif current_task_type == "vote_generic":
-                # Sync generic vote counts and user's voted items
-                try:
-                    # Parse task prompt/payload items
-                    items: list[Any] = []
-                    try:
-                        details = json.loads(task.prompt) if task.prompt else {}
-                        if isinstance(details, dict):
-                            raw_items = details.get('items')
-                            if isinstance(raw_items, list):
-                                items = raw_items
-                    except Exception:
-                        items = []
-                    # Count votes per (item_type,item_id) for this task
-                    rows = (
-                        db.session.query(GenericVote.item_type, GenericVote.item_id, func.count(GenericVote.id))
-                        .filter(GenericVote.task_id == task.id)
-                        .group_by(GenericVote.item_type, GenericVote.item_id)
-                        .all()
-                    )
-                    counts = {f"{t}:{i}": c for (t, i, c) in rows}
-                    emit("generic_votes_sync", {"counts": counts}, to=sid)
-                    # User's selected items
-                    participant = WorkshopParticipant.query.filter_by(
-                        workshop_id=workshop_id, user_id=user_id, status="accepted"
-                    ).first()
-                    if participant:
-                        mine = (
-                            db.session.query(GenericVote.item_type, GenericVote.item_id)
-                            .filter(GenericVote.task_id == task.id, GenericVote.participant_id == participant.id)
-                            .all()
-                        )
-                        mine_keys = [f"{t}:{i}" for (t, i) in mine]
-                        emit("generic_user_votes_sync", {"items": mine_keys}, to=sid)
-                except Exception as e:
-                    current_app.logger.warning(f"Failed generic vote sync for workshop {workshop_id}: {e}")
-        else:
-            current_app.logger.debug(
-                f"Workshop {workshop_id} has no active task upon join."
-            )
-            emit("no_active_task", {}, to=sid)
-        # Optional chat scope filter (defaults to 'workshop_chat')
-        scope = data.get('scope') or 'workshop_chat'
-        q = ChatMessage.query.filter_by(workshop_id=workshop_id)
-        try:
-            if scope in ('workshop_chat', 'discussion_chat'):
-                q = q.filter(ChatMessage.chat_scope == scope)  # type: ignore[attr-defined]
-        except Exception:
-            pass
-        chat_history = (
-            q
-            .order_by(ChatMessage.timestamp.desc())
-            .limit(50)
-            .all()
-        )
-        chat_history.reverse()
-        history_payload = []
-        for msg in chat_history:
-            try:
-                mtype = getattr(msg, 'message_type', 'user')
-            except Exception:
-                mtype = 'user'
-            try:
-                cscope = getattr(msg, 'chat_scope', 'workshop_chat')
-            except Exception:
-                cscope = 'workshop_chat'
-            history_payload.append({
-                "user_name": msg.username,
-                "message": msg.message,
-                "timestamp": msg.timestamp.isoformat(),
-                "message_type": mtype,
-                "chat_scope": cscope,
-            })
-        emit("chat_history", {"messages": history_payload}, to=sid)
+                room_join_sync.labels(mode="snapshot").inc()
+            else:
+                for name, payload in events:
+                    emit(name, payload, to=sid)
+                room_join_sync.labels(mode="events").inc()
+            current_app.logger.debug(f"Emitted room state ({len(events)} events, v{version}) to {sid}")
+        _emit_user_state(sid, snap, wid, user_id)
+        join_admission.observe_join(admission, time.monotonic() - started)
     except Exception as e:  # noqa
         current_app.logger.error(
             f"Error during join_room state emission for workshop {workshop_id}, SID {sid}: {e}",
@@ -714,30 +657,29 @@ def _on_leave_room(data):  # type: ignore
         current_app.logger.warning(f"leave_room incomplete data from {sid}: {data}")
         return
     leave_room(room)
-    if room in _room_presence:
-        _room_presence[room].discard(user_id)
-    if sid in _sid_registry:
-        _sid_registry.pop(sid)
-        if workshop_id and user_id:
-            cleanup_participant_tracking(workshop_id, user_id)
+    entry = presence.get(sid) if isinstance(sid, str) else None
+    if isinstance(sid, str) and entry is not None and entry.room == room:
+        change = presence.remove(sid)
+        if change and change.changed:
+            cleanup_participant_tracking(entry.workshop_id, entry.user_id)
+            _emit_presence_change(change)
         current_app.logger.info(f"User {user_id} (SID: {sid}) left {room}")
     else:
         current_app.logger.warning(
             f"SID {sid} emitted leave_room but was not in registry for room {room}."
         )
-    if room in _room_presence and _room_presence[room]:
-        _broadcast_participant_list(room, workshop_id)
-    elif room in _room_presence:
-        del _room_presence[room]
 
 
 @socketio.on("request_participant_list")
 def _on_request_participant_list(data):  # type: ignore
-    room = data.get("room")
+    """Full participant list for the requesting socket (e.g. after it saw a presence version gap)."""
     workshop_id = data.get("workshop_id")
-    if not all([room, workshop_id]):
+    sid = getattr(request, "sid", None) if has_request_context() else None
+    try:
+        wid = int(workshop_id)
+    except (TypeError, ValueError):
         return
-    _broadcast_participant_list(room, workshop_id)
+    emit("participant_list_update", _participant_list_payload(wid), to=sid)
 
 
 @socketio.on("send_message")
@@ -784,7 +726,8 @@ def _on_send_message(data):  # type: ignore
             pass
         db.session.add(chat_message)
         db.session.commit()
-        emit(
+        room_state.broadcast(
+            int(workshop_id),
             "receive_message",
             {
                 "user_name": chat_message.username,
@@ -794,7 +737,7 @@ def _on_send_message(data):  # type: ignore
                 "chat_scope": getattr(chat_message, 'chat_scope', 'workshop_chat'),
                 "room": room,
             },
-            to=room,
+            room,
         )
     except Exception as e:  # noqa
         db.session.rollback()
@@ -809,12 +752,12 @@ def _on_send_message(data):  # type: ignore
 
 
 def emit_warm_up_start(room: str, payload: dict):  # type: ignore
-    socketio.emit("warm_up_start", payload, to=room)
+    room_state.broadcast(_extract_workshop_id(room, payload), "warm_up_start", payload, room, db_writes=None)
     current_app.logger.info(f"Emitted warm_up_start to {room}")
 
 
 def emit_task_ready(room: str, payload: dict):  # type: ignore
-    socketio.emit("task_ready", payload, to=room)
+    room_state.broadcast(_extract_workshop_id(room, payload), "task_ready", payload, room, db_writes=None)
     current_app.logger.info(
         f"Emitted task_ready to {room} for task {payload.get('task_id')}"
     )
@@ -873,7 +816,7 @@ def _on_presentation_control(data):  # type: ignore
                 _presentation_state[(wid, tid)] = dict(payload)
         except Exception:
             pass
-        socketio.emit("presentation_sync", payload, to=room)
+        room_state.broadcast(workshop_id, "presentation_sync", payload, room)
     except Exception as e:  # noqa
         current_app.logger.warning(f"presentation_control error: {e}")
 
@@ -936,7 +879,7 @@ def _on_feasibility_control(data):  # type: ignore
                 _feasibility_state[(wid, tid)] = dict(payload)
         except Exception:
             pass
-        socketio.emit("feasibility_sync", payload, to=room)
+        room_state.broadcast(workshop_id, "feasibility_sync", payload, room)
     except Exception as e:  # noqa
         current_app.logger.warning(f"feasibility_control error: {e}")
 
@@ -992,7 +935,7 @@ def _on_prioritization_control(data):  # type: ignore
                 _prioritization_state[(wk_id, tk_id)] = dict(payload)
         except Exception:
             pass
-        socketio.emit("prioritization_sync", payload, to=room)
+        room_state.broadcast(workshop_id, "prioritization_sync", payload, room)
     except Exception as e:  # noqa
         current_app.logger.warning(f"prioritization_control error: {e}")
 
@@ -1048,7 +991,7 @@ def _on_action_plan_control(data):  # type: ignore
                 _action_plan_state[(wk_id, tk_id)] = dict(payload)
         except Exception:
             pass
-        socketio.emit("action_plan_sync", payload, to=room)
+        room_state.broadcast(workshop_id, "action_plan_sync", payload, room)
     except Exception as e:  # noqa
         current_app.logger.warning(f"action_plan_control error: {e}")
 
@@ -1084,12 +1027,12 @@ def _on_facilitator_tts_event(data):  # type: ignore
                     uid = 0
                 if touch_facilitator_playback is not None:
                     touch_facilitator_playback(int(workshop_id))
-                socketio.emit('stt_partial', {
+                emit_batcher.emit('stt_partial', {
                     'workshop_id': int(workshop_id),
                     'user_id': uid,
                     'entry_type': 'facilitator',
                     'text': str(partial),
-                }, to=room)
+                }, room)
             except Exception:
                 pass
             return
@@ -1107,12 +1050,12 @@ def _on_facilitator_tts_event(data):  # type: ignore
                         uid = int(getattr(fac_user, 'user_id', 0) or 0)
                     except Exception:
                         uid = 0
-                    socketio.emit('stt_partial', {
+                    emit_batcher.emit('stt_partial', {
                         'workshop_id': int(workshop_id),
                         'user_id': uid,
                         'entry_type': 'facilitator',
                         'text': '',  # signal to remove
-                    }, to=room)
+                    }, room)
             except Exception:
                 pass
             return
@@ -1287,7 +1230,7 @@ def _on_facilitator_tts_event(data):  # type: ignore
                 # Safe datetime formatting
                 _st = getattr(recent, 'start_timestamp', None)
                 _et = getattr(recent, 'end_timestamp', None)
-                socketio.emit('transcript_final', {
+                emit_batcher.emit('transcript_final', {
                     'workshop_id': int(workshop_id),
                     'transcript_id': int(getattr(recent, 'transcript_id', 0) or 0),
                     'user_id': int(user_id) if user_id else 0,
@@ -1298,7 +1241,7 @@ def _on_facilitator_tts_event(data):  # type: ignore
                     'text': text.strip(),
                     'startTs': _st.isoformat() if _st else None,
                     'endTs': _et.isoformat() if _et else datetime.utcnow().isoformat(),
-                }, to=room)
+                }, room)
             except Exception as _e:
                 db.session.rollback()
                 raise
@@ -1307,6 +1250,93 @@ def _on_facilitator_tts_event(data):  # type: ignore
         db.session.rollback()
         current_app.logger.error(f"facilitator_tts_event error: {e}")
 
+def _generic_vote_items(task: BrainstormTask) -> List[str]:
+    """``type:id`` keys of the items a vote_generic task lets participants vote on."""
+    keys: List[str] = []
+    try:
+        payload = json.loads(task.prompt) if task.prompt else {}
+    except Exception:
+        return keys
+    items = payload.get("items") if isinstance(payload, dict) else None
+    for it in items if isinstance(items, list) else []:
+        if isinstance(it, dict):
+            t = str(it.get("type") or "").strip()
+            i = str(it.get("id") or "").strip()
+            if t and i:
+                keys.append(f"{t}:{i}")
+    return keys
+
+
+def _load_vote_tally(workshop_id: int) -> Optional[TaskTally]:
+    """Read the voting state of the workshop's current task for ``vote_tallies``."""
+    workshop = db.session.get(Workshop, workshop_id)
+    if not workshop:
+        return None
+    tally = TaskTally(workshop_id=workshop_id, status=workshop.status)
+    task = db.session.get(BrainstormTask, workshop.current_task_id) if workshop.current_task_id else None
+    if not task or task.task_type not in (CLUSTER_VOTING, GENERIC_VOTING):
+        return tally
+    tally.task_id = task.id
+    tally.kind = task.task_type
+    participants = WorkshopParticipant.query.filter_by(workshop_id=workshop_id, status="accepted").all()
+    by_id = {p.id: p for p in participants}
+    tally.participants = {int(p.user_id): p.id for p in participants}
+    if task.task_type == CLUSTER_VOTING:
+        tally.items = frozenset(
+            str(cid) for (cid,) in db.session.query(IdeaCluster.id).filter(IdeaCluster.task_id == task.id)
+        )
+        votes = [
+            (pid, str(cid), int(dots or 0))
+            for pid, cid, dots in db.session.query(IdeaVote.participant_id, IdeaVote.cluster_id, IdeaVote.dots_used)
+            .join(IdeaCluster, IdeaCluster.id == IdeaVote.cluster_id)
+            .filter(IdeaCluster.task_id == task.id)
+        ]
+    else:
+        tally.items = frozenset(_generic_vote_items(task))
+        votes = [
+            (pid, f"{t}:{i}", 1)
+            for pid, t, i in db.session.query(GenericVote.participant_id, GenericVote.item_type, GenericVote.item_id)
+            .filter(GenericVote.task_id == task.id)
+        ]
+    used: DefaultDict[int, int] = defaultdict(int)
+    for pid, item, dots in votes:
+        tally.counts[item] = tally.counts.get(item, 0) + 1
+        used[pid] += dots
+        participant = by_id.get(pid)
+        if participant is not None:
+            tally.mine.setdefault(int(participant.user_id), set()).add(item)
+    for participant in participants:
+        remaining = max(0, int(participant.dots_remaining or 0))
+        tally.dots[int(participant.user_id)] = remaining
+        # The budget is what the participant started the round with, so un-voting restores dots up to it
+        tally.budgets[int(participant.user_id)] = remaining + used.get(participant.id, 0)
+    return tally
+
+
+def _cast_tallied_vote(sid: Optional[str], room: str, workshop_id: int, user_id: Any, kind: str, item: str) -> None:
+    """Decide a vote against the in-memory tally and acknowledge it to the voter.
+
+    The room learns the new counts from the coalesced ``all_votes_sync`` /
+    ``generic_votes_sync`` frames ``vote_tallies`` broadcasts.
+    """
+    result = vote_tallies.cast(workshop_id, int(user_id), kind, item, room, lambda: _load_vote_tally(workshop_id))
+    if result.action == "rejected":
+        current_app.logger.info(
+            f"{kind} vote by user {user_id} on {item} in workshop {workshop_id} rejected: {result.reason}"
+        )
+        return
+    ack: Dict[str, Any] = {
+        "total_votes": result.total,
+        "user_id": int(user_id),
+        "dots_remaining": result.dots_remaining,
+        "action_taken": result.action,
+    }
+    if kind == CLUSTER_VOTING:
+        socketio.emit("vote_update", {"cluster_id": int(item), **ack}, to=sid or room)
+    else:
+        socketio.emit("generic_vote_update", {"item_key": item, **ack}, to=sid or room)
+
+
 @socketio.on("submit_vote")
 def _on_submit_vote(data):  # type: ignore
     """Handle a participant casting a dot vote on a cluster during clustering_voting."""
@@ -1318,6 +1348,13 @@ def _on_submit_vote(data):  # type: ignore
     if not all([room, workshop_id, user_id, cluster_id]):
         current_app.logger.warning(f"submit_vote incomplete data from {sid}: {data}")
         return
+    if vote_tallies.enabled():
+        try:
+            _cast_tallied_vote(sid, room, int(workshop_id), user_id, CLUSTER_VOTING, str(int(cluster_id)))
+        except Exception as e:  # noqa
+            db.session.rollback()
+            current_app.logger.error(f"submit_vote failed for workshop {workshop_id}, user {user_id}: {e}", exc_info=True)
+        return
     try:
         workshop = db.session.get(Workshop, int(workshop_id))
         # Only allow voting when the workshop is actively in progress (reject when paused)
@@ -1387,7 +1424,8 @@ def _on_submit_vote(data):  # type: ignore
                 db.session.rollback()
                 raise
             total = IdeaVote.query.filter_by(cluster_id=cluster.id).count()
-            socketio.emit(
+            room_state.broadcast(
+                workshop.id,
                 "vote_update",
                 {
                     "cluster_id": cluster.id,
@@ -1396,7 +1434,8 @@ def _on_submit_vote(data):  # type: ignore
                     "dots_remaining": participant.dots_remaining,
                     "action_taken": "unvoted",
                 },
-                to=room,
+                room,
+                db_writes=1,
             )
             return
         # Cast vote
@@ -1409,7 +1448,8 @@ def _on_submit_vote(data):  # type: ignore
         participant.dots_remaining = max(0, (participant.dots_remaining or 0) - 1)
         db.session.commit()
         total = IdeaVote.query.filter_by(cluster_id=cluster.id).count()
-        socketio.emit(
+        room_state.broadcast(
+            workshop.id,
             "vote_update",
             {
                 "cluster_id": cluster.id,
@@ -1418,7 +1458,8 @@ def _on_submit_vote(data):  # type: ignore
                 "dots_remaining": participant.dots_remaining,
                 "action_taken": "voted",
             },
-            to=room,
+            room,
+            db_writes=1,
         )
     except Exception as e:  # noqa
         db.session.rollback()
@@ -1440,29 +1481,34 @@ def _on_submit_vote(data):  # type: ignore
 
 
 def emit_workshop_stopped(room: str, workshop_id: int):  # type: ignore
-    socketio.emit("workshop_stopped", {"workshop_id": workshop_id}, to=room)
+    room_state.broadcast(workshop_id, "workshop_stopped", {"workshop_id": workshop_id}, room, db_writes=None)
     current_app.logger.info(f"Emitted workshop_stopped to {room}")
 
 
 def emit_workshop_paused(room: str, workshop_id: int):  # type: ignore
-    socketio.emit("workshop_paused", {"workshop_id": workshop_id}, to=room)
+    room_state.broadcast(workshop_id, "workshop_paused", {"workshop_id": workshop_id}, room, db_writes=None)
     current_app.logger.info(f"Emitted workshop_paused to {room}")
 
 
 def emit_workshop_resumed(room: str, workshop_id: int):  # type: ignore
-    socketio.emit("workshop_resumed", {"workshop_id": workshop_id}, to=room)
+    room_state.broadcast(workshop_id, "workshop_resumed", {"workshop_id": workshop_id}, room, db_writes=None)
     current_app.logger.info(f"Emitted workshop_resumed to {room}")
 
 
 def emit_timer_sync(room: str, payload: dict, *, workshop_id: Optional[int] = None):  # type: ignore
-    socketio.emit("timer_sync", payload, to=room)
+    emit_batcher.emit("timer_sync", payload, room)
     current_app.logger.debug(f"Emitted timer_sync to {room}: {payload}")
 
     resolved_id = workshop_id if isinstance(workshop_id, int) else _extract_workshop_id(room, payload)
     if resolved_id is None:
         return
     try:
-        emit_assistant_state(resolved_id)
+        emit_assistant_timer_state(
+            resolved_id,
+            task_id=payload.get("task_id"),
+            remaining_seconds=payload.get("remaining_seconds"),
+            is_paused=bool(payload.get("is_paused")),
+        )
     except Exception:
         current_app.logger.exception(
             "assistant_state_emit_failed_timer_sync",
@@ -1497,8 +1543,8 @@ def _extract_workshop_id(room: str, payload: dict) -> Optional[int]:
 
 
 def emit_workshop_status_update(room: str, workshop_id: int, status: str):  # type: ignore
-    socketio.emit(
-        "workshop_status_update", {"workshop_id": workshop_id, "status": status}, to=room
+    room_state.broadcast(
+        workshop_id, "workshop_status_update", {"workshop_id": workshop_id, "status": status}, room, db_writes=None
     )
     current_app.logger.info(
         f"Emitted workshop_status_update ({status}) to {room}"
@@ -1544,12 +1590,12 @@ def _on_ui_hint(data):  # type: ignore
             _ui_flags[wid][key] = val
         except Exception:
             pass
-        # Broadcast the hint to all clients in the room
-        socketio.emit('ui_hint', {
+        # Broadcast the hint to all clients in the room (normalized value, as replayed to late joiners)
+        room_state.broadcast(workshop_id, 'ui_hint', {
             'workshop_id': workshop_id,
             'key': key,
-            'value': data.get('value')
-        }, to=room)
+            'value': _ui_flags.get(workshop_id, {}).get(key, data.get('value'))
+        }, room)
     except Exception as e:  # noqa
         current_app.logger.warning(f"ui_hint error: {e}")
 
@@ -1570,6 +1616,17 @@ def _on_submit_vote_generic(data):  # type: ignore
     if not all([room, workshop_id, user_id]) or not (item_key or (item_type and item_id)):
         current_app.logger.warning(f"submit_vote_generic incomplete data from {sid}: {data}")
         return
+    if vote_tallies.enabled():
+        if not item_key or ":" not in str(item_key):
+            item_key = f"{item_type}:{item_id}"
+        try:
+            _cast_tallied_vote(sid, room, int(workshop_id), user_id, GENERIC_VOTING, str(item_key).strip())
+        except Exception as e:  # noqa
+            db.session.rollback()
+            current_app.logger.error(
+                f"submit_vote_generic failed for workshop {workshop_id}, user {user_id}: {e}", exc_info=True
+            )
+        return
     try:
         workshop = db.session.get(Workshop, int(workshop_id))
         if not workshop or workshop.status not in ["inprogress"]:
@@ -1639,7 +1696,8 @@ def _on_submit_vote_generic(data):  # type: ignore
                 .filter_by(task_id=task.id, item_type=str(item_type), item_id=str(item_id))
                 .scalar()
             ) or 0
-            socketio.emit(
+            room_state.broadcast(
+                workshop.id,
                 "generic_vote_update",
                 {
                     "item_key": f"{item_type}:{item_id}",
@@ -1648,7 +1706,8 @@ def _on_submit_vote_generic(data):  # type: ignore
                     "dots_remaining": int(participant.dots_remaining or 0),
                     "action_taken": "unvoted",
                 },
-                to=room,
+                room,
+                db_writes=1,
             )
             return
         # New vote
@@ -1683,7 +1742,8 @@ def _on_submit_vote_generic(data):  # type: ignore
             .filter_by(task_id=task.id, item_type=str(item_type), item_id=str(item_id))
             .scalar()
         ) or 0
-        socketio.emit(
+        room_state.broadcast(
+            workshop.id,
             "generic_vote_update",
             {
                 "item_key": f"{item_type}:{item_id}",
@@ -1692,7 +1752,8 @@ def _on_submit_vote_generic(data):  # type: ignore
                 "dots_remaining": int(participant.dots_remaining or 0),
                 "action_taken": "voted",
             },
-            to=room,
+            room,
+            db_writes=1,
         )
     except Exception as e:  # noqa
         db.session.rollback()
@@ -1733,7 +1794,7 @@ def _on_forum_typing(data):  # type: ignore
         part = WorkshopParticipant.query.filter_by(workshop_id=workshop_id, user_id=user_id).first()
         if not part:
             return
-        socketio.emit(
+        emit_batcher.emit(
             "forum_typing",
             {
                 "workshop_id": workshop_id,
@@ -1741,7 +1802,7 @@ def _on_forum_typing(data):  # type: ignore
                 "user_id": user_id,
                 "is_typing": is_typing,
             },
-            to=room,
+            room,
         )
     except Exception as e:  # noqa
         current_app.logger.warning(f"forum_typing error: {e}")
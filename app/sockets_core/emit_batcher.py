@@ -0,0 +1,211 @@
+"""Coalescing of high-frequency room emits into batched frames.
+
+During brainstorming and voting a room receives a steady stream of small
+events (``new_idea``, vote counts, ``forum_typing``, ``timer_sync``,
+``stt_partial``, presence deltas, document progress), each its own Socket.IO
+frame to every member. ``emit_batcher.emit`` buffers these per target room for
+``EMIT_BATCH_WINDOW_MS`` and then sends one frame:
+
+- Events in ``_LATEST_WINS`` replace a buffered event of the same type and key
+  (typing per topic and user, timer per task, partial transcript per speaker,
+  vote count per item); ``_MERGE_FIELDS`` names dict fields that are merged
+  rather than replaced (partial vote tallies).
+- Events in ``_APPEND`` are kept, in order.
+- Anything else is sent at once, after the room's buffer, so events never
+  overtake each other.
+
+A window holding one event is sent as that event; more become one
+``event_batch`` frame ``{"events": [{"event", "data"}, ...]}`` (the shape of
+``room_snapshot``/``room_delta``) carrying the highest ``room_version`` inside.
+``static/js/socket_batch.js`` unwraps it into the page's regular handlers.
+Replies to the socket that made the request are never buffered.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from flask import current_app, has_app_context, has_request_context, request
+
+from app.assistant.tools.metric import socket_emit_batch_size, socket_frames_saved
+from app.extensions import socketio
+
+BATCH_EVENT = "event_batch"
+
+# event -> payload fields identifying what a newer event of the same type supersedes
+_LATEST_WINS: Dict[str, Tuple[str, ...]] = {
+    "forum_typing": ("topic_id", "user_id"),
+    "timer_sync": ("task_id",),
+    "stt_partial": ("user_id",),
+    "vote_update": ("cluster_id", "user_id"),
+    "generic_vote_update": ("item_key", "user_id"),
+    "all_votes_sync": (),
+    "generic_votes_sync": (),
+    "doc_processing_progress": ("documentId",),
+}
+# Partial updates: a newer event adds to these dict fields instead of replacing them
+_MERGE_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "all_votes_sync": ("votes", "participants_dots"),
+    "generic_votes_sync": ("counts", "participants_dots"),
+}
+_APPEND = frozenset({"new_idea", "participant_joined", "participant_left"})
+
+
+class _Pending:
+    __slots__ = ("due", "slots", "seq")
+
+    def __init__(self, due: float) -> None:
+        self.due = due
+        self.slots: "OrderedDict[Hashable, Tuple[str, Dict[str, Any]]]" = OrderedDict()
+        self.seq = 0
+
+
+class EmitBatcher:
+    """Per-room emit buffers flushed by a background thread (process-local)."""
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        # Held while taking a buffer and emitting it, so a flush and an immediate emit to the same room keep order
+        self._emit_lock = threading.RLock()
+        # target room (None for the whole namespace) -> buffered events, in order of first buffering
+        self._pending: "OrderedDict[Optional[str], _Pending]" = OrderedDict()
+        self._thread: Optional[threading.Thread] = None
+        self._app: Any = None
+
+    def _config(self, key: str, default: Any) -> Any:
+        app = current_app if has_app_context() else self._app
+        if app is None:
+            return default
+        return app.config.get(key, default)
+
+    def _window(self) -> float:
+        if not self._config("EMIT_BATCH_ENABLED", True):
+            return 0.0
+        return max(0.0, float(self._config("EMIT_BATCH_WINDOW_MS", 50))) / 1000.0
+
+    # ------------------------------------------------------------------
+    def emit(self, event: str, payload: Dict[str, Any], room: Optional[str] = None) -> None:
+        """Send ``event`` to ``room`` now or within the batch window, per the event's policy."""
+        batchable = event in _LATEST_WINS or event in _APPEND
+        window = self._window() if batchable else 0.0
+        if window <= 0 or (room is not None and has_request_context() and room == getattr(request, "sid", None)):
+            with self._emit_lock:
+                self._flush_room(room)
+                socketio.emit(event, payload, to=room)
+            return
+        if not self.start():
+            socketio.emit(event, payload, to=room)
+            return
+        max_events = int(self._config("EMIT_BATCH_MAX_EVENTS", 100))
+        with self._cond:
+            pending = self._pending.get(room)
+            if pending is None:
+                pending = self._pending[room] = _Pending(time.monotonic() + window)
+                self._cond.notify()
+            if event in _LATEST_WINS:
+                key: Hashable = (event,) + tuple(payload.get(name) for name in _LATEST_WINS[event])
+                previous = pending.slots.pop(key, None)
+                if previous is not None:
+                    payload = self._merge(event, previous[1], payload)
+                    socket_frames_saved.labels(event=event, reason="merged").inc()
+            else:
+                pending.seq += 1
+                key = pending.seq
+            pending.slots[key] = (event, payload)
+            full = len(pending.slots) >= max_events
+        if full:
+            self.flush(room)
+
+    @staticmethod
+    def _merge(event: str, older: Dict[str, Any], newer: Dict[str, Any]) -> Dict[str, Any]:
+        fields = _MERGE_FIELDS.get(event)
+        if not fields:
+            return newer
+        merged = dict(newer)
+        for name in fields:
+            if isinstance(older.get(name), dict) and isinstance(newer.get(name), dict):
+                merged[name] = {**older[name], **newer[name]}
+        return merged
+
+    def flush(self, room: Optional[str]) -> int:
+        """Send what is buffered for ``room`` now; returns the number of frames sent."""
+        with self._emit_lock:
+            return self._flush_room(room)
+
+    def flush_all(self) -> int:
+        with self._emit_lock:
+            with self._cond:
+                rooms = list(self._pending)
+            return sum(self._flush_room(room) for room in rooms)
+
+    def _flush_room(self, room: Optional[str]) -> int:
+        with self._cond:
+            pending = self._pending.pop(room, None)
+        if pending is None or not pending.slots:
+            return 0
+        events = list(pending.slots.values())
+        socket_emit_batch_size.observe(len(events))
+        if len(events) == 1:
+            socketio.emit(events[0][0], events[0][1], to=room)
+            return 1
+        frame: Dict[str, Any] = {"events": [{"event": event, "data": data} for event, data in events]}
+        versions = [data["room_version"] for _, data in events if isinstance(data.get("room_version"), int)]
+        if versions:
+            frame["room_version"] = max(versions)
+        socketio.emit(BATCH_EVENT, frame, to=room)
+        for event, _ in events[1:]:
+            socket_frames_saved.labels(event=event, reason="batched").inc()
+        return 1
+
+    # ------------------------------------------------------------------
+    def start(self, app: Any = None) -> bool:
+        """Start the flusher thread if needed; False when no app is known to run it."""
+        if app is None and has_app_context():
+            app = current_app._get_current_object()  # type: ignore[attr-defined]
+        if app is not None:
+            self._app = app
+        if self._app is None:
+            return False
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="emit-batcher", daemon=True)
+                self._thread.start()
+        return True
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                now = time.monotonic()
+                # Rooms are buffered in order of their first event, so the first one is due first.
+                first_due = next(iter(self._pending.values())).due
+                if first_due > now:
+                    self._cond.wait(timeout=first_due - now)
+                    continue
+                due = [room for room, pending in self._pending.items() if pending.due <= now]
+            try:
+                with self._app.app_context():
+                    for room in due:
+                        self.flush(room)
+            except Exception:
+                self._app.logger.exception("emit batch flush failed")
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "rooms": len(self._pending),
+                "events": sum(len(pending.slots) for pending in self._pending.values()),
+            }
+
+
+emit_batcher = EmitBatcher()
+
+
+__all__ = [
+    "BATCH_EVENT",
+    "EmitBatcher",
+    "emit_batcher",
+]
@@ -0,0 +1,247 @@
+"""Admission control for room joins during reconnect storms.
+
+A deploy restart or proxy hiccup makes every client reconnect at once. Each
+reconnect runs ``join_room`` (room state, participant list broadcast) and the
+assistant panel's ``join`` (context build), and an eventlet worker that falls
+behind misses heartbeats, which causes yet more reconnects.
+
+Joins now pass ``join_admission.try_admit`` before any of that work. Admission
+takes one token from a global bucket and one from the workshop's bucket (both
+refill continuously; a rate of 0 disables that bucket). When either is short
+the client gets a ``room_syncing`` (or ``assistant:syncing``) acknowledgement
+with a jittered ``retry_after_ms`` sized from the queue ahead of it, and joins
+again after that delay.
+
+Facilitators (the workshop creator and organizer/facilitator/admin roles) are
+admitted while any token is left; participants must leave
+``ROOM_JOIN_FACILITATOR_RESERVE`` of each bucket's burst untouched, and
+facilitators' retry estimates only count other facilitators. Roles are cached
+per workshop for a minute so deciding costs no query per attempt.
+"""
+from __future__ import annotations
+
+import random
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+from flask import current_app, has_app_context
+
+from app.assistant.tools.metric import room_join_admission, room_join_latency, room_join_queue_depth
+from app.extensions import db
+from app.models import Workshop, WorkshopParticipant
+
+FACILITATOR = "facilitator"
+PARTICIPANT = "participant"
+FACILITATOR_ROLES = frozenset({"organizer", "facilitator", "admin"})
+_ROLE_CACHE_SECONDS = 60.0
+_MIN_RETRY_SECONDS = 0.25
+# Deferred clients that never came back stop counting toward queue depth after this long.
+_DEFERRED_GRACE_SECONDS = 5.0
+_MAX_WORKSHOP_BUCKETS = 1024
+
+
+class _Bucket:
+    """Token bucket refilled at ``rate`` tokens per second up to ``burst``."""
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.level = self.burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.burst, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, floor: float, now: float) -> float:
+        """Seconds until one token can be taken while keeping ``floor`` tokens in reserve."""
+        self._refill(now)
+        need = 1.0 + floor - self.level
+        return 0.0 if need <= 0 else need / self.rate
+
+    def take(self) -> None:
+        self.level -= 1.0
+
+
+@dataclass
+class JoinDecision:
+    admitted: bool
+    priority: str
+    retry_after: float = 0.0
+    position: int = 0
+    # Seconds since this client's first deferred attempt (0 when admitted at once)
+    waited: float = 0.0
+
+    def syncing_payload(self, **extra: Any) -> Dict[str, Any]:
+        return {"retry_after_ms": int(self.retry_after * 1000), "position": self.position, **extra}
+
+
+class JoinAdmission:
+    """Global and per-workshop join buckets with facilitator priority (process-local)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._global: Optional[_Bucket] = None
+        self._workshops: "OrderedDict[int, _Bucket]" = OrderedDict()
+        # (workshop_id, user_id, kind) -> (first attempt, priority, expires)
+        self._deferred: Dict[Tuple[int, Any, str], Tuple[float, str, float]] = {}
+        self._roles: Dict[int, Tuple[float, FrozenSet[int]]] = {}
+        self._next_prune = 0.0
+        self._rng = random.Random()
+
+    def _config(self, key: str, default: float) -> float:
+        if has_app_context():
+            try:
+                return float(current_app.config.get(key, default))
+            except (TypeError, ValueError):
+                return default
+        return default
+
+    def enabled(self) -> bool:
+        return not has_app_context() or bool(current_app.config.get("ROOM_JOIN_ADMISSION_ENABLED", True))
+
+    # ------------------------------------------------------------------
+    def priority_for(self, workshop_id: int, user_id: Any) -> str:
+        try:
+            uid = int(user_id)
+        except (TypeError, ValueError):
+            return PARTICIPANT
+        now = time.monotonic()
+        cached = self._roles.get(workshop_id)
+        if cached is None or now - cached[0] >= _ROLE_CACHE_SECONDS:
+            facilitators: set[int] = set()
+            try:
+                workshop = db.session.get(Workshop, workshop_id)
+                if workshop is not None and workshop.created_by_id is not None:
+                    facilitators.add(int(workshop.created_by_id))
+                rows = (
+                    db.session.query(WorkshopParticipant.user_id)
+                    .filter(
+                        WorkshopParticipant.workshop_id == workshop_id,
+                        db.func.lower(WorkshopParticipant.role).in_(FACILITATOR_ROLES),
+                    )
+                    .all()
+                )
+                facilitators.update(int(user) for (user,) in rows)
+            except Exception:
+                current_app.logger.debug("join_admission: role lookup failed for workshop %s", workshop_id, exc_info=True)
+            cached = (now, frozenset(facilitators))
+            self._roles[workshop_id] = cached
+        return FACILITATOR if uid in cached[1] else PARTICIPANT
+
+    def _buckets(self, workshop_id: int) -> Tuple[Optional[_Bucket], Optional[_Bucket]]:
+        rate = self._config("ROOM_JOIN_RATE_PER_SECOND", 40.0)
+        if rate > 0 and self._global is None:
+            self._global = _Bucket(rate, self._config("ROOM_JOIN_BURST", 80.0))
+        workshop_bucket: Optional[_Bucket] = None
+        workshop_rate = self._config("ROOM_JOIN_WORKSHOP_RATE_PER_SECOND", 15.0)
+        if workshop_rate > 0:
+            workshop_bucket = self._workshops.get(workshop_id)
+            if workshop_bucket is None:
+                workshop_bucket = self._workshops[workshop_id] = _Bucket(
+                    workshop_rate, self._config("ROOM_JOIN_WORKSHOP_BURST", 30.0)
+                )
+                while len(self._workshops) > _MAX_WORKSHOP_BUCKETS:
+                    self._workshops.popitem(last=False)
+            else:
+                self._workshops.move_to_end(workshop_id)
+        return (self._global if rate > 0 else None), workshop_bucket
+
+    def _prune(self, now: float) -> None:
+        if now < self._next_prune:
+            return
+        self._next_prune = now + 1.0
+        for key in [key for key, (_, _, expires) in self._deferred.items() if expires <= now]:
+            del self._deferred[key]
+
+    def _publish_depth(self) -> None:
+        depth = {FACILITATOR: 0, PARTICIPANT: 0}
+        for _, priority, _ in self._deferred.values():
+            depth[priority] += 1
+        for priority, count in depth.items():
+            room_join_queue_depth.labels(priority=priority).set(count)
+
+    def try_admit(self, workshop_id: int, user_id: Any, *, kind: str = "room") -> JoinDecision:
+        """Admit the join now, or return the jittered delay after which the client should retry."""
+        if not self.enabled():
+            return JoinDecision(admitted=True, priority=PARTICIPANT)
+        priority = self.priority_for(workshop_id, user_id)
+        key = (workshop_id, user_id, kind)
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            buckets = [bucket for bucket in self._buckets(workshop_id) if bucket is not None]
+            reserve = 0.0 if priority == FACILITATOR else max(0.0, min(0.9, self._config("ROOM_JOIN_FACILITATOR_RESERVE", 0.25)))
+            wait = max([bucket.wait_time(reserve * bucket.burst, now) for bucket in buckets] or [0.0])
+            entry = self._deferred.get(key)
+            if wait <= 0:
+                for bucket in buckets:
+                    bucket.take()
+                waited = 0.0
+                if entry is not None:
+                    del self._deferred[key]
+                    waited = now - entry[0]
+                    self._publish_depth()
+                room_join_admission.labels(priority=priority, outcome="admitted").inc()
+                return JoinDecision(admitted=True, priority=priority, waited=waited)
+
+            # Queue position: facilitators only wait behind facilitators.
+            first_seen = entry[0] if entry is not None else now
+            ahead = sum(
+                1
+                for (ws_id, _, _), (seen, other, _) in self._deferred.items()
+                if ws_id == workshop_id and seen < first_seen and (priority == PARTICIPANT or other == FACILITATOR)
+            )
+            rate = min(bucket.rate for bucket in buckets)
+            estimate = wait + ahead / rate
+            retry_after = min(
+                self._config("ROOM_JOIN_MAX_RETRY_SECONDS", 20.0),
+                max(_MIN_RETRY_SECONDS, estimate * self._rng.uniform(0.5, 1.5)),
+            )
+            self._deferred[key] = (first_seen, priority, now + retry_after * 2 + _DEFERRED_GRACE_SECONDS)
+            self._publish_depth()
+            room_join_admission.labels(priority=priority, outcome="deferred").inc()
+            return JoinDecision(
+                admitted=False,
+                priority=priority,
+                retry_after=retry_after,
+                position=ahead + 1,
+                waited=now - first_seen,
+            )
+
+    def observe_join(self, decision: JoinDecision, handler_seconds: float) -> None:
+        """Record the client-visible join latency: time spent deferred plus the join handler itself."""
+        room_join_latency.labels(priority=decision.priority).observe(decision.waited + handler_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            depth = {FACILITATOR: 0, PARTICIPANT: 0}
+            for _, priority, _ in self._deferred.values():
+                depth[priority] += 1
+            return {
+                "deferred": depth,
+                "global_tokens": round(self._global.level, 2) if self._global else None,
+                "workshops": len(self._workshops),
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._global = None
+            self._workshops.clear()
+            self._deferred.clear()
+            self._roles.clear()
+
+
+join_admission = JoinAdmission()
+
+
+__all__ = [
+    "FACILITATOR",
+    "PARTICIPANT",
+    "JoinAdmission",
+    "JoinDecision",
+    "join_admission",
+]
@@ -0,0 +1,189 @@
+"""Workshop-indexed socket presence.
+
+Presence used to be a flat ``sid -> {room, workshop_id, user_id}`` dict plus a
+``room -> user ids`` dict. Listing one workshop's online users scanned every
+socket in the process, and every join or disconnect re-sent the full
+participant list to the room, so a join wave of N users cost O(N²) bytes.
+
+``PresenceRegistry`` indexes sockets as workshop -> user -> sids, so adding or
+removing a socket is O(1) and reports whether the *user* came online or went
+offline in that workshop (a second tab or a replaced connection does not).
+Each such transition bumps the workshop's presence ``version``; ``core`` then
+broadcasts a ``participant_joined``/``participant_left`` delta carrying it, and
+sends the full ``participant_list_update`` only to a joining socket or one that
+asks with ``request_participant_list`` (clients do so when they see a version
+gap).
+
+Like the room snapshots, presence is process-local.
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+
+def _normalize_id(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class SidEntry:
+    room: str
+    workshop_id: int
+    user_id: int
+
+
+@dataclass(frozen=True)
+class PresenceChange:
+    """Result of adding or removing one socket."""
+
+    entry: SidEntry
+    # True when the user had no other socket in the workshop (joined) / has none left (left)
+    changed: bool
+    # Whether the user still has a socket in the workshop afterwards
+    online: bool
+    version: int
+
+
+class _WorkshopPresence:
+    __slots__ = ("users", "rooms", "version")
+
+    def __init__(self) -> None:
+        self.users: Dict[int, Set[str]] = {}
+        # Sockets per room, so deltas reach the lobby and the workshop room alike
+        self.rooms: Dict[str, int] = {}
+        self.version = 0
+
+
+class PresenceRegistry:
+    """workshop -> user -> sids, plus the reverse sid -> entry map."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._sids: Dict[str, SidEntry] = {}
+        self._workshops: Dict[int, _WorkshopPresence] = {}
+
+    def add(self, sid: str, room: str, workshop_id: Any, user_id: Any) -> Optional[PresenceChange]:
+        """Register ``sid`` (moving it if it was in another room); None when the ids are not integers."""
+        wid, uid = _normalize_id(workshop_id), _normalize_id(user_id)
+        if wid is None or uid is None:
+            return None
+        entry = SidEntry(room=room, workshop_id=wid, user_id=uid)
+        with self._lock:
+            previous = self._sids.get(sid)
+            if previous == entry:
+                return PresenceChange(entry, False, True, self._workshops[wid].version)
+            if previous is not None and previous.workshop_id == wid and previous.user_id == uid:
+                # Same user moving rooms within the workshop (lobby -> room): not a leave and rejoin.
+                presence = self._workshops[wid]
+                self._sids[sid] = entry
+                self._uncount_room(presence, previous.room)
+                presence.rooms[room] = presence.rooms.get(room, 0) + 1
+                return PresenceChange(entry, False, True, presence.version)
+            if previous is not None:
+                self._discard(sid, previous)
+            self._sids[sid] = entry
+            presence = self._workshops.get(wid)
+            if presence is None:
+                presence = self._workshops[wid] = _WorkshopPresence()
+            sids = presence.users.get(uid)
+            came_online = sids is None
+            if sids is None:
+                sids = presence.users[uid] = set()
+                presence.version += 1
+            sids.add(sid)
+            presence.rooms[room] = presence.rooms.get(room, 0) + 1
+            return PresenceChange(entry, came_online, True, presence.version)
+
+    def remove(self, sid: str) -> Optional[PresenceChange]:
+        """Forget ``sid``; None when it was not registered."""
+        with self._lock:
+            entry = self._sids.pop(sid, None)
+            if entry is None:
+                return None
+            went_offline, version = self._discard(sid, entry)
+            return PresenceChange(entry, went_offline, not went_offline, version)
+
+    def _discard(self, sid: str, entry: SidEntry) -> tuple[bool, int]:
+        presence = self._workshops.get(entry.workshop_id)
+        if presence is None:
+            return False, 0
+        went_offline = False
+        sids = presence.users.get(entry.user_id)
+        if sids is not None:
+            sids.discard(sid)
+            if not sids:
+                del presence.users[entry.user_id]
+                presence.version += 1
+                went_offline = True
+        self._uncount_room(presence, entry.room)
+        # Empty workshops keep their entry so the version never goes backwards for clients.
+        return went_offline, presence.version
+
+    @staticmethod
+    def _uncount_room(presence: _WorkshopPresence, room: str) -> None:
+        count = presence.rooms.get(room, 0) - 1
+        if count > 0:
+            presence.rooms[room] = count
+        else:
+            presence.rooms.pop(room, None)
+
+    # ------------------------------------------------------------------
+    def get(self, sid: str) -> Optional[SidEntry]:
+        return self._sids.get(sid)
+
+    def online(self, workshop_id: Any) -> tuple[int, List[int]]:
+        """``(version, sorted user ids)`` of the workshop, read together."""
+        wid = _normalize_id(workshop_id)
+        with self._lock:
+            presence = self._workshops.get(wid) if wid is not None else None
+            if presence is None:
+                return 0, []
+            return presence.version, sorted(presence.users)
+
+    def rooms(self, workshop_id: Any) -> List[str]:
+        wid = _normalize_id(workshop_id)
+        with self._lock:
+            presence = self._workshops.get(wid) if wid is not None else None
+            return list(presence.rooms) if presence is not None else []
+
+    def room_users(self, room: str, workshop_id: Any) -> List[int]:
+        """Users of the workshop with at least one socket in ``room``."""
+        wid = _normalize_id(workshop_id)
+        with self._lock:
+            presence = self._workshops.get(wid) if wid is not None else None
+            if presence is None:
+                return []
+            return [
+                user_id
+                for user_id, sids in presence.users.items()
+                if any(self._sids[sid].room == room for sid in sids)
+            ]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "sockets": len(self._sids),
+                "workshops": sum(1 for presence in self._workshops.values() if presence.users),
+                "users": sum(len(presence.users) for presence in self._workshops.values()),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sids.clear()
+            self._workshops.clear()
+
+
+presence = PresenceRegistry()
+
+
+__all__ = [
+    "PresenceChange",
+    "PresenceRegistry",
+    "SidEntry",
+    "presence",
+]
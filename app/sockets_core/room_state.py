@@ -0,0 +1,511 @@
+"""Versioned per-workshop room snapshots for ``join_room``.
+
+``join_room`` used to rebuild the room state from the database on every join
+and reconnect (chat history, ideas, vote counts, the current task payload,
+viewer state), so a network blip that reconnects 200 participants ran that work
+200 times. The room-wide part of that state now lives in a ``RoomSnapshot``:
+
+- it is built from the database once (``core._build_room_snapshot``) and shared
+  by every joiner of that workshop;
+- room broadcasts go through ``room_state.broadcast``, which stamps the payload
+  with the room's monotonically increasing ``room_version``, appends it to a
+  bounded delta log and applies it to the snapshot in place;
+- commits to tracked workshop rows that no broadcast accounts for are noticed
+  through ``workshop_versions`` (see ``app.assistant.context_cache``), as are
+  broadcasts the snapshot cannot apply (a new task, the workshop stopping). The
+  snapshot is then rebuilt on the next join, and if its content changed the
+  version is bumped past a *barrier*: clients older than that get the snapshot
+  rather than a delta.
+
+A client that sends ``room_epoch``/``room_version`` with ``join_room`` receives
+one ``room_delta`` (the logged events it missed) while the log still covers its
+version, otherwise one ``room_snapshot``. Clients that send neither keep getting
+the individual events, now rendered from the snapshot. Per-user state (timer,
+own votes) is still resolved per join.
+
+State is process-local like the presence registry; snapshots also expire after
+``ROOM_SNAPSHOT_TTL_SECONDS`` so writes made by other workers are picked up.
+"""
+from __future__ import annotations
+
+import json
+import secrets
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from flask import current_app, has_app_context
+
+from app.assistant.context_cache import WorkshopVersions, workshop_versions
+from app.assistant.tools.metric import room_snapshot_builds
+from app.sockets_core.emit_batcher import emit_batcher
+
+Event = Tuple[str, Dict[str, Any]]
+
+CHAT_HISTORY_LIMIT = 50
+# Chat history keys: the two filtered scopes, and "*" for the unfiltered history.
+CHAT_SCOPES = ("workshop_chat", "discussion_chat")
+# Viewer state event replayed to late joiners, by current task type.
+VIEWER_EVENTS = {
+    "presentation": "presentation_sync",
+    "results_feasibility": "feasibility_sync",
+    "results_prioritization": "prioritization_sync",
+    "results_action_plan": "action_plan_sync",
+}
+_BUILD_ATTEMPTS = 3
+
+
+def chat_key(scope: Optional[str]) -> str:
+    return scope if scope in CHAT_SCOPES else "*"
+
+
+@dataclass
+class RoomSnapshot:
+    """Room-wide join state of one workshop.
+
+    Appliers replace nested payloads instead of mutating them, so the events
+    returned by ``events`` can be emitted without holding the room lock.
+    """
+
+    workshop_id: int
+    status: Optional[str]
+    task_id: Optional[int] = None
+    task_type: str = ""
+    task_event: Optional[Event] = None
+    ui_flags: Dict[str, Any] = field(default_factory=dict)
+    viewer: Optional[Event] = None
+    # whiteboard_sync / all_votes_sync / generic_votes_sync payloads for the current task
+    board: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Remaining time at build; used when no phase timer is registered in this process.
+    timer: Optional[Dict[str, Any]] = None
+    chat: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    data_version: int = 0
+    built_at: float = 0.0
+
+    def events(self, chat_history: Optional[List[Dict[str, Any]]] = None) -> List[Event]:
+        """Room events in the order ``join_room`` has always emitted them."""
+        out: List[Event] = [("workshop_status_update", {"workshop_id": self.workshop_id, "status": self.status})]
+        if self.task_event is None:
+            out.append(("no_active_task", {}))
+        else:
+            out.append(self.task_event)
+            out.extend(
+                ("ui_hint", {"workshop_id": self.workshop_id, "key": key, "value": value})
+                for key, value in self.ui_flags.items()
+            )
+            if self.viewer is not None:
+                out.append(self.viewer)
+            out.extend(self.board.items())
+        if chat_history is not None:
+            out.append(("chat_history", {"messages": chat_history}))
+        return out
+
+    def timer_state(self) -> Optional[Dict[str, Any]]:
+        if not self.timer:
+            return None
+        remaining = int(self.timer["remaining_seconds"] or 0)
+        if not self.timer["is_paused"]:
+            remaining = max(0, remaining - int(time.time() - self.timer["at"]))
+        return {"task_id": self.timer["task_id"], "remaining_seconds": remaining, "is_paused": self.timer["is_paused"]}
+
+    def signature(self) -> str:
+        """Content identity used to decide whether a rebuild changed anything clients can see."""
+        return json.dumps(self.events(), sort_keys=True, default=str)
+
+
+# ----------------------------------------------------------------------
+# Appliers: fold a broadcast into the snapshot. Returning False marks the
+# snapshot stale (rebuilt on the next join).
+# ----------------------------------------------------------------------
+def _apply_message(snap: RoomSnapshot, payload: Dict[str, Any]) -> bool:
+    message = {
+        "user_name": payload.get("user_name"),
+        "message": payload.get("message"),
+        "timestamp": payload.get("timestamp"),
+        "message_type": payload.get("message_type", "user"),
+        "chat_scope": payload.get("chat_scope", "workshop_chat"),
+    }
+    for key, history in list(snap.chat.items()):
+        if key == "*" or key == message["chat_scope"]:
+            snap.chat[key] = (history + [message])[-CHAT_HISTORY_LIMIT:]
+    return True
+
+
+def _apply_idea(snap: RoomSnapshot, payload: Dict[str, Any]) -> bool:
+    board = snap.board.get("whiteboard_sync")
+    if board is None or payload.get("task_id") != snap.task_id:
+        return False
+    idea = {
+        "idea_id": payload.get("idea_id"),
+        "user": payload.get("user"),
+        "content": payload.get("content"),
+        "timestamp": payload.get("timestamp"),
+        "source": payload.get("source", "human"),
+        "rationale": payload.get("rationale"),
+        "metadata": payload.get("metadata"),
+        "include_in_outputs": bool(payload.get("include_in_outputs", True)),
+    }
+    ideas = [item for item in board["ideas"] if item.get("idea_id") != idea["idea_id"]]
+    snap.board["whiteboard_sync"] = {**board, "ideas": ideas + [idea]}
+    return True
+
+
+def merge_participant_dots(snap: RoomSnapshot, dots: Dict[Any, int]) -> None:
+    """Update ``participants_dots`` of the task payload (keys as strings, as in the stored payload)."""
+    if snap.task_event is None or not dots:
+        return
+    event, task_payload = snap.task_event
+    current = task_payload.get("participants_dots")
+    if isinstance(current, dict):
+        merged = {str(key): value for key, value in current.items()}
+        merged.update({str(key): value for key, value in dots.items()})
+        snap.task_event = (event, {**task_payload, "participants_dots": merged})
+
+
+def _apply_vote(snap: RoomSnapshot, payload: Dict[str, Any]) -> bool:
+    board = snap.board.get("all_votes_sync")
+    if board is None or snap.task_event is None:
+        return False
+    snap.board["all_votes_sync"] = {"votes": {**board["votes"], payload["cluster_id"]: payload["total_votes"]}}
+    merge_participant_dots(snap, {payload["user_id"]: payload["dots_remaining"]})
+    return True
+
+
+def _apply_votes_sync(snap: RoomSnapshot, payload: Dict[str, Any]) -> bool:
+    """Coalesced counts from ``vote_tally``: only the clusters that changed."""
+    board = snap.board.get("all_votes_sync")
+    if board is None or snap.task_event is None:
+        return False
+    snap.board["all_votes_sync"] = {"votes": {**board["votes"], **payload["votes"]}}
+    merge_participant_dots(snap, payload.get("participants_dots") or {})
+    return True
+
+
+def _apply_generic_vote(snap: RoomSnapshot, payload: Dict[str, Any]) -> bool:
+    board = snap.board.get("generic_votes_sync")
+    if board is None:
+        return False
+    counts = dict(board["counts"])
+    if payload.get("total_votes"):
+        counts[payload["item_key"]] = payload["total_votes"]
+    else:
+        # The database count only lists items that have votes.
+        counts.pop(payload["item_key"], None)
+    snap.board["generic_votes_sync"] = {"counts": counts}
+    return True
+
+
+def _apply_generic_votes_sync(snap: RoomSnapshot, payload: Dict[str, Any]) -> bool:
+    board = snap.board.get("generic_votes_sync")
+    if board is None:
+        return False
+    counts = dict(board["counts"])
+    for key, total in payload["counts"].items():
+        if total:
+            counts[key] = total
+        else:
+            counts.pop(key, None)
+    snap.board["generic_votes_sync"] = {"counts": counts}
+    merge_participant_dots(snap, payload.get("participants_dots") or {})
+    return True
+
+
+def _apply_viewer(event: str) -> Callable[[RoomSnapshot, Dict[str, Any]], bool]:
+    def apply(snap: RoomSnapshot, payload: Dict[str, Any]) -> bool:
+        if payload.get("task_id") != snap.task_id or VIEWER_EVENTS.get(snap.task_type) != event:
+            return False
+        snap.viewer = (event, dict(payload))
+        return True
+
+    return apply
+
+
+def _apply_ui_hint(snap: RoomSnapshot, payload: Dict[str, Any]) -> bool:
+    snap.ui_flags = {**snap.ui_flags, payload["key"]: payload.get("value")}
+    return True
+
+
+def _apply_status(status: Optional[str]) -> Callable[[RoomSnapshot, Dict[str, Any]], bool]:
+    def apply(snap: RoomSnapshot, payload: Dict[str, Any]) -> bool:
+        snap.status = status or payload.get("status")
+        return True
+
+    return apply
+
+
+_APPLIERS: Dict[str, Callable[[RoomSnapshot, Dict[str, Any]], bool]] = {
+    "receive_message": _apply_message,
+    "new_idea": _apply_idea,
+    "vote_update": _apply_vote,
+    "generic_vote_update": _apply_generic_vote,
+    "all_votes_sync": _apply_votes_sync,
+    "generic_votes_sync": _apply_generic_votes_sync,
+    "ui_hint": _apply_ui_hint,
+    "workshop_status_update": _apply_status(None),
+    "workshop_paused": _apply_status("paused"),
+    "workshop_resumed": _apply_status("inprogress"),
+    **{event: _apply_viewer(event) for event in VIEWER_EVENTS.values()},
+}
+
+
+class _Room:
+    def __init__(self, log_size: int) -> None:
+        # A new epoch tells clients that versions from an earlier room (restart, eviction) do not apply.
+        self.epoch = secrets.token_hex(4)
+        self.version = 0
+        self.barrier = 0
+        self.log: Deque[Tuple[int, str, Dict[str, Any]]] = deque(maxlen=max(0, log_size))
+        self.snapshot: Optional[RoomSnapshot] = None
+        self.stale = False
+        self.lock = threading.RLock()
+        self.build_lock = threading.Lock()
+
+
+class RoomStateStore:
+    """Per-workshop room version, delta log and shared join snapshot (process-local)."""
+
+    def __init__(
+        self,
+        versions: WorkshopVersions,
+        *,
+        ttl_seconds: float = 30.0,
+        log_size: int = 256,
+        max_rooms: int = 256,
+    ) -> None:
+        self._versions = versions
+        self._lock = threading.Lock()
+        self._rooms: "OrderedDict[int, _Room]" = OrderedDict()
+        self._default_ttl = ttl_seconds
+        self._default_log_size = log_size
+        self._default_max_rooms = max_rooms
+        self.builds = 0
+
+    def _config(self, key: str, default: Any) -> Any:
+        if has_app_context():
+            return current_app.config.get(key, default)
+        return default
+
+    def enabled(self) -> bool:
+        return bool(self._config("ROOM_SNAPSHOT_ENABLED", True))
+
+    def _room(self, workshop_id: int) -> _Room:
+        with self._lock:
+            room = self._rooms.get(workshop_id)
+            if room is None:
+                room = self._rooms[workshop_id] = _Room(int(self._config("ROOM_DELTA_LOG_SIZE", self._default_log_size)))
+                max_rooms = max(1, int(self._config("ROOM_SNAPSHOT_MAX_WORKSHOPS", self._default_max_rooms)))
+                while len(self._rooms) > max_rooms:
+                    self._rooms.popitem(last=False)
+            else:
+                self._rooms.move_to_end(workshop_id)
+            return room
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def broadcast(
+        self,
+        workshop_id: Optional[int],
+        event: str,
+        payload: Dict[str, Any],
+        room: str,
+        *,
+        db_writes: Optional[int] = 0,
+    ) -> Dict[str, Any]:
+        """Record ``event`` for the workshop and emit it to ``room`` stamped with ``room_version``.
+
+        ``db_writes`` is the number of commits to tracked rows (see
+        ``context_cache``) the caller made for this event, or None when unknown;
+        any other change to the workshop's data version leaves the snapshot stale.
+        """
+        if workshop_id is None:
+            emit_batcher.emit(event, payload, room)
+            return payload
+        state = self._room(int(workshop_id))
+        with state.lock:
+            # Stamp, log and emit under the room lock so versions reach clients in order.
+            stamped = self._record(int(workshop_id), state, event, payload, db_writes)
+            emit_batcher.emit(event, stamped, room)
+        return stamped
+
+    def _record(
+        self,
+        workshop_id: int,
+        state: _Room,
+        event: str,
+        payload: Dict[str, Any],
+        db_writes: Optional[int],
+    ) -> Dict[str, Any]:
+        state.version += 1
+        stamped = {**payload, "room_version": state.version}
+        state.log.append((state.version, event, stamped))
+        snap = state.snapshot
+        if snap is None or state.stale:
+            return stamped
+        applier = _APPLIERS.get(event)
+        try:
+            applied = applier is not None and applier(snap, payload)
+        except (KeyError, TypeError, ValueError):
+            applied = False
+        current = self._versions.get(workshop_id)
+        if not applied:
+            state.stale = True
+        elif db_writes is not None and current == snap.data_version + db_writes:
+            snap.data_version = current
+        elif current != snap.data_version:
+            state.stale = True
+        return stamped
+
+    def drop_chat(self, workshop_id: int) -> None:
+        """Forget cached chat history (chat rows written without a ``receive_message`` broadcast)."""
+        with self._lock:
+            state = self._rooms.get(int(workshop_id))
+        if state is not None:
+            with state.lock:
+                if state.snapshot is not None:
+                    state.snapshot.chat = {}
+
+    def invalidate(self, workshop_id: Optional[int] = None) -> None:
+        with self._lock:
+            if workshop_id is None:
+                self._rooms.clear()
+            else:
+                self._rooms.pop(int(workshop_id), None)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def _refresh_reason(self, workshop_id: int, state: _Room) -> Optional[str]:
+        snap = state.snapshot
+        if snap is None:
+            return "cold"
+        if state.stale or snap.data_version != self._versions.get(workshop_id):
+            return "stale"
+        ttl = float(self._config("ROOM_SNAPSHOT_TTL_SECONDS", self._default_ttl))
+        if ttl > 0 and time.monotonic() - snap.built_at >= ttl:
+            return "expired"
+        return None
+
+    def snapshot(self, workshop_id: int, build: Callable[[], Optional[RoomSnapshot]]) -> Optional[RoomSnapshot]:
+        """The workshop's current snapshot, rebuilt with ``build`` (once per room, not per joiner) when needed."""
+        if not self.enabled():
+            return build()
+        workshop_id = int(workshop_id)
+        state = self._room(workshop_id)
+        if self._refresh_reason(workshop_id, state) is None:
+            return state.snapshot
+        with state.build_lock:
+            # Joiners that queued behind the builder reuse its result.
+            reason = self._refresh_reason(workshop_id, state)
+            if reason is None:
+                return state.snapshot
+            for attempt in range(_BUILD_ATTEMPTS):
+                with state.lock:
+                    start_version = state.version
+                data_version = self._versions.get(workshop_id)
+                fresh = build()
+                self.builds += 1
+                with state.lock:
+                    if fresh is None:
+                        state.snapshot = None
+                        return None
+                    # A broadcast during the build may or may not be in what was read; build again.
+                    if state.version != start_version and attempt < _BUILD_ATTEMPTS - 1:
+                        continue
+                    fresh.data_version = data_version
+                    fresh.built_at = time.monotonic()
+                    old = state.snapshot
+                    changed = old is None or old.signature() != fresh.signature()
+                    if changed and state.version:
+                        state.version += 1
+                        state.barrier = state.version
+                    state.snapshot = fresh
+                    state.stale = False
+                    room_snapshot_builds.labels(reason=reason, changed=str(changed).lower()).inc()
+                    return fresh
+        return state.snapshot
+
+    def chat_history(
+        self,
+        workshop_id: int,
+        snap: RoomSnapshot,
+        scope: Optional[str],
+        load: Callable[[str], List[Dict[str, Any]]],
+    ) -> List[Dict[str, Any]]:
+        """Last ``CHAT_HISTORY_LIMIT`` messages for ``scope``, loaded on first use and kept current by broadcasts."""
+        key = chat_key(scope)
+        history = snap.chat.get(key)
+        if history is not None:
+            return history
+        if not self.enabled():
+            return load(key)
+        state = self._room(int(workshop_id))
+        # Loading under the room lock keeps a concurrent receive_message from slipping between the query and the cache.
+        with state.lock:
+            history = snap.chat.get(key)
+            if history is None:
+                history = load(key)
+                if state.snapshot is snap:
+                    snap.chat[key] = history
+            return history
+
+    def render(
+        self,
+        workshop_id: int,
+        snap: RoomSnapshot,
+        scope: Optional[str],
+        load: Callable[[str], List[Dict[str, Any]]],
+    ) -> Tuple[str, int, List[Event]]:
+        """``(epoch, version, events)`` of ``snap`` with the chat history for ``scope``, read consistently."""
+        state = self._room(int(workshop_id))
+        with state.lock:
+            chat = self.chat_history(workshop_id, snap, scope, load)
+            return state.epoch, state.version, snap.events(chat)
+
+    def delta(self, workshop_id: int, epoch: Any, since: Any) -> Optional[Tuple[int, List[Dict[str, Any]]]]:
+        """``(version, events)`` a client at ``epoch``/``since`` missed, or None when it needs the snapshot."""
+        if not self.enabled():
+            return None
+        try:
+            since = int(since)
+        except (TypeError, ValueError):
+            return None
+        with self._lock:
+            state = self._rooms.get(int(workshop_id))
+        if state is None or epoch != state.epoch:
+            return None
+        with state.lock:
+            if since < state.barrier or since > state.version:
+                return None
+            if since == state.version:
+                return state.version, []
+            if not state.log or state.log[0][0] > since + 1:
+                return None
+            events = [{"event": event, "data": data} for version, event, data in state.log if version > since]
+            return state.version, events
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rooms = list(self._rooms.values())
+        return {
+            "rooms": len(rooms),
+            "snapshots": sum(1 for state in rooms if state.snapshot is not None),
+            "logged_events": sum(len(state.log) for state in rooms),
+            "builds": self.builds,
+        }
+
+
+room_state = RoomStateStore(workshop_versions)
+
+
+__all__ = [
+    "CHAT_HISTORY_LIMIT",
+    "RoomSnapshot",
+    "RoomStateStore",
+    "VIEWER_EVENTS",
+    "chat_key",
+    "merge_participant_dots",
+    "room_state",
+]
@@ -0,0 +1,392 @@
+"""Deadline-driven phase timer scheduler.
+
+Replaces the former 1-second polling loop. Each running workshop registers a
+single deadline (when its current task runs out of time) in a min-heap; the
+dispatcher thread sleeps until the nearest deadline or the next coarse
+``timer_sync`` tick, whichever comes first. Expiry and auto-advance run as
+independent background jobs so a slow phase generation in one workshop never
+delays the timers of another.
+
+State changes (start/advance/pause/resume/stop) call into this module; the
+database is only touched when a deadline actually fires.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import current_app, has_app_context
+
+from app.extensions import db, socketio
+from app.models import BrainstormTask, Workshop
+
+_KIND_EXPIRE = "expire"
+_KIND_ADVANCE = "advance"
+
+
+@dataclass
+class PhaseTimer:
+    workshop_id: int
+    task_id: int
+    deadline: Optional[float]  # epoch seconds; None while paused
+    paused_remaining: int = 0
+    total_seconds: Optional[int] = None
+    generation: int = 0
+
+    @property
+    def paused(self) -> bool:
+        return self.deadline is None
+
+    def remaining_seconds(self, now: Optional[float] = None) -> int:
+        if self.deadline is None:
+            return max(0, int(self.paused_remaining))
+        now = time.time() if now is None else now
+        return max(0, int(self.deadline - now))
+
+
+class PhaseTimerScheduler:
+    """Min-heap of per-workshop deadlines with lazy cancellation.
+
+    Heap entries are ``(due_at, seq, workshop_id, generation, kind)``. Any state
+    change bumps the workshop's generation, which silently invalidates entries
+    already in the heap instead of searching and removing them.
+    """
+
+    def __init__(self) -> None:
+        self._heap: List[Tuple[float, int, int, int, str]] = []
+        self._timers: Dict[int, PhaseTimer] = {}
+        self._generations: Dict[int, int] = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._app: Any = None
+        self._next_sync_at = 0.0
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def start(self, app: Any = None) -> None:
+        if app is None and has_app_context():
+            app = current_app._get_current_object()  # type: ignore[attr-defined]
+        if app is not None:
+            self._app = app
+        if self._app is None:
+            return
+        with self._cond:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="workshop-timer", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # State changes
+    # ------------------------------------------------------------------
+    def schedule(
+        self,
+        workshop_id: int,
+        task_id: int,
+        remaining_seconds: int,
+        *,
+        total_seconds: Optional[int] = None,
+    ) -> None:
+        """Register (or replace) the running deadline for a workshop's task."""
+        self.start()
+        now = time.time()
+        with self._cond:
+            generation = self._bump(workshop_id)
+            previous = self._timers.get(workshop_id)
+            if total_seconds is None and previous and previous.task_id == task_id:
+                total_seconds = previous.total_seconds
+            deadline = now + max(0, int(remaining_seconds or 0))
+            self._timers[workshop_id] = PhaseTimer(
+                workshop_id=workshop_id,
+                task_id=int(task_id),
+                deadline=deadline,
+                total_seconds=total_seconds,
+                generation=generation,
+            )
+            heapq.heappush(
+                self._heap,
+                (deadline, next(self._seq), workshop_id, generation, _KIND_EXPIRE),
+            )
+            self._cond.notify()
+
+    def pause(self, workshop_id: int, remaining_seconds: Optional[int] = None) -> None:
+        """Freeze a workshop's timer; its pending deadline is invalidated."""
+        with self._cond:
+            timer = self._timers.get(workshop_id)
+            if not timer:
+                return
+            remaining = (
+                timer.remaining_seconds() if remaining_seconds is None else int(remaining_seconds)
+            )
+            timer.generation = self._bump(workshop_id)
+            timer.deadline = None
+            timer.paused_remaining = max(0, remaining)
+
+    def cancel(self, workshop_id: int) -> None:
+        with self._cond:
+            self._bump(workshop_id)
+            self._timers.pop(workshop_id, None)
+
+    def ensure(
+        self,
+        workshop_id: int,
+        task_id: int,
+        remaining_seconds: int,
+        *,
+        paused: bool = False,
+        total_seconds: Optional[int] = None,
+    ) -> None:
+        """Register a timer only if none is tracked for this task (e.g. after a restart)."""
+        with self._cond:
+            timer = self._timers.get(workshop_id)
+            if timer and timer.task_id == int(task_id):
+                return
+        self.schedule(workshop_id, task_id, remaining_seconds, total_seconds=total_seconds)
+        if paused:
+            self.pause(workshop_id, remaining_seconds)
+
+    def get(self, workshop_id: int) -> Optional[PhaseTimer]:
+        with self._cond:
+            return self._timers.get(workshop_id)
+
+    def _bump(self, workshop_id: int) -> int:
+        generation = self._generations.get(workshop_id, 0) + 1
+        self._generations[workshop_id] = generation
+        return generation
+
+    # ------------------------------------------------------------------
+    # Dispatcher
+    # ------------------------------------------------------------------
+    def _sync_interval(self) -> float:
+        try:
+            return float(self._app.config.get("TIMER_SYNC_INTERVAL_SECONDS", 15))
+        except Exception:
+            return 15.0
+
+    def _run(self) -> None:
+        interval = self._sync_interval()
+        self._next_sync_at = time.time() + interval
+        while not self._stop.is_set():
+            due: List[Tuple[int, int, str]] = []
+            sync_due = False
+            with self._cond:
+                now = time.time()
+                while self._heap and self._heap[0][0] <= now:
+                    _, _, workshop_id, generation, kind = heapq.heappop(self._heap)
+                    if self._generations.get(workshop_id) == generation:
+                        due.append((workshop_id, generation, kind))
+                if now >= self._next_sync_at:
+                    sync_due = True
+                    self._next_sync_at = now + interval
+                if not due and not sync_due:
+                    wake_at = self._next_sync_at
+                    if self._heap:
+                        wake_at = min(wake_at, self._heap[0][0])
+                    self._cond.wait(timeout=max(0.0, wake_at - now))
+                    continue
+            for workshop_id, generation, kind in due:
+                socketio.start_background_task(self._dispatch, workshop_id, generation, kind)
+            if sync_due:
+                self._emit_periodic_sync()
+
+    def _dispatch(self, workshop_id: int, generation: int, kind: str) -> None:
+        with self._app.app_context():
+            try:
+                if kind == _KIND_EXPIRE:
+                    self._on_deadline(workshop_id, generation)
+                elif kind == _KIND_ADVANCE:
+                    self._on_auto_advance(workshop_id, generation)
+            except Exception as e:  # noqa
+                db.session.rollback()
+                current_app.logger.error(
+                    f"Timer job '{kind}' failed for workshop {workshop_id}: {e}", exc_info=True
+                )
+
+    def _is_current(self, workshop_id: int, generation: int) -> bool:
+        with self._cond:
+            return self._generations.get(workshop_id) == generation
+
+    def _emit_periodic_sync(self) -> None:
+        from app.sockets_core.core import emit_timer_sync
+
+        with self._cond:
+            timers = list(self._timers.values())
+        if not timers:
+            return
+        now = time.time()
+        with self._app.app_context():
+            for timer in timers:
+                try:
+                    emit_timer_sync(
+                        f"workshop_room_{timer.workshop_id}",
+                        {
+                            "task_id": timer.task_id,
+                            "remaining_seconds": timer.remaining_seconds(now),
+                            "is_paused": timer.paused,
+                        },
+                        workshop_id=timer.workshop_id,
+                    )
+                except Exception as e:  # noqa
+                    current_app.logger.error(
+                        f"Periodic timer_sync failed for workshop {timer.workshop_id}: {e}"
+                    )
+
+    # ------------------------------------------------------------------
+    # Jobs
+    # ------------------------------------------------------------------
+    def _on_deadline(self, workshop_id: int, generation: int) -> None:
+        if not self._is_current(workshop_id, generation):
+            return
+        timer = self.get(workshop_id)
+        if not timer:
+            return
+        ws = db.session.get(Workshop, workshop_id)
+        # Reconcile with the DB in case the workshop moved on without telling us.
+        if not ws or ws.status not in ("inprogress", "paused") or not ws.current_task_id:
+            self.cancel(workshop_id)
+            return
+        remaining = ws.get_remaining_task_time()
+        if ws.status == "paused":
+            self.pause(workshop_id, remaining)
+            return
+        if ws.current_task_id != timer.task_id:
+            self.schedule(workshop_id, ws.current_task_id, remaining)
+            return
+        if remaining > 0:
+            # DB is authoritative (e.g. duration edited mid-phase); re-arm.
+            self.schedule(workshop_id, timer.task_id, remaining)
+            return
+
+        room = f"workshop_room_{ws.id}"
+        from app.sockets_core.core import emit_timer_sync
+
+        emit_timer_sync(
+            room,
+            {"task_id": timer.task_id, "remaining_seconds": 0, "is_paused": False},
+            workshop_id=ws.id,
+        )
+        task = db.session.get(BrainstormTask, ws.current_task_id)
+        if not task or task.status != "running":
+            self.cancel(workshop_id)
+            return
+        task.status = "completed"
+        task.ended_at = datetime.utcnow()
+        db.session.commit()
+        current_app.logger.info(
+            f"Auto-completed task {task.id} for workshop {ws.id} due to time expiry"
+        )
+        socketio.emit(
+            "task_completed",
+            {"task_id": task.id, "workshop_id": ws.id},
+            to=room,
+        )
+        if getattr(ws, "auto_advance_enabled", True) and (
+            getattr(ws, "auto_advance_after_seconds", 0) or 0
+        ) >= 0:
+            delay = int(getattr(ws, "auto_advance_after_seconds", 0) or 0)
+            with self._cond:
+                if self._generations.get(workshop_id) != generation:
+                    return
+                heapq.heappush(
+                    self._heap,
+                    (time.time() + delay, next(self._seq), workshop_id, generation, _KIND_ADVANCE),
+                )
+                self._cond.notify()
+        else:
+            self.cancel(workshop_id)
+            ws.current_task_id = None
+            ws.timer_start_time = None
+            ws.timer_paused_at = None
+            ws.timer_elapsed_before_pause = 0
+            db.session.commit()
+
+    def _on_auto_advance(self, workshop_id: int, generation: int) -> None:
+        if not self._is_current(workshop_id, generation):
+            return
+        timer = self.get(workshop_id)
+        ws = db.session.get(Workshop, workshop_id)
+        if not ws or not timer or ws.status != "inprogress" or ws.current_task_id != timer.task_id:
+            return
+        room = f"workshop_room_{ws.id}"
+        from app.workshop.advance import advance_to_next_task  # type: ignore
+
+        try:
+            ok, err = advance_to_next_task(ws.id)
+        except Exception as e:  # noqa
+            current_app.logger.error(f"Auto-advance failure for workshop {ws.id}: {e}")
+            return
+        if ok:
+            return
+        self.cancel(workshop_id)
+        if isinstance(err, str) and "No more tasks" in err:
+            try:
+                ws.status = "completed"
+                ws.current_task_id = None
+                ws.timer_start_time = None
+                ws.timer_paused_at = None
+                ws.timer_elapsed_before_pause = 0
+                db.session.commit()
+                socketio.emit("workshop_stopped", {"workshop_id": ws.id}, to=room)
+                current_app.logger.info(
+                    f"Workshop {ws.id} completed at end of sequence (auto-advance)"
+                )
+            except Exception as ce:  # noqa
+                db.session.rollback()
+                current_app.logger.error(
+                    f"Error completing workshop {ws.id} at end of sequence: {ce}"
+                )
+        else:
+            ws.current_task_id = None
+            ws.timer_start_time = None
+            ws.timer_paused_at = None
+            ws.timer_elapsed_before_pause = 0
+            db.session.commit()
+
+
+phase_timers = PhaseTimerScheduler()
+
+
+def schedule_phase_timer(
+    workshop_id: int,
+    task_id: int,
+    remaining_seconds: int,
+    *,
+    total_seconds: Optional[int] = None,
+) -> None:
+    phase_timers.schedule(
+        int(workshop_id), int(task_id), remaining_seconds, total_seconds=total_seconds
+    )
+
+
+def pause_phase_timer(workshop_id: int, remaining_seconds: Optional[int] = None) -> None:
+    phase_timers.pause(int(workshop_id), remaining_seconds)
+
+
+def cancel_phase_timer(workshop_id: int) -> None:
+    phase_timers.cancel(int(workshop_id))
+
+
+__all__ = [
+    "PhaseTimer",
+    "PhaseTimerScheduler",
+    "phase_timers",
+    "schedule_phase_timer",
+    "pause_phase_timer",
+    "cancel_phase_timer",
+]
@@ -0,0 +1,556 @@
+"""In-memory dot-vote tallies with write-behind persistence.
+
+``submit_vote`` and ``submit_vote_generic`` used to run around six queries per
+vote (workshop, task, participant, cluster/item check, existing vote, insert or
+delete, commit, COUNT) and broadcast one ``vote_update`` per vote. In a voting
+round everyone votes within seconds and SQLite's write lock serialises them.
+
+Votes are now decided against a ``TaskTally``: the active voting task's items,
+each participant's dot budget, their own votes and the per-item counts, loaded
+from the database once per workshop and kept as the authority while the round
+runs:
+
+- ``cast`` validates and toggles a vote in memory, appends the resulting
+  ``VoteOp`` to an append-only journal and returns at once; the voter's socket
+  gets its ``vote_update`` acknowledgement immediately.
+- A background thread broadcasts the changed counts every
+  ``VOTE_BROADCAST_INTERVAL_MS`` as one ``all_votes_sync`` /
+  ``generic_votes_sync`` frame per workshop (the events join_room already sends),
+  and persists pending ops every ``VOTE_FLUSH_INTERVAL_SECONDS`` in a single
+  transaction. Ops carry the final state of a vote, so a batch collapses to one
+  insert or delete per (participant, item); ``dots_remaining`` is recomputed as
+  budget minus the dots actually used in the database.
+- The journal is rotated at each flush and the rotated file deleted once the
+  batch commits. ``replay`` (run by ``create_app``) applies whatever a crashed
+  process left behind; applying an op twice is harmless.
+
+Commits to the workshop made elsewhere (pause, next task, votes cast by the
+assistant) change ``workshop_versions``; the next vote then flushes pending ops
+and reloads the tally. Phase changes flush first (``advance``), and snapshot
+builds read counts from the tally while one is live, so nothing reads votes the
+database has not received yet.
+
+The journal and tallies are process-local, like room snapshots and presence:
+run one Socket.IO worker per journal directory.
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import func
+
+from app.assistant.context_cache import WorkshopVersions, workshop_versions
+from app.assistant.tools.metric import vote_flush_batch, vote_tally_events
+from app.extensions import db
+from app.models import GenericVote, IdeaCluster, IdeaVote, WorkshopParticipant
+
+CLUSTER_VOTING = "clustering_voting"
+GENERIC_VOTING = "vote_generic"
+VOTING_TASK_TYPES = (CLUSTER_VOTING, GENERIC_VOTING)
+_JOURNAL_NAME = "votes.journal"
+
+
+@dataclass
+class VoteOp:
+    """One accepted vote toggle: the vote's state afterwards and the voter's budget."""
+
+    workshop_id: int
+    task_id: int
+    kind: str
+    participant_id: int
+    item: str
+    voted: bool
+    budget: int
+
+
+@dataclass
+class TaskTally:
+    """Voting state of a workshop's current task (``kind`` is None when it is not a voting task)."""
+
+    workshop_id: int
+    status: Optional[str]
+    task_id: Optional[int] = None
+    kind: Optional[str] = None
+    items: FrozenSet[str] = frozenset()
+    # user_id -> participant_id of accepted participants
+    participants: Dict[int, int] = field(default_factory=dict)
+    budgets: Dict[int, int] = field(default_factory=dict)
+    dots: Dict[int, int] = field(default_factory=dict)
+    mine: Dict[int, Set[str]] = field(default_factory=dict)
+    counts: Dict[str, int] = field(default_factory=dict)
+    data_version: int = 0
+    room: Optional[str] = None
+    dirty_items: Set[str] = field(default_factory=set)
+    dirty_users: Set[int] = field(default_factory=set)
+
+
+@dataclass
+class VoteResult:
+    # voted, unvoted, none (no dots left) or rejected
+    action: str
+    item: str
+    total: int = 0
+    dots_remaining: int = 0
+    reason: Optional[str] = None
+
+
+class VoteTallyStore:
+    """Per-workshop ``TaskTally`` plus the pending-op journal and its flusher thread."""
+
+    def __init__(self, versions: WorkshopVersions) -> None:
+        self._versions = versions
+        self._lock = threading.RLock()
+        self._load_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._tallies: Dict[int, TaskTally] = {}
+        self._pending: List[VoteOp] = []
+        # Rotated journal files holding exactly the ops in ``_pending`` that were re-queued after a failed flush.
+        self._pending_files: List[str] = []
+        self._journal: Any = None
+        self._journal_dir: Optional[str] = None
+        self._rotations = 0
+        self._thread: Optional[threading.Thread] = None
+        self._app: Any = None
+        self._next_flush = 0.0
+        self._atexit_registered = False
+
+    def _config(self, key: str, default: Any) -> Any:
+        app = current_app if has_app_context() else self._app
+        if app is None:
+            return default
+        return app.config.get(key, default)
+
+    def enabled(self) -> bool:
+        return bool(self._config("VOTE_TALLY_ENABLED", True))
+
+    # ------------------------------------------------------------------
+    # Votes
+    # ------------------------------------------------------------------
+    def cast(
+        self,
+        workshop_id: int,
+        user_id: int,
+        kind: str,
+        item: str,
+        room: str,
+        load: Callable[[], Optional[TaskTally]],
+    ) -> VoteResult:
+        """Toggle ``user_id``'s vote on ``item`` in the workshop's ``kind`` voting task."""
+        self.start()
+        tally = self._tally(workshop_id, load)
+        with self._lock:
+            if tally is None or tally.status != "inprogress" or tally.kind != kind:
+                return self._reject(kind, item, "inactive")
+            participant_id = tally.participants.get(user_id)
+            if participant_id is None:
+                return self._reject(kind, item, "not_participant")
+            if item not in tally.items:
+                return self._reject(kind, item, "unknown_item")
+            tally.room = room
+            mine = tally.mine.setdefault(user_id, set())
+            dots = tally.dots.get(user_id, 0)
+            if item in mine:
+                mine.discard(item)
+                tally.counts[item] = max(0, tally.counts.get(item, 0) - 1)
+                dots = min(tally.budgets.get(user_id, 0), dots + 1)
+                action = "unvoted"
+            elif dots <= 0:
+                vote_tally_events.labels(kind=kind, outcome="none").inc()
+                return VoteResult("none", item, tally.counts.get(item, 0), 0)
+            else:
+                mine.add(item)
+                tally.counts[item] = tally.counts.get(item, 0) + 1
+                dots -= 1
+                action = "voted"
+            tally.dots[user_id] = dots
+            tally.dirty_items.add(item)
+            tally.dirty_users.add(user_id)
+            op = VoteOp(
+                workshop_id=workshop_id,
+                task_id=int(tally.task_id or 0),
+                kind=kind,
+                participant_id=participant_id,
+                item=item,
+                voted=action == "voted",
+                budget=tally.budgets.get(user_id, 0),
+            )
+            self._append(op)
+            self._wake.notify()
+            vote_tally_events.labels(kind=kind, outcome=action).inc()
+            return VoteResult(action, item, tally.counts[item], dots)
+
+    def _reject(self, kind: str, item: str, reason: str) -> VoteResult:
+        vote_tally_events.labels(kind=kind, outcome="rejected").inc()
+        return VoteResult("rejected", item, reason=reason)
+
+    def _tally(self, workshop_id: int, load: Callable[[], Optional[TaskTally]]) -> Optional[TaskTally]:
+        with self._lock:
+            tally = self._tallies.get(workshop_id)
+            if tally is not None and tally.data_version == self._versions.get(workshop_id):
+                return tally
+        with self._load_lock:
+            with self._lock:
+                tally = self._tallies.get(workshop_id)
+                if tally is not None and tally.data_version == self._versions.get(workshop_id):
+                    return tally
+            # Someone else wrote to the workshop: persist our ops before re-reading it.
+            self.flush()
+            data_version = self._versions.get(workshop_id)
+            fresh = load()
+            with self._lock:
+                if fresh is None:
+                    self._tallies.pop(workshop_id, None)
+                    return None
+                fresh.data_version = data_version
+                previous = self._tallies.get(workshop_id)
+                if previous is not None and previous.task_id == fresh.task_id:
+                    fresh.room = previous.room
+                    fresh.dirty_items |= previous.dirty_items
+                    fresh.dirty_users |= previous.dirty_users
+                self._tallies[workshop_id] = fresh
+                return fresh
+
+    def view(self, workshop_id: int, task_id: Optional[int]) -> Optional[Tuple[Dict[str, int], Dict[int, int]]]:
+        """``(counts, dots by user)`` of a live tally for ``task_id``, or None to read the database."""
+        with self._lock:
+            tally = self._tallies.get(workshop_id)
+            if tally is None or tally.task_id != task_id or tally.kind is None:
+                return None
+            if tally.data_version == self._versions.get(workshop_id):
+                return dict(tally.counts), dict(tally.dots)
+        # Stale: the database may hold writes the tally has not seen; make it complete and read it.
+        self.flush()
+        return None
+
+    def user_items(self, workshop_id: int, task_id: Optional[int], user_id: Any) -> Optional[List[str]]:
+        with self._lock:
+            tally = self._tallies.get(workshop_id)
+            if (
+                tally is None
+                or tally.task_id != task_id
+                or tally.kind is None
+                or tally.data_version != self._versions.get(workshop_id)
+            ):
+                return None
+            try:
+                return sorted(tally.mine.get(int(user_id), ()))
+            except (TypeError, ValueError):
+                return None
+
+    def close(self, workshop_id: int) -> None:
+        """Send the workshop's last count frame, persist everything and drop its tally (before a task change)."""
+        self.broadcast_dirty(workshop_id)
+        self.flush()
+        with self._lock:
+            self._tallies.pop(workshop_id, None)
+
+    # ------------------------------------------------------------------
+    # Journal and persistence
+    # ------------------------------------------------------------------
+    def _directory(self) -> Optional[str]:
+        if self._journal_dir is None:
+            path = self._config("VOTE_JOURNAL_DIR", None)
+            if not path:
+                return None
+            try:
+                os.makedirs(path, exist_ok=True)
+            except OSError:
+                current_app.logger.warning("vote journal directory %s is not writable; votes are not journaled", path)
+                return None
+            self._journal_dir = path
+        return self._journal_dir
+
+    def _append(self, op: VoteOp) -> None:
+        self._pending.append(op)
+        if self._journal is None:
+            directory = self._directory()
+            if directory is None:
+                return
+            self._journal = open(os.path.join(directory, _JOURNAL_NAME), "a", encoding="utf-8")
+        self._journal.write(json.dumps(asdict(op), separators=(",", ":")) + "\n")
+        self._journal.flush()
+        if self._config("VOTE_JOURNAL_FSYNC", False):
+            os.fsync(self._journal.fileno())
+
+    def _rotate(self) -> Optional[str]:
+        """Close the journal and rename it; the caller deletes it once its ops are committed."""
+        if self._journal is None:
+            return None
+        self._journal.close()
+        self._journal = None
+        self._rotations += 1
+        current = os.path.join(self._journal_dir or "", _JOURNAL_NAME)
+        rotated = f"{current}.{int(time.time() * 1000)}-{self._rotations}.flushing"
+        os.replace(current, rotated)
+        return rotated
+
+    def flush(self) -> int:
+        """Persist all pending ops in one transaction; returns how many were written."""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                files, self._pending_files = self._pending_files, []
+                rotated = self._rotate() if batch else None
+                if rotated:
+                    files.append(rotated)
+            if not batch:
+                return 0
+            started = time.monotonic()
+            workshops = {op.workshop_id for op in batch}
+            before = {workshop_id: self._versions.get(workshop_id) for workshop_id in workshops}
+            try:
+                self._persist(batch)
+            except Exception:
+                db.session.rollback()
+                with self._lock:
+                    # Keep order: these ops precede anything cast meanwhile. Their rotated files stay for replay.
+                    self._pending = batch + self._pending
+                    self._pending_files = files + self._pending_files
+                current_app.logger.exception("vote flush failed; %s ops kept for the next attempt", len(batch))
+                return 0
+            with self._lock:
+                for workshop_id in workshops:
+                    tally = self._tallies.get(workshop_id)
+                    # Our own commit bumped the version once; anything more was somebody else.
+                    if tally is not None and tally.data_version == before[workshop_id]:
+                        if self._versions.get(workshop_id) == before[workshop_id] + 1:
+                            tally.data_version = before[workshop_id] + 1
+            self._remove_rotated(files)
+            vote_flush_batch.observe(len(batch))
+            current_app.logger.debug(
+                "vote flush: %s ops in %.1f ms", len(batch), (time.monotonic() - started) * 1000
+            )
+            return len(batch)
+
+    @staticmethod
+    def _remove_rotated(paths: List[str]) -> None:
+        """Delete the rotated files whose ops were all in the committed batch.
+
+        Other ``.flushing`` files (say, left by a previous process whose replay failed) are not
+        touched: their ops were never queued here, so only ``replay`` may remove them.
+        """
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _persist(ops: List[VoteOp]) -> None:
+        """Apply the final state of each (participant, item) and recompute the voters' dots, then commit."""
+        final: Dict[Tuple[str, int, int, str], bool] = {}
+        budgets: Dict[Tuple[str, int, int], int] = {}
+        for op in ops:
+            final[(op.kind, op.task_id, op.participant_id, op.item)] = op.voted
+            budgets[(op.kind, op.task_id, op.participant_id)] = op.budget
+        participant_ids = {participant_id for (_, _, participant_id) in budgets}
+        participants = {
+            p.id: p for p in WorkshopParticipant.query.filter(WorkshopParticipant.id.in_(participant_ids)).all()
+        }
+
+        cluster_keys = {(pid, int(item)): voted for (kind, _, pid, item), voted in final.items() if kind == CLUSTER_VOTING}
+        if cluster_keys:
+            cluster_ids = {cid for (_, cid) in cluster_keys}
+            valid_clusters = {cid for (cid,) in db.session.query(IdeaCluster.id).filter(IdeaCluster.id.in_(cluster_ids))}
+            existing = {
+                (v.participant_id, v.cluster_id): v
+                for v in IdeaVote.query.filter(
+                    IdeaVote.cluster_id.in_(cluster_ids),
+                    IdeaVote.participant_id.in_({pid for (pid, _) in cluster_keys}),
+                )
+            }
+            for (pid, cid), voted in cluster_keys.items():
+                row = existing.get((pid, cid))
+                if voted and row is None and pid in participants and cid in valid_clusters:
+                    vote = IdeaVote()
+                    vote.cluster_id = cid
+                    vote.participant_id = pid
+                    vote.dots_used = 1
+                    db.session.add(vote)
+                elif not voted and row is not None:
+                    db.session.delete(row)
+
+        generic_keys = {
+            (task_id, pid, item): voted for (kind, task_id, pid, item), voted in final.items() if kind == GENERIC_VOTING
+        }
+        if generic_keys:
+            existing_generic = {
+                (v.task_id, v.participant_id, f"{v.item_type}:{v.item_id}"): v
+                for v in GenericVote.query.filter(
+                    GenericVote.task_id.in_({task_id for (task_id, _, _) in generic_keys}),
+                    GenericVote.participant_id.in_({pid for (_, pid, _) in generic_keys}),
+                )
+            }
+            for (task_id, pid, item), voted in generic_keys.items():
+                row = existing_generic.get((task_id, pid, item))
+                if voted and row is None and pid in participants:
+                    item_type, _, item_id = item.partition(":")
+                    vote = GenericVote()
+                    vote.task_id = task_id
+                    vote.participant_id = pid
+                    vote.item_type = item_type
+                    vote.item_id = item_id
+                    db.session.add(vote)
+                elif not voted and row is not None:
+                    db.session.delete(row)
+        db.session.flush()
+
+        # dots_remaining = budget - dots used in the database, so replaying a batch twice changes nothing.
+        for kind, task_id in {(kind, task_id) for (kind, task_id, _) in budgets}:
+            pids = [pid for (k, t, pid) in budgets if k == kind and t == task_id]
+            if kind == CLUSTER_VOTING:
+                used_rows = (
+                    db.session.query(IdeaVote.participant_id, func.coalesce(func.sum(IdeaVote.dots_used), 0))
+                    .join(IdeaCluster, IdeaCluster.id == IdeaVote.cluster_id)
+                    .filter(IdeaCluster.task_id == task_id, IdeaVote.participant_id.in_(pids))
+                    .group_by(IdeaVote.participant_id)
+                )
+            else:
+                used_rows = (
+                    db.session.query(GenericVote.participant_id, func.count(GenericVote.id))
+                    .filter(GenericVote.task_id == task_id, GenericVote.participant_id.in_(pids))
+                    .group_by(GenericVote.participant_id)
+                )
+            used = {pid: int(count or 0) for pid, count in used_rows}
+            for pid in pids:
+                participant = participants.get(pid)
+                if participant is not None:
+                    participant.dots_remaining = max(0, budgets[(kind, task_id, pid)] - used.get(pid, 0))
+        db.session.commit()
+
+    def replay(self) -> int:
+        """Persist ops journaled by a previous process that had not been committed (call before serving)."""
+        directory = self._directory()
+        if directory is None:
+            return 0
+        with self._flush_lock:
+            names = sorted(name for name in os.listdir(directory) if name.endswith(".flushing"))
+            paths = [os.path.join(directory, name) for name in names]
+            if os.path.exists(os.path.join(directory, _JOURNAL_NAME)):
+                paths.append(os.path.join(directory, _JOURNAL_NAME))
+            ops: List[VoteOp] = []
+            for path in paths:
+                with open(path, encoding="utf-8") as handle:
+                    for line in handle:
+                        try:
+                            ops.append(VoteOp(**json.loads(line)))
+                        except (TypeError, ValueError):
+                            # A torn last line from a crash mid-write.
+                            continue
+            if ops:
+                try:
+                    self._persist(ops)
+                except Exception:
+                    db.session.rollback()
+                    current_app.logger.exception("vote journal replay failed; journal kept in %s", directory)
+                    return 0
+                current_app.logger.info("Replayed %s journaled votes from %s", len(ops), directory)
+            for path in paths:
+                os.remove(path)
+            return len(ops)
+
+    # ------------------------------------------------------------------
+    # Background broadcast / flush loop
+    # ------------------------------------------------------------------
+    def start(self, app: Any = None) -> None:
+        if app is None and has_app_context():
+            app = current_app._get_current_object()  # type: ignore[attr-defined]
+        if app is not None:
+            self._app = app
+        if self._app is None:
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="vote-tally", daemon=True)
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self._flush_at_exit)
+                self._atexit_registered = True
+
+    def _run(self) -> None:
+        while True:
+            interval = max(0.02, float(self._config("VOTE_BROADCAST_INTERVAL_MS", 250)) / 1000.0)
+            with self._wake:
+                if not self._pending and not any(t.dirty_items or t.dirty_users for t in self._tallies.values()):
+                    self._wake.wait(timeout=interval * 4)
+            time.sleep(interval)
+            with self._app.app_context():
+                try:
+                    self.broadcast_dirty()
+                    now = time.monotonic()
+                    if self._pending and now >= self._next_flush:
+                        self._next_flush = now + float(self._config("VOTE_FLUSH_INTERVAL_SECONDS", 1.0))
+                        self.flush()
+                except Exception:
+                    db.session.rollback()
+                    current_app.logger.exception("vote tally loop failed")
+
+    def broadcast_dirty(self, only: Optional[int] = None) -> int:
+        """Send one coalesced count frame per workshop whose tally changed since the last call."""
+        from app.sockets_core.room_state import room_state
+
+        frames: List[Tuple[int, str, str, Dict[str, Any]]] = []
+        with self._lock:
+            for workshop_id, tally in self._tallies.items():
+                if only is not None and workshop_id != only:
+                    continue
+                if not (tally.dirty_items or tally.dirty_users) or tally.room is None:
+                    continue
+                dots = {user_id: tally.dots.get(user_id, 0) for user_id in tally.dirty_users}
+                if tally.kind == CLUSTER_VOTING:
+                    event = "all_votes_sync"
+                    payload: Dict[str, Any] = {
+                        "votes": {int(item): tally.counts.get(item, 0) for item in tally.dirty_items},
+                        "participants_dots": dots,
+                    }
+                else:
+                    event = "generic_votes_sync"
+                    payload = {
+                        "counts": {item: tally.counts.get(item, 0) for item in tally.dirty_items},
+                        "participants_dots": dots,
+                    }
+                tally.dirty_items = set()
+                tally.dirty_users = set()
+                frames.append((workshop_id, event, tally.room, payload))
+        for workshop_id, event, room, payload in frames:
+            room_state.broadcast(workshop_id, event, payload, room, db_writes=0)
+        return len(frames)
+
+    def _flush_at_exit(self) -> None:
+        if self._app is None or not self._pending:
+            return
+        try:
+            with self._app.app_context():
+                self.flush()
+        except Exception:
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "tallies": sum(1 for tally in self._tallies.values() if tally.kind),
+                "pending": len(self._pending),
+            }
+
+
+vote_tallies = VoteTallyStore(workshop_versions)
+
+
+__all__ = [
+    "CLUSTER_VOTING",
+    "GENERIC_VOTING",
+    "TaskTally",
+    "VoteOp",
+    "VoteResult",
+    "VoteTallyStore",
+    "vote_tallies",
+]
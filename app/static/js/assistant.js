@@ -2129,12 +2129,29 @@
   const socket = io('/assistant', { transports: ['websocket', 'polling'] });
   window.assistantSocket = socket;
 
-  socket.on('connect', () => {
+  let joinRetryTimer = null;
+  const emitJoin = () => {
+    joinRetryTimer = null;
     const joinPayload = { workshop_id: workshopId };
     if (typeof userId === 'number' && !Number.isNaN(userId)) {
       joinPayload.user_id = userId;
     }
     socket.emit('join', joinPayload);
+  };
+
+  socket.on('connect', () => {
+    if (joinRetryTimer) clearTimeout(joinRetryTimer);
+    emitJoin();
+  });
+
+  // Server is admitting joins gradually (e.g. everyone reconnecting after a restart); retry after its delay.
+  socket.on('assistant:syncing', (payload) => {
+    if (joinRetryTimer) return;
+    const delay = Math.max(250, Number(payload?.retry_after_ms) || 1000);
+    joinRetryTimer = setTimeout(() => {
+      if (socket.connected) emitJoin();
+      else joinRetryTimer = null;
+    }, delay);
   });
 
   socket.on('assistant:ack', (payload) => {
@@ -0,0 +1,28 @@
+// Unwraps "event_batch" frames from the server's emit batcher (app/sockets_core/emit_batcher.py):
+// several room events sent as one frame, { events: [{ event, data }, ...], room_version }.
+// Each event is handed to the socket's regular listeners in order, so pages keep subscribing to
+// individual events. Loaded right after socket.io; wraps io() so every socket gets the handler.
+(function () {
+  const io = window.io;
+  if (typeof io !== 'function' || io.__eventBatchShim) return;
+
+  function install(socket) {
+    if (!socket || socket.__eventBatchShim || typeof socket.on !== 'function') return socket;
+    socket.__eventBatchShim = true;
+    socket.on('event_batch', (frame) => {
+      ((frame && frame.events) || []).forEach((ev) => {
+        socket.listeners(ev.event).forEach((handler) => {
+          try { handler(ev.data); } catch (err) { console.warn(`[event_batch] ${ev.event} handler failed`, err); }
+        });
+      });
+    });
+    return socket;
+  }
+
+  const wrapped = function () { return install(io.apply(this, arguments)); };
+  Object.keys(io).forEach((key) => { wrapped[key] = io[key]; });
+  wrapped.io = wrapped;
+  wrapped.connect = wrapped;
+  wrapped.__eventBatchShim = true;
+  window.io = wrapped;
+})();
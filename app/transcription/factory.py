@@ -14,8 +14,11 @@ import os
 import logging
 from typing import Tuple
 
+from app.config import Config
+
 from .provider import TranscriptionProvider
 from .aws_transcribe import AwsTranscribeStreamingProvider  # type: ignore
+from .fake_provider import FakeTranscribeStreamingProvider
 from .vosk_provider import VoskStreamingProvider  # type: ignore
 
 _ALIAS_MAP = {
@@ -25,11 +28,15 @@ _ALIAS_MAP = {
     'vosk': 'vosk',
     'local_vosk': 'vosk',
     'offline': 'vosk',
+    'fake': 'fake',
 }
 
 def create_provider(raw_name: str | None) -> Tuple[TranscriptionProvider, str]:
     name = (raw_name or os.getenv('TRANSCRIPTION_PROVIDER') or os.getenv('STT_PROVIDER') or 'vosk').strip().lower()
     name = _ALIAS_MAP.get(name, name)
+    if name == 'fake' or (name == 'aws_transcribe' and Config.AWS_BACKEND == 'fake'):
+        logging.getLogger(__name__).info('Selected transcription provider: fake (AWS_BACKEND=%s)', Config.AWS_BACKEND)
+        return FakeTranscribeStreamingProvider(), 'fake'
     if name == 'aws_transcribe':
         if not AwsTranscribeStreamingProvider.is_available():  # type: ignore[attr-defined]
             raise RuntimeError('AWS Transcribe unavailable: install amazon-transcribe and configure credentials.')
@@ -0,0 +1,96 @@
+"""Offline stand-in for AWS Transcribe streaming.
+
+Selected with ``TRANSCRIPTION_PROVIDER=fake`` or automatically in place of
+``aws_transcribe`` when ``AWS_BACKEND=fake``. Audio is not decoded; the provider
+paces canned utterances by the amount of PCM written, emitting a partial every
+``partial_interval`` seconds of audio and a final each ``utterance_seconds``,
+so the gateway, persistence and broadcast paths see realistic event traffic.
+"""
+from __future__ import annotations
+import asyncio
+import itertools
+from typing import AsyncIterator, Optional
+
+from .provider import (
+    TranscriptionProvider, ProviderConfig,
+    TranscriptPartialEvent, TranscriptFinalEvent, ProviderEvent
+)
+
+_UTTERANCES = (
+    'I think we should start with the customer onboarding flow',
+    'the pilot could run with two teams for a month',
+    'we need a clear metric before we commit budget',
+    'let us group the support ideas together',
+    'privacy review has to happen before launch',
+    'can we assign an owner for the pricing experiment',
+)
+
+
+class FakeTranscribeStreamingProvider(TranscriptionProvider):
+    @classmethod
+    def is_available(cls) -> bool:
+        return True
+
+    def __init__(self, utterance_seconds: float = 3.0, partial_interval: float = 1.0):
+        self._queue: 'asyncio.Queue[Optional[ProviderEvent]]' = asyncio.Queue()
+        self._utterance_seconds = utterance_seconds
+        self._partial_interval = partial_interval
+        self._bytes_per_second = 32000
+        self._audio_seconds = 0.0
+        self._utterance_start = 0.0
+        self._last_partial = 0.0
+        self._lines = itertools.cycle(_UTTERANCES)
+        self._current = next(self._lines)
+        self._opened = False
+
+    async def open_stream(self, session_id: str, config: ProviderConfig) -> None:  # type: ignore[override]
+        self._bytes_per_second = max(1, config.sample_rate_hz * 2)
+        self._opened = True
+
+    async def write(self, chunk: bytes) -> None:  # type: ignore[override]
+        if not self._opened:
+            raise RuntimeError('Stream not opened')
+        self._audio_seconds += len(chunk) / self._bytes_per_second
+        elapsed = self._audio_seconds - self._utterance_start
+        if elapsed >= self._utterance_seconds:
+            await self._queue.put(self._final())
+        elif self._audio_seconds - self._last_partial >= self._partial_interval:
+            self._last_partial = self._audio_seconds
+            words = self._current.split()
+            shown = max(1, int(len(words) * elapsed / self._utterance_seconds))
+            await self._queue.put(
+                TranscriptPartialEvent(text=' '.join(words[:shown]), start_time=self._utterance_start, is_final=False)
+            )
+
+    def _final(self) -> TranscriptFinalEvent:
+        start, end = self._utterance_start, self._audio_seconds
+        words = self._current.split()
+        step = (end - start) / len(words)
+        event = TranscriptFinalEvent(
+            text=self._current,
+            start_time=start,
+            end_time=end,
+            confidence=0.95,
+            words=[
+                {'word': word, 'start': start + i * step, 'end': start + (i + 1) * step, 'confidence': 0.95}
+                for i, word in enumerate(words)
+            ],
+        )
+        self._utterance_start = self._last_partial = end
+        self._current = next(self._lines)
+        return event
+
+    async def aresults(self) -> AsyncIterator[ProviderEvent]:  # type: ignore[override]
+        while True:
+            evt = await self._queue.get()
+            if evt is None:
+                break
+            yield evt
+
+    async def close(self) -> None:  # type: ignore[override]
+        if not self._opened:
+            return
+        self._opened = False
+        if self._audio_seconds - self._utterance_start >= self._partial_interval:
+            await self._queue.put(self._final())
+        await self._queue.put(None)
@@ -0,0 +1,391 @@
+"""Offline stand-in for Bedrock, selected with ``AWS_BACKEND``.
+
+``AWS_BACKEND=record`` keeps calling Bedrock and saves every successful chat
+response as a JSON file under ``AWS_FAKE_RECORDINGS_DIR``, keyed by model id and
+the SHA-256 of the rendered prompt. ``AWS_BACKEND=fake`` never touches the
+network: ``get_chat_llm*`` return ``FakeChatBedrock``, which replays a recording
+when one matches and otherwise synthesizes schema-valid JSON for the calling
+phase (``app.utils.fake_llm_responses``); ``get_text_embeddings`` returns
+deterministic hashed vectors and ``get_bedrock_runtime_client`` a client that
+answers ``invoke_model`` for text and image models.
+
+Replies are delayed according to ``AWS_FAKE_LATENCY`` so a full workshop can be
+driven at realistic model latency, or at zero latency to measure the app's own
+overhead. Fake calls still pass through admission control and usage accounting.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables.config import run_in_executor
+from pydantic import Field
+
+from app.config import Config
+from app.utils.fake_llm_responses import synthesize
+from app.utils.llm_bedrock import (
+    _CallStats,
+    _hedge_cancel,
+    _raise_if_hedge_cancelled,
+    bedrock_admission,
+    estimate_tokens,
+    hedge_cancelled,
+    model_router,
+    record_chat_usage,
+)
+from app.utils.llm_usage import current_usage_tag
+
+# 1x1 transparent PNG returned by image models when there is no input image to echo.
+_BLANK_PNG = (
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+
+def is_fake_backend() -> bool:
+    return Config.AWS_BACKEND == "fake"
+
+
+def is_recording_backend() -> bool:
+    return Config.AWS_BACKEND == "record"
+
+
+def _content_text(content: Any) -> str:
+    if isinstance(content, list):
+        return "".join(str(part.get("text") or "") if isinstance(part, dict) else str(part) for part in content)
+    return "" if content is None else str(content)
+
+
+def prompt_fingerprint(messages: List[BaseMessage]) -> str:
+    """Canonical prompt text used for recording keys (same for str, PromptValue and message inputs)."""
+    if len(messages) == 1 and messages[0].type == "human":
+        return _content_text(messages[0].content)
+    return "\n\n".join(f"{message.type}: {_content_text(message.content)}" for message in messages)
+
+
+# ---------------------------------------------------------------------------
+# Latency
+# ---------------------------------------------------------------------------
+
+class LatencyModel:
+    """Reply delay distribution parsed from an ``AWS_FAKE_LATENCY`` spec."""
+
+    def __init__(self, spec: str, seed: int = 0) -> None:
+        self.spec = (spec or "none").strip().lower()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        kind, _, args = self.spec.partition(":")
+        try:
+            values = [float(v) for v in args.split(":") if v]
+        except ValueError as exc:
+            raise ValueError(f"Invalid AWS_FAKE_LATENCY spec {spec!r}") from exc
+        if kind not in {"none", "recorded", "fixed", "uniform", "lognormal"}:
+            raise ValueError(f"Invalid AWS_FAKE_LATENCY spec {spec!r}")
+        if (kind == "fixed" and len(values) != 1) or (kind in {"uniform", "lognormal"} and len(values) != 2):
+            raise ValueError(f"Invalid AWS_FAKE_LATENCY spec {spec!r}")
+        self.kind = kind
+        self.values = values
+
+    def sample_ms(self, recorded_ms: Optional[int] = None) -> float:
+        if self.kind == "none":
+            return 0.0
+        if self.kind == "recorded":
+            return float(recorded_ms or 0)
+        if self.kind == "fixed":
+            return max(0.0, self.values[0])
+        with self._lock:
+            if self.kind == "uniform":
+                low, high = sorted(self.values)
+                return self._rng.uniform(low, high)
+            p50, p95 = self.values
+            mu = math.log(max(p50, 1.0))
+            sigma = max(0.0, (math.log(max(p95, p50, 1.0)) - mu) / 1.645)
+            return self._rng.lognormvariate(mu, sigma)
+
+
+_latency_models: Dict[Tuple[str, int], LatencyModel] = {}
+_latency_lock = threading.Lock()
+
+
+def latency_model() -> LatencyModel:
+    key = (Config.AWS_FAKE_LATENCY, Config.AWS_FAKE_SEED)
+    with _latency_lock:
+        model = _latency_models.get(key)
+        if model is None:
+            model = _latency_models[key] = LatencyModel(*key)
+        return model
+
+
+# ---------------------------------------------------------------------------
+# Recordings
+# ---------------------------------------------------------------------------
+
+class RecordingStore:
+    """Recorded Bedrock responses, one JSON file per ``(model_id, prompt sha256)``."""
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._loaded: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def path(self) -> str:
+        return self._path or Config.AWS_FAKE_RECORDINGS_DIR
+
+    @staticmethod
+    def make_key(model_id: Optional[str], prompt_text: str) -> str:
+        prompt_sha = hashlib.sha256(prompt_text.encode("utf-8")).hexdigest()
+        return hashlib.sha256(f"{model_id or ''}:{prompt_sha}".encode("utf-8")).hexdigest()
+
+    def _file(self, key: str) -> str:
+        return os.path.join(self.path, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._loaded.get(key)
+        if entry is not None:
+            return entry
+        try:
+            with open(self._file(key), "r", encoding="utf-8") as handle:
+                entry = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            self._loaded[key] = entry
+        return entry
+
+    def save(self, *, model_id: str, prompt_text: str, response: str, latency_ms: int, caller: str) -> str:
+        key = self.make_key(model_id, prompt_text)
+        entry = {
+            "model_id": model_id,
+            "caller": caller,
+            "prompt_sha256": hashlib.sha256(prompt_text.encode("utf-8")).hexdigest(),
+            "prompt_chars": len(prompt_text),
+            "response": response,
+            "latency_ms": int(latency_ms),
+            "recorded_at": datetime.utcnow().isoformat(timespec="seconds"),
+        }
+        os.makedirs(self.path, exist_ok=True)
+        tmp = f"{self._file(key)}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as handle:
+            json.dump(entry, handle, ensure_ascii=False)
+        os.replace(tmp, self._file(key))
+        with self._lock:
+            self._loaded[key] = entry
+        return key
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._loaded.clear()
+
+
+bedrock_recordings = RecordingStore()
+
+
+def record_response(model_id: str, messages: List[BaseMessage], response: str, latency_ms: int) -> None:
+    """Save a live response while ``AWS_BACKEND=record``."""
+    if not response:
+        return
+    caller, _ = current_usage_tag()
+    bedrock_recordings.save(
+        model_id=model_id,
+        prompt_text=prompt_fingerprint(messages),
+        response=response,
+        latency_ms=latency_ms,
+        caller=caller,
+    )
+
+
+def fake_response(model_id: str, prompt_text: str) -> Tuple[str, float, str]:
+    """``(text, delay_ms, source)`` for a prompt: a recording if one exists, else a synthesized reply."""
+    entry = bedrock_recordings.get(RecordingStore.make_key(model_id, prompt_text))
+    if entry is not None:
+        return str(entry.get("response") or ""), latency_model().sample_ms(entry.get("latency_ms")), "recording"
+    caller, _ = current_usage_tag()
+    return synthesize(caller, prompt_text), latency_model().sample_ms(None), "synthesized"
+
+
+def _fake_wait(delay_ms: float) -> None:
+    """Sleep for a fake reply; a hedged attempt that lost the race stops waiting early."""
+    if delay_ms <= 0:
+        return
+    cancel = _hedge_cancel.get()
+    if cancel is None:
+        time.sleep(delay_ms / 1000.0)
+        return
+    cancel.wait(delay_ms / 1000.0)
+    _raise_if_hedge_cancelled()
+
+
+# ---------------------------------------------------------------------------
+# LangChain models
+# ---------------------------------------------------------------------------
+
+class FakeChatBedrock(BaseChatModel):
+    """Drop-in for ``_RetryableChatBedrock`` that answers from recordings or synthesizers.
+
+    ``invoke`` goes through ``model_router`` like the real model, so tiering and
+    hedging can be exercised offline.
+    """
+
+    model_id: str
+    model_kwargs: Optional[Dict[str, Any]] = Field(default=None)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-bedrock"
+
+    def invoke(self, input: Any, config: Optional[Any] = None, *, stop: Optional[list[str]] = None, **kwargs: Any) -> Any:
+        return model_router.invoke(self, lambda llm: llm._invoke_once(input, config, stop, kwargs))
+
+    def _invoke_once(self, input: Any, config: Optional[Any], stop: Optional[list[str]], kwargs: Dict[str, Any]) -> Any:
+        stats = _CallStats()
+        result: Any = None
+        status = "error"
+        try:
+            with bedrock_admission.slot(self.model_id, tokens=self._estimate_tokens(input)):
+                _raise_if_hedge_cancelled()
+                result = super().invoke(input, config=config, stop=stop, **kwargs)
+            status = "ok"
+            return result
+        finally:
+            record_chat_usage(self, input, result, stats, "cancelled" if hedge_cancelled() else status)
+
+    async def ainvoke(self, input: Any, config: Optional[Any] = None, *, stop: Optional[list[str]] = None, **kwargs: Any) -> Any:
+        return await run_in_executor(config, self.invoke, input, config, stop=stop, **kwargs)
+
+    def stream(self, input: Any, config: Optional[Any] = None, *, stop: Optional[list[str]] = None, **kwargs: Any) -> Iterator[Any]:
+        stats = _CallStats()
+        aggregate: Any = None
+        outcome = "cancelled"
+        try:
+            with bedrock_admission.slot(self.model_id, tokens=self._estimate_tokens(input)):
+                for chunk in super().stream(input, config=config, stop=stop, **kwargs):
+                    aggregate = chunk if aggregate is None else aggregate + chunk
+                    yield chunk
+            outcome = "ok"
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            record_chat_usage(self, input, aggregate, stats, outcome)
+
+    def _estimate_tokens(self, input: Any) -> int:
+        return estimate_tokens(input, (self.model_kwargs or {}).get("max_tokens"))
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        text, delay_ms, source = fake_response(self.model_id, prompt_fingerprint(messages))
+        _fake_wait(delay_ms)
+        message = AIMessage(content=text, response_metadata={"model_id": self.model_id, "fake_source": source})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        text, delay_ms, _ = fake_response(self.model_id, prompt_fingerprint(messages))
+        _fake_wait(delay_ms)
+        for start in range(0, len(text), 64):
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=text[start:start + 64]))
+            if run_manager is not None:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+
+class FakeBedrockEmbeddings(Embeddings):
+    """Deterministic feature-hashed bag-of-words vectors (unit length)."""
+
+    def __init__(self, model_id: str, dimensions: int = 1024) -> None:
+        self.model_id = model_id
+        self.dimensions = dimensions
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimensions
+        for token in re.findall(r"\w+", (text or "").lower()):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "little") % self.dimensions
+            vector[index] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+# ---------------------------------------------------------------------------
+# boto3 bedrock-runtime stand-in
+# ---------------------------------------------------------------------------
+
+def _find_images(value: Any) -> List[str]:
+    if isinstance(value, dict):
+        if isinstance(value.get("image"), str):
+            return [value["image"]]
+        if isinstance(value.get("images"), list) and value["images"]:
+            return [img for img in value["images"] if isinstance(img, str)]
+        for nested in value.values():
+            found = _find_images(nested)
+            if found:
+                return found
+    return []
+
+
+class FakeBedrockRuntimeClient:
+    """Answers ``invoke_model`` for Titan/Nova text and image request bodies."""
+
+    def invoke_model(self, *, modelId: str, body: Any, **_: Any) -> Dict[str, Any]:
+        payload = json.loads(body.decode("utf-8") if isinstance(body, (bytes, bytearray)) else body)
+        if "taskType" in payload:
+            # Image edits echo their input so downstream decoding and storage still run.
+            out: Dict[str, Any] = {"images": _find_images(payload)[:1] or [_BLANK_PNG]}
+        else:
+            if "inputText" in payload:
+                prompt = str(payload["inputText"])
+            else:
+                prompt = "\n\n".join(
+                    _content_text(message.get("content")) for message in payload.get("messages") or [] if isinstance(message, dict)
+                )
+            with bedrock_admission.slot(modelId, tokens=estimate_tokens(prompt)):
+                text, delay_ms, _ = fake_response(modelId, prompt)
+                if delay_ms > 0:
+                    time.sleep(delay_ms / 1000.0)
+            if "inputText" in payload:
+                out = {"results": [{"outputText": text}]}
+            else:
+                out = {"output": {"message": {"role": "assistant", "content": [{"text": text}]}}}
+        return {
+            "body": io.BytesIO(json.dumps(out).encode("utf-8")),
+            "contentType": "application/json",
+            "ResponseMetadata": {"HTTPStatusCode": 200},
+        }
+
+
+fake_runtime_client = FakeBedrockRuntimeClient()
+
+
+__all__ = [
+    "FakeBedrockEmbeddings",
+    "FakeBedrockRuntimeClient",
+    "FakeChatBedrock",
+    "LatencyModel",
+    "RecordingStore",
+    "bedrock_recordings",
+    "fake_response",
+    "fake_runtime_client",
+    "is_fake_backend",
+    "is_recording_backend",
+    "latency_model",
+    "prompt_fingerprint",
+    "record_response",
+]
@@ -0,0 +1,720 @@
+"""Schema-valid stand-in responses for every LLM caller.
+
+Used by the fake Bedrock backend when no recording exists for a prompt. Each
+synthesizer is registered under the caller tag its phase uses with
+``track_llm_usage`` / ``llm_usage_context`` and returns the raw model text the
+phase parser expects. Identifiers (idea ids, cluster ids, participant user ids)
+are read back out of the JSON sections of the rendered prompt, so generated
+clusters, shortlists and decisions reference real rows.
+
+Output is deterministic: the same prompt always produces the same text.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import random
+import re
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+Synthesizer = Callable[[str, random.Random], Any]
+
+_SYNTHESIZERS: Dict[str, Synthesizer] = {}
+
+_WORDS = (
+    "team", "customer", "pilot", "signal", "workflow", "insight", "budget", "launch", "feedback",
+    "metric", "risk", "partner", "prototype", "onboarding", "pricing", "channel", "support",
+    "automation", "roadmap", "experiment", "data", "retention", "quality", "platform", "survey",
+)
+_ENERGY = ("low", "medium", "high")
+_MODES = ("solo", "pairs", "groups")
+
+
+def synthesizer(*callers: str) -> Callable[[Synthesizer], Synthesizer]:
+    def decorator(fn: Synthesizer) -> Synthesizer:
+        for caller in callers:
+            _SYNTHESIZERS[caller] = fn
+        return fn
+
+    return decorator
+
+
+def synthesize(caller: str, prompt: str) -> str:
+    """Return model text for ``prompt`` as the phase tagged ``caller`` expects it."""
+    rng = random.Random(int(hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16], 16))
+    result = _SYNTHESIZERS.get(caller, _generic)(prompt, rng)
+    if isinstance(result, str):
+        return result
+    return json.dumps(result, ensure_ascii=False)
+
+
+# ---------------------------------------------------------------------------
+# Prompt helpers
+# ---------------------------------------------------------------------------
+
+def _section(prompt: str, heading: str) -> Any:
+    """Decode the JSON value that follows ``heading`` in the prompt, if any."""
+    index = prompt.find(heading)
+    if index < 0:
+        return None
+    text = prompt[index + len(heading):].lstrip()
+    try:
+        value, _ = json.JSONDecoder().raw_decode(text)
+    except ValueError:
+        return None
+    return value
+
+
+def _workshop_title(prompt: str) -> str:
+    for heading in ("Workshop Snapshot (JSON):", "Workshop Snapshot:", "Workshop Overview:"):
+        snapshot = _section(prompt, heading)
+        if isinstance(snapshot, dict) and snapshot.get("title"):
+            return str(snapshot["title"])
+    match = re.search(r"(?:Title|title)\"?\s*:\s*\"?([^\"\n]{3,80})", prompt)
+    return match.group(1).strip() if match else "the workshop"
+
+
+def _sentence(rng: random.Random, words: int = 10, topic: str = "") -> str:
+    body = " ".join(rng.choice(_WORDS) for _ in range(max(3, words)))
+    prefix = f"For {topic}, " if topic else ""
+    text = f"{prefix}{body}"
+    return text[0].upper() + text[1:] + "."
+
+
+def _paragraph(rng: random.Random, words: int, topic: str = "") -> str:
+    sentences: List[str] = []
+    remaining = words
+    while remaining > 0:
+        size = min(remaining, rng.randint(8, 14))
+        sentences.append(_sentence(rng, size, topic if not sentences else ""))
+        remaining -= size
+    return " ".join(sentences)
+
+
+def _strings(rng: random.Random, count: int, words: int = 8) -> List[str]:
+    return [_sentence(rng, words) for _ in range(count)]
+
+
+def _read_seconds(text: str) -> int:
+    return max(45, int(round(len(text.split()) / 150.0 * 60)))
+
+
+def _speech(rng: random.Random, topic: str, words: int = 120) -> Dict[str, Any]:
+    script = _paragraph(rng, words, topic)
+    return {
+        "narration": _paragraph(rng, 60, topic),
+        "tts_script": script,
+        "tts_read_time_seconds": _read_seconds(script),
+    }
+
+
+def _ideas(prompt: str) -> List[Dict[str, Any]]:
+    ideas = _section(prompt, "Idea Reference Map (JSON):")
+    if not isinstance(ideas, list):
+        return []
+    return [idea for idea in ideas if isinstance(idea, dict) and isinstance(idea.get("idea_id"), int)]
+
+
+def _clusters(prompt: str, *headings: str) -> List[Dict[str, Any]]:
+    for heading in headings:
+        clusters = _section(prompt, heading)
+        if isinstance(clusters, list) and clusters:
+            return [c for c in clusters if isinstance(c, dict)]
+    return []
+
+
+def _cluster_id(cluster: Dict[str, Any]) -> Optional[int]:
+    value = cluster.get("cluster_id", cluster.get("id"))
+    return value if isinstance(value, int) else None
+
+
+def _cluster_name(cluster: Dict[str, Any], index: int) -> str:
+    return str(cluster.get("name") or cluster.get("title") or cluster.get("label") or f"Theme {index + 1}")
+
+
+def _cluster_votes(cluster: Dict[str, Any]) -> int:
+    for key in ("votes", "vote_count"):
+        if isinstance(cluster.get(key), int):
+            return cluster[key]
+    return 0
+
+
+def _representatives(cluster: Dict[str, Any], limit: int = 2) -> List[Dict[str, Any]]:
+    out = []
+    for idea in (cluster.get("ideas") or [])[:limit]:
+        if isinstance(idea, dict) and isinstance(idea.get("idea_id"), int):
+            out.append({"idea_id": idea["idea_id"], "text": str(idea.get("text") or "")})
+    return out
+
+
+def _participant_user_ids(prompt: str) -> List[int]:
+    roster = _section(prompt, "Participants Roster (JSON):")
+    if not isinstance(roster, list):
+        return []
+    return [p["user_id"] for p in roster if isinstance(p, dict) and isinstance(p.get("user_id"), int)]
+
+
+def _today(offset_days: int = 0) -> str:
+    return (datetime.utcnow() + timedelta(days=offset_days)).strftime("%Y-%m-%d")
+
+
+def _document_spec(rng: random.Random, title: str, headings: List[str], table: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    sections: List[Dict[str, Any]] = []
+    for heading in headings:
+        blocks: List[Dict[str, Any]] = [{"type": "p", "text": _paragraph(rng, 30)}]
+        blocks.append({"type": "ul", "items": _strings(rng, 3, 5)})
+        sections.append({"heading": heading, "blocks": blocks})
+    if table and sections:
+        sections[0]["blocks"].append({"type": "table", **table})
+    return {
+        "title": title,
+        "cover": {
+            "subtitle": _sentence(rng, 6),
+            "objective": _sentence(rng, 12),
+            "date_str": datetime.utcnow().strftime("%Y-%m-%d %H:%M UTC"),
+        },
+        "sections": sections,
+        "appendices": [],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Pre-workshop generators
+# ---------------------------------------------------------------------------
+
+@synthesizer("icebreaker")
+def _icebreaker(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    return {"icebreaker": f"What is one {rng.choice(_WORDS)} you would change about {_workshop_title(prompt)}?"}
+
+
+@synthesizer("tips")
+def _tip(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    return {"tip": f"Bring one concrete {rng.choice(_WORDS)} example related to {_workshop_title(prompt)}."}
+
+
+@synthesizer("rules")
+def _rules(prompt: str, rng: random.Random) -> str:
+    return "\n".join(f"- {line}" for line in _strings(rng, 4, 7))
+
+
+@synthesizer("agenda")
+def _agenda(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    activities = ("Welcome & Framing", "Warm-Up", "Brainstorming", "Clustering & Voting", "Wrap-Up")
+    minute = 0
+    agenda = []
+    for activity in activities:
+        duration = rng.choice((10, 15, 20))
+        agenda.append(
+            {
+                "time_slot": f"{minute}-{minute + duration} min",
+                "activity": activity,
+                "description": _sentence(rng, 10),
+                "estimated_duration": f"{duration} minutes",
+            }
+        )
+        minute += duration
+    return {"agenda": agenda}
+
+
+@synthesizer("action_items")
+def _action_items(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    participants = _section(prompt, "Participants (for assignment reference):")
+    owners = [p.get("name") or p.get("email") for p in participants or [] if isinstance(p, dict)]
+    items = []
+    for index in range(3):
+        items.append(
+            {
+                "title": _sentence(rng, 5).rstrip("."),
+                "description": _sentence(rng, 12),
+                "owner": owners[index % len(owners)] if owners else None,
+                "due_date": _today(7 * (index + 1)),
+                "status": "todo",
+            }
+        )
+    return {"items": items}
+
+
+@synthesizer("agenda_pipeline")
+def _agenda_pipeline(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    planned = re.search(r"Planned Duration \(minutes\):\s*(\d+)", prompt)
+    total = int(planned.group(1)) if planned else 90
+    title = re.search(r"^Title:\s*(.+)$", prompt, re.MULTILINE)
+    phases = ("framing", "warm_up", "brainstorming", "clustering_voting", "feasibility", "prioritization", "action_planning", "summary")
+    share = max(1, total // len(phases))
+    agenda = []
+    offset = 0
+    for position, task_type in enumerate(phases, start=1):
+        duration = share if position < len(phases) else max(1, total - offset)
+        agenda.append(
+            {
+                "position": position,
+                "title": task_type.replace("_", " ").title(),
+                "description": _sentence(rng, 12),
+                "task_type": task_type,
+                "duration_minutes": duration,
+                "start_offset_minutes": offset,
+                "end_offset_minutes": offset + duration,
+            }
+        )
+        offset += duration
+    return {
+        "workshop_title": title.group(1).strip() if title else "Workshop",
+        "planned_duration_minutes": total,
+        "agenda": agenda,
+        "guidelines": _strings(rng, 3, 6),
+        "icebreaker": f"What {rng.choice(_WORDS)} surprised you most this month?",
+        "tip": _sentence(rng, 10),
+        "facilitator_tips": _strings(rng, 3, 8),
+        "executive_summary": _paragraph(rng, 40),
+        "confidence_level": "medium",
+    }
+
+
+@synthesizer("document_enrichment")
+def _document_enrichment(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    content = prompt.split("Document Content:", 1)[-1].strip()
+    first_line = next((line.strip() for line in content.splitlines() if line.strip()), "Untitled Document")
+    summary = " ".join(content.split()[:80]) or _paragraph(rng, 40)
+    return {
+        "title": first_line[:80],
+        "description": _sentence(rng, 20),
+        "summary": summary,
+        "markdown": content or summary,
+        "tts_script": summary,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Workshop phases
+# ---------------------------------------------------------------------------
+
+@synthesizer("framing")
+def _framing(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    topic = _workshop_title(prompt)
+    script = _paragraph(rng, 120, topic)
+    return {
+        "problem_statement": _sentence(rng, 18, topic),
+        "context_summary": _paragraph(rng, 40),
+        "assumptions": _strings(rng, 3),
+        "constraints": _strings(rng, 3),
+        "success_criteria": _strings(rng, 3),
+        "key_insights": _strings(rng, 3),
+        "framing_narration": _paragraph(rng, 60, topic),
+        "tts_script": script,
+        "estimated_read_time": _read_seconds(script),
+        "opening_keynote": _sentence(rng, 8, topic),
+        "warmup_segue": _sentence(rng, 12),
+        "warmup_instruction": _sentence(rng, 12),
+        "participation_norms": ["One idea per turn", "Be concise", "Build on others", "Assume good intent"],
+        "agenda_highlights": _strings(rng, 3, 6),
+        "unknowns": _strings(rng, 2, 6),
+        "tech_feasibility_rubric": _strings(rng, 3, 8),
+        "legal_compliance_rules": _strings(rng, 3, 8),
+        "budget_feasibility_rubric": _strings(rng, 3, 8),
+        "data_privacy_checklist": _strings(rng, 3, 8),
+        "ethical_considerations": _strings(rng, 3, 8),
+    }
+
+
+@synthesizer("warm_up")
+def _warm_up(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    topic = _workshop_title(prompt)
+    speech = _speech(rng, topic, 100)
+    options = [
+        {
+            "title": f"{rng.choice(_WORDS).title()} {rng.choice(_WORDS)} check-in",
+            "prompt": f"Share one {rng.choice(_WORDS)} that matters to you about {topic}.",
+            "mode": _MODES[index % len(_MODES)],
+            "timer_sec": rng.choice((60, 90, 120, 180)),
+            "energy_level": _ENERGY[index % len(_ENERGY)],
+        }
+        for index in range(3)
+    ]
+    return {
+        "facilitator_intro": _sentence(rng, 20, topic),
+        "participation_recap": _sentence(rng, 15),
+        "warm_up_instructions": _sentence(rng, 25),
+        "task_duration": rng.choice((120, 180, 240)),
+        "narration": speech["narration"],
+        "tts_script": speech["tts_script"],
+        "estimated_read_time": speech["tts_read_time_seconds"],
+        "options": options,
+        "selected_index": rng.randrange(len(options)),
+        "handoff_phrase": _sentence(rng, 12),
+    }
+
+
+@synthesizer("brainstorming")
+def _brainstorming(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    topic = _workshop_title(prompt)
+    limit = re.search(r"Limit ai_ideas to at most (\d+) items", prompt)
+    max_ideas = int(limit.group(1)) if limit else 0
+    description = _sentence(rng, 20, topic)
+    speech = _speech(rng, topic, 120)
+    return {
+        "title": "Brainstorm Solutions",
+        "task_type": "brainstorming",
+        "task_description": description,
+        "instructions": "Add at least three ideas each; one idea per sticky note.",
+        "task_duration": rng.choice((300, 420, 600)),
+        "narration": f"{description} {speech['narration']}",
+        "tts_script": f"{description} {speech['tts_script']}",
+        "tts_read_time_seconds": speech["tts_read_time_seconds"],
+        "ai_ideas": [
+            {
+                "text": _sentence(rng, 10),
+                "rationale": _sentence(rng, 12),
+                "tags": [rng.choice(_WORDS)],
+                "inspiration": rng.choice(("framing", "warmup", "prework", "mixed")),
+            }
+            for _ in range(min(max_ideas, 3))
+        ],
+        "ai_ideas_include_in_outputs": True,
+    }
+
+
+@synthesizer("clustering")
+def _clustering(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    ideas = _ideas(prompt)
+    count = max(1, min(5, (len(ideas) + 2) // 3))
+    buckets: List[List[int]] = [[] for _ in range(count)]
+    for index, idea in enumerate(ideas):
+        buckets[index % count].append(index)
+    clusters = []
+    for number, bucket in enumerate(buckets):
+        if not bucket:
+            continue
+        ids = [ideas[i]["idea_id"] for i in bucket]
+        name = f"{rng.choice(_WORDS).title()} {rng.choice(_WORDS)}"
+        clusters.append(
+            {
+                "label": chr(ord("A") + number),
+                "name": name,
+                "gist": _sentence(rng, 8),
+                "description": _sentence(rng, 16),
+                "idea_ids": ids,
+                "idea_indices": bucket,
+                "representative_id": ids[0],
+                "examples": ids[:2],
+            }
+        )
+    duration = 300 if len(ideas) <= 10 else 600
+    speech = _speech(rng, _workshop_title(prompt), 120)
+    return {
+        "title": "Vote on Idea Clusters",
+        "task_type": "clustering_voting",
+        "task_description": "Review the idea clusters and vote for the most promising themes.",
+        "instructions": f"Read each cluster, then place your dots. You have {duration // 60} minutes.",
+        "task_duration": duration,
+        "corrected": [{"idea_id": idea["idea_id"], "corrected_text": str(idea.get("text") or "")} for idea in ideas],
+        "clusters": clusters,
+        "duplicates": [],
+        "rationale": _sentence(rng, 20),
+        "market_research_context": "TBD",
+        "market_target_segment": "TBD",
+        "market_positioning": "TBD",
+        "go_to_market_strategy": "TBD",
+        "competitive_alternatives": "TBD",
+        "narration": f"You have {duration // 60} minutes to review the clusters and vote. {speech['narration']}",
+        "tts_script": speech["tts_script"],
+        "tts_read_time_seconds": speech["tts_read_time_seconds"],
+    }
+
+
+def _scores(rng: random.Random) -> Dict[str, int]:
+    return {
+        key: rng.randint(1, 5)
+        for key in ("technical", "operational", "legal_compliance", "data_privacy", "risk", "cost_effort", "time_to_value")
+    }
+
+
+@synthesizer("feasibility")
+def _feasibility(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    clusters = _clusters(prompt, "Clusters (ideas, votes) (JSON):")
+    analysed: List[Dict[str, Any]] = []
+    for index, cluster in enumerate(clusters):
+        analysed.append(
+            {
+                "cluster_id": _cluster_id(cluster),
+                "cluster_name": _cluster_name(cluster, index),
+                "votes": _cluster_votes(cluster),
+                "feasibility_scores": _scores(rng),
+                "findings": {
+                    "key_constraints": _strings(rng, 2, 6),
+                    "dependencies": _strings(rng, 2, 6),
+                    "regulatory_notes": _strings(rng, 1, 6),
+                    "data_privacy_notes": _strings(rng, 1, 6),
+                    "ethical_considerations": _strings(rng, 1, 6),
+                    "risks": [
+                        {
+                            "risk": _sentence(rng, 6),
+                            "severity": rng.choice(_ENERGY),
+                            "likelihood": rng.choice(_ENERGY),
+                            "mitigation": _sentence(rng, 8),
+                        }
+                    ],
+                },
+                "recommendation": {
+                    "summary": _sentence(rng, 14),
+                    "next_steps": _strings(rng, 2, 6),
+                    "confidence": rng.choice(_ENERGY),
+                },
+                "representative_ideas": _representatives(cluster),
+            }
+        )
+    rows = [[c["cluster_name"], str(c["votes"]), "; ".join(i["text"] for i in c["representative_ideas"]) or "TBD"] for c in analysed]
+    spec = _document_spec(
+        rng,
+        "Feasibility Report",
+        [
+            "Executive Summary", "Top Clusters & Ideas", "Technical Considerations", "Market & Competitive Analysis",
+            "Operational Feasibility", "Legal & Compliance", "Data Privacy & Ethics", "Financial Projection",
+            "Project Timeline", "Risk Register (FMEA-style)", "Recommendations & Decision",
+        ],
+        {"columns": ["Cluster", "Votes", "Representative Ideas"], "rows": rows},
+    )
+    spec["cover"]["top_clusters"] = [{"name": c["cluster_name"], "votes": c["votes"]} for c in analysed]
+    return {
+        "title": "Feasibility Analysis",
+        "task_type": "results_feasibility",
+        "task_description": "Review the feasibility analysis of the top voted clusters.",
+        "instructions": _paragraph(rng, 30),
+        "task_duration": 600,
+        **_speech(rng, _workshop_title(prompt), 120),
+        "analysis": {"clusters": analysed, "method_notes": _sentence(rng, 20)},
+        "document_spec": spec,
+    }
+
+
+_POSITIONS = ("High Impact/Low Effort", "High Impact/High Effort", "Low Impact/Low Effort", "Low Impact/High Effort")
+_KANO = ("Basic", "Performance", "Excitement", "Indifferent")
+
+
+@synthesizer("prioritization")
+def _prioritization(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    clusters = sorted(
+        _clusters(prompt, "Clusters (ideas, votes) (JSON):"),
+        key=lambda c: _cluster_votes(c),
+        reverse=True,
+    )
+    weights = {"impact": 0.4, "confidence": 0.2, "effort": 0.2, "feasibility": 0.2}
+    prioritized = []
+    for rank, cluster in enumerate(clusters, start=1):
+        prioritized.append(
+            {
+                "cluster_id": _cluster_id(cluster),
+                "title": _cluster_name(cluster, rank - 1),
+                "description": str(cluster.get("description") or _sentence(rng, 12)),
+                "vote_count": _cluster_votes(cluster),
+                "rank": rank,
+                "scores": {
+                    "RICE": rng.randint(10, 100),
+                    "ICE": rng.randint(10, 100),
+                    "Kano": rng.choice(_KANO),
+                    "impact": rng.randint(1, 5),
+                    "confidence": rng.randint(1, 5),
+                    "effort": rng.randint(1, 5),
+                    "feasibility": rng.randint(1, 5),
+                    "strategic_fit": rng.randint(1, 5),
+                    "success_criteria_alignment": rng.randint(1, 5),
+                },
+                "weights": weights,
+                "position": rng.choice(_POSITIONS),
+                "kano_type": rng.choice(_KANO),
+                "why": _sentence(rng, 14),
+                "representative_ideas": _representatives(cluster),
+                "theme_label": _cluster_name(cluster, rank - 1),
+                "theme_summary": _sentence(rng, 10),
+                "duplicate_refs": [],
+                "risks": [{"risk": _sentence(rng, 6), "severity": rng.randint(1, 5), "likelihood": rng.randint(1, 5), "mitigation": _sentence(rng, 8)}],
+            }
+        )
+    spec = _document_spec(
+        rng,
+        "Prioritization & Shortlist",
+        ["Executive Summary", "Shortlist Table", "Top Candidates — Details", "Impact–Effort Placement", "Recommendations"],
+        {
+            "columns": ["Rank", "Cluster", "Votes"],
+            "rows": [[str(p["rank"]), p["title"], str(p["vote_count"])] for p in prioritized],
+        },
+    )
+    spec["cover"]["topline"] = {
+        "clusters_considered": len(clusters),
+        "ideas_considered": sum(len(c.get("ideas") or []) for c in clusters),
+    }
+    spec["cover"]["weights_table"] = {"columns": ["Factor", "Weight"], "rows": [[k, v] for k, v in weights.items()]}
+    top = prioritized[0] if prioritized else None
+    return {
+        "title": "Prioritization & Shortlisting",
+        "task_type": "results_prioritization",
+        "task_description": "Review the ranked shortlist of clusters.",
+        "instructions": _paragraph(rng, 30),
+        "task_duration": 600,
+        **_speech(rng, _workshop_title(prompt), 120),
+        "prioritized": prioritized,
+        "methods": ["Baseline composite of votes, feasibility and effort"],
+        "risks": [{"risk": _sentence(rng, 6), "severity": 3, "likelihood": 3, "mitigation": _sentence(rng, 8)}],
+        "constraints": _strings(rng, 2, 6),
+        "captured_decisions": (
+            [{"cluster_id": top["cluster_id"], "topic": top["title"], "decision": "Advance to action planning", "rationale": top["why"]}]
+            if top else []
+        ),
+        "captured_action_items": (
+            [{"title": f"Scope pilot for {top['title']}", "cluster_id": top["cluster_id"]}] if top else []
+        ),
+        "open_unknowns": _strings(rng, 2, 6),
+        "notable_findings": _strings(rng, 2, 8),
+        "document_spec": spec,
+    }
+
+
+@synthesizer("action_plan")
+def _action_plan(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    owners = _participant_user_ids(prompt)
+    action_items: List[Dict[str, Any]] = []
+    for index in range(3):
+        action_items.append(
+            {
+                "title": _sentence(rng, 5).rstrip("."),
+                "owner_user_id": owners[index % len(owners)] if owners else None,
+                "due_date": _today(30 * (index + 1)),
+                "metric": _sentence(rng, 6),
+                "dependencies": [],
+            }
+        )
+    milestones = [{"name": f"{days}-day checkpoint", "date": _today(days)} for days in (30, 60, 90)]
+    spec = _document_spec(
+        rng,
+        "Action Plan",
+        ["Executive Summary", "Action Items", "Milestones (30/60/90)", "Operating Model", "Risks & Mitigations", "Constraints & Assumptions"],
+        {
+            "columns": ["Title", "Owner", "Due Date", "Metric", "Dependencies"],
+            "rows": [[a["title"], str(a["owner_user_id"] or "TBD"), a["due_date"], a["metric"], "TBD"] for a in action_items],
+        },
+    )
+    spec["cover"]["owner_note"] = "Owners update status weekly."
+    return {
+        "title": "Action Plan",
+        "task_type": "results_action_plan",
+        "task_description": "Confirm owners and dates for the shortlisted work.",
+        "instructions": _paragraph(rng, 30),
+        "task_duration": 600,
+        **_speech(rng, _workshop_title(prompt), 120),
+        "action_items": action_items,
+        "milestones": milestones,
+        "methods": ["30/60/90"],
+        "risks": [{"risk": _sentence(rng, 6), "severity": 3, "likelihood": 2, "mitigation": _sentence(rng, 8)}],
+        "constraints": _strings(rng, 2, 6),
+        "captured_decisions": [],
+        "captured_action_items": [],
+        "open_unknowns": _strings(rng, 2, 6),
+        "document_spec": spec,
+    }
+
+
+@synthesizer("summary")
+def _summary(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    topic = _workshop_title(prompt)
+    highlights = _strings(rng, 3, 8)
+    markdown = "\n\n".join(
+        [f"# {topic}", "## Executive Summary", _paragraph(rng, 40), "## Highlights"]
+        + [f"- {h}" for h in highlights]
+        + ["## Decisions", "TBD", "## Next Steps", "TBD", "## Risks & Watch-outs", "TBD"]
+    )
+    return {
+        "title": "Workshop Summary",
+        "task_type": "summary",
+        "task_description": "Review the session summary and shared artifacts.",
+        "instructions": _paragraph(rng, 30),
+        "task_duration": 300,
+        **_speech(rng, topic, 120),
+        "artifacts": {
+            "markdown_doc": markdown,
+            "document_spec": _document_spec(
+                rng,
+                "Workshop Summary",
+                ["Executive Summary", "Session Highlights", "Shortlist & Scores", "Decisions & Action Items", "Risks & Mitigations"],
+            ),
+            "slides_spec": {
+                "title": topic,
+                "slides": [
+                    {"layout": "title", "title": topic, "bullets": []},
+                    {"layout": "title+bullets", "title": "Highlights", "bullets": highlights},
+                    {"layout": "title+bullets", "title": "Next Steps", "bullets": _strings(rng, 3, 6)},
+                ],
+            },
+        },
+        "canonical_session_json": "AUTO",
+    }
+
+
+@synthesizer("discussion")
+def _discussion(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    match = re.search(r"MODE:\s*(\w+)", prompt)
+    mode = match.group(1) if match else "initial"
+    clusters = _clusters(prompt, "Clusters:", "Prioritization Shortlist:")
+    focus = clusters[:3]
+    notes = [
+        {"ts": datetime.utcnow().isoformat(timespec="seconds") + "Z", "speaker_user_id": None, "point": _sentence(rng, 12)}
+        for _ in range(2)
+    ]
+    decisions = [
+        {
+            "topic": _cluster_name(cluster, index),
+            "decision": _sentence(rng, 10),
+            "owner_user_id": None,
+            "rationale": _sentence(rng, 12),
+            "cluster_id": _cluster_id(cluster),
+        }
+        for index, cluster in enumerate(focus[:1])
+    ]
+    devil = [
+        {
+            "cluster_id": _cluster_id(cluster),
+            "cluster_title": _cluster_name(cluster, index),
+            "counterargument": _sentence(rng, 12),
+            "probing_question": _sentence(rng, 10).rstrip(".") + "?",
+        }
+        for index, cluster in enumerate(focus)
+    ] or [{"cluster_id": None, "cluster_title": "Shortlist", "counterargument": _sentence(rng, 12), "probing_question": "What evidence would change our minds?"}]
+    mediator_prompt = _sentence(rng, 14)
+    scribe_summary = _paragraph(rng, 30)
+    if mode == "devil_advocate":
+        return {"devil_advocate": devil, "scribe_summary": scribe_summary}
+    if mode == "mediator":
+        return {"decisions": decisions, "mediator_prompt": mediator_prompt, "scribe_summary": scribe_summary}
+    if mode == "scribe":
+        return {"discussion_notes": notes, "scribe_summary": scribe_summary}
+    return {
+        "discussion_notes": notes,
+        "decisions": decisions,
+        "devil_advocate": devil,
+        "mediator_prompt": mediator_prompt,
+        "scribe_summary": scribe_summary,
+        **_speech(rng, _workshop_title(prompt), 120),
+    }
+
+
+@synthesizer("assistant.plan", "assistant.compose")
+def _assistant(prompt: str, rng: random.Random) -> Dict[str, Any]:
+    return {
+        "text": _paragraph(rng, 40),
+        "citations": [],
+        "tool_calls": [],
+        "proposed_actions": [],
+        "ui_hints": {},
+    }
+
+
+def _generic(prompt: str, rng: random.Random) -> str:
+    # Rewrite-style prompts (transcript polish) quote their input between triple backticks.
+    fenced = re.findall(r"```\s*\n?(.*?)\n?```", prompt, re.DOTALL)
+    if fenced:
+        return fenced[-1].strip()
+    if "json" in prompt.lower():
+        return json.dumps({"text": _paragraph(rng, 30)})
+    return _paragraph(rng, 40)
+
+
+__all__ = ["synthesize", "synthesizer"]
@@ -1,82 +1,291 @@
 # app/utils/json_utils.py
 import json
 import re
+from typing import Any, List, NamedTuple, Optional, Tuple
+
 from flask import current_app
 
+_DECODER = json.JSONDecoder()
+_FENCE_RE = re.compile(r"```json\s*", re.IGNORECASE)
+_OPEN_QUOTES = '"“”'
+_PAIRS = {"{": "}", "[": "]"}
+# Next structurally interesting character outside / inside a string.
+_STRUCT_RE = re.compile('[{}\\[\\]"“”,]')
+_STRING_RE = re.compile('["\\\\\n\r\t]')
+_SMART_STRING_RE = re.compile('["\\\\\n\r\t”]')
+_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+_VALID_ESCAPES = set('"\\/bfnrtu')
+
+
+class JSONBlock(NamedTuple):
+    """JSON text found in LLM output; ``truncated`` when an unclosed tail was closed to get it."""
+
+    text: str
+    truncated: bool = False
+
+
+class JSONScanner:
+    """Single-pass, tolerant scanner for the first top-level JSON value in LLM output.
+
+    Feed text as it arrives (``feed`` can be called per streamed token); the
+    scanner walks each character once, tracking nesting and string state, and
+    builds a repaired copy of the value as it goes:
+
+    - trailing commas before ``}``/``]`` are dropped;
+    - curly quotes used as string delimiters become ``"``;
+    - raw newlines/tabs inside strings are escaped.
+
+    ``finish`` returns the repaired JSON text once the value has closed, or, when
+    the input ended early and ``repair_truncated`` is set, the value with the
+    open string and containers closed (dropping a dangling partial element).
+    The result is not decoded here.
+    """
+
+    def __init__(self, openers: str = "{[", repair_truncated: bool = True) -> None:
+        self.openers = openers
+        self.repair_truncated = repair_truncated
+        self._consumed = 0
+        self._start = -1
+        self._out: List[str] = []
+        self._out_len = 0
+        self._stack: List[str] = []
+        # Output offset of the last complete element boundary per open container.
+        self._cuts: List[int] = []
+        self._in_string = False
+        self._smart = False
+        self._escape = False
+        self.done = False
+
+    @property
+    def start(self) -> int:
+        """Offset of the value's opening bracket in the fed text, or -1."""
+        return self._start
+
+    @property
+    def truncated(self) -> bool:
+        """True when a value was opened but the input ended before it closed."""
+        return self._start >= 0 and not self.done
+
+    def feed(self, chunk: str) -> bool:
+        """Consume ``chunk``; returns True once the first top-level value has closed."""
+        if chunk and not self.done:
+            self._scan(chunk)
+            self._consumed += len(chunk)
+        return self.done
+
+    def finish(self) -> str:
+        """Repaired JSON text of the first value, or '' when there is none."""
+        if self._start < 0:
+            return ""
+        text = "".join(self._out)
+        if self.done:
+            return text
+        if not self.repair_truncated:
+            return ""
+        return self._close_truncated(text)
 
-def _find_balanced_json(text: str, start_char: str, end_char: str) -> str:
-    start = text.find(start_char)
-    while start != -1:
-        depth = 0
-        in_string = False
-        escape = False
-        for idx in range(start, len(text)):
-            ch = text[idx]
-            if escape:
-                escape = False
+    # ------------------------------------------------------------------
+    def _emit(self, piece: str) -> None:
+        if piece:
+            self._out.append(piece)
+            self._out_len += len(piece)
+
+    def _drop_trailing_comma(self) -> None:
+        while self._out:
+            last = self._out[-1]
+            tail = last.rstrip()
+            if not tail:
+                self._out.pop()
+                self._out_len -= len(last)
                 continue
-            if ch == "\\":
-                escape = True
+            if tail.endswith(","):
+                self._out[-1] = tail[:-1]
+                self._out_len -= len(last) - len(tail) + 1
+            break
+
+    def _scan(self, buf: str) -> None:
+        pos = 0
+        end = len(buf)
+        if self._start < 0:
+            hits = [i for i in (buf.find(ch) for ch in self.openers) if i != -1]
+            if not hits:
+                return
+            pos = min(hits)
+            self._start = self._consumed + pos
+            self._stack.append(_PAIRS[buf[pos]])
+            self._emit(buf[pos])
+            self._cuts.append(self._out_len)
+            pos += 1
+        while pos < end:
+            if self._escape:
+                ch = buf[pos]
+                # Invalid escapes (e.g. \' from the model) keep the character, not the backslash.
+                self._emit("\\" + ch if ch in _VALID_ESCAPES else ch)
+                self._escape = False
+                pos += 1
                 continue
-            if ch == '"':
-                in_string = not in_string
+            if self._in_string:
+                match = (_SMART_STRING_RE if self._smart else _STRING_RE).search(buf, pos)
+                if match is None:
+                    self._emit(buf[pos:])
+                    break
+                idx = match.start()
+                self._emit(buf[pos:idx])
+                ch = buf[idx]
+                pos = idx + 1
+                if ch == "\\":
+                    self._escape = True
+                elif ch in _CONTROL_ESCAPES:
+                    self._emit(_CONTROL_ESCAPES[ch])
+                elif ch == '"' and self._smart:
+                    self._emit('\\"')
+                else:
+                    self._emit('"')
+                    self._in_string = False
                 continue
-            if in_string:
+            match = _STRUCT_RE.search(buf, pos)
+            if match is None:
+                self._emit(buf[pos:])
+                break
+            idx = match.start()
+            self._emit(buf[pos:idx])
+            ch = buf[idx]
+            pos = idx + 1
+            if ch in _OPEN_QUOTES:
+                self._in_string = True
+                self._smart = ch != '"'
+                self._emit('"')
+            elif ch == ",":
+                self._cuts[-1] = self._out_len
+                self._emit(",")
+            elif ch in _PAIRS:
+                self._stack.append(_PAIRS[ch])
+                self._emit(ch)
+                self._cuts.append(self._out_len)
+            else:
+                if ch != self._stack[-1]:
+                    # Mismatched closer: not JSON we can trust; stop at this point.
+                    self._emit(ch)
+                    self._stack.clear()
+                    self.done = True
+                    break
+                self._drop_trailing_comma()
+                self._emit(ch)
+                self._stack.pop()
+                self._cuts.pop()
+                if not self._stack:
+                    self.done = True
+                    break
+
+    def _close_truncated(self, text: str) -> str:
+        closers = "".join(reversed(self._stack))
+        head = text
+        if self._in_string:
+            head += '"'
+        head = head.rstrip().rstrip(",").rstrip()
+        if head.endswith(":"):
+            head += " null"
+        candidates = [head + closers]
+        # Fall back to the last complete element of the innermost open container.
+        if self._cuts:
+            cut = text[: self._cuts[-1]].rstrip().rstrip(",")
+            candidates.append(cut + closers)
+        for candidate in candidates:
+            try:
+                json.loads(candidate)
+                return candidate
+            except (json.JSONDecodeError, RecursionError):
                 continue
-            if ch == start_char:
-                depth += 1
-            elif ch == end_char:
-                depth -= 1
-                if depth == 0:
-                    candidate = text[start : idx + 1]
-                    try:
-                        json.loads(candidate)
-                        return candidate
-                    except json.JSONDecodeError:
-                        break
-        start = text.find(start_char, start + 1)
-    return ""
-
-
-def extract_json_block(text: str) -> str:
+        return ""
+
+
+def scan_json(text: str, openers: str = "{[", start: int = 0, repair_truncated: bool = True) -> Optional[Tuple[str, Any]]:
+    """Locate and decode the first JSON value opened by one of ``openers`` at/after ``start``.
+
+    Returns ``(json_text, value)``. Well-formed values are decoded in place by the C
+    decoder (one pass, no substring copies); a value it rejects is re-read with
+    ``JSONScanner`` to repair LLM defects. Candidates that still fail are skipped and
+    the search resumes after their opening bracket. Repaired truncated tails that
+    decode to an empty container are not accepted.
+    """
+    found = _scan_json(text, openers, start, repair_truncated)
+    return (found[0], found[1]) if found else None
+
+
+def _scan_json(text: str, openers: str, start: int, repair_truncated: bool) -> Optional[Tuple[str, Any, bool]]:
+    """``scan_json`` plus whether the value was a truncated tail closed by the scanner."""
+    pos = start
+    hit_end = False
+    while True:
+        hits = [i for i in (text.find(ch, pos) for ch in openers) if i != -1]
+        if not hits:
+            return None
+        idx = min(hits)
+        try:
+            value, end = _DECODER.raw_decode(text, idx)
+            return text[idx:end], value, False
+        except (json.JSONDecodeError, RecursionError):
+            pass
+        pos = idx + 1
+        if hit_end:
+            # A repair scan already ran to the end of the text without closing; later
+            # openers lie inside that region, so only the C decoder is tried for them
+            # rather than re-running the Python scan from every opener.
+            continue
+        scanner = JSONScanner(openers, repair_truncated=repair_truncated)
+        scanner.feed(text[idx:])
+        candidate = scanner.finish()
+        if candidate:
+            try:
+                value = json.loads(candidate)
+            except (json.JSONDecodeError, RecursionError):
+                pass
+            else:
+                if scanner.done or value:
+                    return candidate, value, scanner.truncated
+        hit_end = not scanner.done
+
+
+def extract_json_block(text: str, repair_truncated: bool = True) -> str:
     """
     Extracts the first complete JSON object or array from a string,
     handling optional markdown code fences (```json ... ```).
+    Common LLM defects (trailing commas, curly quotes, raw newlines in strings)
+    are repaired, so the result is always valid JSON. Truncated tails are closed
+    too unless ``repair_truncated`` is False (use that to reject replies cut off
+    at ``max_tokens``; ``extract_json`` reports whether a tail was closed).
     Returns an empty string if no valid JSON block is found.
     """
-    if not text:
-        return ""
+    return extract_json(text, repair_truncated=repair_truncated).text
+
 
-    fence_pattern = r"```json\s*(\{[\s\S]*?\}|\[[\s\S]*?\])\s*```"
-    fence_match = re.search(fence_pattern, text, re.IGNORECASE | re.DOTALL)
+def extract_json(text: str, repair_truncated: bool = True) -> JSONBlock:
+    """``extract_json_block`` that also says whether the JSON was a repaired truncated tail."""
+    if not text:
+        return JSONBlock("")
 
+    fence_match = _FENCE_RE.search(text)
     if fence_match:
-        potential_json = fence_match.group(1).strip()
-        try:
-            json.loads(potential_json)
+        found = _scan_json(text, "{[", fence_match.end(), repair_truncated)
+        if found:
             current_app.logger.debug("[extract_json_block] Extracted JSON from fenced block.")
-            return potential_json
-        except json.JSONDecodeError:
-            current_app.logger.warning("[extract_json_block] Found fenced block, but content is invalid JSON. Falling back.")
+            return _block(found)
+        current_app.logger.warning("[extract_json_block] Found fenced block, but content is invalid JSON. Falling back.")
 
-    stripped = text.lstrip()
+    # Prefer an array only when the text leads with one; otherwise the first object wins.
+    order = "[{" if text.lstrip().startswith("[") else "{["
+    for opener in order:
+        found = _scan_json(text, opener, 0, repair_truncated)
+        if found:
+            kind = "array" if opener == "[" else "object"
+            current_app.logger.debug(f"[extract_json_block] Extracted JSON {kind} from freeform text.")
+            return _block(found)
 
-    if stripped.startswith("["):
-        candidate = _find_balanced_json(text, "[", "]")
-        if candidate:
-            current_app.logger.debug("[extract_json_block] Extracted JSON array from freeform text.")
-            return candidate
-
-    candidate = _find_balanced_json(text, "{", "}")
-    if candidate:
-        current_app.logger.debug("[extract_json_block] Extracted JSON object from freeform text.")
-        return candidate
+    current_app.logger.warning("[extract_json_block] No valid JSON object or array found in the text.")
+    return JSONBlock("")
 
-    if not stripped.startswith("["):
-        candidate = _find_balanced_json(text, "[", "]")
-        if candidate:
-            current_app.logger.debug("[extract_json_block] Extracted JSON array from freeform text.")
-            return candidate
 
-    current_app.logger.warning("[extract_json_block] No valid JSON object or array found in the text.")
-    return ""
+def _block(found: Tuple[str, Any, bool]) -> JSONBlock:
+    if found[2]:
+        current_app.logger.warning("[extract_json_block] Output was truncated; closed the open JSON value.")
+    return JSONBlock(found[0], found[2])
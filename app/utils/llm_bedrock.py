@@ -7,10 +7,20 @@ throttling (HTTP 429/503).
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import contextvars
+import hashlib
+import heapq
+import itertools
+import json
 import logging
+import math
 import random
+import threading
 import time
-from typing import Any, Callable, ClassVar, Dict, Optional, Sequence, Tuple, TypeVar
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, ClassVar, Deque, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
 
 import boto3
 from botocore.config import Config as BotoConfig
@@ -18,7 +28,20 @@ from botocore.exceptions import ClientError
 from flask import current_app
 from pydantic import PrivateAttr
 
+from app.assistant.tools.metric import (
+    bedrock_admission_rejected,
+    bedrock_admission_wait,
+    bedrock_client_construct_seconds,
+    bedrock_client_pool_events,
+    bedrock_hedge_delay,
+    bedrock_hedge_events,
+    bedrock_http_connections_opened,
+    bedrock_http_requests_sent,
+    bedrock_inflight,
+    bedrock_llm_cache_events,
+)
 from app.config import Config
+from app.utils.llm_usage import LLMCallRecord, current_usage_tag, llm_usage_recorder, usage_from_message
 
 try:
     from langchain_aws import ChatBedrock, BedrockEmbeddings
@@ -30,12 +53,24 @@ T = TypeVar("T")
 
 logger = logging.getLogger(__name__)
 
-def get_bedrock_runtime_client():
-    """Return a configured boto3 Bedrock Runtime client.
+def _client_key() -> Tuple[Any, ...]:
+    """Identity of the client Config currently asks for (secrets are hashed)."""
+    secret = None
+    if Config.AWS_ACCESS_KEY_ID and Config.AWS_SECRET_ACCESS_KEY:
+        secret = hashlib.sha256(
+            f"{Config.AWS_SECRET_ACCESS_KEY}:{Config.AWS_SESSION_TOKEN or ''}".encode("utf-8")
+        ).hexdigest()
+    return (
+        Config.AWS_REGION,
+        Config.AWS_ACCESS_KEY_ID if secret else None,
+        secret,
+        Config.BEDROCK_BOTO_MAX_ATTEMPTS,
+        Config.BEDROCK_MAX_POOL_CONNECTIONS,
+        Config.BEDROCK_TCP_KEEPALIVE,
+    )
 
-    Uses explicit credentials from Config if provided, else falls back
-    to standard AWS credential resolution (env vars, profiles, etc.).
-    """
+
+def _build_bedrock_runtime_client():
     kwargs: Dict[str, Any] = {"region_name": Config.AWS_REGION}
 
     if Config.AWS_ACCESS_KEY_ID and Config.AWS_SECRET_ACCESS_KEY:
@@ -52,10 +87,79 @@ def get_bedrock_runtime_client():
         retries={
             "mode": "adaptive",
             "max_attempts": Config.BEDROCK_BOTO_MAX_ATTEMPTS,
-        }
+        },
+        max_pool_connections=Config.BEDROCK_MAX_POOL_CONNECTIONS,
+        tcp_keepalive=Config.BEDROCK_TCP_KEEPALIVE,
     )
 
-    return boto3.client("bedrock-runtime", **kwargs)
+    # The default boto3 session is not thread-safe; build from a private one.
+    return boto3.session.Session().client("bedrock-runtime", **kwargs)
+
+
+class BedrockClientPool:
+    """Process-wide bedrock-runtime clients keyed by region and credentials.
+
+    boto3 clients are thread-safe once built, but building one resolves credentials
+    and loads the service model, and each client owns its own urllib3 pool. Sharing
+    one client per key lets every LLM wrapper reuse warm keep-alive connections.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._clients: Dict[Tuple[Any, ...], Any] = {}
+
+    def get(self) -> Any:
+        key = _client_key()
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                bedrock_client_pool_events.labels(result="hit").inc()
+                return client
+            started = time.perf_counter()
+            client = _build_bedrock_runtime_client()
+            bedrock_client_construct_seconds.observe(time.perf_counter() - started)
+            bedrock_client_pool_events.labels(result="miss").inc()
+            self._clients[key] = client
+            return client
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clients.clear()
+
+    def connection_stats(self) -> Dict[str, int]:
+        """HTTP connections opened vs requests sent across the pooled clients."""
+        opened = sent = 0
+        with self._lock:
+            clients = list(self._clients.values())
+        for client in clients:
+            try:
+                pools = client._endpoint.http_session._manager.pools
+                for pool_key in list(pools.keys()):
+                    pool = pools.get(pool_key)
+                    opened += int(getattr(pool, "num_connections", 0) or 0)
+                    sent += int(getattr(pool, "num_requests", 0) or 0)
+            except Exception:  # pragma: no cover - botocore internals changed
+                continue
+        return {"clients": len(clients), "connections": opened, "requests": sent}
+
+
+bedrock_client_pool = BedrockClientPool()
+bedrock_http_connections_opened.set_function(lambda: bedrock_client_pool.connection_stats()["connections"])
+bedrock_http_requests_sent.set_function(lambda: bedrock_client_pool.connection_stats()["requests"])
+
+
+def get_bedrock_runtime_client():
+    """Return the shared boto3 Bedrock Runtime client for the configured credentials.
+
+    Uses explicit credentials from Config if provided, else falls back
+    to standard AWS credential resolution (env vars, profiles, etc.).
+    With ``AWS_BACKEND=fake`` an offline stand-in is returned instead.
+    """
+    if Config.AWS_BACKEND == "fake":
+        from app.utils.fake_bedrock import fake_runtime_client
+
+        return fake_runtime_client
+    return bedrock_client_pool.get()
 
 
 def is_bedrock_configured() -> bool:
@@ -66,6 +170,8 @@ def is_bedrock_configured() -> bool:
     - Either explicit access keys are provided via Config, or
       boto3 can resolve credentials from the default chain.
     """
+    if Config.AWS_BACKEND == "fake":
+        return True
     try:
         if not Config.AWS_REGION:
             return False
@@ -95,6 +201,549 @@ def _is_retryable_message(message: str, patterns: Sequence[str]) -> bool:
     return any(token in lowered for token in patterns)
 
 
+# ---------------------------------------------------------------------------
+# Admission control
+# ---------------------------------------------------------------------------
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_PHASE = "phase"
+PRIORITY_BACKGROUND = "background"
+_PRIORITY_RANK: Dict[str, int] = {PRIORITY_INTERACTIVE: 0, PRIORITY_PHASE: 1, PRIORITY_BACKGROUND: 2}
+
+_current_priority: contextvars.ContextVar[str] = contextvars.ContextVar("bedrock_priority", default=PRIORITY_PHASE)
+
+
+@contextlib.contextmanager
+def bedrock_priority(priority: str) -> Iterator[None]:
+    """Run Bedrock calls made inside the block under ``priority``.
+
+    Calls default to ``phase``; the assistant runs ``interactive`` and document
+    enrichment ``background``. Worker threads do not inherit the setting.
+    """
+    if priority not in _PRIORITY_RANK:
+        raise ValueError(f"Unknown Bedrock priority: {priority}")
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class BedrockAdmissionTimeout(RuntimeError):
+    """Raised when a call waited longer than BEDROCK_ADMISSION_TIMEOUT_SECONDS."""
+
+
+class _TokenBucket:
+    """Continuously refilling per-minute budget (requests or tokens)."""
+
+    def __init__(self, per_minute: int) -> None:
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        amount = min(amount, self.capacity)  # oversized requests wait for a full bucket, not forever
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+    def drain(self) -> None:
+        self.level = min(self.level, 0.0)
+        self.updated = time.monotonic()
+
+
+class _ModelGate:
+    """Priority-ordered admission for one model.
+
+    Waiters are served strictly by (priority, arrival). A class may only start while
+    total in-flight calls are below its limit: interactive may use every slot, phase
+    work leaves one free, background work at most half, so interactive requests
+    always find headroom while a document batch is being enriched.
+    """
+
+    def __init__(self, model_id: str, max_concurrency: int, requests_per_minute: int, tokens_per_minute: int) -> None:
+        self.model_id = model_id
+        self.max_concurrency = max(1, max_concurrency)
+        self.requests = _TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = _TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.inflight = 0
+        self._cond = threading.Condition()
+        self._waiting: list[Tuple[int, int]] = []
+        self._seq = itertools.count()
+
+    def _limit(self, rank: int) -> int:
+        if rank == 0:
+            return self.max_concurrency
+        if rank == 1:
+            return max(1, self.max_concurrency - 1)
+        return max(1, self.max_concurrency // 2)
+
+    def _budget_wait(self, tokens: int, now: float) -> float:
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.wait_time(1, now))
+        if self.tokens is not None and tokens > 0:
+            wait = max(wait, self.tokens.wait_time(tokens, now))
+        return wait
+
+    def acquire(self, rank: int, tokens: int, timeout: float) -> float:
+        """Block until admitted; return the time spent waiting."""
+        started = time.monotonic()
+        deadline = started + timeout
+        entry = (rank, next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiting, entry)
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait: Optional[float] = None
+                    if self._waiting[0] == entry and self.inflight < self._limit(rank):
+                        wait = self._budget_wait(tokens, now)
+                        if wait <= 0:
+                            heapq.heappop(self._waiting)
+                            if self.requests is not None:
+                                self.requests.take(1)
+                            if self.tokens is not None and tokens > 0:
+                                self.tokens.take(tokens)
+                            self.inflight += 1
+                            self._cond.notify_all()
+                            return now - started
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._waiting.remove(entry)
+                        heapq.heapify(self._waiting)
+                        self._cond.notify_all()
+                        raise BedrockAdmissionTimeout(
+                            f"Bedrock admission timed out after {timeout:.0f}s for {self.model_id}"
+                        )
+                    self._cond.wait(remaining if wait is None else min(wait, remaining))
+            except BaseException:
+                if entry in self._waiting:
+                    self._waiting.remove(entry)
+                    heapq.heapify(self._waiting)
+                    self._cond.notify_all()
+                raise
+
+    def release(self) -> None:
+        with self._cond:
+            self.inflight = max(0, self.inflight - 1)
+            self._cond.notify_all()
+
+    def throttled(self) -> None:
+        """Bedrock pushed back: spend the request budget so queued calls spread out."""
+        with self._cond:
+            if self.requests is not None:
+                self.requests.drain()
+
+
+class BedrockAdmission:
+    """Process-wide admission layer in front of every Bedrock text call."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._gates: Dict[str, _ModelGate] = {}
+
+    @staticmethod
+    def _concurrency_for(model_id: str) -> int:
+        for item in (Config.BEDROCK_MODEL_CONCURRENCY or "").split(","):
+            name, _, value = item.strip().rpartition("=")
+            if name == model_id:
+                try:
+                    return max(1, int(value))
+                except ValueError:
+                    break
+        return Config.BEDROCK_MAX_CONCURRENCY_PER_MODEL
+
+    def gate(self, model_id: str) -> _ModelGate:
+        with self._lock:
+            gate = self._gates.get(model_id)
+            if gate is None:
+                gate = _ModelGate(
+                    model_id,
+                    self._concurrency_for(model_id),
+                    Config.BEDROCK_REQUESTS_PER_MINUTE,
+                    Config.BEDROCK_TOKENS_PER_MINUTE,
+                )
+                self._gates[model_id] = gate
+            return gate
+
+    def acquire(self, model_id: str, *, tokens: int = 0, priority: Optional[str] = None) -> Callable[[], None]:
+        """Wait for admission and return the matching release callback."""
+        if not Config.BEDROCK_ADMISSION_ENABLED:
+            return lambda: None
+        priority = priority or _current_priority.get()
+        gate = self.gate(model_id or "unknown")
+        try:
+            waited = gate.acquire(_PRIORITY_RANK.get(priority, 1), tokens, Config.BEDROCK_ADMISSION_TIMEOUT_SECONDS)
+        except BedrockAdmissionTimeout:
+            bedrock_admission_rejected.labels(model=gate.model_id, priority=priority).inc()
+            raise
+        bedrock_admission_wait.labels(model=gate.model_id, priority=priority).observe(waited)
+        bedrock_inflight.labels(model=gate.model_id).set(gate.inflight)
+        released = False
+
+        def _release() -> None:
+            nonlocal released
+            if released:
+                return
+            released = True
+            gate.release()
+            bedrock_inflight.labels(model=gate.model_id).set(gate.inflight)
+
+        return _release
+
+    @contextlib.contextmanager
+    def slot(self, model_id: str, *, tokens: int = 0, priority: Optional[str] = None) -> Iterator[None]:
+        release = self.acquire(model_id, tokens=tokens, priority=priority)
+        try:
+            yield
+        finally:
+            release()
+
+    def throttled(self, model_id: str) -> None:
+        if Config.BEDROCK_ADMISSION_ENABLED:
+            self.gate(model_id or "unknown").throttled()
+
+
+bedrock_admission = BedrockAdmission()
+
+
+def _prompt_text(prompt: Any) -> str:
+    if hasattr(prompt, "to_string"):
+        return prompt.to_string()
+    if isinstance(prompt, str):
+        return prompt
+    return str(prompt)
+
+
+def estimate_tokens(prompt: Any, max_tokens: Any = None) -> int:
+    """Rough token cost of a call: ~4 characters per prompt token plus the output cap."""
+    try:
+        output = int(max_tokens) if max_tokens else 512
+    except (TypeError, ValueError):
+        output = 512
+    return len(_prompt_text(prompt)) // 4 + output
+
+
+def _response_text(message: Any) -> str:
+    content = getattr(message, "content", message)
+    if isinstance(content, list):
+        return "".join(str(part.get("text") or "") if isinstance(part, dict) else str(part) for part in content)
+    return "" if content is None else str(content)
+
+
+class _CallStats:
+    """Retry bookkeeping for one logical chat call (all attempts)."""
+
+    __slots__ = ("started", "retries", "throttles")
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.retries = 0
+        self.throttles = 0
+
+
+def record_chat_usage(llm: Any, input: Any, result: Any, stats: _CallStats, status: str) -> None:
+    """Report one chat call to usage accounting (and to the recordings when ``AWS_BACKEND=record``)."""
+    model_id = getattr(llm, "model_id", None) or "unknown"
+    try:
+        caller, workshop_id = current_usage_tag()
+        prompt_text = _prompt_text(input)
+        response_text = _response_text(result) if result is not None else ""
+        prompt_tokens, completion_tokens = usage_from_message(result)
+        estimated = prompt_tokens is None
+        if estimated:
+            prompt_tokens, completion_tokens = len(prompt_text) // 4, len(response_text) // 4
+        latency_ms = int((time.perf_counter() - stats.started) * 1000)
+        llm_usage_recorder.record(
+            LLMCallRecord(
+                model_id=model_id,
+                caller=caller,
+                workshop_id=workshop_id,
+                prompt_chars=len(prompt_text),
+                response_chars=len(response_text),
+                prompt_tokens=int(prompt_tokens or 0),
+                completion_tokens=int(completion_tokens or 0),
+                tokens_estimated=estimated,
+                latency_ms=latency_ms,
+                retries=stats.retries,
+                throttles=stats.throttles,
+                status=status,
+            )
+        )
+    except Exception:  # pragma: no cover - accounting must never fail a call
+        logger.debug("Bedrock usage accounting failed", exc_info=True)
+        return
+
+    if status == "ok" and Config.AWS_BACKEND == "record":
+        try:
+            from app.utils.fake_bedrock import record_response
+
+            record_response(model_id, llm._convert_input(input).to_messages(), response_text, latency_ms)
+        except Exception:  # pragma: no cover - recording must never fail a call
+            logger.warning("Failed to record Bedrock response", exc_info=True)
+
+
+# ---------------------------------------------------------------------------
+# Model tiering and hedged requests
+# ---------------------------------------------------------------------------
+
+class HedgeCancelled(RuntimeError):
+    """Raised inside a routed attempt once another model tier has answered."""
+
+
+_hedge_cancel: contextvars.ContextVar[Optional[threading.Event]] = contextvars.ContextVar(
+    "bedrock_hedge_cancel", default=None
+)
+
+
+def hedge_cancelled() -> bool:
+    """True inside a routed attempt that lost the race (its reply will be discarded)."""
+    event = _hedge_cancel.get()
+    return event is not None and event.is_set()
+
+
+def _raise_if_hedge_cancelled() -> None:
+    if hedge_cancelled():
+        raise HedgeCancelled("Bedrock attempt cancelled: another model tier answered first")
+
+
+# ``response_metadata`` key naming the model tier that produced a routed reply.
+ROUTED_MODEL_KEY = "routed_model_id"
+
+
+def routed_model_id(result: Any) -> Optional[str]:
+    """Model that produced ``result`` when the router served it (a fallback or hedge tier may answer)."""
+    metadata = getattr(result, "response_metadata", None)
+    value = metadata.get(ROUTED_MODEL_KEY) if isinstance(metadata, dict) else None
+    return value if isinstance(value, str) else None
+
+
+def _parse_pairs(spec: str) -> Dict[str, str]:
+    pairs: Dict[str, str] = {}
+    for item in (spec or "").split(","):
+        name, sep, value = item.strip().rpartition("=")
+        if sep and name.strip() and value.strip():
+            pairs[name.strip()] = value.strip()
+    return pairs
+
+
+class _RoutedAttempt:
+    __slots__ = ("model_id", "future", "cancel")
+
+    def __init__(self, model_id: str, future: Future, cancel: threading.Event) -> None:
+        self.model_id = model_id
+        self.future = future
+        self.cancel = cancel
+
+
+class ModelRouter:
+    """Routes chat ``invoke`` calls across model tiers (``BEDROCK_MODEL_TIERS``).
+
+    When hedging is enabled, the model has a next tier, the call's priority class
+    has a latency budget (``BEDROCK_HEDGE_BUDGETS``) and at least
+    ``BEDROCK_HEDGE_MIN_SAMPLES`` calls of this model and caller were observed, the
+    call runs on a worker thread. If it has not answered after the hedge delay (the
+    observed p95, capped by the budget) the same input is also sent to the next
+    tier. Callers without enough samples are not hedged. The first
+    non-empty reply wins and the other attempt is cancelled: it stops before
+    admission or between retries, while a request already on the wire finishes
+    and its reply is discarded (logged with status ``cancelled``).
+
+    A primary that fails with a retryable error or an admission timeout is retried
+    once on the next tier, with or without a budget. Every routed reply names the
+    model that produced it under ``response_metadata[ROUTED_MODEL_KEY]``, so callers
+    can tell a fallback or hedge answer from the requested model's. Streaming and
+    async calls are not routed.
+    """
+
+    _WINDOW = 200
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._latencies: Dict[Tuple[str, str], Deque[float]] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._busy = 0
+
+    @staticmethod
+    def fallback_for(model_id: str) -> Optional[str]:
+        fallback = _parse_pairs(Config.BEDROCK_MODEL_TIERS).get(model_id)
+        return fallback if fallback and fallback != model_id else None
+
+    @staticmethod
+    def budget_for(priority: str) -> Optional[float]:
+        if not Config.BEDROCK_HEDGING_ENABLED:
+            return None
+        try:
+            budget = float(_parse_pairs(Config.BEDROCK_HEDGE_BUDGETS)[priority])
+        except (KeyError, ValueError):
+            return None
+        return budget if budget > 0 else None
+
+    def observe(self, model_id: str, caller: str, seconds: float) -> None:
+        with self._lock:
+            window = self._latencies.get((model_id, caller))
+            if window is None:
+                window = self._latencies[(model_id, caller)] = deque(maxlen=self._WINDOW)
+            window.append(seconds)
+
+    def p95(self, model_id: str, caller: str) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._latencies.get((model_id, caller), ()))
+        if len(samples) < Config.BEDROCK_HEDGE_MIN_SAMPLES:
+            return None
+        return samples[max(0, math.ceil(0.95 * len(samples)) - 1)]
+
+    def hedge_delay(self, model_id: str, caller: str, budget: float) -> Optional[float]:
+        """Observed p95 capped by ``budget``; None (do not hedge) until enough calls were seen."""
+        p95 = self.p95(model_id, caller)
+        return None if p95 is None else min(p95, budget)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._latencies.clear()
+
+    # ------------------------------------------------------------------
+    def invoke(self, llm: Any, attempt: Callable[[Any], T]) -> T:
+        """Run ``attempt(model)`` for ``llm`` and, when routed, for its next tier."""
+        model_id = getattr(llm, "model_id", None) or "unknown"
+        caller, _ = current_usage_tag()
+        fallback_id = self.fallback_for(model_id)
+        if fallback_id is None:
+            return self._timed(llm, attempt, caller)
+        priority = _current_priority.get()
+        budget = self.budget_for(priority)
+        delay = self.hedge_delay(model_id, caller, budget) if budget is not None else None
+        if delay is None or not self._reserve_workers():
+            try:
+                return self._timed(llm, attempt, caller)
+            except Exception as exc:
+                if not self._falls_back(llm, exc):
+                    raise
+            return self._fall_back(llm, fallback_id, attempt, caller)
+        return self._race(llm, fallback_id, attempt, caller, priority, delay)
+
+    def _race(self, llm: Any, fallback_id: str, attempt: Callable[[Any], T], caller: str, priority: str, delay: float) -> T:
+        model_id = llm.model_id
+        primary = self._submit(llm, attempt, caller)
+        done, _ = wait([primary.future], timeout=delay)
+        if done:
+            self._release_worker()
+            try:
+                result = primary.future.result()
+            except Exception as exc:
+                if not self._falls_back(llm, exc):
+                    raise
+                return self._fall_back(llm, fallback_id, attempt, caller)
+            bedrock_hedge_events.labels(model=model_id, outcome="primary").inc()
+            return result
+
+        bedrock_hedge_delay.labels(model=model_id, priority=priority).observe(delay)
+        hedge = self._submit(_cached_chat_llm(fallback_id, getattr(llm, "model_kwargs", None)), attempt, caller)
+        pending = [primary, hedge]
+        empty: List[Any] = []
+        errors: List[Exception] = []
+        while pending:
+            wait([item.future for item in pending], return_when=FIRST_COMPLETED)
+            for item in [item for item in pending if item.future.done()]:
+                pending.remove(item)
+                try:
+                    result = item.future.result()
+                except Exception as exc:
+                    errors.append(exc)
+                    continue
+                if not _response_text(result).strip():
+                    empty.append(result)
+                    continue
+                for other in pending:
+                    other.cancel.set()
+                outcome = "hedge" if item is hedge else "primary_after_hedge"
+                bedrock_hedge_events.labels(model=model_id, outcome=outcome).inc()
+                logger.info(
+                    "Bedrock hedge for %s (caller=%s) after %.2fs: %s won (%s)",
+                    model_id,
+                    caller,
+                    delay,
+                    item.model_id,
+                    outcome,
+                )
+                return result
+        if empty:
+            bedrock_hedge_events.labels(model=model_id, outcome="primary_after_hedge").inc()
+            return empty[0]
+        bedrock_hedge_events.labels(model=model_id, outcome="failed").inc()
+        raise errors[0]
+
+    def _fall_back(self, llm: Any, fallback_id: str, attempt: Callable[[Any], T], caller: str) -> T:
+        logger.warning("Bedrock call on %s failed (caller=%s); falling back to %s", llm.model_id, caller, fallback_id)
+        bedrock_hedge_events.labels(model=llm.model_id, outcome="fallback").inc()
+        return self._timed(_cached_chat_llm(fallback_id, getattr(llm, "model_kwargs", None)), attempt, caller)
+
+    @staticmethod
+    def _falls_back(llm: Any, exc: Exception) -> bool:
+        if isinstance(exc, BedrockAdmissionTimeout):
+            return True
+        should_retry = getattr(llm, "_should_retry", None)
+        return bool(callable(should_retry) and should_retry(exc))
+
+    def _timed(self, llm: Any, attempt: Callable[[Any], T], caller: str) -> T:
+        started = time.perf_counter()
+        result = attempt(llm)
+        # Losers count too: dropping slow samples would pull the p95 down.
+        self.observe(llm.model_id, caller, time.perf_counter() - started)
+        metadata = getattr(result, "response_metadata", None)
+        if isinstance(metadata, dict):
+            metadata[ROUTED_MODEL_KEY] = llm.model_id
+        return result
+
+    def _submit(self, llm: Any, attempt: Callable[[Any], T], caller: str) -> _RoutedAttempt:
+        cancel = threading.Event()
+
+        def _run() -> T:
+            _hedge_cancel.set(cancel)
+            return self._timed(llm, attempt, caller)
+
+        # Worker threads keep the caller's usage tag and priority.
+        future = self._get_executor().submit(contextvars.copy_context().run, _run)
+        future.add_done_callback(lambda _: self._release_worker())
+        return _RoutedAttempt(llm.model_id, future, cancel)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=Config.BEDROCK_HEDGE_MAX_WORKERS,
+                    thread_name_prefix="bedrock-route",
+                )
+            return self._executor
+
+    def _reserve_workers(self) -> bool:
+        # A race may need two workers (each released when its attempt finishes, which for
+        # a loser can be after the caller returned). When the pool is full, run unhedged on
+        # the caller's thread rather than queue the primary behind other calls.
+        with self._lock:
+            if self._busy + 2 > Config.BEDROCK_HEDGE_MAX_WORKERS:
+                return False
+            self._busy += 2
+            return True
+
+    def _release_worker(self) -> None:
+        with self._lock:
+            self._busy -= 1
+
+
+model_router = ModelRouter()
+
+
 if ChatBedrock is not None:
 
     class _RetryableChatBedrock(ChatBedrock):
@@ -144,40 +793,110 @@ if ChatBedrock is not None:
         # ------------- Public ChatModel overrides -------------
 
         def invoke(self, input: Any, config: Optional[Any] = None, *, stop: Optional[list[str]] = None, **kwargs: Any) -> Any:
-            if self._retry_max_attempts <= 1:
-                return super().invoke(input, config=config, stop=stop, **kwargs)
+            return model_router.invoke(self, lambda llm: llm._invoke_once(input, config, stop, kwargs))
+
+        def _invoke_once(self, input: Any, config: Optional[Any], stop: Optional[list[str]], kwargs: Dict[str, Any]) -> Any:
+            """One routed attempt on this model: admission, retries and usage accounting."""
+            tokens = self._estimate_tokens(input)
+            stats = _CallStats()
+            result: Any = None
+            status = "error"
 
             def _call() -> Any:
-                return super(_RetryableChatBedrock, self).invoke(input, config=config, stop=stop, **kwargs)
+                # Each attempt queues for admission separately, so backoff never holds a slot.
+                with bedrock_admission.slot(self.model_id, tokens=tokens):
+                    _raise_if_hedge_cancelled()
+                    return super(_RetryableChatBedrock, self).invoke(input, config=config, stop=stop, **kwargs)
 
-            return self._run_with_retry(_call)
+            try:
+                result = _call() if self._retry_max_attempts <= 1 else self._run_with_retry(_call, stats)
+                status = "ok"
+                return result
+            finally:
+                self._record_usage(input, result, stats, "cancelled" if hedge_cancelled() else status)
 
         async def ainvoke(self, input: Any, config: Optional[Any] = None, *, stop: Optional[list[str]] = None, **kwargs: Any) -> Any:
-            if self._retry_max_attempts <= 1:
-                return await super().ainvoke(input, config=config, stop=stop, **kwargs)
+            tokens = self._estimate_tokens(input)
+            priority = _current_priority.get()
+            stats = _CallStats()
+            result: Any = None
+            status = "error"
 
             async def _call() -> Any:
-                return await super(_RetryableChatBedrock, self).ainvoke(input, config=config, stop=stop, **kwargs)
+                loop = asyncio.get_running_loop()
+                release = await loop.run_in_executor(
+                    None,
+                    lambda: bedrock_admission.acquire(self.model_id, tokens=tokens, priority=priority),
+                )
+                try:
+                    return await super(_RetryableChatBedrock, self).ainvoke(input, config=config, stop=stop, **kwargs)
+                finally:
+                    release()
 
-            return await self._run_async_with_retry(_call)
+            try:
+                if self._retry_max_attempts <= 1:
+                    result = await _call()
+                else:
+                    result = await self._run_async_with_retry(_call, stats)
+                status = "ok"
+                return result
+            finally:
+                self._record_usage(input, result, stats, status)
+
+        def stream(self, input: Any, config: Optional[Any] = None, *, stop: Optional[list[str]] = None, **kwargs: Any) -> Iterator[Any]:
+            """Stream chunks, retrying throttled calls only until the first chunk arrives.
+
+            Once a chunk has been yielded the caller may already have forwarded it,
+            so a mid-stream failure is raised instead of replaying the request. The
+            admission slot is held until the stream is exhausted or closed.
+            """
+            tokens = self._estimate_tokens(input)
+            stats = _CallStats()
+            aggregate: Any = None
+            outcome = "cancelled"
+            attempt = 1
+            try:
+                while True:
+                    received = False
+                    try:
+                        with bedrock_admission.slot(self.model_id, tokens=tokens):
+                            for chunk in super().stream(input, config=config, stop=stop, **kwargs):
+                                received = True
+                                aggregate = chunk if aggregate is None else aggregate + chunk
+                                yield chunk
+                        outcome = "ok"
+                        return
+                    except Exception as exc:  # pragma: no cover - network dependent
+                        if received or not self._should_retry(exc) or attempt >= self._retry_max_attempts:
+                            outcome = "error"
+                            raise
+                        delay = self._backoff_delay(attempt)
+                        code, status = self._extract_error_details(exc)
+                        self._note_retry(stats, code, status, exc)
+                        self._log_retry_event(code, status, attempt, delay, exc)
+                        time.sleep(delay)
+                        attempt += 1
+            finally:
+                self._record_usage(input, aggregate, stats, outcome)
 
         # ------------- Internal helpers -------------
 
-        def _run_with_retry(self, func: Callable[[], T]) -> T:
+        def _run_with_retry(self, func: Callable[[], T], stats: Optional[_CallStats] = None) -> T:
             attempt = 1
             while True:
                 try:
                     return func()
                 except Exception as exc:  # pragma: no cover - network dependent
-                    if not self._should_retry(exc) or attempt >= self._retry_max_attempts:
+                    if not self._should_retry(exc) or attempt >= self._retry_max_attempts or hedge_cancelled():
                         raise
                     delay = self._backoff_delay(attempt)
                     code, status = self._extract_error_details(exc)
+                    self._note_retry(stats, code, status, exc)
                     self._log_retry_event(code, status, attempt, delay, exc)
                     time.sleep(delay)
                     attempt += 1
 
-        async def _run_async_with_retry(self, func: Callable[[], Any]) -> Any:
+        async def _run_async_with_retry(self, func: Callable[[], Any], stats: Optional[_CallStats] = None) -> Any:
             attempt = 1
             while True:
                 try:
@@ -187,10 +906,26 @@ if ChatBedrock is not None:
                         raise
                     delay = self._backoff_delay(attempt)
                     code, status = self._extract_error_details(exc)
+                    self._note_retry(stats, code, status, exc)
                     self._log_retry_event(code, status, attempt, delay, exc, asynchronous=True)
                     await asyncio.sleep(delay)
                     attempt += 1
 
+        def _estimate_tokens(self, input: Any) -> int:
+            return estimate_tokens(input, (self.model_kwargs or {}).get("max_tokens"))
+
+        def _note_retry(self, stats: Optional[_CallStats], code: Optional[str], status: Optional[int], exc: Exception) -> None:
+            if stats is None:
+                return
+            stats.retries += 1
+            if code in ("ThrottlingException", "TooManyRequestsException") or status == 429 or _is_retryable_message(
+                str(exc), ("throttl", "too many requests", "rate exceeded")
+            ):
+                stats.throttles += 1
+
+        def _record_usage(self, input: Any, result: Any, stats: _CallStats, status: str) -> None:
+            record_chat_usage(self, input, result, stats, status)
+
         def _should_retry(self, exc: Exception) -> bool:
             code, status = self._extract_error_details(exc)
             if code and code in self._retryable_error_codes:
@@ -235,6 +970,7 @@ if ChatBedrock is not None:
             *,
             asynchronous: bool = False,
         ) -> None:
+            bedrock_admission.throttled(self.model_id)
             log = _resolve_logger()
             log.warning(
                 "Bedrock request throttled (%s, code=%s, status=%s) – attempt %s/%s, backing off %.2fs%s",
@@ -248,66 +984,98 @@ if ChatBedrock is not None:
             )
 
 
-def get_chat_llm(model_kwargs: Optional[Dict[str, Any]] = None):
-    """Return a configured ChatBedrock Default (Nova Lite) LLM for chat/text generation.
+class _LLMCache:
+    """LRU of LangChain Bedrock wrappers keyed by model, model_kwargs and client.
 
-    model_kwargs will be passed to the underlying provider (temperature, max_tokens, etc.).
+    Returned instances are shared across requests and threads; callers must not
+    mutate them (``bind``/``with_structured_output`` return new runnables).
     """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[Any, ...], Any]" = OrderedDict()
+
+    def get_or_create(self, key: Tuple[Any, ...], factory: Callable[[], T]) -> T:
+        max_entries = Config.BEDROCK_LLM_CACHE_MAX_ENTRIES
+        if max_entries <= 0:
+            return factory()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                bedrock_llm_cache_events.labels(result="hit").inc()
+                return entry
+        value = factory()
+        bedrock_llm_cache_events.labels(result="miss").inc()
+        with self._lock:
+            # Keep the first instance if another thread raced us here.
+            value = self._entries.setdefault(key, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+llm_cache = _LLMCache()
+
+
+def _kwargs_key(model_kwargs: Optional[Dict[str, Any]]) -> str:
+    return json.dumps(model_kwargs or {}, sort_keys=True, default=repr)
+
+
+def _cached_chat_llm(model_id: str, model_kwargs: Optional[Dict[str, Any]]):
+    if Config.AWS_BACKEND == "fake":
+        from app.utils.fake_bedrock import FakeChatBedrock
+
+        return llm_cache.get_or_create(
+            ("fake-chat", model_id, _kwargs_key(model_kwargs)),
+            lambda: FakeChatBedrock(model_id=model_id, model_kwargs=dict(model_kwargs or {})),
+        )
     if ChatBedrock is None:
         raise RuntimeError("langchain-aws not installed. Please install 'langchain-aws'.")
 
-    client = get_bedrock_runtime_client()
-    llm = _RetryableChatBedrock(
-        model=Config.BEDROCK_MODEL_ID,
-        client=client,
-        model_kwargs=model_kwargs or {},
-        retry_max_attempts=Config.BEDROCK_RETRY_MAX_ATTEMPTS,
-        retry_base_delay=Config.BEDROCK_RETRY_BASE_DELAY_SECONDS,
-        retry_max_delay=Config.BEDROCK_RETRY_MAX_DELAY_SECONDS,
-        retry_jitter_factor=Config.BEDROCK_RETRY_JITTER_FACTOR,
-    )
-    return llm
+    def _create():
+        return _RetryableChatBedrock(
+            model=model_id,
+            client=get_bedrock_runtime_client(),
+            model_kwargs=dict(model_kwargs or {}),
+            retry_max_attempts=Config.BEDROCK_RETRY_MAX_ATTEMPTS,
+            retry_base_delay=Config.BEDROCK_RETRY_BASE_DELAY_SECONDS,
+            retry_max_delay=Config.BEDROCK_RETRY_MAX_DELAY_SECONDS,
+            retry_jitter_factor=Config.BEDROCK_RETRY_JITTER_FACTOR,
+        )
+
+    return llm_cache.get_or_create(("chat", model_id, _kwargs_key(model_kwargs), _client_key()), _create)
+
+
+def get_chat_llm(model_kwargs: Optional[Dict[str, Any]] = None):
+    """Return a configured ChatBedrock Default (Nova Lite) LLM for chat/text generation.
+
+    model_kwargs will be passed to the underlying provider (temperature, max_tokens, etc.).
+    Instances are cached per ``model_kwargs`` and shared; do not mutate them.
+    """
+    return _cached_chat_llm(Config.BEDROCK_MODEL_ID, model_kwargs)
  
 def get_chat_llm_pro(model_kwargs: Optional[Dict[str, Any]] = None):
     """Return a configured ChatBedrock Nova Pro LLM for chat/text generation.
 
     model_kwargs will be passed to the underlying provider (temperature, max_tokens, etc.).
+    Instances are cached per ``model_kwargs`` and shared; do not mutate them.
     """
-    if ChatBedrock is None:
-        raise RuntimeError("langchain-aws not installed. Please install 'langchain-aws'.")
-
-    client = get_bedrock_runtime_client()
-    llm = _RetryableChatBedrock(
-        model=Config.BEDROCK_NOVA_PRO,
-        client=client,
-        model_kwargs=model_kwargs or {},
-        retry_max_attempts=Config.BEDROCK_RETRY_MAX_ATTEMPTS,
-        retry_base_delay=Config.BEDROCK_RETRY_BASE_DELAY_SECONDS,
-        retry_max_delay=Config.BEDROCK_RETRY_MAX_DELAY_SECONDS,
-        retry_jitter_factor=Config.BEDROCK_RETRY_JITTER_FACTOR,
-    )
-    return llm
+    return _cached_chat_llm(Config.BEDROCK_NOVA_PRO, model_kwargs)
 
 
 def get_chat_llm_claude(model_kwargs: Optional[Dict[str, Any]] = None):
     """Return a configured ChatBedrock Claude LLM for chat/text generation.
 
     model_kwargs will be passed to the underlying provider (temperature, max_tokens, etc.).
+    Instances are cached per ``model_kwargs`` and shared; do not mutate them.
     """
-    if ChatBedrock is None:
-        raise RuntimeError("langchain-aws not installed. Please install 'langchain-aws'.")
-
-    client = get_bedrock_runtime_client()
-    llm = _RetryableChatBedrock(
-        model=Config.BEDROCK_CLAUDE_SONNET,
-        client=client,
-        model_kwargs=model_kwargs or {},
-        retry_max_attempts=Config.BEDROCK_RETRY_MAX_ATTEMPTS,
-        retry_base_delay=Config.BEDROCK_RETRY_BASE_DELAY_SECONDS,
-        retry_max_delay=Config.BEDROCK_RETRY_MAX_DELAY_SECONDS,
-        retry_jitter_factor=Config.BEDROCK_RETRY_JITTER_FACTOR,
-    )
-    return llm
+    return _cached_chat_llm(Config.BEDROCK_CLAUDE_SONNET, model_kwargs)
 
 
 def get_text_embeddings(model_id: Optional[str] = None):
@@ -315,13 +1083,20 @@ def get_text_embeddings(model_id: Optional[str] = None):
 
     Default to Titan Text Embeddings v2 if no model specified.
     """
+    resolved = model_id or "amazon.titan-embed-text-v2:0"
+    if Config.AWS_BACKEND == "fake":
+        from app.utils.fake_bedrock import FakeBedrockEmbeddings
+
+        return llm_cache.get_or_create(("fake-embeddings", resolved), lambda: FakeBedrockEmbeddings(resolved))
     if BedrockEmbeddings is None:
         raise RuntimeError("langchain-aws not installed. Please install 'langchain-aws'.")
 
-    client = get_bedrock_runtime_client()
-    emb = BedrockEmbeddings(
-        model_id=model_id or "amazon.titan-embed-text-v2:0",
-        region_name=Config.AWS_REGION,
-        client=client,
-    )
-    return emb
+
+    def _create():
+        return BedrockEmbeddings(
+            model_id=resolved,
+            region_name=Config.AWS_REGION,
+            client=get_bedrock_runtime_client(),
+        )
+
+    return llm_cache.get_or_create(("embeddings", resolved, _client_key()), _create)
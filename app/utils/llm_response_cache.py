@@ -0,0 +1,275 @@
+"""Content-addressed cache for LLM responses.
+
+Phase generators (discussion, clustering, feasibility, prioritization, summary)
+re-render the same prompt whenever a facilitator revisits a phase without the
+underlying ideas/votes changing. ``invoke_cached`` keys the raw model text by
+``(model_id, model_kwargs, rendered prompt)`` and replays it instead of paying the
+Bedrock round-trip again. For a ``RegisteredPrompt`` the template's
+``name@version`` and input variables stand in for the rendered prompt.
+
+Entries live in a small SQLite file under ``instance/`` (separate from the app
+database, so no migration is involved) with TTL and LRU size limits. Caching is
+opt-in per call site; pass ``bypass=True`` or wrap the call in
+``llm_cache_bypass()`` to force a fresh generation (the fresh result replaces the
+cached one).
+"""
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from flask import current_app, has_app_context
+
+from app.assistant.tools.metric import llm_response_cache_events, llm_response_cache_saved_seconds
+from app.config import Config
+from app.utils.llm_bedrock import routed_model_id
+from app.utils.prompt_registry import RegisteredPrompt
+from app.utils.single_flight import get_single_flight
+
+try:
+    from langchain_core.messages import AIMessage
+except Exception:  # pragma: no cover - dependency import guard
+    AIMessage = None  # type: ignore
+
+_bypass: contextvars.ContextVar[bool] = contextvars.ContextVar("llm_cache_bypass", default=False)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key TEXT PRIMARY KEY,
+    phase TEXT NOT NULL,
+    model_id TEXT,
+    response TEXT NOT NULL,
+    latency_ms INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    last_hit_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS ix_llm_responses_last_hit_at ON llm_responses (last_hit_at);
+"""
+
+
+@contextlib.contextmanager
+def llm_cache_bypass() -> Iterator[None]:
+    """Force fresh generations for every ``invoke_cached`` call inside the block."""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def _setting(name: str, default: Any) -> Any:
+    if has_app_context():
+        return current_app.config.get(name, getattr(Config, name, default))
+    return getattr(Config, name, default)
+
+
+def _message_text(raw: Any) -> str:
+    if raw is None:
+        return ""
+    if isinstance(raw, str):
+        return raw
+    content = getattr(raw, "content", raw)
+    if isinstance(content, list):
+        parts = []
+        for part in content:
+            if isinstance(part, dict):
+                parts.append(str(part.get("text") or ""))
+            else:
+                parts.append(str(part))
+        return "".join(parts)
+    return str(content)
+
+
+class LLMResponseCache:
+    """SQLite-backed response store with TTL expiry and LRU eviction."""
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._initialized: Optional[str] = None
+
+    @property
+    def path(self) -> str:
+        return self._path or str(_setting("LLM_RESPONSE_CACHE_PATH", ""))
+
+    def _connect(self) -> sqlite3.Connection:
+        path = self.path
+        conn = sqlite3.connect(path, timeout=5.0)
+        if self._initialized != path:
+            with self._lock:
+                if self._initialized != path:
+                    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(_SCHEMA)
+                    self._initialized = path
+        return conn
+
+    @staticmethod
+    def make_key(model_id: Optional[str], model_kwargs: Optional[Dict[str, Any]], prompt_text: str) -> str:
+        fields = {
+            "model_id": model_id or "",
+            "model_kwargs": model_kwargs or {},
+            "prompt_sha256": hashlib.sha256(prompt_text.encode("utf-8")).hexdigest(),
+        }
+        if Config.AWS_BACKEND == "fake":
+            # Synthesized replies must never be served to a later run against real Bedrock.
+            fields["backend"] = "fake"
+        material = json.dumps(fields, sort_keys=True, default=repr)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[tuple[str, int]]:
+        """Return ``(response, original latency_ms)`` for a live entry."""
+        ttl = float(_setting("LLM_RESPONSE_CACHE_TTL_SECONDS", 0) or 0)
+        now = time.time()
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT response, latency_ms, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            response, latency_ms, created_at = row
+            if ttl > 0 and now - created_at > ttl:
+                with conn:
+                    conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                return None
+            with conn:
+                conn.execute(
+                    "UPDATE llm_responses SET hits = hits + 1, last_hit_at = ? WHERE key = ?", (now, key)
+                )
+            return response, int(latency_ms or 0)
+        finally:
+            conn.close()
+
+    def put(self, key: str, *, phase: str, model_id: Optional[str], response: str, latency_ms: int) -> None:
+        max_entries = int(_setting("LLM_RESPONSE_CACHE_MAX_ENTRIES", 0) or 0)
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                # A forced regeneration replaces the response but keeps the hit count.
+                conn.execute(
+                    "INSERT INTO llm_responses "
+                    "(key, phase, model_id, response, latency_ms, created_at, last_hit_at, hits) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, 0) "
+                    "ON CONFLICT(key) DO UPDATE SET response = excluded.response, "
+                    "latency_ms = excluded.latency_ms, created_at = excluded.created_at, "
+                    "last_hit_at = excluded.last_hit_at",
+                    (key, phase, model_id, response, int(latency_ms), now, now),
+                )
+                if max_entries > 0:
+                    conn.execute(
+                        "DELETE FROM llm_responses WHERE key IN ("
+                        "SELECT key FROM llm_responses ORDER BY last_hit_at DESC LIMIT -1 OFFSET ?)",
+                        (max_entries,),
+                    )
+        finally:
+            conn.close()
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        """Per-phase entry count, lifetime hits and Bedrock seconds saved by those hits."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT phase, COUNT(*), COALESCE(SUM(hits), 0), COALESCE(SUM(hits * latency_ms), 0) "
+                "FROM llm_responses GROUP BY phase"
+            ).fetchall()
+        finally:
+            conn.close()
+        return {
+            phase: {"entries": entries, "hits": hits, "saved_seconds": round(saved_ms / 1000.0, 1)}
+            for phase, entries, hits, saved_ms in rows
+        }
+
+    def clear(self) -> None:
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM llm_responses")
+        finally:
+            conn.close()
+
+
+llm_response_cache = LLMResponseCache()
+
+
+def invoke_cached(
+    prompt: Any,
+    llm: Any,
+    inputs: Dict[str, Any],
+    *,
+    phase: str,
+    bypass: bool = False,
+    validate: Optional[Callable[[str], bool]] = None,
+) -> Any:
+    """Run ``(prompt | llm).invoke(inputs)`` through the response cache.
+
+    On a hit an ``AIMessage`` carrying the cached text is returned, so callers
+    handle both paths the same way. Only responses accepted by ``validate`` (any
+    non-empty text by default) and produced by ``llm``'s own model (not a fallback
+    or hedge tier) are stored. Cache I/O errors never fail the call.
+    """
+    prompt_value = prompt.invoke(inputs)
+    if not _setting("LLM_RESPONSE_CACHE_ENABLED", False) or AIMessage is None:
+        return llm.invoke(prompt_value)
+
+    model_id = getattr(llm, "model_id", None)
+    # Registered prompts are keyed by template version + their own variables, not the rendered text.
+    key_text = prompt.cache_key_text(inputs) if isinstance(prompt, RegisteredPrompt) else prompt_value.to_string()
+    key = LLMResponseCache.make_key(model_id, getattr(llm, "model_kwargs", None), key_text)
+    log = current_app.logger if has_app_context() else None
+
+    if not (bypass or _bypass.get()):
+        try:
+            hit = llm_response_cache.get(key)
+        except sqlite3.Error as exc:
+            hit = None
+            if log:
+                log.warning("[LLMCache] lookup failed for %s: %s", phase, exc)
+        if hit is not None:
+            response, latency_ms = hit
+            llm_response_cache_events.labels(phase=phase, result="hit").inc()
+            llm_response_cache_saved_seconds.labels(phase=phase).inc(latency_ms / 1000.0)
+            if log:
+                log.info("[LLMCache] %s hit (saved ~%d ms)", phase, latency_ms)
+            return AIMessage(content=response)
+        llm_response_cache_events.labels(phase=phase, result="miss").inc()
+    else:
+        llm_response_cache_events.labels(phase=phase, result="bypass").inc()
+
+    def _generate() -> Any:
+        started = time.perf_counter()
+        raw = llm.invoke(prompt_value)
+        latency_ms = int((time.perf_counter() - started) * 1000)
+        text = _message_text(raw)
+        served_by = routed_model_id(raw)
+        if served_by is not None and served_by != model_id:
+            # A lower tier answered; do not replay its reply as this model's for the whole TTL.
+            if log:
+                log.info("[LLMCache] %s reply came from %s, not %s; not cached", phase, served_by, model_id)
+        elif text and (validate is None or validate(text)):
+            try:
+                llm_response_cache.put(key, phase=phase, model_id=model_id, response=text, latency_ms=latency_ms)
+            except sqlite3.Error as exc:
+                if log:
+                    log.warning("[LLMCache] store failed for %s: %s", phase, exc)
+        return raw
+
+    # Identical prompts already being generated elsewhere share that Bedrock call.
+    return get_single_flight("llm_response").do(key, _generate)
+
+
+__all__ = [
+    "LLMResponseCache",
+    "llm_response_cache",
+    "llm_cache_bypass",
+    "invoke_cached",
+]
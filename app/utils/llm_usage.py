@@ -0,0 +1,247 @@
+"""Per-call accounting for Bedrock chat calls.
+
+``_RetryableChatBedrock`` reports every invoke/ainvoke/stream here: model,
+caller tag, prompt/completion tokens, latency, retries and throttles. Each call
+updates the Prometheus histograms/counters immediately and is queued as an
+``LLMUsageLog`` row; a daemon worker writes the rows in batches so accounting
+never adds a database commit to the request path.
+
+Callers are tagged with ``track_llm_usage("clustering")`` on the phase entry
+point (which also picks up its ``workshop_id`` argument) or with
+``llm_usage_context(...)`` around ad-hoc calls. Untagged calls are recorded as
+``untagged``.
+"""
+from __future__ import annotations
+
+import atexit
+import contextlib
+import contextvars
+import functools
+import inspect
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, List, Optional, Tuple, TypeVar
+
+from app.assistant.tools.metric import llm_call_latency, llm_call_retries, llm_tokens
+from app.config import Config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+UNTAGGED = "untagged"
+
+_usage_tag: contextvars.ContextVar[Tuple[Optional[str], Optional[int]]] = contextvars.ContextVar(
+    "llm_usage_tag", default=(None, None)
+)
+
+
+@contextlib.contextmanager
+def llm_usage_context(caller: Optional[str] = None, *, workshop_id: Optional[int] = None) -> Iterator[None]:
+    """Attribute Bedrock calls made inside the block to ``caller`` / ``workshop_id``.
+
+    Unset values are inherited from an enclosing block. Worker threads do not
+    inherit the tag.
+    """
+    outer_caller, outer_workshop = _usage_tag.get()
+    token = _usage_tag.set((caller or outer_caller, workshop_id if workshop_id is not None else outer_workshop))
+    try:
+        yield
+    finally:
+        _usage_tag.reset(token)
+
+
+def track_llm_usage(caller: str) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Decorator form of ``llm_usage_context``; reads ``workshop_id`` from the call arguments."""
+
+    def decorator(fn: Callable[..., T]) -> Callable[..., T]:
+        signature = inspect.signature(fn)
+        takes_workshop = "workshop_id" in signature.parameters
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            workshop_id = None
+            if takes_workshop:
+                try:
+                    workshop_id = signature.bind(*args, **kwargs).arguments.get("workshop_id")
+                except TypeError:
+                    workshop_id = None
+            with llm_usage_context(caller, workshop_id=workshop_id if isinstance(workshop_id, int) else None):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def current_usage_tag() -> Tuple[str, Optional[int]]:
+    caller, workshop_id = _usage_tag.get()
+    return caller or UNTAGGED, workshop_id
+
+
+def usage_from_message(message: Any) -> Tuple[Optional[int], Optional[int]]:
+    """Provider-reported ``(prompt_tokens, completion_tokens)`` for a chat result, if any."""
+    usage = getattr(message, "usage_metadata", None)
+    if isinstance(usage, dict) and usage.get("input_tokens") is not None:
+        return int(usage.get("input_tokens") or 0), int(usage.get("output_tokens") or 0)
+    metadata = getattr(message, "response_metadata", None)
+    if isinstance(metadata, dict):
+        usage = metadata.get("usage")
+        if isinstance(usage, dict):
+            prompt = usage.get("prompt_tokens", usage.get("input_tokens"))
+            completion = usage.get("completion_tokens", usage.get("output_tokens"))
+            if prompt is not None:
+                return int(prompt or 0), int(completion or 0)
+    return None, None
+
+
+@dataclass
+class LLMCallRecord:
+    model_id: str
+    caller: str
+    workshop_id: Optional[int]
+    prompt_chars: int
+    response_chars: int
+    prompt_tokens: int
+    completion_tokens: int
+    tokens_estimated: bool
+    latency_ms: int
+    retries: int
+    throttles: int
+    status: str
+
+
+class LLMUsageRecorder:
+    """Publishes call metrics and writes ``LLMUsageLog`` rows in batches on a worker thread."""
+
+    def __init__(self) -> None:
+        self._app = None
+        self._queue: Optional[queue.Queue[LLMCallRecord]] = None
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self.dropped = 0
+
+    def init_app(self, app) -> None:
+        self._app = app
+        with self._lock:
+            if self._queue is None:
+                self._queue = queue.Queue(maxsize=int(app.config.get("LLM_USAGE_LOG_QUEUE_SIZE", Config.LLM_USAGE_LOG_QUEUE_SIZE)))
+                atexit.register(self.flush)
+
+    def record(self, record: LLMCallRecord) -> None:
+        try:
+            llm_call_latency.labels(model=record.model_id, caller=record.caller, status=record.status).observe(
+                record.latency_ms / 1000.0
+            )
+            llm_tokens.labels(model=record.model_id, caller=record.caller, kind="prompt").inc(record.prompt_tokens)
+            llm_tokens.labels(model=record.model_id, caller=record.caller, kind="completion").inc(record.completion_tokens)
+            if record.throttles:
+                llm_call_retries.labels(model=record.model_id, caller=record.caller, reason="throttle").inc(record.throttles)
+            if record.retries > record.throttles:
+                llm_call_retries.labels(model=record.model_id, caller=record.caller, reason="error").inc(
+                    record.retries - record.throttles
+                )
+        except Exception:  # pragma: no cover - metrics must never break a call
+            logger.debug("llm usage metrics update failed", exc_info=True)
+
+        if self._app is None or self._queue is None or not self._app.config.get("LLM_USAGE_LOG_ENABLED", True):
+            return
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped % 100 == 1:
+                logger.warning("LLM usage log queue full; %s records dropped so far", self.dropped)
+            return
+        self._ensure_worker()
+
+    def flush(self) -> int:
+        """Write everything queued so far on the calling thread; returns the row count."""
+        written = 0
+        while True:
+            batch = self._drain(block=False)
+            if not batch:
+                return written
+            self._write(batch)
+            written += len(batch)
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+    def _ensure_worker(self) -> None:
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._worker_loop, name="llm-usage-writer", daemon=True)
+                self._worker.start()
+
+    def _worker_loop(self) -> None:
+        while True:
+            batch = self._drain(block=True)
+            if batch:
+                self._write(batch)
+
+    def _drain(self, *, block: bool) -> List[LLMCallRecord]:
+        if self._queue is None or self._app is None:
+            return []
+        batch_size = int(self._app.config.get("LLM_USAGE_LOG_BATCH_SIZE", Config.LLM_USAGE_LOG_BATCH_SIZE))
+        flush_seconds = float(self._app.config.get("LLM_USAGE_LOG_FLUSH_SECONDS", Config.LLM_USAGE_LOG_FLUSH_SECONDS))
+        batch: List[LLMCallRecord] = []
+        try:
+            batch.append(self._queue.get(timeout=flush_seconds) if block else self._queue.get_nowait())
+        except queue.Empty:
+            return batch
+        while len(batch) < batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: List[LLMCallRecord]) -> None:
+        assert self._app is not None
+        from app.extensions import db
+        from app.models import LLMUsageLog
+
+        with self._write_lock, self._app.app_context():
+            try:
+                for record in batch:
+                    row = LLMUsageLog()
+                    row.workshop_id = record.workshop_id
+                    row.service_used = "bedrock"
+                    row.model_used = record.model_id
+                    row.caller = record.caller
+                    row.prompt_input_size = record.prompt_chars
+                    row.response_size = record.response_chars
+                    row.prompt_tokens = record.prompt_tokens
+                    row.completion_tokens = record.completion_tokens
+                    row.token_usage = "estimated" if record.tokens_estimated else None
+                    row.latency_ms = record.latency_ms
+                    row.retries = record.retries
+                    row.throttles = record.throttles
+                    row.status = record.status
+                    db.session.add(row)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                logger.exception("Failed to write %s LLM usage log rows", len(batch))
+            finally:
+                db.session.remove()
+
+
+llm_usage_recorder = LLMUsageRecorder()
+
+
+__all__ = [
+    "LLMCallRecord",
+    "LLMUsageRecorder",
+    "current_usage_tag",
+    "llm_usage_context",
+    "llm_usage_recorder",
+    "track_llm_usage",
+    "usage_from_message",
+]
@@ -0,0 +1,191 @@
+"""Parse-once registry for LLM prompt templates.
+
+Phase generators and the assistant used to build ``PromptTemplate`` objects (or
+f-strings) from multi-kilobyte literals on every call. Templates are now
+registered at import time::
+
+    SUMMARY_PROMPT = register_prompt("summary", _SUMMARY_TEMPLATE)
+    raw = invoke_cached(SUMMARY_PROMPT, llm, inputs, phase="summary")
+
+Registration validates the template once, splits it into literal text and
+variable slots, and derives:
+
+- ``version``: a short hash of the template text and format. The response cache
+  keys registered prompts by ``name@version`` plus the variables the template
+  uses, so editing a template invalidates exactly its own cached replies.
+- ``static_tokens``: token count of the literal portion (schema blocks, few-shot
+  text), i.e. what every call pays before any workshop data is filled in.
+
+Rendering only fills the slots. Each render is counted per prompt (static and
+variable tokens), and ``prompt_registry.report()`` lists the prompts that
+dominate token spend; the admin LLM usage page shows it.
+
+Token counts use the same ~4 characters per token estimate as Bedrock admission
+(no tokenizer for Nova/Claude ships with the app).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import string
+import textwrap
+import threading
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+from langchain_core.prompt_values import StringPromptValue
+from langchain_core.prompts import PromptTemplate
+
+from app.assistant.tools.metric import llm_prompt_tokens
+
+TemplateFormat = Literal["f-string", "mustache", "jinja2"]
+
+_JINJA_TAG_RE = re.compile(r"{{.*?}}|{%.*?%}|{#.*?#}", re.DOTALL)
+
+
+def count_tokens(text: str) -> int:
+    """Approximate model tokens in ``text`` (~4 characters per token)."""
+    return (len(text) + 3) // 4 if text else 0
+
+
+def _compile_f_string(template: str) -> Optional[List[Tuple[str, Optional[str]]]]:
+    """``[(literal, variable), ...]`` for plain ``{name}`` slots; None when the template needs ``str.format``."""
+    segments: List[Tuple[str, Optional[str]]] = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        if field is not None and (spec or conversion or not field.isidentifier()):
+            return None
+        segments.append((literal, field))
+    return segments
+
+
+class RegisteredPrompt:
+    """A validated template with its version hash, static token count and render statistics."""
+
+    def __init__(self, name: str, template: str, template_format: TemplateFormat = "f-string") -> None:
+        self.name = name
+        self.template_format = template_format
+        # Parsing here surfaces unbalanced braces / bad Jinja at import time, not mid-workshop.
+        self.prompt = PromptTemplate.from_template(template, template_format=template_format)
+        self.input_variables: Tuple[str, ...] = tuple(sorted(self.prompt.input_variables))
+        self.version = hashlib.sha256(f"{template_format}\0{template}".encode("utf-8")).hexdigest()[:12]
+        self._segments = _compile_f_string(template) if template_format == "f-string" else None
+        if self._segments is not None:
+            static_text = "".join(literal for literal, _ in self._segments)
+        elif template_format == "f-string":
+            static_text = "".join(literal for literal, *_ in string.Formatter().parse(template))
+        else:
+            static_text = _JINJA_TAG_RE.sub("", template)
+        self.static_tokens = count_tokens(static_text)
+        self._lock = threading.Lock()
+        self.renders = 0
+        self.rendered_tokens = 0
+
+    def format(self, **kwargs: Any) -> str:
+        """Render the template; variables not used by it are ignored."""
+        missing = [name for name in self.input_variables if name not in kwargs]
+        if missing:
+            raise KeyError(f"Prompt {self.name!r} is missing variables {missing}")
+        if self._segments is None:
+            text = self.prompt.format(**{name: kwargs[name] for name in self.input_variables})
+        else:
+            parts: List[str] = []
+            for literal, field in self._segments:
+                parts.append(literal)
+                if field is not None:
+                    parts.append(str(kwargs[field]))
+            text = "".join(parts)
+        self._observe(text)
+        return text
+
+    def invoke(self, inputs: Dict[str, Any], config: Optional[Any] = None, **_: Any) -> StringPromptValue:
+        """Drop-in for ``PromptTemplate.invoke`` (used by ``invoke_cached``)."""
+        return StringPromptValue(text=self.format(**inputs))
+
+    def cache_key_text(self, inputs: Dict[str, Any]) -> str:
+        """Stable cache identity: ``name@version`` plus the values of the template's own variables."""
+        used = {name: inputs.get(name) for name in self.input_variables}
+        return f"{self.name}@{self.version}\n" + json.dumps(used, sort_keys=True, ensure_ascii=False, default=str)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            renders, rendered = self.renders, self.rendered_tokens
+        static_total = self.static_tokens * renders
+        return {
+            "name": self.name,
+            "version": self.version,
+            "variables": len(self.input_variables),
+            "static_tokens": self.static_tokens,
+            "renders": renders,
+            "rendered_tokens": rendered,
+            "avg_tokens": round(rendered / renders) if renders else 0,
+            "static_share": round(static_total / rendered, 3) if rendered else None,
+        }
+
+    def _observe(self, text: str) -> None:
+        tokens = count_tokens(text)
+        with self._lock:
+            self.renders += 1
+            self.rendered_tokens += tokens
+        llm_prompt_tokens.labels(prompt=self.name, part="static").inc(self.static_tokens)
+        llm_prompt_tokens.labels(prompt=self.name, part="variable").inc(max(0, tokens - self.static_tokens))
+
+    def __repr__(self) -> str:
+        return f"RegisteredPrompt({self.name!r}, version={self.version}, static_tokens={self.static_tokens})"
+
+
+class PromptRegistry:
+    """Process-wide map of prompt name to ``RegisteredPrompt``."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._prompts: Dict[str, RegisteredPrompt] = {}
+
+    def register(self, name: str, template: str, *, template_format: TemplateFormat = "f-string", dedent: bool = False) -> RegisteredPrompt:
+        """Validate and register ``template``; re-registering identical text returns the existing entry."""
+        if dedent:
+            template = textwrap.dedent(template).strip()
+        prompt = RegisteredPrompt(name, template, template_format)
+        with self._lock:
+            existing = self._prompts.get(name)
+            if existing is not None:
+                if existing.version != prompt.version:
+                    raise ValueError(f"Prompt {name!r} is already registered with a different template")
+                return existing
+            self._prompts[name] = prompt
+        return prompt
+
+    def get(self, name: str) -> RegisteredPrompt:
+        with self._lock:
+            return self._prompts[name]
+
+    def render(self, name: str, **kwargs: Any) -> str:
+        return self.get(name).format(**kwargs)
+
+    def report(self) -> List[Dict[str, Any]]:
+        """Per-prompt statistics, largest token spend first, with each prompt's share of the total."""
+        with self._lock:
+            prompts = list(self._prompts.values())
+        rows = [prompt.stats() for prompt in prompts]
+        total = sum(row["rendered_tokens"] for row in rows)
+        for row in rows:
+            row["spend_share"] = round(row["rendered_tokens"] / total, 3) if total else None
+        rows.sort(key=lambda row: (row["rendered_tokens"], row["static_tokens"]), reverse=True)
+        return rows
+
+
+prompt_registry = PromptRegistry()
+
+
+def register_prompt(name: str, template: str, *, template_format: TemplateFormat = "f-string", dedent: bool = False) -> RegisteredPrompt:
+    """Register ``template`` under ``name`` in the shared registry."""
+    return prompt_registry.register(name, template, template_format=template_format, dedent=dedent)
+
+
+__all__ = [
+    "RegisteredPrompt",
+    "TemplateFormat",
+    "PromptRegistry",
+    "prompt_registry",
+    "register_prompt",
+    "count_tokens",
+]
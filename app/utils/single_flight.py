@@ -0,0 +1,136 @@
+"""Single-flight coalescing of identical in-flight work.
+
+When several callers ask for the same generation at once (a double-clicked
+"next", ``advance_to_next_task`` racing a manual regeneration route), only the
+first caller runs it; the others block until it finishes and receive a copy of
+its result, or the same exception. Nothing is cached once the call completes.
+
+Coalescing is per process: separate gunicorn workers still run their own calls.
+"""
+from __future__ import annotations
+
+import copy
+import functools
+import inspect
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+from app.assistant.tools.metric import single_flight_events
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters", "thread_id")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+        self.thread_id = threading.get_ident()
+
+
+def _snapshot(value: Any) -> Any:
+    try:
+        return copy.deepcopy(value)
+    except Exception:
+        return value
+
+
+class SingleFlight:
+    """Run at most one ``fn`` per key at a time; concurrent callers share its outcome."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                role = "leader"
+            elif call.thread_id == threading.get_ident():
+                # Re-entrant call for the same key from the leader itself; waiting would deadlock.
+                role = "reentrant"
+            else:
+                call.waiters += 1
+                role = "coalesced"
+
+        if role == "reentrant":
+            return fn()
+
+        if role == "coalesced":
+            single_flight_events.labels(name=self.name, result="coalesced").inc()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            # Every follower gets its own copy so callers can mutate results freely.
+            return _snapshot(call.result)
+
+        single_flight_events.labels(name=self.name, result="leader").inc()
+        try:
+            result = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        else:
+            call.result = result
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+                waiters = call.waiters
+            if waiters and call.error is None:
+                # Snapshot before waking followers; the leader may mutate its result next.
+                call.result = _snapshot(call.result)
+            call.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+_flights: Dict[str, SingleFlight] = {}
+_flights_lock = threading.Lock()
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    with _flights_lock:
+        flight = _flights.get(name)
+        if flight is None:
+            flight = _flights[name] = SingleFlight(name)
+        return flight
+
+
+def single_flight(name: str, key: Optional[Callable[..., Hashable]] = None) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Decorator coalescing concurrent calls with equal arguments (or equal ``key(...)``)."""
+    flight = get_single_flight(name)
+
+    def decorator(fn: Callable[..., T]) -> Callable[..., T]:
+        signature = inspect.signature(fn)
+
+        def _default_key(*args: Any, **kwargs: Any) -> Hashable:
+            # Bind so positional and keyword spellings of the same call coalesce.
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            return (fn.__qualname__, tuple(bound.arguments.items()))
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            try:
+                call_key = (key or _default_key)(*args, **kwargs)
+                hash(call_key)
+            except TypeError:
+                return fn(*args, **kwargs)
+            return flight.do(call_key, lambda: fn(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
+
+
+__all__ = ["SingleFlight", "get_single_flight", "single_flight"]
@@ -0,0 +1,186 @@
+"""Run a small dependency graph of callables on a shared, bounded thread pool.
+
+Phase pipelines (e.g. the presentation payload) mix LLM calls and artifact
+rendering where only some steps depend on each other. ``TaskGraph`` runs every
+node as soon as its dependencies have finished, so wall-clock time follows the
+longest dependency chain instead of the sum of all steps::
+
+    graph = TaskGraph("presentation")
+    graph.add("actions", lambda deps: build_actions())
+    graph.add("milestones", lambda deps: build_milestones(deps["actions"]), deps=("actions",))
+    graph.add("pdf", lambda deps: render_pdf(deps["actions"]), deps=("actions",))
+    outcomes = graph.run()
+
+Nodes run inside a copy of the caller's ``contextvars`` context (LLM usage tags
+and Bedrock priority carry over, so calls stay under the shared admission
+limiter). Each concurrent node then pushes a fresh app context for the caller's
+app, so it gets its own SQLAlchemy session (removed when the node ends) instead
+of sharing the caller's: read what a node needs on the calling thread and pass
+plain data in, rather than touching ORM objects from inside a node.
+
+A node whose dependency failed is skipped. Per-node timing is logged at INFO.
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from flask import current_app, has_app_context
+
+from app.config import Config
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+NodeFn = Callable[[Dict[str, Any]], Any]
+
+
+@dataclass
+class NodeOutcome:
+    """Result and timing of one graph node; ``status`` is ``ok``, ``error`` or ``skipped``."""
+
+    name: str
+    status: str
+    value: Any = None
+    error: Optional[str] = None
+    start_ms: float = 0.0
+    elapsed_ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+
+@dataclass
+class _Node:
+    name: str
+    fn: NodeFn
+    deps: Tuple[str, ...]
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=Config.PIPELINE_MAX_WORKERS, thread_name_prefix="pipeline")
+        return _executor
+
+
+class TaskGraph:
+    """Dependency graph of named callables; see the module docstring."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._nodes: Dict[str, _Node] = {}
+
+    def add(self, name: str, fn: NodeFn, *, deps: Iterable[str] = ()) -> None:
+        """Add ``fn`` as node ``name``; it receives ``{dep: value}`` for each entry in ``deps``.
+
+        Dependencies must be added first, which keeps the graph acyclic.
+        """
+        if name in self._nodes:
+            raise ValueError(f"Duplicate task graph node: {name}")
+        deps = tuple(deps)
+        missing = [dep for dep in deps if dep not in self._nodes]
+        if missing:
+            raise ValueError(f"Task graph node {name!r} depends on unknown node(s): {', '.join(missing)}")
+        self._nodes[name] = _Node(name=name, fn=fn, deps=deps)
+
+    def run(self) -> Dict[str, NodeOutcome]:
+        """Run every node and return outcomes keyed by node name (in insertion order)."""
+        app = current_app._get_current_object() if has_app_context() else None  # type: ignore[attr-defined]
+        started = time.perf_counter()
+        outcomes: Dict[str, NodeOutcome] = {}
+        if Config.PIPELINE_MAX_WORKERS <= 1 or len(self._nodes) <= 1:
+            for node in self._nodes.values():
+                outcomes[node.name] = self._skip_or_none(node, outcomes) or self._execute(node, outcomes, None, started)
+        else:
+            self._run_concurrent(outcomes, app, started)
+        self._log(outcomes, (time.perf_counter() - started) * 1000.0)
+        return {name: outcomes[name] for name in self._nodes}
+
+    # ------------------------------------------------------------------
+    def _run_concurrent(self, outcomes: Dict[str, NodeOutcome], app: Any, started: float) -> None:
+        executor = _get_executor()
+        pending: List[_Node] = list(self._nodes.values())
+        running: Dict[Future, str] = {}
+        while pending or running:
+            for node in list(pending):
+                if any(dep not in outcomes for dep in node.deps):
+                    continue
+                pending.remove(node)
+                skipped = self._skip_or_none(node, outcomes)
+                if skipped is not None:
+                    outcomes[node.name] = skipped
+                    continue
+                ctx = contextvars.copy_context()
+                future = executor.submit(ctx.run, self._execute, node, dict(outcomes), app, started)
+                running[future] = node.name
+            if not running:
+                continue
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for future in done:
+                outcomes[running.pop(future)] = future.result()
+
+    @staticmethod
+    def _skip_or_none(node: _Node, outcomes: Dict[str, NodeOutcome]) -> Optional[NodeOutcome]:
+        failed = [dep for dep in node.deps if not outcomes[dep].ok]
+        if not failed:
+            return None
+        return NodeOutcome(name=node.name, status="skipped", error=f"dependency failed: {', '.join(failed)}")
+
+    @staticmethod
+    def _execute(node: _Node, outcomes: Dict[str, NodeOutcome], app: Any, started: float) -> NodeOutcome:
+        t0 = time.perf_counter()
+        inputs = {dep: outcomes[dep].value for dep in node.deps}
+        try:
+            if app is not None:
+                # The copied contextvars carry the caller's app context, and Flask-SQLAlchemy
+                # scopes sessions by app context: push a new one so the node has its own session.
+                with app.app_context():
+                    try:
+                        value = node.fn(inputs)
+                    finally:
+                        db.session.remove()
+            else:
+                value = node.fn(inputs)
+            status, error = "ok", None
+        except Exception as exc:
+            logger.warning("task graph node %s failed: %s", node.name, exc, exc_info=True)
+            value, status, error = None, "error", str(exc)
+        t1 = time.perf_counter()
+        return NodeOutcome(
+            name=node.name,
+            status=status,
+            value=value,
+            error=error,
+            start_ms=(t0 - started) * 1000.0,
+            elapsed_ms=(t1 - t0) * 1000.0,
+        )
+
+    def _log(self, outcomes: Dict[str, NodeOutcome], wall_ms: float) -> None:
+        for name in self._nodes:
+            outcome = outcomes[name]
+            logger.info(
+                "task graph %s node=%s status=%s start_ms=%.1f elapsed_ms=%.1f%s",
+                self.name,
+                name,
+                outcome.status,
+                outcome.start_ms,
+                outcome.elapsed_ms,
+                f" error={outcome.error}" if outcome.error else "",
+            )
+        serial_ms = sum(outcome.elapsed_ms for outcome in outcomes.values())
+        logger.info("task graph %s wall_ms=%.1f serial_ms=%.1f nodes=%d", self.name, wall_ms, serial_ms, len(outcomes))
+
+
+__all__ = ["NodeOutcome", "TaskGraph"]
@@ -14,7 +14,10 @@ from app.config import TASK_SEQUENCE
 from app.tasks.registry import TASK_REGISTRY
 from app.tasks.validation import validate_payload
 from app.workshop.helpers import get_or_create_facilitator_user
-from app.sockets_core.core import emit_timer_sync
+from app.sockets_core.core import emit_timer_sync, _extract_workshop_id
+from app.sockets_core.room_state import room_state
+from app.sockets_core.timer_scheduler import schedule_phase_timer
+from app.sockets_core.vote_tally import vote_tallies
 from app.assistant.assistant_socket import emit_assistant_state
 
 # Import task payload generators
@@ -242,8 +245,8 @@ def _emit_for_task_type(room: str, task_type: str, payload: dict):
         else:
             event = "task_ready"  # Default fallback
     
-    # Actually emit the event
-    socketio.emit(event, payload, to=room)
+    # Actually emit the event (recorded in the room's delta log; join snapshots rebuild on the next join)
+    room_state.broadcast(_extract_workshop_id(room, payload), event, payload, room, db_writes=None)
     if current_app:
         try:
             current_app.logger.info(f"[Workshop] Emitted {event} to {room} for task type {canonical_type}")
@@ -265,16 +268,20 @@ def _find_latest_task_id(workshop_id: int, task_type: str) -> int | None:
         return None
 
 
-def advance_to_next_task(workshop_id: int):
+def advance_to_next_task(workshop_id: int, *, bypass_cache: bool = False):
     """Advance to the next task in the sequence and broadcast. Returns (ok, payload_or_error).
     Safe to call from background threads.
 
     Behavior improvements:
     - If a dependent phase cannot start (e.g., clustering with no ideas, feasibility with no votes),
       gracefully skip to the next actionable phase instead of failing with 400.
+    - ``bypass_cache`` regenerates cached LLM phases (clustering, feasibility, prioritization,
+      summary) instead of replaying the response cache.
     """
     logger = current_app.logger if current_app else None
     try:
+        # Votes of the outgoing task must reach the database before the next phase reads them
+        vote_tallies.close(workshop_id)
         workshop = db.session.get(Workshop, workshop_id)
         if not workshop:
             return False, "Workshop not found"
@@ -312,24 +319,24 @@ def advance_to_next_task(workshop_id: int):
                 base_id = _find_latest_task_id(workshop.id, "brainstorming") or workshop.current_task_id
                 if not base_id:
                     return False, "Cannot start clustering without a prior Brainstorming phase.", True
-                res = get_clustering_voting_payload(workshop_id, base_id, ctx)
+                res = get_clustering_voting_payload(workshop_id, base_id, ctx, bypass_cache=bypass_cache)
             elif ttype == "results_feasibility":
                 # Prefer latest clustering/voting task as base; else fall back to current
                 base_id = _find_latest_task_id(workshop.id, "clustering_voting") or workshop.current_task_id
                 if not base_id:
                     return False, "Cannot start feasibility without a prior Clustering/Voting phase.", True
-                res = get_feasibility_payload(workshop_id, base_id, ctx)
+                res = get_feasibility_payload(workshop_id, base_id, ctx, bypass_cache=bypass_cache)
             elif ttype == "results_prioritization":
                 base_id = _find_latest_task_id(workshop.id, "clustering_voting")
                 if not base_id:
                     return False, "Cannot start prioritization without a prior Clustering/Voting phase.", True
-                res = get_prioritization_payload(workshop_id, base_id, ctx)
+                res = get_prioritization_payload(workshop_id, base_id, ctx, bypass_cache=bypass_cache)
             elif ttype == "results_action_plan":
                 res = get_action_plan_payload(workshop_id, ctx)
             elif ttype == "discussion":
                 res = get_discussion_payload(workshop_id, ctx)
             elif ttype == "summary":
-                res = get_summary_payload(workshop_id, ctx)
+                res = get_summary_payload(workshop_id, ctx, bypass_cache=bypass_cache)
             elif ttype == "meeting":
                 res = get_meeting_payload(workshop_id, ctx)
             elif ttype == "presentation":
@@ -479,7 +486,13 @@ def advance_to_next_task(workshop_id: int):
         task_type_str = task_payload.get("task_type") if isinstance(task_payload, dict) else None
         task_type_str = task_type_str or "brainstorming"
         _emit_for_task_type(room, task_type_str, task_payload if isinstance(task_payload, dict) else {})
-        # Emit initial timer sync
+        # Arm the phase deadline (expiry/auto-advance) and emit initial timer sync
+        schedule_phase_timer(
+            workshop_id,
+            new_task_id,
+            new_task.duration or 0,
+            total_seconds=new_task.duration,
+        )
         emit_timer_sync(
             room,
             {
@@ -509,7 +522,7 @@ def advance_to_next_task(workshop_id: int):
         return False, "Server error during auto-advance"
 
 
-def go_to_task(workshop_id: int, target_index: int):
+def go_to_task(workshop_id: int, target_index: int, *, bypass_cache: bool = False):
     """Jump to a specific task index in the plan and broadcast it.
     Returns (ok, payload_or_error).
 
@@ -517,9 +530,12 @@ def go_to_task(workshop_id: int, target_index: int):
     - Completes the currently running task (if any) before switching.
     - Generates payload for the requested index (skipping is not applied here; caller chooses index).
     - Emits the correct event for the selected task type and an initial timer_sync.
+    - ``bypass_cache`` regenerates cached LLM phases instead of replaying the response cache.
     """
     logger = current_app.logger if current_app else None
     try:
+        # Votes of the outgoing task must reach the database before the next phase reads them
+        vote_tallies.close(workshop_id)
         workshop = db.session.get(Workshop, workshop_id)
         if not workshop:
             return False, "Workshop not found"
@@ -556,24 +572,24 @@ def go_to_task(workshop_id: int, target_index: int):
                 base_id = _find_latest_task_id(workshop.id, "brainstorming")
                 if not base_id:
                     return False, "Cannot start clustering without a prior Brainstorming phase.", False
-                res = get_clustering_voting_payload(workshop_id, base_id, ctx)
+                res = get_clustering_voting_payload(workshop_id, base_id, ctx, bypass_cache=bypass_cache)
             elif t == "results_feasibility":
                 # For direct navigation, use the latest Clustering/Voting task as dependency
                 base_id = _find_latest_task_id(workshop.id, "clustering_voting")
                 if not base_id:
                     return False, "Cannot start feasibility without a prior Clustering/Voting phase.", False
-                res = get_feasibility_payload(workshop_id, base_id, ctx)
+                res = get_feasibility_payload(workshop_id, base_id, ctx, bypass_cache=bypass_cache)
             elif t == "results_prioritization":
                 base_id = _find_latest_task_id(workshop.id, "clustering_voting")
                 if not base_id:
                     return False, "Cannot start prioritization without a prior Clustering/Voting phase.", False
-                res = get_prioritization_payload(workshop_id, base_id, ctx)
+                res = get_prioritization_payload(workshop_id, base_id, ctx, bypass_cache=bypass_cache)
             elif t == "results_action_plan":
                 res = get_action_plan_payload(workshop_id, ctx)
             elif t == "discussion":
                 res = get_discussion_payload(workshop_id, ctx)
             elif t == "summary":
-                res = get_summary_payload(workshop_id, ctx)
+                res = get_summary_payload(workshop_id, ctx, bypass_cache=bypass_cache)
             elif t == "meeting":
                 res = get_meeting_payload(workshop_id, ctx)
             elif t == "presentation":
@@ -666,7 +682,13 @@ def go_to_task(workshop_id: int, target_index: int):
         task_type_str = payload.get("task_type") if isinstance(payload, dict) else None
         task_type_str = task_type_str or ttype
         _emit_for_task_type(room, task_type_str, payload if isinstance(payload, dict) else {})
-        # Emit initial timer sync
+        # Arm the phase deadline (expiry/auto-advance) and emit initial timer sync
+        schedule_phase_timer(
+            workshop_id,
+            new_task_id,
+            new_task.duration or 0,
+            total_seconds=new_task.duration,
+        )
         emit_timer_sync(
             room,
             {
@@ -41,6 +41,7 @@ from app.service.routes.icebreaker import generate_icebreaker_text
 from app.service.routes.tip import generate_tip_text
 from app.service.routes.actions import import_action_items
 from app.service.agenda_pipeline import run_agenda_pipeline, AgendaGenerationError
+from app.service.phase_artifacts import latest_phase_artifact
 from app.document.service.pipeline import run_pipeline
 from app.workshop.advance import advance_to_next_task
 from app.workshop.advance import go_to_task
@@ -52,9 +53,15 @@ from app.sockets import (
     emit_workshop_stopped,
     emit_workshop_paused,
     emit_workshop_resumed,
-    _room_presence,
-    _sid_registry,
     _broadcast_participant_list,
+    presence,
+)
+from app.sockets_core.core import emit_timer_sync
+from app.sockets_core.room_state import room_state
+from app.sockets_core.timer_scheduler import (
+    schedule_phase_timer,
+    pause_phase_timer,
+    cancel_phase_timer,
 )
 from markupsafe import escape
 from werkzeug.datastructures import FileStorage
@@ -2089,8 +2096,9 @@ def next_task(workshop_id):
     if workshop.status != "inprogress":
         return jsonify({"error": "Workshop is not in progress."}), 400
 
-    # Delegate to single orchestrator
-    ok, payload_or_error = advance_to_next_task(workshop_id)
+    # Delegate to single orchestrator; {"refresh": true} forces fresh LLM output for cached phases
+    body = request.get_json(silent=True) or {}
+    ok, payload_or_error = advance_to_next_task(workshop_id, bypass_cache=bool(body.get("refresh")))
     if not ok:
         # End of sequence? Mark completed gracefully
         if str(payload_or_error).lower().startswith("no more tasks"):
@@ -2101,6 +2109,7 @@ def next_task(workshop_id):
                 workshop.timer_paused_at = None
                 workshop.timer_elapsed_before_pause = 0
                 db.session.commit()
+                cancel_phase_timer(workshop_id)
                 emit_workshop_stopped(f"workshop_room_{workshop_id}", workshop_id)
                 return jsonify({
                     "success": True,
@@ -2128,6 +2137,7 @@ def end_current_task(workshop_id):
     # Keep index where it is; the UI can then call next/prev navigation
     try:
         db.session.commit()
+        cancel_phase_timer(workshop_id)
         socketio.emit('task_completed', { 'workshop_id': workshop_id }, to=f'workshop_room_{workshop_id}')
         return jsonify({ 'success': True })
     except Exception as e:
@@ -2142,7 +2152,9 @@ def goto_task(workshop_id, target_index):
     workshop = Workshop.query.get_or_404(workshop_id)
     if not is_organizer(workshop, current_user):
         abort(403)
-    ok, payload_or_error = go_to_task(workshop_id, target_index)
+    # {"refresh": true} regenerates the phase instead of replaying a cached LLM response
+    body = request.get_json(silent=True) or {}
+    ok, payload_or_error = go_to_task(workshop_id, target_index, bypass_cache=bool(body.get("refresh")))
     if not ok:
         return jsonify({ 'success': False, 'message': str(payload_or_error) }), 400
     return jsonify({ 'success': True, 'task': payload_or_error })
@@ -2159,7 +2171,8 @@ def nav_prev(workshop_id):
     if current_index <= 0:
         return jsonify({ 'success': False, 'message': 'Already at the first phase.' }), 400
     target_index = current_index - 1
-    ok, payload_or_error = go_to_task(workshop_id, target_index)
+    body = request.get_json(silent=True) or {}
+    ok, payload_or_error = go_to_task(workshop_id, target_index, bypass_cache=bool(body.get("refresh")))
     if not ok:
         return jsonify({ 'success': False, 'message': str(payload_or_error) }), 400
     return jsonify({ 'success': True, 'task': payload_or_error })
@@ -2173,7 +2186,8 @@ def nav_next(workshop_id):
         abort(403)
     current_index = workshop.current_task_index if workshop.current_task_index is not None else -1
     target_index = current_index + 1
-    ok, payload_or_error = go_to_task(workshop_id, target_index)
+    body = request.get_json(silent=True) or {}
+    ok, payload_or_error = go_to_task(workshop_id, target_index, bypass_cache=bool(body.get("refresh")))
     if not ok:
         return jsonify({ 'success': False, 'message': str(payload_or_error) }), 400
     return jsonify({ 'success': True, 'task': payload_or_error })
@@ -3422,6 +3436,7 @@ def start_workshop(workshop_id):
     workshop.current_task_index = None # Reset task sequence index
 
     db.session.commit()
+    cancel_phase_timer(workshop_id)
 
     socketio.emit(
         "workshop_started",
@@ -3461,6 +3476,7 @@ def pause_workshop(workshop_id):
         workshop.timer_start_time = None # Clear start time as it's now paused
 
     db.session.commit()
+    pause_phase_timer(workshop_id, workshop.get_remaining_task_time())
 
     emit_workshop_paused(f"workshop_room_{workshop_id}", workshop_id) # Use helper emitter
 
@@ -3486,8 +3502,21 @@ def resume_workshop(workshop_id):
         workshop.timer_paused_at = None # Clear paused time
 
     db.session.commit()
-
-    emit_workshop_resumed(f"workshop_room_{workshop_id}", workshop_id) # Use helper emitter
+    room = f"workshop_room_{workshop_id}"
+    emit_workshop_resumed(room, workshop_id) # Use helper emitter
+    if workshop.current_task_id:
+        remaining = workshop.get_remaining_task_time()
+        schedule_phase_timer(workshop_id, workshop.current_task_id, remaining)
+        # Clients wait for timer_sync to restart their countdown after a resume.
+        emit_timer_sync(
+            room,
+            {
+                "task_id": workshop.current_task_id,
+                "remaining_seconds": int(remaining),
+                "is_paused": False,
+            },
+            workshop_id=workshop_id,
+        )
 
     flash("Workshop resumed successfully.", "success")
     # No redirect needed if handled by socket event + JS reload
@@ -3522,6 +3551,7 @@ def stop_workshop(workshop_id):
     clear_workshop_tracking(workshop_id) # Clear moderator tracking
     
     db.session.commit()
+    cancel_phase_timer(workshop_id)
 
     emit_workshop_stopped(f"workshop_room_{workshop_id}", workshop_id) # Use helper emitter
 
@@ -3590,26 +3620,17 @@ def workshop_report(workshop_id):
         if not task_types:
             return None, {}
         try:
-            task = (
-                BrainstormTask.query
-                .filter(BrainstormTask.workshop_id == workshop.id, BrainstormTask.task_type.in_(task_types))
-                .order_by(BrainstormTask.created_at.desc())
-                .first()
-            )
-            if not task:
+            artifact = latest_phase_artifact(workshop.id, task_types)
+            if not artifact:
                 return None, {}
-            raw_payload = task.payload_json or task.prompt or ""
-            if not raw_payload:
-                return task, {}
-            try:
-                data = json.loads(raw_payload)
-                if isinstance(data, dict):
-                    return task, data
-            except Exception:
+            task = db.session.get(BrainstormTask, artifact.task_id)
+            data = artifact.payload if artifact.payload is not None else artifact.legacy_payload
+            if isinstance(data, dict):
+                return task, data
+            if artifact.raw_payload is not None:
                 current_app.logger.warning(
                     "[Report] Failed to parse payload for task %s (types=%s)",
-                    getattr(task, "id", None), task_types,
-                    exc_info=True,
+                    artifact.task_id, task_types,
                 )
             return task, {}
         except Exception as exc:
@@ -4340,11 +4361,11 @@ def submit_idea(workshop_id):
             except Exception:
                 emit_payload["metadata"] = idea.metadata_json
         room = f"workshop_room_{workshop_id}"
-        socketio.emit("new_idea", emit_payload, to=room)
+        room_state.broadcast(workshop.id, "new_idea", emit_payload, room, db_writes=1)
 
         # Optional: nudge inactive participants
         try:
-            present_user_ids = list(_room_presence.get(room, set())) if isinstance(_room_presence.get(room, set()), set) else []
+            present_user_ids = presence.room_users(room, workshop_id)
             check_and_nudge(workshop_id, current_user.user_id, present_user_ids)
         except Exception as e:
             current_app.logger.debug(f"[Moderator] nudge skipped: {e}")